@@ -1,12 +1,22 @@
 import pandas as pd
 
-def generate_client_count_summary():
-    """Generate a summary of client IDs and their appearance counts"""
+from report_sinks import create_report_sink, report_argument_parser, report_sink_from_args
+
+def generate_client_count_summary(duplicate_records=None, report=None):
+    """
+    Generate a summary of client IDs and their appearance counts
+    
+    duplicate_records can be passed in memory; otherwise duplicate_insurance_records.csv is read
+    """
+    report = report or create_report_sink()
     
     # Load the duplicate insurance records
     try:
-        df = pd.read_csv('duplicate_insurance_records.csv')
-        print("Loading duplicate insurance records...")
+        if duplicate_records is None:
+            df = pd.read_csv('duplicate_insurance_records.csv', dtype={'CLIENT_ID': str})
+            print("Loading duplicate insurance records...")
+        else:
+            df = duplicate_records
         print(f"Total records: {len(df)}")
         
         # Count occurrences of each client
@@ -17,12 +27,11 @@ def generate_client_count_summary():
         client_counts = client_counts.sort_values('APPEARANCE_COUNT', ascending=False)
         
         print(f"\nFound {len(client_counts)} unique clients with multiple records")
-        print("\n" + "="*60)
-        print("CLIENT ID AND APPEARANCE COUNT SUMMARY")
-        print("="*60)
         
         # Display the summary
-        print(client_counts.to_string(index=False))
+        report.section("CLIENT ID AND APPEARANCE COUNT SUMMARY")
+        if report.wants_detail:
+            report.table('client_appearance_counts', client_counts, title="Client appearance counts")
         
         # Save to CSV
         output_file = 'client_appearance_counts.csv'
@@ -30,11 +39,14 @@ def generate_client_count_summary():
         print(f"\nSummary saved to: {output_file}")
         
         # Show some statistics
-        print(f"\nStatistics:")
-        print(f"  - Clients with 2 appearances: {len(client_counts[client_counts['APPEARANCE_COUNT'] == 2])}")
-        print(f"  - Clients with 3+ appearances: {len(client_counts[client_counts['APPEARANCE_COUNT'] >= 3])}")
-        print(f"  - Highest appearance count: {client_counts['APPEARANCE_COUNT'].max()}")
-        print(f"  - Average appearance count: {client_counts['APPEARANCE_COUNT'].mean():.2f}")
+        report.metrics("Statistics", {
+            "Clients with 2 appearances": len(client_counts[client_counts['APPEARANCE_COUNT'] == 2]),
+            "Clients with 3+ appearances": len(client_counts[client_counts['APPEARANCE_COUNT'] >= 3]),
+            "Highest appearance count": client_counts['APPEARANCE_COUNT'].max(),
+            "Average appearance count": f"{client_counts['APPEARANCE_COUNT'].mean():.2f}",
+        })
+        
+        return client_counts
         
     except FileNotFoundError:
         print("Error: duplicate_insurance_records.csv not found. Please run the main analysis first.")
@@ -42,4 +54,7 @@ def generate_client_count_summary():
         print(f"An error occurred: {e}")
 
 if __name__ == "__main__":
-    generate_client_count_summary()
+    args = report_argument_parser("Count how often each duplicate client appears").parse_args()
+    report = report_sink_from_args(args, 'client_counts')
+    generate_client_count_summary(report=report)
+    report.close()
@@ -0,0 +1,134 @@
+"""
+Array-based CLIENT_ID reconciliation between the results table and insurance files
+CLIENT_IDs are canonicalised to int64 once and compared with sorted-array operations,
+so results come back as sorted id arrays and row positions instead of Python sets
+"""
+
+import pandas as pd
+import numpy as np
+
+# Marker for CLIENT_IDs that are blank or not numeric (e.g. 'nan', 'N/A'); below any real id,
+# so negative ids stay valid and the marker sorts first
+INVALID_CLIENT_ID = np.iinfo(np.int64).min
+
+# Integer text, optionally with a zero fraction as written by Excel ('71.0'); at most 18 digits after
+# the zero padding so every match fits in int64
+INTEGER_TEXT = r'^\s*([+-]?)0*(\d{1,18})(?:\.0*)?\s*$'
+
+def canonicalise_client_ids(client_ids):
+    """Convert CLIENT_ID values ('000000071', ' 71 ', 71, 71.0) to an int64 array"""
+    ids = pd.Series(client_ids, copy=False)
+
+    # Integer columns are already canonical - read_csv drops the zero padding
+    if ids.dtype.kind in 'iu':
+        return ids.to_numpy(dtype=np.int64, na_value=INVALID_CLIENT_ID)
+
+    # Float columns (integer ids with NaN) are converted directly, never through text
+    if ids.dtype.kind == 'f':
+        values = ids.to_numpy(dtype=float, na_value=np.nan)
+        whole = np.isfinite(values) & (np.floor(values) == values) & (np.abs(values) < 2.0 ** 63)
+        return np.where(whole, values, 0).astype(np.int64) * whole + INVALID_CLIENT_ID * ~whole
+
+    parts = ids.astype(str).str.extract(INTEGER_TEXT)
+    digits = parts[0] + parts[1]
+    canonical = np.full(len(ids), INVALID_CLIENT_ID, dtype=np.int64)
+    valid = digits.notna().to_numpy()
+    canonical[valid] = digits[valid].astype(np.int64).to_numpy()
+    return canonical
+
+def sorted_unique(sorted_ids):
+    """Unique values of an already sorted int64 array"""
+    if len(sorted_ids) == 0:
+        return sorted_ids
+    keep = np.empty(len(sorted_ids), dtype=bool)
+    keep[0] = True
+    np.not_equal(sorted_ids[1:], sorted_ids[:-1], out=keep[1:])
+    return sorted_ids[keep]
+
+def unique_client_ids(canonical_ids):
+    """Sorted unique valid ids from a canonical int64 array"""
+    # np.sort + adjacent compare; np.unique defaults to hashing on recent numpy
+    return sorted_unique(np.sort(canonical_ids[canonical_ids != INVALID_CLIENT_ID]))
+
+def member_mask(canonical_ids, sorted_ids, order=None):
+    """
+    Boolean mask of which canonical ids are in sorted_ids (binary search, no hashing)
+
+    Pass order = np.argsort(canonical_ids) when it is already known; searching with
+    sorted needles is far more cache friendly than searching in row order.
+    """
+    if len(sorted_ids) == 0 or len(canonical_ids) == 0:
+        return np.zeros(len(canonical_ids), dtype=bool)
+
+    if order is None:
+        order = np.argsort(canonical_ids)
+    needles = canonical_ids[order]
+
+    positions = np.searchsorted(sorted_ids, needles)
+    positions[positions == len(sorted_ids)] = 0
+
+    mask = np.empty(len(canonical_ids), dtype=bool)
+    mask[order] = sorted_ids[positions] == needles
+    return mask
+
+def _sort_client_ids(client_ids):
+    """Canonicalise a CLIENT_ID column and sort it once: (ids, order, unique valid ids)"""
+    ids = canonicalise_client_ids(client_ids)
+    order = np.argsort(ids)
+    sorted_ids = ids[order]
+    valid_from = np.searchsorted(sorted_ids, INVALID_CLIENT_ID, side='right')
+    return ids, order, sorted_unique(sorted_ids[valid_from:])
+
+def reconcile_client_ids(left_ids, right_ids):
+    """
+    Compare two CLIENT_ID columns
+
+    Returns a dict with the sorted unique ids in both / only left / only right and the
+    row positions of each group in the original left and right columns, so callers can
+    select rows with .iloc instead of isin over sets
+    """
+    left, left_order, left_unique = _sort_client_ids(left_ids)
+    right, right_order, right_unique = _sort_client_ids(right_ids)
+
+    common = np.intersect1d(left_unique, right_unique, assume_unique=True)
+    only_left = np.setdiff1d(left_unique, right_unique, assume_unique=True)
+    only_right = np.setdiff1d(right_unique, left_unique, assume_unique=True)
+
+    left_in_common = member_mask(left, common, left_order)
+    right_in_common = member_mask(right, common, right_order)
+
+    return {
+        'left_ids': left_unique,
+        'right_ids': right_unique,
+        'common_ids': common,
+        'only_left_ids': only_left,
+        'only_right_ids': only_right,
+        'left_common_rows': np.flatnonzero(left_in_common),
+        'right_common_rows': np.flatnonzero(right_in_common),
+        'left_only_rows': np.flatnonzero(~left_in_common & (left != INVALID_CLIENT_ID)),
+        'right_only_rows': np.flatnonzero(~right_in_common & (right != INVALID_CLIENT_ID)),
+        'left_invalid_rows': np.flatnonzero(left == INVALID_CLIENT_ID),
+        'right_invalid_rows': np.flatnonzero(right == INVALID_CLIENT_ID),
+    }
+
+def client_presence_matrix(id_columns):
+    """
+    Presence of every client across many files in one pass
+
+    id_columns maps a file/sheet name to its CLIENT_ID column. Returns a boolean
+    DataFrame indexed by canonical CLIENT_ID with one column per file.
+    """
+    unique_per_file = {name: unique_client_ids(canonicalise_client_ids(ids))
+                       for name, ids in id_columns.items()}
+
+    if unique_per_file:
+        all_ids = sorted_unique(np.sort(np.concatenate(list(unique_per_file.values()))))
+    else:
+        all_ids = np.array([], dtype=np.int64)
+
+    presence = {name: member_mask(all_ids, ids) for name, ids in unique_per_file.items()}
+    return pd.DataFrame(presence, index=pd.Index(all_ids, name='CLIENT_ID'))
+
+def format_client_ids(canonical_ids, width=9):
+    """Render canonical ids back to the zero-padded string form used in the files"""
+    return pd.Series(canonical_ids, dtype=np.int64).astype(str).str.zfill(width)
@@ -1,13 +1,23 @@
 import pandas as pd
 from datetime import datetime
 
-def extract_and_rank_insurance_dates():
-    """Extract specific fields and rank by insurance start date for each client"""
+from report_sinks import create_report_sink, report_argument_parser, report_sink_from_args
+
+def extract_and_rank_insurance_dates(report=None, duplicate_records=None):
+    """
+    Extract specific fields and rank by insurance start date for each client
+    
+    duplicate_records can be passed in memory; otherwise duplicate_insurance_records.csv is read
+    """
+    report = report or create_report_sink()
     
     try:
         # Load the duplicate insurance records
-        print("Loading duplicate insurance records...")
-        df = pd.read_csv('duplicate_insurance_records.csv')
+        if duplicate_records is None:
+            print("Loading duplicate insurance records...")
+            df = pd.read_csv('duplicate_insurance_records.csv', dtype={'CLIENT_ID': str})
+        else:
+            df = duplicate_records
         print(f"Loaded {len(df)} records")
         
         # Select only the required columns
@@ -48,20 +58,13 @@ def extract_and_rank_insurance_dates():
         for rank, count in rank_distribution.items():
             print(f"  Rank {rank}: {count} records")
         
-        # Show sample of the ranked data
-        print(f"\nSample of ranked insurance dates (first 20 records):")
-        print("="*80)
-        print(df_final.head(20).to_string(index=False))
-        
-        # Show clients with their complete ranking
-        print(f"\nComplete ranking for first 10 clients:")
-        print("="*80)
-        sample_clients = df_final['CLIENT_ID'].unique()[:10]
-        for client_id in sample_clients:
-            client_records = df_final[df_final['CLIENT_ID'] == client_id]
-            print(f"\nClient {client_id}:")
-            for _, record in client_records.iterrows():
-                print(f"  Rank {record['RANK']}: {record['DISASTER_INSURANCE_START_DATE']} - {record['RECORD_MONTH']} - {record['ACCT_TYPE']}")
+        # Show sample of the ranked data and the complete ranking for the first 10 clients
+        if report.wants_detail:
+            report.table('ranked_sample', df_final.head(20),
+                         title="Sample of ranked insurance dates (first 20 records)")
+            sample_clients = df_final['CLIENT_ID'].unique()[:10]
+            report.table('first_clients_ranking', df_final[df_final['CLIENT_ID'].isin(sample_clients)],
+                         title="Complete ranking for first 10 clients")
         
         return df_final
         
@@ -72,10 +75,11 @@ def extract_and_rank_insurance_dates():
         print(f"An error occurred: {e}")
         return None
 
-def analyze_insurance_patterns(df):
+def analyze_insurance_patterns(df, report=None):
     """Analyze patterns in the insurance dates"""
     if df is None:
         return
+    report = report or create_report_sink()
     
     print(f"\n" + "="*60)
     print("INSURANCE PATTERN ANALYSIS")
@@ -103,34 +107,25 @@ def analyze_insurance_patterns(df):
         print(f"\nRank 2 records saved to: {rank2_file}")
         
         # Show sample of clients with second insurance
-        print(f"\nSample of clients with second insurance (first 15):")
-        sample_rank2 = rank2_records.head(15)
-        for _, record in sample_rank2.iterrows():
-            print(f"  {record['CLIENT_ID']}: {record['DISASTER_INSURANCE_START_DATE']} - {record['RECORD_MONTH']} - {record['ACCT_TYPE']}")
+        if report.wants_detail:
+            report.table('rank2_sample', rank2_records.head(15)[
+                ['CLIENT_ID', 'DISASTER_INSURANCE_START_DATE', 'RECORD_MONTH', 'ACCT_TYPE']
+            ], title="Sample of clients with second insurance (first 15)")
     else:
         print("No rank 2 records found.")
     
-    # Group by client and analyze patterns
-    client_patterns = []
-    for client_id in df['CLIENT_ID'].unique():
-        client_records = df[df['CLIENT_ID'] == client_id].sort_values('DISASTER_INSURANCE_START_DATE')
-        
-        if len(client_records) > 1:
-            # Calculate time difference between first and last insurance
-            first_date = client_records.iloc[0]['DISASTER_INSURANCE_START_DATE']
-            last_date = client_records.iloc[-1]['DISASTER_INSURANCE_START_DATE']
-            days_between = (last_date - first_date).days
-            
-            client_patterns.append({
-                'CLIENT_ID': client_id,
-                'FIRST_INSURANCE': first_date.strftime('%Y-%m-%d'),
-                'LAST_INSURANCE': last_date.strftime('%Y-%m-%d'),
-                'DAYS_BETWEEN': days_between,
-                'RECORD_COUNT': len(client_records)
-            })
-    
-    if client_patterns:
-        patterns_df = pd.DataFrame(client_patterns)
+    # Group by client and analyze patterns (first vs last insurance per client)
+    client_dates = df.groupby('CLIENT_ID')['DISASTER_INSURANCE_START_DATE'].agg(['min', 'max', 'size'])
+    client_dates = client_dates[client_dates['size'] > 1]
+    patterns_df = pd.DataFrame({
+        'CLIENT_ID': client_dates.index,
+        'FIRST_INSURANCE': client_dates['min'].dt.strftime('%Y-%m-%d').to_numpy(),
+        'LAST_INSURANCE': client_dates['max'].dt.strftime('%Y-%m-%d').to_numpy(),
+        'DAYS_BETWEEN': (client_dates['max'] - client_dates['min']).dt.days.to_numpy(),
+        'RECORD_COUNT': client_dates['size'].to_numpy()
+    })
+    
+    if not patterns_df.empty:
         patterns_df = patterns_df.sort_values('DAYS_BETWEEN', ascending=False)
         
         print(f"\nClients with multiple insurance records:")
@@ -145,8 +140,10 @@ def analyze_insurance_patterns(df):
         print(f"\nInsurance patterns analysis saved to: {patterns_file}")
         
         # Show top 10 clients with longest time between insurance records
-        print(f"\nTop 10 clients with longest time between insurance records:")
-        print(patterns_df.head(10)[['CLIENT_ID', 'FIRST_INSURANCE', 'LAST_INSURANCE', 'DAYS_BETWEEN']].to_string(index=False))
+        if report.wants_detail:
+            report.table('longest_between_insurance',
+                         patterns_df.head(10)[['CLIENT_ID', 'FIRST_INSURANCE', 'LAST_INSURANCE', 'DAYS_BETWEEN']],
+                         title="Top 10 clients with longest time between insurance records")
 
 def count_rank_distribution_by_month(df):
     """Count the distribution of ranks by month"""
@@ -215,11 +212,14 @@ def count_rank_distribution_by_month(df):
     return rank_month_pivot
 
 if __name__ == "__main__":
+    args = report_argument_parser("Rank insurance start dates for duplicate clients").parse_args()
+    report = report_sink_from_args(args, 'insurance_dates')
+    
     # Extract and rank the insurance dates
-    ranked_df = extract_and_rank_insurance_dates()
+    ranked_df = extract_and_rank_insurance_dates(report)
     
     # Analyze patterns
-    analyze_insurance_patterns(ranked_df)
+    analyze_insurance_patterns(ranked_df, report)
     
     # Count rank distribution by month
     count_rank_distribution_by_month(ranked_df)
@@ -227,3 +227,4 @@ if __name__ == "__main__":
     print(f"\n" + "="*60)
     print("EXTRACTION AND ANALYSIS COMPLETE!")
     print("="*60)
+    report.close()
@@ -0,0 +1,95 @@
+"""
+Key-aligned field diff between two record sets
+Each side is first reduced to one deterministic row per key (or per key + month),
+then columns are compared vectorized with per-column tolerances. The output is a
+compact long-format mismatch report: key, column, left value, right value.
+"""
+
+import pandas as pd
+import numpy as np
+
+def pick_representative_rows(df, key_columns, order_by=None, keep='last'):
+    """
+    Reduce df to one row per key
+
+    Rows are stably sorted by key and order_by, then the first or last row per key is
+    kept, so the same input always yields the same representative. With order_by=None
+    the original row order decides.
+    """
+    key_columns = [key_columns] if isinstance(key_columns, str) else list(key_columns)
+    order_by = [] if order_by is None else ([order_by] if isinstance(order_by, str) else list(order_by))
+
+    if df.empty:
+        return df.copy()
+
+    sorted_df = df.sort_values(key_columns + order_by, kind='mergesort', na_position='first')
+    return sorted_df.drop_duplicates(subset=key_columns, keep=keep)
+
+def _values_differ(left, right, tolerance):
+    """Boolean mask of differing values; NaN on both sides counts as equal"""
+    both_missing = left.isna().to_numpy() & right.isna().to_numpy()
+
+    if pd.api.types.is_numeric_dtype(left) and pd.api.types.is_numeric_dtype(right):
+        left_values = left.to_numpy(dtype=float)
+        right_values = right.to_numpy(dtype=float)
+        with np.errstate(invalid='ignore'):
+            differ = ~(np.abs(left_values - right_values) <= tolerance)
+    else:
+        differ = (left.astype(str).to_numpy() != right.astype(str).to_numpy())
+
+    return differ & ~both_missing
+
+def diff_fields(left_df, right_df, key_columns, compare_columns, tolerances=None,
+                left_order_by=None, right_order_by=None, keep='last'):
+    """
+    Compare compare_columns between two frames for keys present on both sides
+
+    tolerances maps a numeric column to the absolute difference that still counts as a
+    match (default 0). Both sides are reduced with pick_representative_rows first, so
+    repeated keys never produce a many-to-many join. Returns (mismatches, summary):
+    mismatches has the key columns plus COLUMN, LEFT_VALUE and RIGHT_VALUE; summary has
+    the number of compared keys and mismatches per column.
+    """
+    key_columns = [key_columns] if isinstance(key_columns, str) else list(key_columns)
+    tolerances = tolerances or {}
+
+    left_rows = pick_representative_rows(left_df[key_columns + compare_columns + _extra(left_order_by, key_columns + compare_columns)],
+                                         key_columns, left_order_by, keep)
+    right_rows = pick_representative_rows(right_df[key_columns + compare_columns + _extra(right_order_by, key_columns + compare_columns)],
+                                          key_columns, right_order_by, keep)
+
+    # One row per key on each side, so this is a one-to-one hash join
+    aligned = pd.merge(left_rows[key_columns + compare_columns],
+                       right_rows[key_columns + compare_columns],
+                       on=key_columns, suffixes=('_left', '_right'),
+                       validate='one_to_one')
+
+    mismatch_frames = []
+    summary_rows = []
+    for column in compare_columns:
+        left = aligned[f'{column}_left']
+        right = aligned[f'{column}_right']
+        differ = _values_differ(left, right, tolerances.get(column, 0))
+
+        summary_rows.append({'COLUMN': column, 'COMPARED': len(aligned), 'MISMATCHES': int(differ.sum())})
+
+        if differ.any():
+            column_mismatches = aligned.loc[differ, key_columns].copy()
+            column_mismatches['COLUMN'] = column
+            column_mismatches['LEFT_VALUE'] = left[differ].astype(object).to_numpy()
+            column_mismatches['RIGHT_VALUE'] = right[differ].astype(object).to_numpy()
+            mismatch_frames.append(column_mismatches)
+
+    if mismatch_frames:
+        mismatches = pd.concat(mismatch_frames, ignore_index=True)
+    else:
+        mismatches = pd.DataFrame(columns=key_columns + ['COLUMN', 'LEFT_VALUE', 'RIGHT_VALUE'])
+
+    return mismatches, pd.DataFrame(summary_rows)
+
+def _extra(order_by, selected_columns):
+    """Ordering columns that are not already selected"""
+    if order_by is None:
+        return []
+    order_by = [order_by] if isinstance(order_by, str) else list(order_by)
+    return [column for column in order_by if column not in selected_columns]
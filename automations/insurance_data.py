@@ -0,0 +1,85 @@
+"""
+Shared loading of the results table and the monthly Climate Disaster Insurance sheets
+"""
+
+import pandas as pd
+import glob
+
+MONTH_MARKERS = ["'25", "'24", "Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+def find_insurance_file():
+    """First Climate Disaster Insurance Excel file in the current directory"""
+    excel_files = glob.glob('*.xlsx')
+    insurance_files = [f for f in excel_files if 'Climate_Disaster_Insurance' in f]
+    return insurance_files[0] if insurance_files else None
+
+def load_insurance_sheets(insurance_file):
+    """Load every monthly sheet in one pass over the workbook"""
+    print(f"Loading insurance data from: {insurance_file}")
+
+    # The workbook is opened once; each sheet is parsed on its own so one bad sheet is skipped
+    workbook = pd.ExcelFile(insurance_file)
+    print(f"Found {len(workbook.sheet_names)} monthly sheets: {workbook.sheet_names}")
+
+    all_insurance_data = []
+    for sheet_name in workbook.sheet_names:
+        # Skip non-monthly sheets (if any)
+        if not any(month in sheet_name for month in MONTH_MARKERS):
+            continue
+
+        try:
+            df = workbook.parse(sheet_name)
+
+            # Clean column names (remove extra whitespace)
+            df.columns = df.columns.str.strip()
+
+            # Add source information
+            df['SOURCE_SHEET'] = sheet_name
+            df['RECORD_MONTH'] = sheet_name  # Use sheet name as month
+
+            all_insurance_data.append(df)
+            print(f"  {sheet_name}: {len(df)} records")
+
+        except Exception as e:
+            print(f"  Error loading sheet {sheet_name}: {e}")
+
+    # Combine all monthly data
+    if not all_insurance_data:
+        print("No monthly sheets loaded successfully")
+        return pd.DataFrame()
+
+    climate_df = pd.concat(all_insurance_data, ignore_index=True)
+    print(f"Combined insurance data: {len(climate_df)} total records")
+    print(f"Months loaded: {sorted(climate_df['RECORD_MONTH'].unique())}")
+    return climate_df
+
+def load_and_clean_data(results_file='result-Table 1.csv', insurance_file=None):
+    """Load Excel file with monthly sheets and clean the data"""
+    print("Loading Excel file with monthly insurance data...")
+
+    insurance_file = insurance_file or find_insurance_file()
+    if not insurance_file:
+        print("No Climate Disaster Insurance Excel files found!")
+        return pd.DataFrame(), pd.DataFrame()
+
+    # Load the results table - keep CLIENT_ID as text so zero padding survives
+    results_df = pd.read_csv(results_file, dtype={'CLIENT_ID': str})
+    print(f"Results table: {len(results_df)} records")
+
+    climate_df = load_insurance_sheets(insurance_file)
+
+    # Clean CLIENT_ID column - remove any whitespace and convert to string
+    results_df['CLIENT_ID'] = results_df['CLIENT_ID'].astype(str).str.strip()
+    if not climate_df.empty:
+        climate_df['CLIENT_ID'] = climate_df['CLIENT_ID'].astype(str).str.strip()
+
+    return results_df, climate_df
+
+def duplicate_insurance_records(climate_df):
+    """All insurance rows of clients appearing more than once, sorted by CLIENT_ID and sheet"""
+    if climate_df.empty:
+        return climate_df.copy()
+
+    appearance_counts = climate_df.groupby('CLIENT_ID')['CLIENT_ID'].transform('size')
+    duplicate_records = climate_df[appearance_counts > 1]
+    return duplicate_records.sort_values(['CLIENT_ID', 'SOURCE_SHEET'])
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Insurance reconciliation CLI
+One entry point for the overlap, duplicate, date-ranking and count analyses.
+The 'all' command loads the workbook once and passes the insurance frame and the
+derived duplicate records between steps in memory; only final outputs are written.
+
+Usage:
+    python insurance_reconciliation.py overlap
+    python insurance_reconciliation.py duplicates
+    python insurance_reconciliation.py rank-dates [--duplicates-csv FILE]
+    python insurance_reconciliation.py counts [--duplicates-csv FILE]
+    python insurance_reconciliation.py all [--quiet] [--report-format console html]
+"""
+
+import argparse
+import time
+
+import pandas as pd
+
+import client_comparison_analysis
+import client_count_summary
+import enhanced_duplicate_analysis
+import extract_insurance_dates
+from insurance_data import duplicate_insurance_records, load_and_clean_data
+from report_sinks import add_report_arguments, report_sink_from_args
+
+class ReconciliationRun:
+    """Shared state for one CLI invocation - each input is loaded at most once"""
+
+    def __init__(self, args):
+        self.args = args
+        self._results_df = None
+        self._climate_df = None
+        self._duplicate_records = None
+
+    def load(self):
+        if self._climate_df is None:
+            self._results_df, self._climate_df = load_and_clean_data(self.args.results_file, self.args.insurance_file)
+
+    @property
+    def results_df(self):
+        self.load()
+        return self._results_df
+
+    @property
+    def climate_df(self):
+        self.load()
+        return self._climate_df
+
+    @property
+    def duplicate_records(self):
+        """Duplicate rows from memory, the workbook, or a previously written CSV"""
+        if self._duplicate_records is None:
+            if getattr(self.args, 'duplicates_csv', None):
+                print(f"Loading duplicate insurance records from: {self.args.duplicates_csv}")
+                self._duplicate_records = pd.read_csv(self.args.duplicates_csv, dtype={'CLIENT_ID': str})
+            else:
+                self._duplicate_records = duplicate_insurance_records(self.climate_df)
+        return self._duplicate_records
+
+    @duplicate_records.setter
+    def duplicate_records(self, records):
+        self._duplicate_records = records
+
+def run_overlap(run, report):
+    """Results table vs insurance sheets: missing clients and field mismatches"""
+    overlap = client_comparison_analysis.analyze_client_overlap(run.results_df, run.climate_df)
+    client_comparison_analysis.detailed_analysis(run.results_df, run.climate_df, overlap, report)
+    client_comparison_analysis.generate_summary_report(overlap)
+
+def run_duplicates(run, report):
+    """Clients repeated across monthly sheets; keeps the duplicate records for later steps"""
+    duplicate_clients, single_appearance_clients = \
+        enhanced_duplicate_analysis.analyze_client_duplicates_enhanced(run.climate_df)
+    run.duplicate_records = enhanced_duplicate_analysis.detailed_duplicate_analysis_enhanced(
+        run.climate_df, duplicate_clients, report)
+    enhanced_duplicate_analysis.generate_enhanced_summary_report(duplicate_clients, single_appearance_clients, report)
+
+def run_rank_dates(run, report):
+    """Rank each duplicate client's insurance start dates"""
+    ranked_df = extract_insurance_dates.extract_and_rank_insurance_dates(report, run.duplicate_records)
+    extract_insurance_dates.analyze_insurance_patterns(ranked_df, report)
+    extract_insurance_dates.count_rank_distribution_by_month(ranked_df)
+
+def run_counts(run, report):
+    """Appearance count per duplicate client"""
+    client_count_summary.generate_client_count_summary(run.duplicate_records, report)
+
+def run_all(run, report):
+    """Every step above on a single load of the inputs"""
+    run_overlap(run, report)
+    run_duplicates(run, report)
+    run_rank_dates(run, report)
+    run_counts(run, report)
+
+COMMANDS = {
+    'overlap': run_overlap,
+    'duplicates': run_duplicates,
+    'rank-dates': run_rank_dates,
+    'counts': run_counts,
+    'all': run_all,
+}
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Climate Disaster Insurance reconciliation")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for name, command in COMMANDS.items():
+        subparser = subparsers.add_parser(name, help=command.__doc__)
+        subparser.add_argument('--results-file', default='result-Table 1.csv',
+                               help="Results table CSV (default: 'result-Table 1.csv')")
+        subparser.add_argument('--insurance-file', default=None,
+                               help="Insurance workbook (default: first *Climate_Disaster_Insurance*.xlsx)")
+        if name in ('rank-dates', 'counts'):
+            subparser.add_argument('--duplicates-csv', default=None,
+                                   help="Read duplicate records from this CSV instead of the workbook")
+        add_report_arguments(subparser)
+
+    return parser
+
+def main():
+    args = build_parser().parse_args()
+    report = report_sink_from_args(args, f"insurance_{args.command.replace('-', '_')}")
+    run = ReconciliationRun(args)
+
+    start = time.perf_counter()
+    try:
+        COMMANDS[args.command](run, report)
+    finally:
+        report.close()
+
+    print(f"\n" + "="*60)
+    print(f"{args.command.upper()} COMPLETE in {time.perf_counter() - start:.1f}s")
+    print("="*60)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Blocked fuzzy matching of FULL_NAME values between the results table and insurance files
+Names are scored with character n-gram TF-IDF cosine and token containment, both computed
+as sparse matrix products, and classified as exact / variant / different.
+Candidates are blocked either by CLIENT_ID (same client, different spelling) or by a
+phonetic key of the name tokens (same person under different CLIENT_IDs).
+"""
+
+import pandas as pd
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+
+from client_id_reconciliation import canonicalise_client_ids
+
+# Character n-gram cosine at or above this counts as a spelling variant
+VARIANT_SIMILARITY = 0.8
+
+# Phonetic blocks larger than this on either side are skipped (e.g. very common surnames)
+MAX_BLOCK_SIZE = 200
+
+SOUNDEX_CODES = {letter: str(code)
+                 for code, letters in enumerate(['aeiouyhw', 'bfpv', 'cgjkqsxz', 'dt', 'l', 'mn', 'r'])
+                 for letter in letters}
+
+def normalise_names(names):
+    """Casefold, strip punctuation and collapse whitespace"""
+    return (pd.Series(names, copy=False).fillna('').astype(str)
+            .str.casefold()
+            .str.replace(r'[^\w\s]', ' ', regex=True)
+            .str.replace(r'\s+', ' ', regex=True)
+            .str.strip())
+
+def soundex(token):
+    """Classic 4-character Soundex code of a single name token"""
+    letters = [letter for letter in token if letter in SOUNDEX_CODES]
+    if not letters:
+        return ''
+
+    code = letters[0].upper()
+    previous = SOUNDEX_CODES[letters[0]]
+    for letter in letters[1:]:
+        digit = SOUNDEX_CODES[letter]
+        if digit != '0' and digit != previous:
+            code += digit
+        if letter not in 'hw':
+            previous = digit
+    return (code + '000')[:4]
+
+def score_name_pairs(left_names, right_names, variant_similarity=VARIANT_SIMILARITY):
+    """
+    Score aligned name pairs (left_names[i] vs right_names[i])
+
+    Returns a DataFrame with NGRAM_SIMILARITY (char 2-3 gram TF-IDF cosine), TOKEN_CONTAINMENT
+    (shared tokens / tokens in the shorter name) and MATCH_CLASS:
+      exact     - identical after trimming (and not blank)
+      variant   - same tokens in another order or casing, a missing middle name,
+                  or n-gram similarity >= variant_similarity
+      different - anything else, including blank names
+    """
+    left_raw = pd.Series(left_names, copy=False).fillna('').astype(str).str.strip().to_numpy()
+    right_raw = pd.Series(right_names, copy=False).fillna('').astype(str).str.strip().to_numpy()
+    left = normalise_names(left_raw)
+    right = normalise_names(right_raw)
+
+    if len(left) == 0:
+        return pd.DataFrame(columns=['NGRAM_SIMILARITY', 'TOKEN_CONTAINMENT', 'MATCH_CLASS'])
+
+    vocabulary = pd.concat([left, right], ignore_index=True).drop_duplicates()
+    vocabulary = vocabulary[vocabulary != '']
+
+    if vocabulary.empty:
+        # Every name is blank or punctuation only - nothing to vectorise, so nothing is similar
+        ngram_similarity = token_containment = shorter = np.zeros(len(left))
+    else:
+        # Rows are L2-normalised, so the row-wise dot product is the cosine similarity
+        ngrams = TfidfVectorizer(analyzer='char_wb', ngram_range=(2, 3)).fit(vocabulary)
+        ngram_similarity = np.asarray(ngrams.transform(left).multiply(ngrams.transform(right)).sum(axis=1)).ravel()
+
+        tokens = CountVectorizer(analyzer=str.split, binary=True).fit(vocabulary)
+        left_tokens = tokens.transform(left)
+        right_tokens = tokens.transform(right)
+        shared = np.asarray(left_tokens.multiply(right_tokens).sum(axis=1)).ravel()
+        shorter = np.minimum(np.asarray(left_tokens.sum(axis=1)).ravel(),
+                             np.asarray(right_tokens.sum(axis=1)).ravel())
+        token_containment = np.divide(shared, shorter, out=np.zeros(len(shared)), where=shorter > 0)
+
+    # Two blank names are not a match
+    exact = (left_raw == right_raw) & (left_raw != '')
+    variant = ((token_containment == 1) & (shorter > 1)) | (ngram_similarity >= variant_similarity)
+    variant |= (left.to_numpy() == right.to_numpy()) & (left.to_numpy() != '')
+
+    return pd.DataFrame({
+        'NGRAM_SIMILARITY': ngram_similarity.round(4),
+        'TOKEN_CONTAINMENT': token_containment.round(4),
+        'MATCH_CLASS': np.select([exact, variant], ['exact', 'variant'], 'different'),
+    })
+
+def match_names_by_client(left_df, right_df, name_column='FULL_NAME', key_column='CLIENT_ID'):
+    """
+    Block by CLIENT_ID and classify each client's name pair
+
+    Both frames should already hold one row per client (see field_diff.pick_representative_rows).
+    """
+    left = left_df[[key_column, name_column]].assign(CLIENT_KEY=canonicalise_client_ids(left_df[key_column]))
+    right = right_df[[key_column, name_column]].assign(CLIENT_KEY=canonicalise_client_ids(right_df[key_column]))
+    pairs = pd.merge(left, right, on='CLIENT_KEY', suffixes=('_left', '_right'))
+
+    scores = score_name_pairs(pairs[f'{name_column}_left'], pairs[f'{name_column}_right'])
+    return pd.concat([pairs.reset_index(drop=True), scores], axis=1)
+
+def phonetic_blocks(names):
+    """Long (ROW, BLOCK_KEY) frame with one row per distinct Soundex code of each name's tokens"""
+    tokens = normalise_names(names).str.split().explode()
+    tokens = tokens[tokens.notna() & (tokens.str.len() > 1)]
+
+    # Soundex is computed once per distinct token, not per row or per pair
+    unique_tokens = tokens.unique()
+    codes = pd.Series([soundex(token) for token in unique_tokens], index=unique_tokens)
+
+    blocks = pd.DataFrame({'ROW': tokens.index.to_numpy(), 'BLOCK_KEY': codes.reindex(tokens.to_numpy()).to_numpy()})
+    return blocks[blocks['BLOCK_KEY'] != ''].drop_duplicates()
+
+def find_name_candidates(left_df, right_df, name_column='FULL_NAME', min_shared_blocks=2,
+                         max_block_size=MAX_BLOCK_SIZE, variant_similarity=VARIANT_SIMILARITY):
+    """
+    Find likely same-person pairs across two frames without comparing every pair
+
+    Rows are blocked on the Soundex code of each name token; only pairs sharing at least
+    min_shared_blocks codes are scored. Returns candidate pairs classified exact/variant,
+    with LEFT_ROW/RIGHT_ROW positions into the inputs.
+    """
+    left_names = left_df[name_column].reset_index(drop=True)
+    right_names = right_df[name_column].reset_index(drop=True)
+
+    left_blocks = phonetic_blocks(left_names)
+    right_blocks = phonetic_blocks(right_names)
+
+    # Drop oversized blocks so a common surname can't explode the candidate set
+    left_sizes = left_blocks['BLOCK_KEY'].value_counts()
+    right_sizes = right_blocks['BLOCK_KEY'].value_counts()
+    usable = left_sizes.index.intersection(right_sizes.index)
+    usable = usable[(left_sizes[usable] <= max_block_size).to_numpy() & (right_sizes[usable] <= max_block_size).to_numpy()]
+
+    candidates = pd.merge(left_blocks[left_blocks['BLOCK_KEY'].isin(usable)],
+                          right_blocks[right_blocks['BLOCK_KEY'].isin(usable)],
+                          on='BLOCK_KEY', suffixes=('_LEFT', '_RIGHT'))
+    candidates = (candidates.groupby(['ROW_LEFT', 'ROW_RIGHT']).size()
+                  .reset_index(name='SHARED_BLOCKS'))
+    candidates = candidates[candidates['SHARED_BLOCKS'] >= min_shared_blocks].reset_index(drop=True)
+    candidates = candidates.rename(columns={'ROW_LEFT': 'LEFT_ROW', 'ROW_RIGHT': 'RIGHT_ROW'})
+
+    candidates['LEFT_NAME'] = left_names.to_numpy()[candidates['LEFT_ROW'].to_numpy()]
+    candidates['RIGHT_NAME'] = right_names.to_numpy()[candidates['RIGHT_ROW'].to_numpy()]
+    scores = score_name_pairs(candidates['LEFT_NAME'], candidates['RIGHT_NAME'], variant_similarity)
+    candidates = pd.concat([candidates, scores], axis=1)
+
+    return (candidates[candidates['MATCH_CLASS'] != 'different']
+            .sort_values('NGRAM_SIMILARITY', ascending=False)
+            .reset_index(drop=True))
+
+def main():
+    """Look for clients missing from one file who appear in the other under a different CLIENT_ID"""
+    try:
+        missing_from_results = pd.read_csv('clients_missing_from_results_table.csv', dtype={'CLIENT_ID': str})
+        missing_from_climate = pd.read_csv('clients_missing_from_climate_disaster.csv', dtype={'CLIENT_ID': str})
+        print(f"Clients missing from results table: {len(missing_from_results)}")
+        print(f"Clients missing from climate disaster file: {len(missing_from_climate)}")
+
+        candidates = find_name_candidates(missing_from_climate, missing_from_results)
+        candidates['LEFT_CLIENT_ID'] = missing_from_climate['CLIENT_ID'].to_numpy()[candidates['LEFT_ROW'].to_numpy()]
+        candidates['RIGHT_CLIENT_ID'] = missing_from_results['CLIENT_ID'].to_numpy()[candidates['RIGHT_ROW'].to_numpy()]
+
+        print(f"\nCandidate same-person pairs under different CLIENT_IDs: {len(candidates)}")
+        print(candidates['MATCH_CLASS'].value_counts().to_string())
+
+        output_file = 'name_match_candidates.csv'
+        candidates.to_csv(output_file, index=False)
+        print(f"\nCandidates saved to: {output_file}")
+
+    except FileNotFoundError as e:
+        print(f"Error: {e}. Please run client_comparison_analysis.py first.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Buffered report sinks for the insurance reconciliation scripts
+Detail sections are handed over as whole DataFrames and written in bulk by each backend
+(console summary, CSV, JSON lines, HTML) instead of being printed row by row.
+In quiet mode detail sections are skipped entirely so the analysis can run headless.
+"""
+
+import argparse
+import html
+import json
+import os
+import sys
+
+REPORT_FORMATS = ['console', 'csv', 'jsonl', 'html']
+
+class ReportSink:
+    """Base sink - every method is a no-op"""
+
+    # Callers check this before building detail frames that only feed the report
+    wants_detail = True
+
+    def section(self, title):
+        pass
+
+    def metrics(self, name, values):
+        pass
+
+    def table(self, name, df, title=None):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class ConsoleSink(ReportSink):
+    """Console summary: tables are shown as a short preview, each call is a single write"""
+
+    def __init__(self, preview_rows=20, stream=None):
+        self.preview_rows = preview_rows
+        self.stream = stream or sys.stdout
+
+    def write(self, lines):
+        self.stream.write("\n".join(lines) + "\n")
+
+    def section(self, title):
+        self.write(["\n" + "="*60, title, "="*60])
+
+    def metrics(self, name, values):
+        self.write([f"\n{name}:"] + [f"  - {label}: {value}" for label, value in values.items()])
+
+    def table(self, name, df, title=None):
+        lines = [f"\n{title or name} ({len(df)} rows):"]
+        if not df.empty:
+            lines.append(df.head(self.preview_rows).to_string(index=False))
+        if len(df) > self.preview_rows:
+            lines.append(f"  ... and {len(df) - self.preview_rows} more rows")
+        self.write(lines)
+
+    def close(self):
+        self.stream.flush()
+
+class CsvSink(ReportSink):
+    """One CSV file per detail table"""
+
+    def __init__(self, output_dir='.', prefix=''):
+        self.output_dir = output_dir
+        self.prefix = prefix
+        os.makedirs(output_dir, exist_ok=True)
+
+    def table(self, name, df, title=None):
+        df.to_csv(os.path.join(self.output_dir, f"{self.prefix}{name}.csv"), index=False)
+
+class JsonLinesSink(ReportSink):
+    """All sections in a single JSON-lines file, one record per row tagged with its section"""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.file = open(path, 'w', encoding='utf-8')
+        self.current_section = None
+
+    def section(self, title):
+        self.current_section = title
+
+    def metrics(self, name, values):
+        record = {'section': self.current_section, 'table': name, 'metrics': values}
+        self.file.write(json.dumps(record, default=str) + "\n")
+
+    def table(self, name, df, title=None):
+        if df.empty:
+            return
+        tagged = df.assign(section=self.current_section, table=name)
+        self.file.write(tagged.to_json(orient='records', lines=True, date_format='iso', default_handler=str))
+        self.file.write("\n")
+
+    def close(self):
+        self.file.close()
+
+class HtmlSink(ReportSink):
+    """Single HTML page written on close"""
+
+    def __init__(self, path, title='Insurance reconciliation report'):
+        self.path = path
+        self.parts = [f"<html><head><meta charset='utf-8'><title>{html.escape(title)}</title></head><body>",
+                      f"<h1>{html.escape(title)}</h1>"]
+
+    def section(self, title):
+        self.parts.append(f"<h2>{html.escape(title)}</h2>")
+
+    def metrics(self, name, values):
+        items = "".join(f"<li>{html.escape(str(label))}: {html.escape(str(value))}</li>" for label, value in values.items())
+        self.parts.append(f"<h3>{html.escape(name)}</h3><ul>{items}</ul>")
+
+    def table(self, name, df, title=None):
+        self.parts.append(f"<h3>{html.escape(title or name)} ({len(df)} rows)</h3>")
+        self.parts.append(df.to_html(index=False, border=0))
+
+    def close(self):
+        self.parts.append("</body></html>")
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(self.parts))
+
+class MultiSink(ReportSink):
+    """Fan out to several sinks; quiet=True drops detail tables before any backend sees them"""
+
+    def __init__(self, sinks, quiet=False):
+        self.sinks = sinks
+        self.quiet = quiet
+        self.wants_detail = not quiet
+
+    def section(self, title):
+        for sink in self.sinks:
+            sink.section(title)
+
+    def metrics(self, name, values):
+        for sink in self.sinks:
+            sink.metrics(name, values)
+
+    def table(self, name, df, title=None):
+        if self.quiet:
+            return
+        for sink in self.sinks:
+            sink.table(name, df, title)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+def create_report_sink(formats=('console',), output_dir='.', report_name='report', quiet=False):
+    """Build a sink for the requested formats (console, csv, jsonl, html)"""
+    sinks = []
+    for report_format in formats:
+        if report_format == 'console':
+            sinks.append(ConsoleSink())
+        elif report_format == 'csv':
+            sinks.append(CsvSink(output_dir, prefix=f"{report_name}_"))
+        elif report_format == 'jsonl':
+            sinks.append(JsonLinesSink(os.path.join(output_dir, f"{report_name}.jsonl")))
+        elif report_format == 'html':
+            sinks.append(HtmlSink(os.path.join(output_dir, f"{report_name}.html")))
+        else:
+            raise ValueError(f"Unknown report format: {report_format} (expected one of {REPORT_FORMATS})")
+    return MultiSink(sinks, quiet=quiet)
+
+def add_report_arguments(parser):
+    """Add the shared --report-format / --output-dir / --quiet options to an argparse parser"""
+    parser.add_argument('--report-format', nargs='+', choices=REPORT_FORMATS, default=['console'],
+                        help="Where detail sections go (default: console)")
+    parser.add_argument('--output-dir', default='.', help="Directory for csv/jsonl/html reports")
+    parser.add_argument('--quiet', action='store_true', help="Skip detail sections entirely")
+    return parser
+
+def report_sink_from_args(args, report_name):
+    """Create the sink selected on the command line"""
+    return create_report_sink(args.report_format, args.output_dir, report_name, args.quiet)
+
+def report_argument_parser(description):
+    """argparse parser with only the report options, for the single-purpose scripts"""
+    return add_report_arguments(argparse.ArgumentParser(description=description))
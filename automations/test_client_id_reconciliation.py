@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from client_id_reconciliation import (INVALID_CLIENT_ID, canonicalise_client_ids, client_presence_matrix,
+                                      format_client_ids, reconcile_client_ids)
+
+def test_padded_spaced_and_excel_ids_share_one_value():
+    ids = canonicalise_client_ids(['000000071', ' 71 ', '71.0', '+71', '-5'])
+    assert ids.tolist() == [71, 71, 71, 71, -5]
+
+def test_blank_and_non_numeric_ids_are_invalid():
+    ids = canonicalise_client_ids(['nan', '', 'N/A', None, '71.5', '7e3', '1234567890123456789'])
+    assert (ids == INVALID_CLIENT_ID).all()
+
+def test_large_ids_keep_every_digit():
+    # Beyond 2**53 a float round-trip would change the last digits
+    large = 123456789012345678
+    assert canonicalise_client_ids([str(large), f"{large:020d}"]).tolist() == [large, large]
+    assert canonicalise_client_ids(pd.Series([large, None], dtype='Int64')).tolist() == [large, INVALID_CLIENT_ID]
+    assert canonicalise_client_ids(pd.Series([71.0, np.nan, 71.5, 2.0 ** 63])).tolist() == [71] + [INVALID_CLIENT_ID] * 3
+
+def test_reconcile_returns_sorted_ids_and_row_positions():
+    overlap = reconcile_client_ids(pd.Series(['003', '1', '2', 'x', '3']), pd.Series([3, 4, 3, None]))
+    assert overlap['common_ids'].tolist() == [3]
+    assert overlap['only_left_ids'].tolist() == [1, 2]
+    assert overlap['only_right_ids'].tolist() == [4]
+    assert overlap['left_common_rows'].tolist() == [0, 4]
+    assert overlap['right_common_rows'].tolist() == [0, 2]
+    assert overlap['left_only_rows'].tolist() == [1, 2]
+    assert overlap['right_only_rows'].tolist() == [1]
+    assert overlap['left_invalid_rows'].tolist() == [3]
+    assert overlap['right_invalid_rows'].tolist() == [3]
+
+def test_reconcile_against_an_empty_side():
+    overlap = reconcile_client_ids(pd.Series(['1', '2']), [])
+    assert overlap['only_left_ids'].tolist() == [1, 2]
+    assert overlap['left_only_rows'].tolist() == [0, 1]
+    assert len(overlap['common_ids']) == 0
+
+def test_presence_matrix_and_formatting():
+    presence = client_presence_matrix({"Jan '25": ['1', '2'], "Feb '25": ['002', '3', 'nan']})
+    assert presence.index.tolist() == [1, 2, 3]
+    assert presence.to_numpy().tolist() == [[True, False], [True, True], [False, True]]
+    assert format_client_ids(presence.index.to_numpy()).tolist() == ['000000001', '000000002', '000000003']
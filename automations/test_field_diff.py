@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from field_diff import diff_fields, pick_representative_rows
+
+def test_representative_row_is_the_latest_per_key():
+    df = pd.DataFrame({'KEY': [1, 1, 2, 1], 'DATE': ['2025-03', '2025-01', '2025-02', '2025-02'], 'VALUE': ['c', 'a', 'x', 'b']})
+    assert pick_representative_rows(df, 'KEY', 'DATE')['VALUE'].tolist() == ['c', 'x']
+    assert pick_representative_rows(df, 'KEY', 'DATE', keep='first')['VALUE'].tolist() == ['a', 'x']
+    # Without an ordering column the input order decides
+    assert pick_representative_rows(df, 'KEY')['VALUE'].tolist() == ['b', 'x']
+
+def test_repeated_keys_are_compared_one_to_one():
+    # Three monthly rows per client on the left, two on the right: one comparison per client, not six
+    left = pd.DataFrame({'KEY': [1, 1, 1, 2], 'MONTH': [1, 2, 3, 1], 'NAME': ['Ama', 'Ama', 'Ama M', 'Kofi'],
+                         'AMOUNT': [100.0, 100.0, 100.0, 50.0]})
+    right = pd.DataFrame({'KEY': [1, 1, 2, 3], 'MONTH': [1, 2, 1, 1], 'NAME': ['Ama', 'Ama', 'Kofi', 'Yaw'],
+                          'AMOUNT': [100.0, 100.004, 50.5, 10.0]})
+    mismatches, summary = diff_fields(left, right, 'KEY', ['NAME', 'AMOUNT'], tolerances={'AMOUNT': 0.01},
+                                      left_order_by='MONTH', right_order_by='MONTH')
+    assert summary.values.tolist() == [['NAME', 2, 1], ['AMOUNT', 2, 1]]
+    assert mismatches.values.tolist() == [[1, 'NAME', 'Ama M', 'Ama'], [2, 'AMOUNT', 50.0, 50.5]]
+
+def test_missing_on_both_sides_is_equal():
+    left = pd.DataFrame({'KEY': [1, 2, 3], 'ACCT_TYPE': ['Loan', None, None], 'AMOUNT': [np.nan, 1.0, np.nan]})
+    right = pd.DataFrame({'KEY': [1, 2, 3], 'ACCT_TYPE': ['Loan', None, 'Savings'], 'AMOUNT': [np.nan, np.nan, np.nan]})
+    mismatches, _ = diff_fields(left, right, 'KEY', ['ACCT_TYPE', 'AMOUNT'])
+    assert mismatches[['KEY', 'COLUMN']].values.tolist() == [[3, 'ACCT_TYPE'], [2, 'AMOUNT']]
+
+def test_no_mismatches():
+    df = pd.DataFrame({'KEY': [1], 'NAME': ['Ama']})
+    mismatches, summary = diff_fields(df, df, 'KEY', ['NAME'])
+    assert mismatches.empty and list(mismatches.columns) == ['KEY', 'COLUMN', 'LEFT_VALUE', 'RIGHT_VALUE']
+    assert summary.values.tolist() == [['NAME', 1, 0]]
@@ -0,0 +1,57 @@
+import json
+import sys
+
+import pandas as pd
+import pytest
+
+import insurance_reconciliation
+
+COLUMNS = ['CLIENT_ID', 'FULL_NAME', 'GENDER', 'ACCT_TYPE', 'DISASTER_INSURANCE_CLIENT_TYPE', 'LOANAMOUNT',
+           'DISASTER_INSURANCE_START_DATE']
+
+@pytest.fixture
+def inputs(tmp_path, monkeypatch):
+    """Results table and a two-sheet workbook in a scratch working directory"""
+    results = pd.DataFrame([
+        ['0001', 'Ama Mensah', 'F', 'Loan', 'Borrower', 500, '2025-01-03'],
+        ['0002', 'Kofi Boateng', 'M', 'Loan', 'Borrower', 800, '2025-01-05'],
+        ['0003', 'Yaw Owusu', 'M', 'Savings', 'Saver', 0, '2025-01-07'],
+    ], columns=COLUMNS)
+    results.to_csv(tmp_path / 'result-Table 1.csv', index=False)
+    with pd.ExcelWriter(tmp_path / 'Climate_Disaster_Insurance.xlsx') as workbook:
+        pd.DataFrame([
+            [1, 'Ama Mensah', 'F', 'Loan', 'Borrower', 500, '2025-01-03'],
+            [2, 'Boateng Kofi', 'M', 'Loan', 'Borrower', 800, '2025-01-05'],
+        ], columns=COLUMNS).to_excel(workbook, sheet_name="Jan '25", index=False)
+        pd.DataFrame([
+            [1, 'Ama Mensah', 'F', 'Loan', 'Borrower', 500, '2025-02-03'],
+            [4, 'Esi Asante', 'F', 'Loan', 'Borrower', 300, '2025-02-10'],
+        ], columns=COLUMNS).to_excel(workbook, sheet_name="Feb '25", index=False)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+def run_cli(monkeypatch, capsys, *args):
+    monkeypatch.setattr(sys, 'argv', ['insurance_reconciliation.py', *args])
+    insurance_reconciliation.main()
+    return capsys.readouterr().out
+
+def test_all_shows_detail_tables_on_the_console(inputs, monkeypatch, capsys):
+    output = run_cli(monkeypatch, capsys, 'all')
+    assert "Clients missing from climate disaster file (1 rows)" in output
+    assert "ALL DUPLICATE CLIENTS (1 rows)" in output
+    assert (inputs / 'insurance_dates_ranked.csv').exists()
+
+def test_quiet_all_skips_every_detail_table(inputs, monkeypatch, capsys):
+    output = run_cli(monkeypatch, capsys, 'all', '--quiet')
+    assert " rows):" not in output
+    # Summaries and final outputs are still produced
+    assert "Clients ONLY in Results table: 1" in output
+    assert pd.read_csv(inputs / 'client_appearance_counts.csv', dtype={'CLIENT_ID': str}).values.tolist() == [['1', 2]]
+
+def test_overlap_tables_go_to_the_selected_format_only(inputs, monkeypatch, capsys):
+    output = run_cli(monkeypatch, capsys, 'overlap', '--report-format', 'jsonl')
+    assert " rows):" not in output
+    with open(inputs / 'insurance_overlap.jsonl') as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    tables = {record['table'] for record in records if 'CLIENT_ID' in record}
+    assert tables == {'clients_missing_from_climate_disaster', 'clients_missing_from_results_table'}
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from name_matching import find_name_candidates, score_name_pairs, soundex
+
+def classes(pairs):
+    """MATCH_CLASS per (left, right) name pair"""
+    left, right = zip(*pairs)
+    return score_name_pairs(list(left), list(right))['MATCH_CLASS'].tolist()
+
+def test_name_classes():
+    assert classes([
+        ('Ama Mensah', 'Ama Mensah'),
+        (' Ama Mensah ', 'Ama Mensah'),
+        ('Ama Mensah', 'MENSAH, Ama'),
+        ('Ama Serwaa Mensah', 'Ama Mensah'),
+        ('Kwabena Owusu', 'Kwabena Owusuu'),
+        ('Ama Mensah', 'Kofi Boateng'),
+    ]) == ['exact', 'exact', 'variant', 'variant', 'variant', 'different']
+
+def test_blank_names_score_zero_and_never_match():
+    scores = score_name_pairs([np.nan], [''])
+    assert scores.values.tolist() == [[0.0, 0.0, 'different']]
+    assert classes([(None, None), ('', 'Ama Mensah'), ('Ama Mensah', 'Ama Mensah')]) == ['different', 'different', 'exact']
+
+def test_no_pairs():
+    assert score_name_pairs([], []).empty
+
+def test_soundex():
+    assert [soundex(token) for token in ['robert', 'rupert', 'ashcraft', 'tymczak', '']] == ['R163', 'R163', 'A261', 'T522', '']
+
+def test_phonetic_candidates_skip_unrelated_names():
+    left = pd.DataFrame({'FULL_NAME': ['Ama Mensah', 'Kofi Boateng']})
+    right = pd.DataFrame({'FULL_NAME': ['Yaw Owusu', 'Mensah Ama', 'Kofi Boatteng']})
+    candidates = find_name_candidates(left, right)
+    assert sorted(zip(candidates['LEFT_ROW'], candidates['RIGHT_ROW'], candidates['MATCH_CLASS'])) == [
+        (0, 1, 'variant'), (1, 2, 'variant')]
@@ -0,0 +1,52 @@
+import io
+import json
+
+import pandas as pd
+import pytest
+
+from report_sinks import ConsoleSink, create_report_sink, report_argument_parser, report_sink_from_args
+
+TABLE = pd.DataFrame({'CLIENT_ID': ['001', '002', '003'], 'AMOUNT': [10, 20, 30]})
+
+def write_report(sink):
+    """One section with metrics and a table, then close"""
+    sink.section("OVERLAP")
+    sink.metrics("Counts", {"Common": 3})
+    sink.table('missing', TABLE, title="Missing clients")
+    sink.close()
+
+def test_console_previews_tables():
+    stream = io.StringIO()
+    sink = ConsoleSink(preview_rows=2, stream=stream)
+    write_report(sink)
+    output = stream.getvalue()
+    assert "OVERLAP" in output and "  - Common: 3" in output
+    assert "Missing clients (3 rows):" in output and "... and 1 more rows" in output
+    assert "003" not in output
+
+def test_file_sinks(tmp_path):
+    write_report(create_report_sink(['csv', 'jsonl', 'html'], str(tmp_path), 'overlap'))
+    assert pd.read_csv(tmp_path / 'overlap_missing.csv', dtype={'CLIENT_ID': str}).equals(TABLE)
+    with open(tmp_path / 'overlap.jsonl') as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    assert records[0] == {'section': 'OVERLAP', 'table': 'Counts', 'metrics': {'Common': 3}}
+    assert [(record['CLIENT_ID'], record['table'], record['section']) for record in records[1:]] == [
+        ('001', 'missing', 'OVERLAP'), ('002', 'missing', 'OVERLAP'), ('003', 'missing', 'OVERLAP')]
+    page = (tmp_path / 'overlap.html').read_text()
+    assert "<h2>OVERLAP</h2>" in page and "Missing clients (3 rows)" in page and page.endswith("</html>")
+
+def test_quiet_keeps_metrics_and_drops_tables(tmp_path):
+    sink = create_report_sink(['csv', 'jsonl'], str(tmp_path), 'overlap', quiet=True)
+    assert not sink.wants_detail
+    write_report(sink)
+    assert not (tmp_path / 'overlap_missing.csv').exists()
+    with open(tmp_path / 'overlap.jsonl') as f:
+        assert [json.loads(line)['table'] for line in f] == ['Counts']
+
+def test_command_line_options(tmp_path):
+    args = report_argument_parser("test").parse_args(['--report-format', 'jsonl', '--output-dir', str(tmp_path), '--quiet'])
+    sink = report_sink_from_args(args, 'counts')
+    sink.close()
+    assert (tmp_path / 'counts.jsonl').exists() and not sink.wants_detail
+    with pytest.raises(ValueError, match="Unknown report format"):
+        create_report_sink(['pdf'])
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Pre-aggregated disbursement cube over the Finance Department disbursement export
+
+Cells hold COUNT / TOTAL / MIN / MAX of DISBURSED_AMOUNT at day grain for every combination of
+PRODUCT_GROUP x LN band x INDUSTRY x GENDER x EMPLOYMENT that occurs. Month roll-ups are
+precomputed for every subset of those dimensions (a SQL CUBE), so a slice reads the smallest
+matching cuboid and groups a few hundred cells instead of rescanning the export.
+Appending a new day only replaces that day's cells and re-rolls its month.
+
+Usage:
+    python disbursement_cube.py build [EXPORT.csv ...] [--cube disbursement_cube]
+    python disbursement_cube.py append EXPORT.csv [--cube disbursement_cube]
+    python disbursement_cube.py slice --by PRODUCT_GROUP LN_BAND [--grain month] [--where GENDER=MALE] [--cube disbursement_cube]
+"""
+
+import argparse
+import glob
+import itertools
+import os
+import time
+
+import pandas as pd
+import numpy as np
+
+CUBE_DIR = 'disbursement_cube'
+DIMENSIONS = ['PRODUCT_GROUP', 'LN_BAND', 'INDUSTRY', 'GENDER', 'EMPLOYMENT']
+MEASURES = ['COUNT', 'TOTAL', 'MIN', 'MAX']
+
+# Same CASE as disbursement_analysis.sql: LN BETWEEN low AND high, everything else (NULL included) is LN24+
+LN_BANDS = [(0, 5, 'LN0-5'), (6, 11, 'LN6-11'), (12, 19, 'LN12-19'), (20, 23, 'LN20-23')]
+LN_OTHER = 'LN24+'
+
+def ln_band(ln):
+    """LN number -> band label"""
+    ln = pd.to_numeric(ln, errors='coerce').to_numpy(dtype=float)
+    conditions = [(ln >= low) & (ln <= high) for low, high, _ in LN_BANDS]
+    return np.select(conditions, [label for _, _, label in LN_BANDS], LN_OTHER).astype(object)
+
+def day_cells(export_df):
+    """Day-grain cells from raw export rows"""
+    rows = pd.DataFrame({
+        'DAY': pd.to_datetime(export_df['DISBURSMENT_DATE'], errors='coerce').dt.normalize(),
+        'PRODUCT_GROUP': export_df['PRODUCT_GROUP'],
+        'LN_BAND': ln_band(export_df['LN']),
+        'INDUSTRY': export_df['INDUSTRY'],
+        'GENDER': export_df['GENDER'],
+        'EMPLOYMENT': export_df['EMPLOYMENT'],
+        'AMOUNT': pd.to_numeric(export_df['DISBURSED_AMOUNT'], errors='coerce'),
+    })
+    rows = rows[rows['DAY'].notna()]
+    rows[DIMENSIONS] = rows[DIMENSIONS].fillna('Unknown').astype(str)
+    return rows.groupby(['DAY'] + DIMENSIONS, sort=True).agg(
+        COUNT=('AMOUNT', 'size'), TOTAL=('AMOUNT', 'sum'), MIN=('AMOUNT', 'min'), MAX=('AMOUNT', 'max'),
+    ).reset_index()
+
+def merge_cells(cells, keys):
+    """Roll cells up to keys - counts and totals add, minima and maxima combine"""
+    return cells.groupby(keys, sort=True, observed=True).agg(
+        COUNT=('COUNT', 'sum'), TOTAL=('TOTAL', 'sum'), MIN=('MIN', 'min'), MAX=('MAX', 'max'),
+    ).reset_index()
+
+def month_rollups(cells):
+    """MONTH x every subset of DIMENSIONS; rolled-up dimensions hold '*'"""
+    cells = cells.assign(MONTH=cells['DAY'].dt.to_period('M').dt.to_timestamp())
+    cuboids = []
+    for size in range(len(DIMENSIONS) + 1):
+        for dims in itertools.combinations(DIMENSIONS, size):
+            cuboid = merge_cells(cells, ['MONTH'] + list(dims))
+            cuboid['CUBOID'] = cuboid_id(dims)
+            cuboids.append(cuboid)
+    rollups = pd.concat(cuboids, ignore_index=True)
+    rollups[DIMENSIONS] = rollups[DIMENSIONS].fillna('*')
+    return rollups[['CUBOID', 'MONTH'] + DIMENSIONS + MEASURES]
+
+def cuboid_id(dims):
+    """Bitmask of the dimensions kept in a cuboid"""
+    return sum(1 << DIMENSIONS.index(dim) for dim in dims)
+
+class DisbursementCube:
+    """Day cells plus month roll-ups, persisted as two Parquet files"""
+
+    def __init__(self, cells, rollups):
+        self.cells = cells
+        self.rollups = rollups
+
+    @classmethod
+    def build(cls, export_df):
+        cells = day_cells(export_df)
+        return cls(cells, month_rollups(cells))
+
+    def append(self, export_df):
+        """Replace the cells of the days in export_df and re-roll only their months"""
+        new_cells = day_cells(export_df)
+        days = new_cells['DAY'].unique()
+        self.cells = pd.concat([self.cells[~self.cells['DAY'].isin(days)], new_cells]) \
+            .sort_values(['DAY'] + DIMENSIONS, kind='mergesort').reset_index(drop=True)
+
+        months = pd.DatetimeIndex(days).to_period('M').unique().to_timestamp()
+        month_of_cell = self.cells['DAY'].dt.to_period('M').dt.to_timestamp()
+        changed = month_rollups(self.cells[month_of_cell.isin(months)])
+        self.rollups = pd.concat([self.rollups[~self.rollups['MONTH'].isin(months)], changed], ignore_index=True)
+        return len(new_cells)
+
+    def slice(self, by=(), grain=None, where=None, start=None, end=None):
+        """
+        COUNT / TOTAL / MIN / MAX / AVERAGE grouped by the given dimensions
+
+        grain: 'day', 'month' or None (whole range); where: {dimension: value or list of values};
+        start/end bound the dates (inclusive). Month-aligned queries are answered from the
+        smallest month cuboid holding every grouped and filtered dimension; day grain or
+        mid-month bounds fall back to the day cells.
+        """
+        by, where = list(by), dict(where or {})
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        month_aligned = (start is None or start == start.to_period('M').start_time) and \
+                        (end is None or end.normalize() == end.to_period('M').end_time.normalize())
+
+        if grain == 'day' or not month_aligned:
+            cells, time_column = self.cells, 'DAY'
+        else:
+            cells = self.rollups[self.rollups['CUBOID'] == cuboid_id(set(by) | set(where))]
+            time_column = 'MONTH'
+
+        dates = cells[time_column]
+        keep = np.ones(len(cells), dtype=bool)
+        if start is not None:
+            keep &= (dates >= start).to_numpy()
+        if end is not None:
+            keep &= (dates <= end).to_numpy()
+        for dim, values in where.items():
+            keep &= cells[dim].isin(values if isinstance(values, (list, tuple, set)) else [values]).to_numpy()
+        cells = cells[keep]
+
+        keys = ([time_column] if grain else []) + by
+        if grain == 'month' and time_column == 'DAY':
+            cells = cells.assign(MONTH=cells['DAY'].dt.to_period('M').dt.to_timestamp())
+            keys = ['MONTH'] + by
+        result = merge_cells(cells, keys) if keys else pd.DataFrame({
+            'COUNT': [cells['COUNT'].sum()], 'TOTAL': [cells['TOTAL'].sum()],
+            'MIN': [cells['MIN'].min()], 'MAX': [cells['MAX'].max()]})
+        result['AVERAGE'] = result['TOTAL'] / result['COUNT']
+        return result
+
+    def save(self, directory=CUBE_DIR):
+        os.makedirs(directory, exist_ok=True)
+        self.cells.to_parquet(os.path.join(directory, 'day_cells.parquet'), index=False)
+        self.rollups.to_parquet(os.path.join(directory, 'month_rollups.parquet'), index=False)
+
+    @classmethod
+    def load(cls, directory=CUBE_DIR):
+        return cls(pd.read_parquet(os.path.join(directory, 'day_cells.parquet')),
+                   pd.read_parquet(os.path.join(directory, 'month_rollups.parquet')))
+
+def parse_where(conditions):
+    """['GENDER=MALE', 'LN_BAND=LN0-5,LN6-11'] -> {'GENDER': ['MALE'], 'LN_BAND': ['LN0-5', 'LN6-11']}"""
+    where = {}
+    for condition in conditions or []:
+        dim, _, values = condition.partition('=')
+        if dim not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension: {dim} (expected one of {DIMENSIONS})")
+        where[dim] = values.split(',')
+    return where
+
+def main():
+    parser = argparse.ArgumentParser(description="Disbursement OLAP cube")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help="Build the cube from disbursement exports")
+    build_parser.add_argument('exports', nargs='*', default=None)
+    append_parser = subparsers.add_parser('append', help="Replace the days found in a new export")
+    append_parser.add_argument('export')
+    slice_parser = subparsers.add_parser('slice', help="Query the cube")
+    slice_parser.add_argument('--by', nargs='*', default=[], choices=DIMENSIONS)
+    slice_parser.add_argument('--grain', choices=['day', 'month'], default=None)
+    slice_parser.add_argument('--where', nargs='*', default=[], help="DIMENSION=value[,value...]")
+    slice_parser.add_argument('--start', default=None)
+    slice_parser.add_argument('--end', default=None)
+    slice_parser.add_argument('--output', default=None, help="Write the slice to this CSV")
+    for subparser in (build_parser, append_parser, slice_parser):
+        subparser.add_argument('--cube', default=CUBE_DIR)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == 'build':
+        exports = args.exports or sorted(glob.glob('Disbursements_-_UGANDA_Finance_Department_*.csv'))
+        export_df = pd.concat([pd.read_csv(path) for path in exports], ignore_index=True)
+        cube = DisbursementCube.build(export_df)
+        cube.save(args.cube)
+        print(f"Built cube from {len(export_df)} disbursements: {len(cube.cells)} day cells, "
+              f"{len(cube.rollups)} month roll-up cells ({time.perf_counter() - start:.2f}s)")
+
+    elif args.command == 'append':
+        cube = DisbursementCube.load(args.cube)
+        changed = cube.append(pd.read_csv(args.export))
+        cube.save(args.cube)
+        print(f"Replaced {changed} day cells from {args.export} ({time.perf_counter() - start:.2f}s)")
+
+    else:
+        cube = DisbursementCube.load(args.cube)
+        loaded = time.perf_counter()
+        result = cube.slice(args.by, args.grain, parse_where(args.where), args.start, args.end)
+        print(result.to_string(index=False))
+        print(f"\n{len(result)} rows in {(time.perf_counter() - loaded) * 1000:.1f} ms")
+        if args.output:
+            result.to_csv(args.output, index=False)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Multi-key tolerance reconciliation between the Transactions export (Excel) and the
+Finance Department disbursements file (CSV).
+
+Rows are paired on ID first, then amount within a tolerance, then value date within
+an N-day window, using sorted merge_asof joins so it scales to millions of ledger lines.
+Every row on both sides ends up with exactly one status:
+    matched, amount_mismatch, date_mismatch,
+    missing_in_disbursements (transaction with no disbursement),
+    missing_in_transactions (disbursement with no transaction)
+"""
+
+import pandas as pd
+import numpy as np
+
+TRANSACTION_COLUMNS = {'id': 'Account ID', 'amount': 'Amount', 'date': 'Value Date (Entry Date)'}
+DISBURSEMENT_COLUMNS = {'id': 'LOAN_ID', 'amount': 'DISBURSED_AMOUNT', 'date': 'DISBURSMENT_DATE'}
+
+STATUSES = ['matched', 'amount_mismatch', 'date_mismatch', 'missing_in_disbursements', 'missing_in_transactions']
+
+def ledger_values(df, columns):
+    """ID / AMOUNT / VALUE_DATE in original row order"""
+    return pd.DataFrame({
+        'ID': df[columns['id']].astype(str).str.strip().to_numpy(),
+        'AMOUNT': pd.to_numeric(df[columns['amount']], errors='coerce').to_numpy(dtype=float),
+        'VALUE_DATE': pd.to_datetime(df[columns['date']], errors='coerce').to_numpy(),
+    })
+
+def prepare_ledger(values):
+    """Add ROW positions to ledger_values output and sort by VALUE_DATE for merge_asof"""
+    ledger = values.assign(ROW=np.arange(len(values)))
+    # Rows without an ID or a date can't be paired and are reported as missing
+    ledger = ledger[(ledger['ID'] != 'nan') & (ledger['ID'] != '') & ledger['VALUE_DATE'].notna()]
+    return ledger.sort_values('VALUE_DATE', kind='mergesort').reset_index(drop=True)
+
+def _amount_buckets(amounts, amount_tolerance):
+    """Equal amounts share a bucket; amounts within the tolerance are at most one bucket apart"""
+    return np.floor(amounts / amount_tolerance) if amount_tolerance > 0 else amounts
+
+def _nearest_candidates(left, right, window, amount_tolerance, amount_must_match):
+    """
+    The nearest-dated same-ID right row (within window) for every left row, with its date GAP
+
+    When the amount must match, the amount bucket is part of the merge_asof key, so a nearer row
+    with the wrong amount never hides a further one with the right amount. With a tolerance the
+    two neighbouring buckets are searched too and their nearest rows are checked exactly.
+    """
+    right = right.rename(columns={'ROW': 'RIGHT_ROW', 'AMOUNT': 'RIGHT_AMOUNT'}).assign(RIGHT_DATE=right['VALUE_DATE'])
+    keys, offsets = ['ID'], [0]
+    if amount_must_match:
+        left = left[left['AMOUNT'].notna()]
+        right = right[right['RIGHT_AMOUNT'].notna()]
+        left = left.assign(BUCKET=_amount_buckets(left['AMOUNT'], amount_tolerance))
+        right = right.assign(BUCKET=_amount_buckets(right['RIGHT_AMOUNT'], amount_tolerance))
+        keys, offsets = ['ID', 'BUCKET'], ([-1, 0, 1] if amount_tolerance > 0 else [0])
+
+    found = []
+    for offset in offsets:
+        shifted = right.assign(BUCKET=right['BUCKET'] - offset) if offset else right
+        found.append(pd.merge_asof(left, shifted, on='VALUE_DATE', by=keys, direction='nearest',
+                                   tolerance=window).dropna(subset=['RIGHT_ROW']))
+    candidates = pd.concat(found, ignore_index=True)
+    if amount_must_match:
+        candidates = candidates[(candidates['AMOUNT'] - candidates['RIGHT_AMOUNT']).abs() <= amount_tolerance]
+    return candidates.assign(RIGHT_ROW=candidates['RIGHT_ROW'].astype(np.int64),
+                             GAP=(candidates['VALUE_DATE'] - candidates['RIGHT_DATE']).abs())
+
+def _nearest_pairs(left, right, window, amount_tolerance, amount_must_match):
+    """
+    Pair left and right rows with the same ID and the nearest VALUE_DATE (within window)
+
+    Each row is used at most once: when several left rows pick the same right row the closest
+    one wins and the others retry against the remaining rows in the next round, until a round
+    pairs nothing.
+    Returns (pairs, unpaired_left, unpaired_right).
+    """
+    pairs = []
+    while not left.empty and not right.empty:
+        candidates = _nearest_candidates(left, right, window, amount_tolerance, amount_must_match)
+        if candidates.empty:
+            break
+        # One-to-one: each left row keeps its closest candidate, then the closest left row keeps a contested right row
+        chosen = candidates.sort_values(['GAP', 'ROW', 'RIGHT_ROW'], kind='mergesort') \
+            .drop_duplicates('ROW').drop_duplicates('RIGHT_ROW')
+        pairs.append(chosen[['ROW', 'RIGHT_ROW']])
+        left = left[~left['ROW'].isin(chosen['ROW'])]
+        right = right[~right['ROW'].isin(chosen['RIGHT_ROW'])]
+
+    pairs = pd.concat(pairs, ignore_index=True) if pairs else pd.DataFrame({'ROW': [], 'RIGHT_ROW': []}, dtype=np.int64)
+    return pairs, left, right
+
+def reconcile_disbursements(transactions_df, disbursements_df, amount_tolerance=0.0, date_window_days=3,
+                            transaction_columns=TRANSACTION_COLUMNS, disbursement_columns=DISBURSEMENT_COLUMNS):
+    """
+    Classify every transaction and disbursement row
+
+    Pass 1: same ID, date within the window, amount within tolerance -> matched
+    Pass 2: same ID, date within the window, amount differs           -> amount_mismatch
+    Pass 3: same ID, amount within tolerance, date outside the window -> date_mismatch
+    Pass 4: same ID, amount and date both differ                      -> amount_mismatch
+    Whatever is left on either side is missing from the other file.
+
+    Returns one row per pair or unpaired row with STATUS, TRANSACTION_ROW, DISBURSEMENT_ROW
+    (positions in the inputs), ID, both amounts and dates, AMOUNT_DIFF and DAYS_DIFF.
+    """
+    transaction_values = ledger_values(transactions_df, transaction_columns)
+    disbursement_values = ledger_values(disbursements_df, disbursement_columns)
+    transactions = prepare_ledger(transaction_values)
+    disbursements = prepare_ledger(disbursement_values)
+    window = pd.Timedelta(days=date_window_days)
+
+    passes = [
+        ('matched', window, True),
+        ('amount_mismatch', window, False),
+        ('date_mismatch', None, True),
+        ('amount_mismatch', None, False),
+    ]
+
+    paired = []
+    left, right = transactions, disbursements
+    for status, pass_window, amount_must_match in passes:
+        pairs, left, right = _nearest_pairs(left, right, pass_window, amount_tolerance, amount_must_match)
+        paired.append(pairs.assign(STATUS=status))
+
+    paired = pd.concat(paired, ignore_index=True)
+    transaction_rows = paired['ROW'].to_numpy(dtype=np.int64)
+    disbursement_rows = paired['RIGHT_ROW'].to_numpy(dtype=np.int64)
+
+    unpaired_transactions = _unpaired_rows(len(transactions_df), transaction_rows)
+    unpaired_disbursements = _unpaired_rows(len(disbursements_df), disbursement_rows)
+
+    result = pd.concat([
+        pd.DataFrame({'STATUS': paired['STATUS'].to_numpy(),
+                      'TRANSACTION_ROW': transaction_rows, 'DISBURSEMENT_ROW': disbursement_rows}),
+        pd.DataFrame({'STATUS': 'missing_in_disbursements',
+                      'TRANSACTION_ROW': unpaired_transactions, 'DISBURSEMENT_ROW': -1}),
+        pd.DataFrame({'STATUS': 'missing_in_transactions',
+                      'TRANSACTION_ROW': -1, 'DISBURSEMENT_ROW': unpaired_disbursements}),
+    ], ignore_index=True)
+
+    transaction_part = _values_at(transaction_values, result['TRANSACTION_ROW'].to_numpy())
+    disbursement_part = _values_at(disbursement_values, result['DISBURSEMENT_ROW'].to_numpy())
+
+    result['ID'] = transaction_part['ID'].fillna(disbursement_part['ID'])
+    result['TRANSACTION_AMOUNT'] = transaction_part['AMOUNT']
+    result['TRANSACTION_DATE'] = transaction_part['VALUE_DATE']
+    result['DISBURSEMENT_AMOUNT'] = disbursement_part['AMOUNT']
+    result['DISBURSEMENT_DATE'] = disbursement_part['VALUE_DATE']
+
+    result['AMOUNT_DIFF'] = result['TRANSACTION_AMOUNT'] - result['DISBURSEMENT_AMOUNT']
+    result['DAYS_DIFF'] = (result['TRANSACTION_DATE'] - result['DISBURSEMENT_DATE']).dt.total_seconds() / 86400
+    result['STATUS'] = pd.Categorical(result['STATUS'], categories=STATUSES)
+    return result
+
+def _values_at(values, rows):
+    """Rows of values at the given positions, all-missing where the position is -1"""
+    present = rows >= 0
+    taken = values.iloc[rows[present]]
+    taken.index = np.flatnonzero(present)
+    return taken.reindex(np.arange(len(rows)))
+
+def _unpaired_rows(row_count, paired_rows):
+    """Positions not present in paired_rows"""
+    used = np.zeros(row_count, dtype=bool)
+    used[paired_rows] = True
+    return np.flatnonzero(~used)
+
+def summarise_reconciliation(result):
+    """Row count and amounts per status"""
+    return result.groupby('STATUS', observed=False).agg(
+        ROWS=('STATUS', 'size'),
+        TRANSACTION_AMOUNT=('TRANSACTION_AMOUNT', 'sum'),
+        DISBURSEMENT_AMOUNT=('DISBURSEMENT_AMOUNT', 'sum'),
+    ).reset_index()
@@ -6,10 +6,17 @@ Script to find transactions in the Excel file that are not in the CSV disburseme
 import pandas as pd
 from datetime import datetime
 
+from disbursement_reconciliation import reconcile_disbursements, summarise_reconciliation
+
 # File paths
 csv_file = 'Disbursements_-_UGANDA_Finance_Department_2025_11_06.csv'
 excel_file = 'Transactions-fidoug-stellan-2025-11-06T10_29_04.894_03_00.xlsx'
 output_file = 'missing_transactions.csv'
+exceptions_file = 'reconciliation_exceptions.csv'
+
+# Matching tolerances
+amount_tolerance = 0      # UGX
+date_window_days = 3
 
 print("Loading files...")
 # Read CSV file
@@ -20,27 +27,27 @@ print(f"CSV file loaded: {len(csv_df)} records")
 excel_df = pd.read_excel(excel_file)
 print(f"Excel file loaded: {len(excel_df)} records")
 
-# Clean and prepare data for matching
-# Convert dates to datetime for comparison
-csv_df['DISBURSMENT_DATE'] = pd.to_datetime(csv_df['DISBURSMENT_DATE'], errors='coerce')
-excel_df['Value Date (Entry Date)'] = pd.to_datetime(excel_df['Value Date (Entry Date)'], errors='coerce')
-
-# Normalize amounts (remove decimals if needed, convert to float)
-csv_df['DISBURSED_AMOUNT'] = csv_df['DISBURSED_AMOUNT'].astype(float)
-excel_df['Amount'] = excel_df['Amount'].astype(float)
+# Reconcile on ID, then amount within tolerance, then value date within the window,
+# so wrong-amount and wrong-date disbursements are no longer counted as matched
+reconciliation = reconcile_disbursements(excel_df, csv_df,
+                                         amount_tolerance=amount_tolerance,
+                                         date_window_days=date_window_days)
+summary = summarise_reconciliation(reconciliation)
 
-# Match on Account ID (Excel) vs LOAN_ID (CSV)
-# These are the primary identifiers that should match
-csv_loan_ids = set(csv_df['LOAN_ID'].dropna().astype(str))
-excel_account_ids = set(excel_df['Account ID'].dropna().astype(str))
-
-# Find transactions in Excel that don't have matching LOAN_ID in CSV
-missing_transactions = excel_df[~excel_df['Account ID'].astype(str).isin(csv_loan_ids)]
+# Transactions in Excel without a matching disbursement in CSV
+missing_rows = reconciliation.loc[reconciliation['STATUS'] == 'missing_in_disbursements', 'TRANSACTION_ROW']
+missing_transactions = excel_df.iloc[missing_rows.sort_values().to_numpy()]
 
 print(f"\nTransactions in Excel not found in CSV (by Account ID/LOAN_ID): {len(missing_transactions)}")
 print(f"Total transactions in Excel: {len(excel_df)}")
 print(f"Total transactions in CSV: {len(csv_df)}")
-print(f"Matched transactions: {len(excel_df) - len(missing_transactions)}")
+print(f"\nReconciliation by status (amount tolerance {amount_tolerance:,.0f}, date window {date_window_days} days):")
+print(summary.to_string(index=False))
+
+# Save every exception (anything not matched) for follow-up
+exceptions = reconciliation[reconciliation['STATUS'] != 'matched']
+exceptions.to_csv(exceptions_file, index=False)
+print(f"\nReconciliation exceptions saved to: {exceptions_file}")
 
 print(f"\nTotal unique missing transactions: {len(missing_transactions)}")
 
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Persistent incremental reconciliation ledger for the daily finance exports.
+
+The ledger (a local SQLite file) remembers every transaction and disbursement row it has
+seen by row hash, the pairs that matched and the rows that are still open exceptions.
+A new pair of daily exports only reconciles rows whose hash is new (new or changed rows)
+against the open set, so the work scales with the daily delta instead of the full history.
+
+Usage:
+    python reconciliation_ledger.py [--transactions FILE] [--disbursements FILE] [--ledger FILE]
+"""
+
+import argparse
+import glob
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+import numpy as np
+
+from disbursement_reconciliation import (DISBURSEMENT_COLUMNS, TRANSACTION_COLUMNS, ledger_values,
+                                         reconcile_disbursements, summarise_reconciliation)
+
+LEDGER_FILE = 'reconciliation_ledger.sqlite'
+LEDGER_COLUMNS = {'id': 'ID', 'amount': 'AMOUNT', 'date': 'VALUE_DATE'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ledger_rows (
+    side        TEXT    NOT NULL,   -- 'transaction' or 'disbursement'
+    row_hash    INTEGER NOT NULL,
+    id          TEXT,
+    amount      REAL,
+    value_date  TEXT,
+    status      TEXT    NOT NULL,   -- reconciliation status, or 'superseded' for replaced rows
+    pair_hash   INTEGER,            -- row_hash of the paired row on the other side
+    first_seen  TEXT    NOT NULL,
+    updated_at  TEXT    NOT NULL,
+    PRIMARY KEY (side, row_hash)
+);
+CREATE INDEX IF NOT EXISTS ledger_rows_open ON ledger_rows (side, status);
+CREATE INDEX IF NOT EXISTS ledger_rows_id ON ledger_rows (side, id);
+"""
+
+def row_hashes(df):
+    """
+    Stable 64-bit key of every row: the hash of all columns (as text so dtype inference can't
+    change it), combined with its occurrence number when identical rows repeat in the export.
+    Repeated rows are duplicate disbursements to surface, not one row; the first occurrence
+    keeps the plain hash.
+    """
+    hashes = pd.Series(pd.util.hash_pandas_object(df.astype(str), index=False).to_numpy())
+    occurrence = hashes.groupby(hashes).cumcount()
+    repeated = pd.util.hash_pandas_object(pd.DataFrame({'HASH': hashes, 'OCCURRENCE': occurrence}), index=False)
+    return np.where(occurrence > 0, repeated.to_numpy(), hashes.to_numpy()).view(np.int64)
+
+class ReconciliationLedger:
+    """SQLite-backed store of matched pairs and open exceptions"""
+
+    def __init__(self, path=LEDGER_FILE):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def known_hashes(self, side):
+        """Row hashes already recorded for a side (superseded rows count as unseen if they come back)"""
+        rows = self.connection.execute("SELECT row_hash FROM ledger_rows WHERE side = ? AND status != 'superseded'",
+                                       (side,)).fetchall()
+        return np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+
+    def open_rows(self, side):
+        """Rows that are not matched (or superseded) yet, in ledger column layout"""
+        open_df = pd.read_sql(
+            "SELECT row_hash AS ROW_HASH, id AS ID, amount AS AMOUNT, value_date AS VALUE_DATE "
+            "FROM ledger_rows WHERE side = ? AND status NOT IN ('matched', 'superseded')",
+            self.connection, params=(side,))
+        open_df['VALUE_DATE'] = pd.to_datetime(open_df['VALUE_DATE'])
+        return open_df
+
+    def open_items(self):
+        """All open exceptions on both sides"""
+        return pd.read_sql("SELECT * FROM ledger_rows WHERE status NOT IN ('matched', 'superseded') "
+                           "ORDER BY side, value_date", self.connection)
+
+    def supersede_changed_rows(self, side, new_rows, export_hashes, now):
+        """
+        A row changed when its ID arrives with a new hash and the old hash is gone from the export.
+        Mark the old row superseded and reopen whatever it was paired with, so both are
+        reconciled again. Returns the number of superseded rows.
+        """
+        ids = pd.unique(new_rows['ID'])
+        if len(ids) == 0:
+            return 0
+
+        for table, column, values in [('changed_ids', 'id TEXT', ((str(i),) for i in ids)),
+                                      ('export_hashes', 'row_hash INTEGER', ((int(h),) for h in export_hashes))]:
+            self.connection.execute(f"CREATE TEMP TABLE IF NOT EXISTS {table} ({column} PRIMARY KEY)")
+            self.connection.execute(f"DELETE FROM {table}")
+            self.connection.executemany(f"INSERT OR IGNORE INTO {table} VALUES (?)", values)
+
+        changed = ("side = ? AND status != 'superseded' AND id IN (SELECT id FROM changed_ids) "
+                   "AND row_hash NOT IN (SELECT row_hash FROM export_hashes)")
+        other_side = 'disbursement' if side == 'transaction' else 'transaction'
+        self.connection.execute(
+            "UPDATE ledger_rows SET status = 'reopened', pair_hash = NULL, updated_at = ? "
+            f"WHERE side = ? AND row_hash IN (SELECT pair_hash FROM ledger_rows WHERE {changed})",
+            (now, other_side, side))
+        cursor = self.connection.execute(
+            f"UPDATE ledger_rows SET status = 'superseded', pair_hash = NULL, updated_at = ? WHERE {changed}",
+            (now, side))
+        return cursor.rowcount
+
+    def record(self, side, rows, statuses, pair_hashes, now):
+        """Insert or update ledger rows with their latest status and pair"""
+        records = zip(
+            [side] * len(rows),
+            rows['ROW_HASH'].tolist(),
+            rows['ID'].tolist(),
+            rows['AMOUNT'].astype(float).tolist(),
+            rows['VALUE_DATE'].dt.strftime('%Y-%m-%dT%H:%M:%S').tolist(),
+            list(statuses),
+            [None if h is None or pd.isna(h) else int(h) for h in pair_hashes],
+            [now] * len(rows),
+            [now] * len(rows),
+        )
+        self.connection.executemany(
+            "INSERT INTO ledger_rows (side, row_hash, id, amount, value_date, status, pair_hash, first_seen, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (side, row_hash) DO UPDATE SET "
+            "status = excluded.status, pair_hash = excluded.pair_hash, updated_at = excluded.updated_at",
+            records)
+
+    def reconcile_exports(self, transactions_df, disbursements_df, amount_tolerance=0.0, date_window_days=3):
+        """
+        Reconcile only the new or changed rows of today's exports against the open set
+
+        Returns (delta_result, stats): delta_result is the reconcile_disbursements output for
+        the rows that were looked at, with TRANSACTION_HASH / DISBURSEMENT_HASH columns.
+        """
+        now = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+        stats = {}
+
+        # Supersede changed rows on both sides first - that can reopen rows on the other side
+        new_rows = {}
+        for side, df, columns in [('transaction', transactions_df, TRANSACTION_COLUMNS),
+                                  ('disbursement', disbursements_df, DISBURSEMENT_COLUMNS)]:
+            values = ledger_values(df, columns).assign(ROW_HASH=row_hashes(df))
+            side_new = values[~np.isin(values['ROW_HASH'].to_numpy(), self.known_hashes(side))]
+            # Rows without a value date can't be reconciled or recorded; they are reported every run
+            undated = side_new['VALUE_DATE'].isna()
+            new_rows[side] = side_new[~undated]
+
+            stats[f'{side}s in export'] = len(df)
+            stats[f'new or changed {side}s'] = len(new_rows[side])
+            stats[f'{side}s without a value date (not recorded)'] = int(undated.sum())
+            stats[f'superseded {side}s'] = self.supersede_changed_rows(side, new_rows[side], values['ROW_HASH'], now)
+
+        sides = {}
+        for side in ['transaction', 'disbursement']:
+            open_rows = self.open_rows(side)
+            stats[f'open {side}s carried forward'] = len(open_rows)
+            sides[side] = pd.concat([open_rows, new_rows[side][open_rows.columns]], ignore_index=True)
+
+        transactions = sides['transaction']
+        disbursements = sides['disbursement']
+        result = reconcile_disbursements(transactions, disbursements, amount_tolerance, date_window_days,
+                                         transaction_columns=LEDGER_COLUMNS, disbursement_columns=LEDGER_COLUMNS)
+
+        result['TRANSACTION_HASH'] = _hashes_at(transactions['ROW_HASH'].to_numpy(), result['TRANSACTION_ROW'].to_numpy())
+        result['DISBURSEMENT_HASH'] = _hashes_at(disbursements['ROW_HASH'].to_numpy(), result['DISBURSEMENT_ROW'].to_numpy())
+        has_transaction = result['TRANSACTION_ROW'].to_numpy() >= 0
+        has_disbursement = result['DISBURSEMENT_ROW'].to_numpy() >= 0
+
+        with self.connection:
+            left = result[has_transaction]
+            self.record('transaction', transactions.iloc[left['TRANSACTION_ROW'].to_numpy()],
+                        left['STATUS'].astype(str), left['DISBURSEMENT_HASH'].tolist(), now)
+            right = result[has_disbursement]
+            self.record('disbursement', disbursements.iloc[right['DISBURSEMENT_ROW'].to_numpy()],
+                        right['STATUS'].astype(str), right['TRANSACTION_HASH'].tolist(), now)
+
+        return result, stats
+
+def _hashes_at(hashes, rows):
+    """Row hashes at result positions, <NA> where the position is -1 (no row on that side)"""
+    present = rows >= 0
+    values = np.zeros(len(rows), dtype=np.int64)
+    values[present] = hashes[rows[present]]
+    return pd.arrays.IntegerArray(values, ~present)
+
+def latest_file(pattern):
+    """Most recent export matching pattern (exports carry the date in the name)"""
+    files = sorted(glob.glob(pattern))
+    return files[-1] if files else None
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental disbursement reconciliation")
+    parser.add_argument('--transactions', default=latest_file('Transactions-fidoug-*.xlsx'))
+    parser.add_argument('--disbursements', default=latest_file('Disbursements_-_UGANDA_Finance_Department_*.csv'))
+    parser.add_argument('--ledger', default=LEDGER_FILE)
+    parser.add_argument('--amount-tolerance', type=float, default=0.0)
+    parser.add_argument('--date-window-days', type=int, default=3)
+    args = parser.parse_args()
+
+    if not args.transactions or not args.disbursements:
+        print("Error: could not find the transactions and disbursements exports.")
+        return
+
+    print("Loading files...")
+    transactions_df = pd.read_excel(args.transactions)
+    disbursements_df = pd.read_csv(args.disbursements)
+    print(f"Transactions: {args.transactions} ({len(transactions_df)} records)")
+    print(f"Disbursements: {args.disbursements} ({len(disbursements_df)} records)")
+
+    ledger = ReconciliationLedger(args.ledger)
+    try:
+        start = datetime.now()
+        result, stats = ledger.reconcile_exports(transactions_df, disbursements_df,
+                                                 args.amount_tolerance, args.date_window_days)
+        elapsed = (datetime.now() - start).total_seconds()
+
+        print(f"\nDelta reconciliation ({elapsed:.2f}s):")
+        for label, value in stats.items():
+            print(f"  - {label}: {value}")
+
+        print(f"\nThis run by status:")
+        print(summarise_reconciliation(result).to_string(index=False))
+
+        open_items = ledger.open_items()
+        print(f"\nOpen exceptions in ledger: {len(open_items)}")
+        if len(open_items) > 0:
+            print(open_items['status'].value_counts().to_string())
+            open_items.to_csv('open_reconciliation_items.csv', index=False)
+            print(f"Open exceptions saved to: open_reconciliation_items.csv")
+    finally:
+        ledger.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from disbursement_cube import DisbursementCube, ln_band
+
+def fixture_export(seed=3, rows=400, start='2025-01-01', days=90):
+    """Finance Department export columns with a few missing dimensions and amounts"""
+    rng = np.random.default_rng(seed)
+    export = pd.DataFrame({
+        'DISBURSMENT_DATE': (pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, days, rows), unit='D')
+                             + pd.to_timedelta(rng.integers(0, 86400, rows), unit='s')).astype(str),
+        'PRODUCT_GROUP': rng.choice(['Mobile', 'Boda', 'SME'], rows),
+        'LN': rng.choice([0, 3, 6, 12, 20, 30, np.nan], rows),
+        'INDUSTRY': rng.choice(['Retail', 'Farming', None], rows),
+        'GENDER': rng.choice(['MALE', 'FEMALE'], rows),
+        'EMPLOYMENT': rng.choice(['Self', 'Salaried'], rows),
+        'DISBURSED_AMOUNT': rng.integers(10, 500, rows).astype(float),
+    })
+    export.loc[::37, 'DISBURSED_AMOUNT'] = np.nan
+    return export
+
+def reference_slice(export, by, grain=None, where=None, start=None, end=None):
+    """The same slice grouped straight from the export rows"""
+    rows = export.assign(LN_BAND=ln_band(export['LN']),
+                         DAY=pd.to_datetime(export['DISBURSMENT_DATE']).dt.normalize(),
+                         AMOUNT=export['DISBURSED_AMOUNT'])
+    rows[['INDUSTRY', 'GENDER']] = rows[['INDUSTRY', 'GENDER']].fillna('Unknown')
+    rows['MONTH'] = rows['DAY'].dt.to_period('M').dt.to_timestamp()
+    if start is not None:
+        rows = rows[rows['DAY'] >= pd.Timestamp(start)]
+    if end is not None:
+        rows = rows[rows['DAY'] <= pd.Timestamp(end)]
+    for dim, values in (where or {}).items():
+        rows = rows[rows[dim].isin(values)]
+    keys = ([{'day': 'DAY', 'month': 'MONTH'}[grain]] if grain else []) + list(by)
+    return rows.groupby(keys, sort=True).agg(COUNT=('AMOUNT', 'size'), TOTAL=('AMOUNT', 'sum'),
+                                             MIN=('AMOUNT', 'min'), MAX=('AMOUNT', 'max')).reset_index()
+
+def assert_slice_matches(cube, export, **query):
+    actual = cube.slice(**query).drop(columns='AVERAGE')
+    expected = reference_slice(export, **query)
+    pd.testing.assert_frame_equal(actual.reset_index(drop=True), expected, check_dtype=False)
+
+def test_ln_bands_follow_the_sql_case():
+    assert list(ln_band(pd.Series([0, 5, 6, 11, 12, 19, 20, 23, 24, None, -1, 5.5]))) == [
+        'LN0-5', 'LN0-5', 'LN6-11', 'LN6-11', 'LN12-19', 'LN12-19', 'LN20-23', 'LN20-23',
+        'LN24+', 'LN24+', 'LN24+', 'LN24+']
+
+def test_slices_match_grouping_the_export():
+    export = fixture_export()
+    cube = DisbursementCube.build(export)
+    assert_slice_matches(cube, export, by=['PRODUCT_GROUP', 'LN_BAND'], grain='month')
+    assert_slice_matches(cube, export, by=['GENDER'], where={'INDUSTRY': ['Retail']},
+                         start='2025-02-01', end='2025-03-31')
+    assert_slice_matches(cube, export, by=['INDUSTRY'], grain='day', where={'GENDER': ['MALE']})
+    # Mid-month bounds fall back to the day cells
+    assert_slice_matches(cube, export, by=['EMPLOYMENT'], grain='month', start='2025-01-15', end='2025-02-10')
+
+def test_append_equals_a_full_rebuild():
+    history, update = fixture_export(days=60), fixture_export(seed=4, start='2025-02-20', days=20)
+    # The update replaces every day it covers
+    update_days = pd.to_datetime(update['DISBURSMENT_DATE']).dt.normalize()
+    kept = history[~pd.to_datetime(history['DISBURSMENT_DATE']).dt.normalize().isin(update_days)]
+    cube = DisbursementCube.build(history)
+    cube.append(update)
+    rebuilt = DisbursementCube.build(pd.concat([kept, update], ignore_index=True))
+
+    sort = lambda df, keys: df.sort_values(keys, kind='mergesort').reset_index(drop=True)
+    pd.testing.assert_frame_equal(sort(cube.cells, ['DAY', 'PRODUCT_GROUP', 'LN_BAND', 'INDUSTRY', 'GENDER', 'EMPLOYMENT']),
+                                  sort(rebuilt.cells, ['DAY', 'PRODUCT_GROUP', 'LN_BAND', 'INDUSTRY', 'GENDER', 'EMPLOYMENT']))
+    rollup_keys = ['CUBOID', 'MONTH', 'PRODUCT_GROUP', 'LN_BAND', 'INDUSTRY', 'GENDER', 'EMPLOYMENT']
+    pd.testing.assert_frame_equal(sort(cube.rollups, rollup_keys), sort(rebuilt.rollups, rollup_keys))
@@ -0,0 +1,60 @@
+import pandas as pd
+
+from disbursement_reconciliation import reconcile_disbursements
+
+def ledgers(transactions, disbursements):
+    """Transactions / disbursements frames from (id, amount, date) tuples"""
+    return (pd.DataFrame(transactions, columns=['Account ID', 'Amount', 'Value Date (Entry Date)']),
+            pd.DataFrame(disbursements, columns=['LOAN_ID', 'DISBURSED_AMOUNT', 'DISBURSMENT_DATE']))
+
+def statuses(result):
+    return sorted(result['STATUS'].astype(str))
+
+def test_same_amount_row_further_away_is_matched():
+    # The nearest disbursement has the wrong amount; the exact one is a day later
+    transactions, disbursements = ledgers([('A', 100, '2025-01-01')],
+                                          [('A', 200, '2025-01-01'), ('A', 100, '2025-01-02')])
+    result = reconcile_disbursements(transactions, disbursements)
+    assert statuses(result) == ['matched', 'missing_in_transactions']
+    matched = result[result['STATUS'] == 'matched'].iloc[0]
+    assert (matched['TRANSACTION_ROW'], matched['DISBURSEMENT_ROW']) == (0, 1)
+
+def test_closest_row_wins_a_contested_partner():
+    transactions, disbursements = ledgers([('A', 100, '2025-01-01'), ('A', 100, '2025-01-03')],
+                                          [('A', 100, '2025-01-03')])
+    result = reconcile_disbursements(transactions, disbursements)
+    matched = result[result['STATUS'] == 'matched'].iloc[0]
+    assert (matched['TRANSACTION_ROW'], matched['DISBURSEMENT_ROW']) == (1, 0)
+    assert statuses(result) == ['matched', 'missing_in_disbursements']
+
+def test_passes_classify_amount_and_date_mismatches():
+    transactions, disbursements = ledgers([('A', 100, '2025-01-01'), ('B', 50, '2025-01-01'), ('C', 10, '2025-01-01')],
+                                          [('A', 120, '2025-01-02'), ('B', 50, '2025-02-01'), ('D', 10, '2025-01-01')])
+    result = reconcile_disbursements(transactions, disbursements).set_index('ID')
+    assert result.loc['A', 'STATUS'] == 'amount_mismatch'
+    assert result.loc['B', 'STATUS'] == 'date_mismatch'
+    assert result.loc['C', 'STATUS'] == 'missing_in_disbursements'
+    assert result.loc['D', 'STATUS'] == 'missing_in_transactions'
+
+def test_one_side_empty():
+    transactions, disbursements = ledgers([('A', 100, '2025-01-01')], [])
+    assert statuses(reconcile_disbursements(transactions, disbursements)) == ['missing_in_disbursements']
+
+def test_many_rows_per_id_pair_one_to_one():
+    # 40 disbursements per loan on distinct dates and amounts, plus 5 identical rows that all want the same partner
+    rows = [(loan, 1000 + day, pd.Timestamp('2025-01-01') + pd.Timedelta(days=2 * day))
+            for loan in ['A', 'B', 'C'] for day in range(40)]
+    rows += [('A', 7, pd.Timestamp('2025-06-01'))] * 5
+    shuffled = rows[1::2] + rows[::2]
+    transactions, disbursements = ledgers(shuffled, rows)
+    result = reconcile_disbursements(transactions, disbursements)
+    assert statuses(result) == ['matched'] * len(rows)
+    assert result['TRANSACTION_ROW'].is_unique and result['DISBURSEMENT_ROW'].is_unique
+    assert (result['AMOUNT_DIFF'] == 0).all() and (result['DAYS_DIFF'] == 0).all()
+
+def test_tolerance_searches_the_neighbouring_amount_buckets():
+    transactions, disbursements = ledgers([('A', 100.4, '2025-01-01'), ('A', 100.6, '2025-01-05')],
+                                          [('A', 99.9, '2025-01-02'), ('A', 101.2, '2025-01-05')])
+    result = reconcile_disbursements(transactions, disbursements, amount_tolerance=1.0)
+    matched = result[result['STATUS'] == 'matched'].sort_values('TRANSACTION_ROW')
+    assert matched[['TRANSACTION_ROW', 'DISBURSEMENT_ROW']].values.tolist() == [[0, 0], [1, 1]]
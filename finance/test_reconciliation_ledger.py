@@ -0,0 +1,81 @@
+import pandas as pd
+
+from reconciliation_ledger import ReconciliationLedger
+
+def exports(transactions, disbursements):
+    """Transactions / disbursements exports from (id, amount, date) tuples"""
+    return (pd.DataFrame(transactions, columns=['Account ID', 'Amount', 'Value Date (Entry Date)']),
+            pd.DataFrame(disbursements, columns=['LOAN_ID', 'DISBURSED_AMOUNT', 'DISBURSMENT_DATE']))
+
+def test_identical_rows_are_kept_as_separate_items(tmp_path):
+    ledger = ReconciliationLedger(str(tmp_path / 'ledger.sqlite'))
+    transactions, disbursements = exports([('A', 100, '2025-01-01')],
+                                          [('A', 100, '2025-01-01'), ('A', 100, '2025-01-01')])
+    result, stats = ledger.reconcile_exports(transactions, disbursements)
+    assert sorted(result['STATUS'].astype(str)) == ['matched', 'missing_in_transactions']
+    assert stats['new or changed disbursements'] == 2
+
+    # The same exports again: nothing new, the duplicate stays open
+    result, stats = ledger.reconcile_exports(transactions, disbursements)
+    assert stats['new or changed disbursements'] == 0
+    assert list(ledger.open_items()['status']) == ['missing_in_transactions']
+    ledger.close()
+
+def test_undated_rows_are_reported(tmp_path):
+    ledger = ReconciliationLedger(str(tmp_path / 'ledger.sqlite'))
+    transactions, disbursements = exports([('A', 100, None)], [('A', 100, '2025-01-01')])
+    _, stats = ledger.reconcile_exports(transactions, disbursements)
+    assert stats['transactions without a value date (not recorded)'] == 1
+    assert list(ledger.open_items()['side']) == ['disbursement']
+    ledger.close()
+
+def ledger_statuses(ledger):
+    """(side, id, amount) -> status of every ledger row"""
+    rows = ledger.connection.execute("SELECT side, id, amount, status FROM ledger_rows").fetchall()
+    return {(side, id, amount): status for side, id, amount, status in rows}
+
+def test_a_changed_row_supersedes_the_old_one_and_reopens_its_pair(tmp_path):
+    ledger = ReconciliationLedger(str(tmp_path / 'ledger.sqlite'))
+    transactions = [('A', 100, '2025-01-01'), ('B', 50, '2025-01-02')]
+    result, _ = ledger.reconcile_exports(*exports(transactions, [('A', 100, '2025-01-01'), ('B', 50, '2025-01-02')]))
+    assert list(result['STATUS'].astype(str)) == ['matched', 'matched']
+
+    # A's disbursement is corrected to 120: the old row is superseded and A's transaction is reconciled again
+    result, stats = ledger.reconcile_exports(*exports(transactions, [('A', 120, '2025-01-01'), ('B', 50, '2025-01-02')]))
+    assert stats['superseded disbursements'] == 1 and stats['superseded transactions'] == 0
+    assert stats['new or changed disbursements'] == 1 and stats['open transactions carried forward'] == 1
+    assert list(result['STATUS'].astype(str)) == ['amount_mismatch']
+    assert ledger_statuses(ledger) == {
+        ('transaction', 'A', 100.0): 'amount_mismatch', ('transaction', 'B', 50.0): 'matched',
+        ('disbursement', 'A', 100.0): 'superseded', ('disbursement', 'A', 120.0): 'amount_mismatch',
+        ('disbursement', 'B', 50.0): 'matched',
+    }
+    # The reopened transaction is paired with the new disbursement row, and the other way round
+    rows = ledger.connection.execute("SELECT side, row_hash, pair_hash FROM ledger_rows "
+                                     "WHERE id = 'A' AND status != 'superseded'").fetchall()
+    pairs = {side: (row_hash, pair_hash) for side, row_hash, pair_hash in rows}
+    assert pairs['transaction'][1] == pairs['disbursement'][0] and pairs['disbursement'][1] == pairs['transaction'][0]
+    ledger.close()
+
+def test_a_superseded_row_that_comes_back_is_reconciled_again(tmp_path):
+    ledger = ReconciliationLedger(str(tmp_path / 'ledger.sqlite'))
+    transactions = [('A', 100, '2025-01-01')]
+    ledger.reconcile_exports(*exports(transactions, [('A', 100, '2025-01-01')]))
+    ledger.reconcile_exports(*exports(transactions, [('A', 120, '2025-01-01')]))
+    # The correction is reverted: the 120 row is superseded and the original row matches again
+    result, stats = ledger.reconcile_exports(*exports(transactions, [('A', 100, '2025-01-01')]))
+    assert stats['new or changed disbursements'] == 1 and stats['superseded disbursements'] == 1
+    assert list(result['STATUS'].astype(str)) == ['matched']
+    assert ledger_statuses(ledger) == {('transaction', 'A', 100.0): 'matched', ('disbursement', 'A', 100.0): 'matched',
+                                       ('disbursement', 'A', 120.0): 'superseded'}
+    assert ledger.open_items().empty
+    ledger.close()
+
+def test_a_changed_transaction_reopens_an_open_exception_too(tmp_path):
+    ledger = ReconciliationLedger(str(tmp_path / 'ledger.sqlite'))
+    ledger.reconcile_exports(*exports([('A', 90, '2025-01-01')], [('A', 100, '2025-01-01')]))
+    assert sorted(ledger.open_items()['status']) == ['amount_mismatch', 'amount_mismatch']
+    result, stats = ledger.reconcile_exports(*exports([('A', 100, '2025-01-01')], [('A', 100, '2025-01-01')]))
+    assert stats['superseded transactions'] == 1 and stats['open disbursements carried forward'] == 1
+    assert list(result['STATUS'].astype(str)) == ['matched'] and ledger.open_items().empty
+    ledger.close()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Point-in-time loan balance index - "the loan book at date X" for any date, not just month ends
+
+Transactions are kept per loan in contiguous arrays sorted by (loan, day) with per-loan offsets,
+holding the latest principal/total balance and running repayment, fee, interest and penalty
+totals at every transaction. The balance of any loans at any dates is then one vectorized
+binary search (the same lookup loan_book_engine.py does for month ends). Dates are compared
+on calendar day, like DATE(entrydate) <= date in loanbookatdate.sql.
+
+The arrays can be saved as .npy files and memory-mapped back, so a saved index opens instantly
+and only the pages a query touches are read.
+
+Usage:
+    python loan_balance_index.py build DATA [--index loan_balance_index]
+    python loan_balance_index.py book 2025-07-15 [2025-08-20 ...] [--index loan_balance_index] [--loans L1 L2]
+"""
+
+import argparse
+import json
+import os
+import time
+
+import pandas as pd
+import numpy as np
+
+from loan_book_engine import load_tables, positions_at, sort_loan_transactions, to_days
+
+INDEX_DIR = 'loan_balance_index'
+INDEX_ARRAYS = ['key', 'offsets', 'principalbalance', 'balance', 'repayments', 'fees_paid',
+                'interest_accrued', 'interest_paid', 'penalty_accrued', 'penalty_paid']
+
+class LoanBalanceIndex:
+    """Per-loan sorted transaction arrays answering as-of balance queries"""
+
+    def __init__(self, loans_df, arrays):
+        self.loans = loans_df.reset_index(drop=True)
+        self.arrays = arrays
+        self.loan_index = pd.Index(self.loans['loan_id'])
+        self.disbursement_days = to_days(self.loans['disbursementdate'])
+        fees = self.loans['processing_fee'] if 'processing_fee' in self.loans else pd.Series(0.0, index=self.loans.index)
+        self.processing_fee = pd.to_numeric(fees, errors='coerce').fillna(0).to_numpy(dtype=float)
+
+    @classmethod
+    def build(cls, loans_df, transactions_df):
+        """Sort the transactions once and keep only the arrays the queries need"""
+        loans_df = loans_df[loans_df['disbursementdate'].notna()].reset_index(drop=True)
+        arrays = sort_loan_transactions(loans_df['loan_key'].to_numpy(), transactions_df)
+        return cls(loans_df, {name: arrays[name] for name in INDEX_ARRAYS})
+
+    def save(self, directory=INDEX_DIR):
+        os.makedirs(directory, exist_ok=True)
+        for name, values in self.arrays.items():
+            np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(values))
+        self.loans.to_parquet(os.path.join(directory, 'loans.parquet'), index=False)
+        with open(os.path.join(directory, 'index.json'), 'w') as f:
+            json.dump({'loans': len(self.loans), 'transactions': len(self.arrays['key']),
+                       'built_at': pd.Timestamp.now().isoformat(timespec='seconds')}, f, indent=2)
+
+    @classmethod
+    def load(cls, directory=INDEX_DIR, mmap=True):
+        """Open a saved index; with mmap=True the arrays stay on disk until a query reads them"""
+        mmap_mode = 'r' if mmap else None
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode) for name in INDEX_ARRAYS}
+        return cls(pd.read_parquet(os.path.join(directory, 'loans.parquet')), arrays)
+
+    def loan_positions(self, loan_ids):
+        positions = self.loan_index.get_indexer(loan_ids)
+        unknown = positions < 0
+        if unknown.any():
+            raise KeyError(f"Unknown loan_id(s): {list(pd.Series(loan_ids)[unknown][:5])}")
+        return positions
+
+    def balances(self, loans, days):
+        """Balances of loan positions at day numbers (elementwise); rows without a transaction yet are NaN"""
+        positions = positions_at(self.arrays, loans, days)
+        found = positions >= 0
+        taken = np.where(found, positions, 0)
+
+        def at(name):
+            return np.where(found, np.asarray(self.arrays[name])[taken], np.nan)
+
+        result = pd.DataFrame({
+            'as_of_date': np.asarray(days, dtype=np.int64).astype('datetime64[D]'),
+            'loan_id': self.loans['loan_id'].to_numpy()[loans],
+            'principal_balance': at('principalbalance'),
+            'outstanding_fees': np.where(found, self.processing_fee[loans] - at('fees_paid'), np.nan),
+            'outstanding_interest': at('interest_accrued') - at('interest_paid'),
+            'outstanding_penalties': at('penalty_accrued') - at('penalty_paid'),
+            'total_balance': at('balance'),
+            'total_repayments': at('repayments'),
+        })
+        return result
+
+    def balances_at(self, loan_ids, as_of):
+        """Balances of the given loans at one date, or at one date per loan"""
+        loans = self.loan_positions(loan_ids)
+        days = np.broadcast_to(to_days(np.atleast_1d(as_of)), loans.shape) if np.ndim(as_of) == 0 \
+            else to_days(as_of)
+        return self.balances(loans, days)
+
+    def book_at(self, as_of):
+        """Every loan disbursed by the date with a positive total balance at the end of that day"""
+        day = to_days([as_of])[0]
+        loans = np.flatnonzero(self.disbursement_days <= day)
+        book = self.balances(loans, np.full(len(loans), day))
+        open_loans = (book['total_balance'] > 0).to_numpy()
+        book = book[open_loans].reset_index(drop=True)
+
+        static = self.loans.iloc[loans[open_loans]].drop(columns=['loan_id']).reset_index(drop=True)
+        return pd.concat([book, static], axis=1)
+
+def main():
+    parser = argparse.ArgumentParser(description="Point-in-time loan balance index")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help="Build the index from loan and transaction tables")
+    build_parser.add_argument('data', help="Directory of Parquet files or a DuckDB database")
+    build_parser.add_argument('--index', default=INDEX_DIR)
+
+    book_parser = subparsers.add_parser('book', help="Loan book (or selected loans) at one or more dates")
+    book_parser.add_argument('dates', nargs='+')
+    book_parser.add_argument('--index', default=INDEX_DIR)
+    book_parser.add_argument('--loans', nargs='+', default=None, help="Only these loan_ids")
+    book_parser.add_argument('--output', default=None, help="CSV path (default: loan_book_<date>.csv per date)")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        tables = load_tables(args.data)
+        start = time.perf_counter()
+        index = LoanBalanceIndex.build(tables['loans'], tables['transactions'])
+        index.save(args.index)
+        print(f"Indexed {len(index.loans)} loans / {len(index.arrays['key'])} transactions "
+              f"in {time.perf_counter() - start:.2f}s -> {args.index}/")
+        return
+
+    index = LoanBalanceIndex.load(args.index)
+    for as_of in args.dates:
+        start = time.perf_counter()
+        book = index.balances_at(args.loans, as_of) if args.loans else index.book_at(as_of)
+        elapsed = time.perf_counter() - start
+
+        output = args.output or f"loan_book_{pd.Timestamp(as_of):%Y-%m-%d}.csv"
+        book.to_csv(output, index=False)
+        print(f"{as_of}: {len(book)} loans, total balance {book['total_balance'].sum():,.0f} "
+              f"({elapsed * 1000:.0f} ms) -> {output}")
+
+if __name__ == "__main__":
+    main()
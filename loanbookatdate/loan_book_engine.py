@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Local month-end loan book engine
+Replaces the month_spine CROSS JOIN in loanbookatdate.sql / monthly_loan_balances.sql.
+
+Transactions are sorted per loan once. Running sums give repayments, interest, penalties and
+fee payments to date, and a searchsorted over the month-end boundaries finds each loan's
+latest transaction state (highest transactionid on or before the month end). Each loan is
+only expanded over the months between disbursement and the month its balance reaches zero,
+so the work is linear in the output instead of months x loans x transactions.
+
+Usage:
+    python loan_book_engine.py DATA [--as-of YYYY-MM-DD] [--output loan_book_month_end.csv] [--verify]
+
+DATA is a directory of Parquet files (loans.parquet, loantransaction.parquet, repayment.parquet)
+or a DuckDB database with tables of the same names.
+"""
+
+import argparse
+import os
+
+import pandas as pd
+import numpy as np
+
+LOAN_COLUMNS = ['loan_id', 'loan_key', 'client_id', 'disbursementdate', 'disbursed_amount']
+TRANSACTION_COLUMNS = ['parentaccountkey', 'transactionid', 'entrydate', 'type', 'amount', 'principalbalance', 'balance']
+REPAYMENT_COLUMNS = ['parentaccountkey', 'duedate']
+
+# Running sums kept per loan, by loantransaction "type" (same buckets as monthly_loan_balances.sql)
+RUNNING_SUMS = {
+    'repayments': ['REPAYMENT', 'REPAYMENT_ADJUSTMENT'],
+    'fees_paid': ['FEE_PAYMENT'],
+    'interest_accrued': ['INTEREST_ACCRUAL'],
+    'interest_paid': ['INTEREST_PAYMENT'],
+    'penalty_accrued': ['PENALTY_ACCRUAL'],
+    'penalty_paid': ['PENALTY_PAYMENT'],
+}
+
+# (loan, day) keys: days since 1970 shifted by DAY_OFFSET fit in DAY_BITS (years 1791-2149).
+# Days outside that range are clipped to its ends so they never spill into a neighbouring loan.
+DAY_BITS = 17
+DAY_OFFSET = 1 << 16
+MAX_SHIFTED_DAY = (1 << DAY_BITS) - 1
+
+TABLE_NAMES = {'loans': 'loans', 'transactions': 'loantransaction', 'repayments': 'repayment'}
+
+def to_days(values):
+    """Calendar day numbers (days since 1970-01-01) - DATE(x) in the SQL"""
+    return pd.to_datetime(values).to_numpy(dtype='datetime64[D]').astype(np.int64)
+
+def month_ends(first_day, last_day):
+    """Month-end day numbers from the month of first_day to the last month end on or before last_day"""
+    first_month = np.datetime64(first_day, 'D').astype('datetime64[M]')
+    last_month = (np.datetime64(last_day, 'D') + 1).astype('datetime64[M]') - 1
+    months = np.arange(first_month, last_month + 1)
+    return ((months + 1).astype('datetime64[D]') - 1).astype(np.int64)
+
+def loan_positions(loan_keys, keys):
+    """Position of each key in loan_keys, -1 for keys that are not a known loan"""
+    return pd.Index(loan_keys).get_indexer(keys)
+
+def sort_loan_transactions(loan_keys, transactions_df):
+    """
+    Sort transactions by (loan, day, transactionid) and lay them out as per-loan runs
+
+    Returns a dict of arrays:
+        loan, day, transactionid    - sort keys
+        key                         - loan_day_keys(loan, day), for positions_at
+        principalbalance, balance   - state columns of the latest transaction so far (by transactionid)
+        <running sum>               - running totals per RUNNING_SUMS bucket
+        offsets                     - loan i owns positions offsets[i]:offsets[i + 1]
+    """
+    loan = loan_positions(loan_keys, transactions_df['parentaccountkey'].to_numpy())
+    known = loan >= 0
+    tx = transactions_df[known]
+    loan = loan[known]
+    day = to_days(tx['entrydate'])
+    transactionid = pd.to_numeric(tx['transactionid']).to_numpy(dtype=np.int64)
+
+    order = np.lexsort((transactionid, day, loan))
+    loan, day, transactionid = loan[order], day[order], transactionid[order]
+    offsets = np.searchsorted(loan, np.arange(len(loan_keys) + 1))
+
+    # Latest state = highest transactionid seen so far within the loan. transactionid ranks are
+    # shifted by loan so one running maximum over the whole array never crosses a loan boundary.
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[np.lexsort((transactionid, loan))] = np.arange(len(order))
+    latest_rank = np.maximum.accumulate(rank)
+    position_of_rank = np.empty(len(order), dtype=np.int64)
+    position_of_rank[rank] = np.arange(len(order))
+    latest = position_of_rank[latest_rank]
+
+    arrays = {
+        'loan': loan,
+        'day': day,
+        'transactionid': transactionid,
+        'key': loan_day_keys(loan, day),
+        'principalbalance': pd.to_numeric(tx['principalbalance']).to_numpy(dtype=float)[order][latest],
+        'balance': pd.to_numeric(tx['balance']).to_numpy(dtype=float)[order][latest],
+        'offsets': offsets,
+    }
+
+    types = tx['type'].to_numpy()[order]
+    amounts = pd.to_numeric(tx['amount']).fillna(0).to_numpy(dtype=float)[order]
+    for name, tx_types in RUNNING_SUMS.items():
+        running = np.cumsum(np.where(np.isin(types, tx_types), amounts, 0.0))
+        # Subtract the total before each loan's first row so every loan starts from zero
+        before_loan = np.concatenate([[0.0], running])[offsets[:-1]]
+        arrays[name] = running - np.repeat(before_loan, np.diff(offsets))
+
+    return arrays
+
+def loan_day_keys(loans, days):
+    """One sortable int64 per (loan, day): loan in the high bits, day (offset to be non-negative) in the low"""
+    shifted = np.clip(np.asarray(days, dtype=np.int64) + DAY_OFFSET, 0, MAX_SHIFTED_DAY)
+    return (np.asarray(loans, dtype=np.int64) << DAY_BITS) + shifted
+
+def positions_at(arrays, loans, days):
+    """Position of each loan's last transaction on or before the day, -1 when there is none"""
+    loans = np.asarray(loans, dtype=np.int64)
+    positions = np.searchsorted(arrays['key'], loan_day_keys(loans, days), side='right') - 1
+    return np.where(positions >= arrays['offsets'][loans], positions, -1)
+
+def latest_due_dates(loan_keys, repayments_df, loans, days):
+    """Latest installment due date on or before each day (NaT when none yet)"""
+    due = repayments_df[['parentaccountkey', 'duedate']].dropna()
+    due_loan = loan_positions(loan_keys, due['parentaccountkey'].to_numpy())
+    known = due_loan >= 0
+    due_loan, due_day = due_loan[known], to_days(due['duedate'])[known]
+    order = np.lexsort((due_day, due_loan))
+    due_arrays = {'day': due_day[order], 'key': loan_day_keys(due_loan[order], due_day[order]),
+                  'offsets': np.searchsorted(due_loan[order], np.arange(len(loan_keys) + 1))}
+
+    positions = positions_at(due_arrays, loans, days)
+    result = np.full(len(loans), np.iinfo(np.int64).min, dtype=np.int64)
+    result[positions >= 0] = due_arrays['day'][positions[positions >= 0]]
+    return result.astype('datetime64[D]')
+
+def active_loan_months(arrays, disbursement_days, spine):
+    """
+    (loan, month end) pairs to evaluate: from the disbursement month to the month the loan's
+    final balance hit zero (or the end of the spine while it is still open)
+    """
+    offsets = arrays['offsets']
+    has_transactions = np.diff(offsets) > 0
+    last = np.maximum(offsets[1:] - 1, 0)
+
+    first_month = np.searchsorted(spine, disbursement_days, side='left')
+    last_month = np.full(len(disbursement_days), len(spine) - 1)
+    if len(arrays['day']):
+        closed = has_transactions & (arrays['balance'][last] <= 0)
+        last_month[closed] = np.searchsorted(spine, arrays['day'][last[closed]], side='left')
+    last_month = np.minimum(last_month, len(spine) - 1)
+
+    counts = np.where(has_transactions & (last_month >= first_month), last_month - first_month + 1, 0)
+    loans = np.repeat(np.arange(len(disbursement_days)), counts)
+    # Month index of each pair = first month of its loan + its position inside the loan's run
+    run_starts = np.repeat(np.cumsum(counts) - counts, counts)
+    months = np.repeat(first_month, counts) + (np.arange(len(loans)) - run_starts)
+    return loans, months
+
+def month_end_loan_book(loans_df, transactions_df, repayments_df=None, as_of=None):
+    """
+    Month-end state of every loan with a positive balance, one row per (report_month, loan)
+
+    As in monthly_loan_balances.sql a loan-month needs both balance > 0 on its latest transaction
+    and total_outstanding_balance (principal + fees + interest + penalties) > 0.
+
+    loans_df needs LOAN_COLUMNS (processing_fee and any other columns are passed through),
+    transactions_df needs TRANSACTION_COLUMNS and repayments_df REPAYMENT_COLUMNS.
+    """
+    loans_df = loans_df[loans_df['disbursementdate'].notna()].reset_index(drop=True)
+    loan_keys = loans_df['loan_key'].to_numpy()
+    disbursement_days = to_days(loans_df['disbursementdate'])
+
+    as_of = pd.Timestamp(as_of or pd.Timestamp.today()).normalize()
+    if len(loans_df) == 0:
+        return pd.DataFrame(columns=['report_month'] + LOAN_COLUMNS)
+    spine = month_ends(disbursement_days.min().astype('datetime64[D]'), as_of.to_datetime64())
+
+    arrays = sort_loan_transactions(loan_keys, transactions_df)
+    loans, months = active_loan_months(arrays, disbursement_days, spine)
+    month_end = spine[months]
+
+    positions = positions_at(arrays, loans, month_end)
+    existed = positions >= 0
+    loans, month_end, positions = loans[existed], month_end[existed], positions[existed]
+
+    total_balance = arrays['balance'][positions]
+    open_rows = total_balance > 0
+    loans, month_end, positions = loans[open_rows], month_end[open_rows], positions[open_rows]
+
+    # Format per loan, then spread - strftime per loan-month dominates otherwise
+    month_disbursed = pd.to_datetime(loans_df['disbursementdate']).dt.strftime('%Y-%m').to_numpy()
+    book = loans_df.iloc[loans].reset_index(drop=True)
+    book.insert(0, 'report_month', month_end.astype('datetime64[D]'))
+    book.insert(1, 'month_disbursed', month_disbursed[loans])
+
+    processing_fee = pd.to_numeric(book['processing_fee'], errors='coerce').fillna(0).to_numpy(dtype=float) \
+        if 'processing_fee' in book else 0.0
+    book['principal_balance'] = arrays['principalbalance'][positions]
+    book['outstanding_fees'] = processing_fee - arrays['fees_paid'][positions]
+    book['outstanding_interest'] = arrays['interest_accrued'][positions] - arrays['interest_paid'][positions]
+    book['outstanding_penalties'] = arrays['penalty_accrued'][positions] - arrays['penalty_paid'][positions]
+    book['total_outstanding_balance'] = (book['principal_balance'] + book['outstanding_fees']
+                                         + book['outstanding_interest'] + book['outstanding_penalties'])
+    book['total_balance'] = arrays['balance'][positions]
+    book['total_repayments'] = arrays['repayments'][positions]
+
+    if repayments_df is not None:
+        book['due_date'] = latest_due_dates(loan_keys, repayments_df, loans, month_end)
+        book['days_past_due'] = (book['report_month'] - book['due_date']).dt.days
+    # The final SELECT of monthly_loan_balances.sql also drops loan-months with nothing outstanding
+    return book[book['total_outstanding_balance'] > 0].reset_index(drop=True)
+
+def load_tables(source):
+    """loans / loantransaction / repayment from a Parquet directory or a DuckDB database"""
+    if os.path.isdir(source):
+        tables = {}
+        for name, table in TABLE_NAMES.items():
+            path = os.path.join(source, f"{table}.parquet")
+            tables[name] = pd.read_parquet(path) if os.path.exists(path) else None
+        return tables
+
+    import duckdb
+    with duckdb.connect(source, read_only=True) as con:
+        existing = {row[0] for row in con.execute("SELECT table_name FROM information_schema.tables").fetchall()}
+        return {name: con.execute(f"SELECT * FROM {table}").df() if table in existing else None
+                for name, table in TABLE_NAMES.items()}
+
+# monthly_loan_balances.sql with the month_spine CROSS JOIN written per month in DuckDB - only for --verify
+REFERENCE_SQL = """
+WITH month_spine AS (
+    SELECT CAST(m + INTERVAL 1 MONTH - INTERVAL 1 DAY AS DATE) AS month_end
+    FROM generate_series(DATE_TRUNC('month', (SELECT MIN(disbursementdate) FROM loans)),
+                         DATE_TRUNC('month', CAST(? AS DATE)), INTERVAL 1 MONTH) s(m)
+    WHERE CAST(m + INTERVAL 1 MONTH - INTERVAL 1 DAY AS DATE) <= CAST(? AS DATE)
+),
+state AS (
+    SELECT ms.month_end, li.loan_id, lt.principalbalance, lt.balance
+    FROM month_spine ms
+    CROSS JOIN loans li
+    JOIN loantransaction lt ON lt.parentaccountkey = li.loan_key AND CAST(lt.entrydate AS DATE) <= ms.month_end
+    WHERE ms.month_end >= DATE_TRUNC('month', li.disbursementdate)
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY ms.month_end, li.loan_id ORDER BY lt.transactionid DESC) = 1
+),
+sums AS (
+    SELECT ms.month_end, li.loan_id, COALESCE(li.processing_fee, 0) AS processing_fee,
+           SUM(CASE WHEN t.type IN ('REPAYMENT', 'REPAYMENT_ADJUSTMENT') THEN t.amount ELSE 0 END) AS total_repayments,
+           SUM(CASE WHEN t.type = 'FEE_PAYMENT' THEN t.amount ELSE 0 END) AS fees_paid,
+           SUM(CASE WHEN t.type = 'INTEREST_ACCRUAL' THEN t.amount ELSE 0 END)
+             - SUM(CASE WHEN t.type = 'INTEREST_PAYMENT' THEN t.amount ELSE 0 END) AS outstanding_interest,
+           SUM(CASE WHEN t.type = 'PENALTY_ACCRUAL' THEN t.amount ELSE 0 END)
+             - SUM(CASE WHEN t.type = 'PENALTY_PAYMENT' THEN t.amount ELSE 0 END) AS outstanding_penalties
+    FROM month_spine ms
+    CROSS JOIN loans li
+    JOIN loantransaction t ON t.parentaccountkey = li.loan_key AND CAST(t.entrydate AS DATE) <= ms.month_end
+    GROUP BY 1, 2, 3
+)
+SELECT s.month_end AS report_month, s.loan_id, s.principalbalance AS principal_balance, s.balance AS total_balance,
+       u.total_repayments, u.outstanding_interest,
+       s.principalbalance + (u.processing_fee - u.fees_paid) + u.outstanding_interest + u.outstanding_penalties
+           AS total_outstanding_balance
+FROM state s JOIN sums u USING (month_end, loan_id)
+WHERE s.balance > 0
+  AND s.principalbalance + (u.processing_fee - u.fees_paid) + u.outstanding_interest + u.outstanding_penalties > 0
+ORDER BY 2, 1
+"""
+
+def verify_against_sql(tables, book, as_of):
+    """Run the CROSS JOIN formulation in DuckDB on the same tables and compare the shared columns"""
+    import duckdb
+    con = duckdb.connect()
+    loans = tables['loans'][tables['loans']['disbursementdate'].notna()]
+    if 'processing_fee' not in loans:
+        loans = loans.assign(processing_fee=0.0)
+    con.register('loans', loans)
+    con.register('loantransaction', tables['transactions'])
+    as_of = pd.Timestamp(as_of).date()
+    expected = con.execute(REFERENCE_SQL, [as_of, as_of]).df()
+    con.close()
+
+    columns = ['report_month', 'loan_id', 'principal_balance', 'total_balance', 'total_repayments',
+               'outstanding_interest', 'total_outstanding_balance']
+    actual = book[columns].sort_values(['loan_id', 'report_month']).reset_index(drop=True)
+    expected['report_month'] = pd.to_datetime(expected['report_month']).astype(actual['report_month'].dtype)
+    try:
+        pd.testing.assert_frame_equal(actual, expected[columns].reset_index(drop=True), check_dtype=False)
+    except AssertionError as error:
+        print(f"Verification FAILED against the SQL formulation:\n{error}")
+        return False
+    print(f"Verification passed: {len(actual)} loan-months match the SQL formulation")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Month-end loan book from local loan and transaction tables")
+    parser.add_argument('data', help="Directory of Parquet files or a DuckDB database")
+    parser.add_argument('--as-of', default=None, help="Last date of the month spine (default: today)")
+    parser.add_argument('--output', default='loan_book_month_end.csv')
+    parser.add_argument('--verify', action='store_true', help="Compare with the CROSS JOIN SQL run in DuckDB")
+    args = parser.parse_args()
+
+    tables = load_tables(args.data)
+    print(f"Loans: {len(tables['loans'])}, transactions: {len(tables['transactions'])}")
+
+    start = pd.Timestamp.now()
+    book = month_end_loan_book(tables['loans'], tables['transactions'], tables['repayments'], args.as_of)
+    elapsed = (pd.Timestamp.now() - start).total_seconds()
+    print(f"Month-end loan book: {len(book)} loan-months across {book['report_month'].nunique()} months ({elapsed:.2f}s)")
+
+    book.to_csv(args.output, index=False)
+    print(f"Saved to: {args.output}")
+
+    if args.verify:
+        verify_against_sql(tables, book, args.as_of or pd.Timestamp.today())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from loan_balance_index import LoanBalanceIndex
+from loan_book_engine import RUNNING_SUMS
+from test_loan_book_engine import fixture_tables
+
+# Month ends, days between transactions, a day with several transactions, and dates outside the
+# 1791-2149 range the (loan, day) keys clip to
+DATES = ['1700-01-01', '1791-01-01', '2025-01-09', '2025-01-10', '2025-02-15', '2025-02-20', '2025-03-31',
+         '2149-12-31', '2200-06-30']
+
+def expected_balances(tables, loan_ids, as_of):
+    """The balances by a direct filter: each loan's transactions up to the day, latest by transactionid"""
+    loans = tables['loans'].set_index('loan_id')
+    rows = []
+    for loan_id in loan_ids:
+        tx = tables['transactions']
+        tx = tx[(tx['parentaccountkey'] == loans.loc[loan_id, 'loan_key'])
+                & (tx['entrydate'].dt.normalize() <= pd.Timestamp(as_of))]
+        if tx.empty:
+            rows.append({'loan_id': loan_id})
+            continue
+        latest = tx.sort_values('transactionid').iloc[-1]
+        paid = {name: tx.loc[tx['type'].isin(types), 'amount'].sum() for name, types in RUNNING_SUMS.items()}
+        rows.append({
+            'loan_id': loan_id,
+            'principal_balance': latest['principalbalance'],
+            'outstanding_fees': np.nan_to_num(loans.loc[loan_id, 'processing_fee']) - paid['fees_paid'],
+            'outstanding_interest': paid['interest_accrued'] - paid['interest_paid'],
+            'outstanding_penalties': paid['penalty_accrued'] - paid['penalty_paid'],
+            'total_balance': latest['balance'],
+            'total_repayments': paid['repayments'],
+        })
+    return pd.DataFrame(rows).reindex(columns=['loan_id', 'principal_balance', 'outstanding_fees', 'outstanding_interest',
+                                               'outstanding_penalties', 'total_balance', 'total_repayments'])
+
+def test_balances_match_a_direct_filter_at_every_date(tmp_path):
+    tables = fixture_tables()
+    index = LoanBalanceIndex.build(tables['loans'], tables['transactions'])
+    index.save(str(tmp_path))
+    loan_ids = ['L3', 'L1', 'L2']
+    for loaded in (index, LoanBalanceIndex.load(str(tmp_path))):
+        for as_of in DATES:
+            balances = loaded.balances_at(loan_ids, as_of)
+            assert (balances['as_of_date'] == pd.Timestamp(as_of)).all()
+            pd.testing.assert_frame_equal(balances.drop(columns=['as_of_date']),
+                                          expected_balances(tables, loan_ids, as_of), check_dtype=False)
+
+def test_one_date_per_loan():
+    tables = fixture_tables()
+    index = LoanBalanceIndex.build(tables['loans'], tables['transactions'])
+    balances = index.balances_at(['L1', 'L1', 'L3'], ['2025-01-31', '2200-06-30', '1700-01-01'])
+    assert balances['total_balance'].tolist()[:2] == [103.0, 0.0] and np.isnan(balances['total_balance'].iloc[2])
@@ -0,0 +1,59 @@
+import pandas as pd
+
+from loan_book_engine import month_end_loan_book, verify_against_sql
+
+AS_OF = '2025-04-30'
+
+def fixture_tables():
+    """Three loans: one repaid in March, one only covered by interest, one still open"""
+    loans = pd.DataFrame({
+        'loan_id': ['L1', 'L2', 'L3'],
+        'loan_key': ['K1', 'K2', 'K3'],
+        'client_id': [1, 2, 3],
+        'disbursementdate': pd.to_datetime(['2025-01-10', '2025-01-20', '2025-02-05']),
+        'disbursed_amount': [100.0, 50.0, 80.0],
+        'processing_fee': [5.0, 0.0, None],
+    })
+    rows = [
+        ('K1', 1, '2025-01-10', 'DISBURSEMENT', 100.0, 100.0, 100.0),
+        ('K1', 2, '2025-01-31', 'INTEREST_ACCRUAL', 3.0, 100.0, 103.0),
+        ('K1', 3, '2025-02-15', 'REPAYMENT', 60.0, 43.0, 43.0),
+        ('K1', 4, '2025-02-15', 'FEE_PAYMENT', 5.0, 43.0, 43.0),
+        ('K1', 5, '2025-03-10', 'REPAYMENT', 43.0, 0.0, 0.0),
+        # Positive balance but the fee and interest credits leave nothing outstanding
+        ('K2', 6, '2025-01-20', 'DISBURSEMENT', 50.0, 50.0, 50.0),
+        ('K2', 7, '2025-02-01', 'INTEREST_PAYMENT', 50.0, 0.0, 10.0),
+        ('K3', 8, '2025-02-05', 'DISBURSEMENT', 80.0, 80.0, 80.0),
+        ('K3', 9, '2025-03-31', 'PENALTY_ACCRUAL', 2.0, 80.0, 82.0),
+        ('K3', 10, '2025-04-02', 'PENALTY_PAYMENT', 2.0, 80.0, 80.0),
+    ]
+    transactions = pd.DataFrame(rows, columns=['parentaccountkey', 'transactionid', 'entrydate', 'type',
+                                               'amount', 'principalbalance', 'balance'])
+    transactions['entrydate'] = pd.to_datetime(transactions['entrydate'])
+    return {'loans': loans, 'transactions': transactions, 'repayments': None}
+
+def test_engine_matches_the_sql_formulation():
+    tables = fixture_tables()
+    book = month_end_loan_book(tables['loans'], tables['transactions'], as_of=AS_OF)
+    assert verify_against_sql(tables, book, AS_OF)
+
+def test_loan_months_with_nothing_outstanding_are_dropped():
+    tables = fixture_tables()
+    book = month_end_loan_book(tables['loans'], tables['transactions'], as_of=AS_OF)
+    assert (book['total_outstanding_balance'] > 0).all()
+    months = book.groupby('loan_id')['report_month'].apply(lambda m: [str(d.date()) for d in m]).to_dict()
+    assert months == {
+        'L1': ['2025-01-31', '2025-02-28'],
+        'L2': ['2025-01-31'],
+        'L3': ['2025-02-28', '2025-03-31', '2025-04-30'],
+    }
+
+def test_far_future_as_of_stays_within_each_loan():
+    tables = fixture_tables()
+    book = month_end_loan_book(tables['loans'], tables['transactions'], as_of='9999-12-31')
+    last = book.groupby('loan_id')['report_month'].max()
+    assert sorted(last.index) == ['L1', 'L2', 'L3']
+    assert str(last['L2'].date()) == '2025-01-31'
+    assert str(last['L3'].date()) == '9999-12-31'
+    l3 = book[book['loan_id'] == 'L3']
+    assert (l3.loc[l3['report_month'] >= '2025-04-30', 'total_balance'] == 80.0).all()
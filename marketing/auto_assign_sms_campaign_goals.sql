@@ -95,10 +95,10 @@ user_pipeline_steps AS (
         SELECT DISTINCT 
             USER_IDENTITY,
             MIN(timestamp) as timestamp
-        FROM GHANA_PROD.DATA.BACKEND_NOTIFICATIONS 
+        FROM GHANA_PROD.DATA.BACKEND_EVENTS 
         WHERE TYPE = 'BE_KYC_VERIFICATION_RESULT'
-            AND parse_json(payload):status = 'succeeded'
-            AND parse_json(payload):is_duplicate = false
+            AND status = 'succeeded'
+            AND is_duplicate = false
         GROUP BY USER_IDENTITY
     ) kyc ON kyc.USER_IDENTITY = swu.user_id 
         AND kyc.timestamp <= swu.sent_at
@@ -178,7 +178,7 @@ user_pipeline_steps AS (
         SELECT DISTINCT 
             USER_IDENTITY,
             MIN(timestamp) as timestamp
-        FROM GHANA_PROD.DATA.BACKEND_NOTIFICATIONS
+        FROM GHANA_PROD.DATA.BACKEND_EVENTS
         WHERE TYPE = 'BE_FIDOBIZ_SURVEY_SUBMISSION'
         GROUP BY USER_IDENTITY
     ) kyb ON kyb.USER_IDENTITY = swu.user_id
@@ -189,9 +189,9 @@ user_pipeline_steps AS (
         SELECT DISTINCT 
             USER_IDENTITY,
             MIN(timestamp) as timestamp
-        FROM GHANA_PROD.DATA.BACKEND_NOTIFICATIONS
+        FROM GHANA_PROD.DATA.BACKEND_EVENTS
         WHERE TYPE = 'BE_FIDOBIZ_SCORE_DOCUMENT_STATUS_EVENT'
-            AND parse_json(payload):updated_status::string = 'IN_REVIEW'
+            AND updated_status = 'IN_REVIEW'
         GROUP BY USER_IDENTITY
     ) biz_doc ON biz_doc.USER_IDENTITY = swu.user_id
         AND biz_doc.timestamp <= swu.sent_at
@@ -62,23 +62,23 @@ total_unique_disbursements_ln0 AS (
 kyc_verified AS (  
 select date_, count(*) as KYC_VERIFIED
     from (
-    SELECT DISTINCT to_char(date_trunc('{{Scale}}',date(TIMESTAMP)),'YYYY-MM-DD') as date_, USER_IDENTITY
-    		FROM GHANA_PROD.DATA.BACKEND_NOTIFICATIONS WHERE TYPE='BE_KYC_VERIFICATION_RESULT'
-            AND parse_json(payload):status = 'succeeded'
-            AND parse_json(payload):is_duplicate = false
-            AND date(TIMESTAMP) BETWEEN '{{ Range.start }}' and '{{ Range.end }}'
+    SELECT DISTINCT to_char(date_trunc('{{Scale}}',event_date),'YYYY-MM-DD') as date_, USER_IDENTITY
+    		FROM GHANA_PROD.DATA.BACKEND_EVENTS WHERE TYPE='BE_KYC_VERIFICATION_RESULT'
+            AND status = 'succeeded'
+            AND is_duplicate = false
+            AND event_date BETWEEN '{{ Range.start }}' and '{{ Range.end }}'
     	)
     group by date_
     order by date_
 ),
 Duplicat_Users_Ratio as (
-    SELECT  to_char(date_trunc('{{Scale}}',date(TIMESTAMP)),'YYYY-MM-DD') as date_,
-            count(DISTINCT(case when parse_json(payload):is_duplicate = true then USER_IDENTITY end )) duplicate_users,
+    SELECT  to_char(date_trunc('{{Scale}}',event_date),'YYYY-MM-DD') as date_,
+            count(DISTINCT(case when is_duplicate = true then USER_IDENTITY end )) duplicate_users,
             count(DISTINCT USER_IDENTITY) all_kyc,
             duplicate_users/all_kyc Duplicat_Users_Ratio
-    		FROM GHANA_PROD.DATA.BACKEND_NOTIFICATIONS WHERE TYPE='BE_KYC_VERIFICATION_RESULT'
-            AND parse_json(payload):status = 'succeeded'
-            AND date(TIMESTAMP) BETWEEN '{{ Range.start }}' and '{{ Range.end }}'
+    		FROM GHANA_PROD.DATA.BACKEND_EVENTS WHERE TYPE='BE_KYC_VERIFICATION_RESULT'
+            AND status = 'succeeded'
+            AND event_date BETWEEN '{{ Range.start }}' and '{{ Range.end }}'
     group by date_
     order by date_
 ),
@@ -361,7 +361,7 @@ and new_ln = 0
 group by 1 )   
 
 ,kyb as 
-(select to_char(date_trunc('{{Scale}}',timestamp::date),'YYYY-MM-DD') date_,
+(select to_char(date_trunc('{{Scale}}',event_date),'YYYY-MM-DD') date_,
 count(distinct USER_IDENTITY) as KYB_submitted 
 from (
 select *,
@@ -369,8 +369,8 @@ case when (disbursementdate is null or ln=0 ) then 'New'
 when ln between 1 and 3 then 'Migrated-New'
 when ln>3 then 'Migrated-Old' end as Client_Type_1 
 from (
-select *,parse_json(payload):application_info:application_version::string as app_version 
-from DATA.BACKEND_NOTIFICATIONS where type ='BE_FIDOBIZ_SURVEY_SUBMISSION'
+select *,application_version as app_version 
+from DATA.BACKEND_EVENTS where type ='BE_FIDOBIZ_SURVEY_SUBMISSION'
 qualify row_number () over (partition by USER_IDENTITY order by timestamp)=1 ) app 
 LEFT JOIN BANKING_SERVICE.USER_BANK_USER s ON app.USER_IDENTITY =s.USER_ID 
 LEFT JOIN (
@@ -378,12 +378,12 @@ SELECT client_id , disbursementdate, LN FROM GHANA_PROD.ml.LOAN_INFO_TBL ml WHER
 AND ml.LOAN_PRODUCT_ID not LIKE '%UCBLL%'
 QUALIFY ROW_NUMBER () over (PARTITION BY CLIENT_ID ORDER BY DISBURSEMENTDATE desc)=1 ) ml 
 ON ml.CLIENT_ID =s.BANKING_PLATFORM_ID 
-where date(app.timestamp) between '{{ Range.start }}' and '{{ Range.end }}')
+where app.event_date between '{{ Range.start }}' and '{{ Range.end }}')
 where Client_Type_1 IN ('New')
 group by 1)
  
 ,biz_doc as 
-(select to_char(date_trunc('{{Scale}}',timestamp::date),'YYYY-MM-DD') date_,
+(select to_char(date_trunc('{{Scale}}',event_date),'YYYY-MM-DD') date_,
 count(distinct USER_IDENTITY) as biz_doc 
 from (
 select *,
@@ -391,8 +391,8 @@ case when (disbursementdate is null or ln=0 ) then 'New'
 when ln between 1 and 3 then 'Migrated-New'
 when ln>3 then 'Migrated-Old' end as Client_Type_1 
 from (
-select *,parse_json(payload):updated_status::string as doc_status 
-from DATA.BACKEND_NOTIFICATIONS where type ='BE_FIDOBIZ_SCORE_DOCUMENT_STATUS_EVENT'
+select *,updated_status as doc_status 
+from DATA.BACKEND_EVENTS where type ='BE_FIDOBIZ_SCORE_DOCUMENT_STATUS_EVENT'
 and doc_status='IN_REVIEW'
 qualify row_number () over (partition by USER_IDENTITY order by timestamp)=1 ) app 
 LEFT JOIN BANKING_SERVICE.USER_BANK_USER s ON app.USER_IDENTITY =s.USER_ID 
@@ -401,7 +401,7 @@ SELECT client_id , disbursementdate, LN FROM GHANA_PROD.ml.LOAN_INFO_TBL ml WHER
 AND ml.LOAN_PRODUCT_ID not LIKE '%UCBLL%'
 QUALIFY ROW_NUMBER () over (PARTITION BY CLIENT_ID ORDER BY DISBURSEMENTDATE desc)=1 ) ml 
 ON ml.CLIENT_ID =s.BANKING_PLATFORM_ID 
-where date(app.timestamp) between '{{ Range.start }}' and '{{ Range.end }}')
+where app.event_date between '{{ Range.start }}' and '{{ Range.end }}')
 where Client_Type_1 IN ('New')
 group by 1)
 
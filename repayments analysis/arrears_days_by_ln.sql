@@ -2,12 +2,12 @@ WITH relevant_notifications AS (
     SELECT 
         timestamp,
         "TYPE",
-        PARSE_JSON(PAYLOAD):user_id::string as user_id,
-        PARSE_JSON(PAYLOAD):client_id::string as client_id,
-        PARSE_JSON(PAYLOAD):status::string as status
-    FROM data.backend_notifications
+        user_id,
+        client_id,
+        status
+    FROM data.backend_events
     WHERE ("TYPE" = 'BE_AUTHENTICATION_PHONE_VERIFICATION_2' OR "TYPE" = 'BE_LOAN_REPAYMENT_RESULT')
-    AND TO_TIMESTAMP_NTZ(timestamp) >= '2024-01-01'
+    AND event_date >= '2024-01-01'
 ),
 
 base_loans AS (
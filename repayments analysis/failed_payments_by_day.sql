@@ -2,18 +2,18 @@ WITH relevant_notifications AS (
     SELECT 
         timestamp,
         "TYPE",
-        PARSE_JSON(PAYLOAD):user_id::string as user_id,
-        PARSE_JSON(PAYLOAD):client_id::string as client_id,
-        PARSE_JSON(PAYLOAD):status::string as status
-    FROM data.backend_notifications
+        user_id,
+        client_id,
+        status
+    FROM data.backend_events
     WHERE ("TYPE" = 'BE_AUTHENTICATION_PHONE_VERIFICATION_2' OR "TYPE" = 'BE_LOAN_REPAYMENT_RESULT')
-    AND TO_TIMESTAMP_NTZ(timestamp) >= '2024-01-01'
+    AND event_date >= '2024-01-01'
 ),
 
 daily_payment_attempts AS (
     SELECT 
-        DATE(TO_TIMESTAMP_NTZ(timestamp)) as attempt_date,
-        DAYOFMONTH(TO_TIMESTAMP_NTZ(timestamp)) as day_of_month,
+        DATE(timestamp) as attempt_date,
+        DAYOFMONTH(timestamp) as day_of_month,
         "TYPE",
         status,
         COUNT(*) as attempt_count
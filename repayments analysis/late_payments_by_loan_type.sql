@@ -2,12 +2,12 @@ WITH relevant_notifications AS (
     SELECT 
         timestamp,
         "TYPE",
-        PARSE_JSON(PAYLOAD):user_id::string as user_id,
-        PARSE_JSON(PAYLOAD):client_id::string as client_id,
-        PARSE_JSON(PAYLOAD):status::string as status
-    FROM data.backend_notifications
+        user_id,
+        client_id,
+        status
+    FROM data.backend_events
     WHERE ("TYPE" = 'BE_AUTHENTICATION_PHONE_VERIFICATION_2' OR "TYPE" = 'BE_LOAN_REPAYMENT_RESULT')
-    AND TO_TIMESTAMP_NTZ(timestamp) >= '2024-01-01'
+    AND event_date >= '2024-01-01'
 ),
 
 base_loans AS (
@@ -61,7 +61,7 @@ base_late_payments AS (
 login_activity AS (
     SELECT DISTINCT
         bu.banking_platform_id as client_id,
-        DATE(TO_TIMESTAMP_NTZ(rn.timestamp)) as activity_date
+        DATE(rn.timestamp) as activity_date
     FROM relevant_notifications rn
     JOIN banking_service.user bu ON rn.user_id = bu.id
     WHERE rn."TYPE" = 'BE_AUTHENTICATION_PHONE_VERIFICATION_2'
@@ -69,14 +69,14 @@ login_activity AS (
         SELECT 1 
         FROM base_late_payments blp 
         WHERE blp.client_id = bu.banking_platform_id
-        AND DATE(blp.transaction_date) = DATE(TO_TIMESTAMP_NTZ(rn.timestamp))
+        AND DATE(blp.transaction_date) = DATE(rn.timestamp)
     )
 ),
 
 failed_payments AS (
     SELECT DISTINCT
         rn.client_id,
-        DATE(TO_TIMESTAMP_NTZ(rn.timestamp)) as activity_date
+        DATE(rn.timestamp) as activity_date
     FROM relevant_notifications rn
     WHERE rn."TYPE" = 'BE_LOAN_REPAYMENT_RESULT'
     AND rn.status != 'succeeded'
@@ -84,7 +84,7 @@ failed_payments AS (
         SELECT 1 
         FROM base_late_payments blp 
         WHERE blp.client_id = rn.client_id
-        AND DATE(blp.transaction_date) = DATE(TO_TIMESTAMP_NTZ(rn.timestamp))
+        AND DATE(blp.transaction_date) = DATE(rn.timestamp)
     )
 ),
 
@@ -40,19 +40,19 @@ login_activity AS (
         client_id,
         DATE_TRUNC('month', created_at) as activity_month,
         'login' as activity_type
-    FROM data.backend_notifications
+    FROM data.backend_events
     WHERE "TYPE" = 'BE_AUTHENTICATION_PHONE_VERIFICATION_2'
     AND IDENTITY_TYPE = 'USER_ID'
 ),
 
 failed_payments AS (
     SELECT 
-        PARSE_JSON(PAYLOAD):client_id::string as client_id,
+        client_id,
         DATE_TRUNC('month', created_at) as activity_month,
         'failed_payment' as activity_type
-    FROM data.backend_notifications
+    FROM data.backend_events
     WHERE "TYPE" = 'BE_LOAN_REPAYMENT_RESULT'
-    AND PARSE_JSON(PAYLOAD):status::string != 'succeeded'
+    AND status != 'succeeded'
 ),
 
 combined_activity AS (
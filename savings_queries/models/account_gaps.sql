@@ -0,0 +1,11 @@
+-- Days between a client's consecutive savings accounts; account_rank 1 is the most recent account
+SELECT
+    client_id,
+    account_id,
+    creation_date,
+    closeddate,
+    account_key,
+    LAG(creation_date) OVER (PARTITION BY client_id ORDER BY creation_date) as previous_creation_date,
+    DATEDIFF('day', LAG(creation_date) OVER (PARTITION BY client_id ORDER BY creation_date), creation_date) as days_since_previous_account,
+    ROW_NUMBER() OVER (PARTITION BY client_id ORDER BY creation_date DESC) as account_rank
+FROM {{ ref('base_savings_data') }}
@@ -0,0 +1,22 @@
+-- Regular savings accounts opened between the savings launch and the as-of date, test clients excluded
+SELECT DISTINCT
+    cl.id as client_id,
+    cl.encodedkey as client_key,
+    sa.id as account_id,
+    sa.encodedkey as account_key,
+    sa.creationdate as creation_date,
+    sa.closeddate,
+    sa.accountstate,
+    sa.balance,
+    cl.birthdate,
+    DATEDIFF('year', cl.birthdate, ri.as_of_date) as age
+FROM GHANA_PROD.MAMBU.SAVINGSACCOUNT sa
+LEFT JOIN GHANA_PROD.MAMBU.CLIENT cl on cl.ENCODEDKEY = sa.ACCOUNTHOLDERKEY
+JOIN {{ ref('refresh_info') }} ri
+    ON CAST(sa.creationdate AS DATE) BETWEEN ri.savings_start_date AND ri.as_of_date
+LEFT JOIN {{ ref('test_phone_numbers') }} test1 on test1.phone_number = cl.MOBILEPHONE1
+LEFT JOIN {{ ref('test_phone_numbers') }} test2 on test2.phone_number = cl.MOBILEPHONE2
+WHERE sa.ACCOUNTTYPE = 'REGULAR_SAVINGS'
+AND sa.accountstate != 'WITHDRAWN'
+AND test1.phone_number IS NULL
+AND test2.phone_number IS NULL
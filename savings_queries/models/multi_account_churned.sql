@@ -0,0 +1,8 @@
+-- Clients who reopened an account more than 25 days after their previous one
+SELECT
+    client_id,
+    MAX(days_since_previous_account) as max_gap_days
+FROM {{ ref('account_gaps') }}
+WHERE days_since_previous_account IS NOT NULL
+GROUP BY client_id
+HAVING MAX(days_since_previous_account) > 25
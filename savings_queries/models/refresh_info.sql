@@ -0,0 +1,5 @@
+-- As-of date and window the savings models were built for; reports read their as-of date from here
+SELECT
+    CAST('{{as_of}}' AS DATE) as as_of_date,
+    CAST('{{savings_start_date}}' AS DATE) as savings_start_date,
+    CURRENT_TIMESTAMP as built_at
@@ -0,0 +1,37 @@
+-- Deposits, withdrawals and adjustments on the modelled accounts up to the as-of date: the one scan of
+-- SAVINGSTRANSACTION (and of the transaction channel custom fields) per refresh
+WITH transaction_fields AS (
+    SELECT
+        cv.PARENTKEY as transaction_key,
+        MAX(CASE WHEN cf.id = 'ACCOUNT_NUMBER_TRANSACTION_CHANN' THEN cv.value END) as wallet_id,
+        MAX(CASE WHEN cf.id = 'NETWORK_TRANSACTION_CHANNEL' THEN cv.value END) as network,
+        MAX(CASE WHEN cf.id = 'IDENTIFIER_TRANSACTION_CHANNEL_I' THEN cv.value END) as identifier,
+        MAX(CASE WHEN cf.id = 'INTERNAL_ID' THEN cv.value END) as momo_id
+    FROM GHANA_PROD.MAMBU.CUSTOMFIELDVALUE cv
+    JOIN GHANA_PROD.MAMBU.CUSTOMFIELD cf ON cf.encodedkey = cv.CUSTOMFIELDKEY
+    WHERE cf.id IN ('ACCOUNT_NUMBER_TRANSACTION_CHANN', 'NETWORK_TRANSACTION_CHANNEL', 'IDENTIFIER_TRANSACTION_CHANNEL_I', 'INTERNAL_ID')
+    GROUP BY cv.PARENTKEY
+)
+SELECT
+    st.ENCODEDKEY as transaction_key,
+    st.TRANSACTIONID as transaction_id,
+    st.PARENTACCOUNTKEY as account_key,
+    bsd.client_id,
+    bsd.account_id,
+    st.creationdate as transaction_date,
+    st.ENTRYDATE as entry_date,
+    st."type" as transaction_type,
+    st.amount,
+    st.balance,
+    tf.wallet_id,
+    tf.network,
+    tf.identifier,
+    tf.momo_id
+FROM GHANA_PROD.MAMBU.SAVINGSTRANSACTION st
+JOIN {{ ref('base_savings_data') }} bsd ON bsd.account_key = st.PARENTACCOUNTKEY
+CROSS JOIN {{ ref('refresh_info') }} ri
+LEFT JOIN transaction_fields tf ON tf.transaction_key = st.ENCODEDKEY
+LEFT JOIN {{ ref('test_phone_numbers') }} test_wallet ON test_wallet.phone_number = tf.wallet_id
+WHERE st."type" IN ('DEPOSIT', 'WITHDRAWAL', 'WITHDRAWAL_ADJUSTMENT', 'ADJUSTMENT')
+AND CAST(st.creationdate AS DATE) <= ri.as_of_date
+AND test_wallet.phone_number IS NULL
@@ -0,0 +1,9 @@
+-- Internal test phones / wallets excluded from every savings report
+SELECT phone_number
+FROM (VALUES
+    ('233552602681'),
+    ('233243630046'),
+    ('233245822584'),
+    ('23346722591'),
+    ('233257806345')
+) AS test_phones(phone_number)
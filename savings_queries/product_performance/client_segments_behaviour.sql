@@ -1,32 +1,11 @@
 WITH base_savings_data AS (
-    SELECT DISTINCT
-        cl.id as client_id, 
-        sa.id as account_id,
-        sa.creationdate as creation_date,
-        sa.closeddate,
-        sa.accountstate,
-        sa.encodedkey as account_key,
-        cl.birthdate,
-        DATEDIFF('year', cl.birthdate, current_date) as age
-    FROM GHANA_PROD.MAMBU.SAVINGSACCOUNT sa
-    LEFT JOIN MAMBU.CLIENT cl on cl.ENCODEDKEY = sa.ACCOUNTHOLDERKEY
-    WHERE sa.ACCOUNTTYPE = 'REGULAR_SAVINGS'
-    AND (cl.MOBILEPHONE1 not in ('233552602681', '233243630046', '233245822584' , '23346722591', '233257806345') or cl.MOBILEPHONE1 is null)
-    AND (cl.MOBILEPHONE2 not in ('233552602681', '233243630046', '233245822584' , '23346722591', '233257806345') or cl.MOBILEPHONE2 is null) 
-    AND date(sa.creationdate) >= date('2025-04-03')
-    AND date(sa.creationdate) between '2025-04-03' and '2025-10-15'
+    SELECT * FROM GHANA_PROD.SAVINGS_MODELS.BASE_SAVINGS_DATA
 ),
 
 transaction_data AS (
-    SELECT 
-        st.parentaccountkey as account_key,
-        st.creationdate as transaction_date,
-        st.amount,
-        st."type" as transaction_type,
-        st.balance
-    FROM GHANA_PROD.MAMBU.SAVINGSTRANSACTION st
-    WHERE st."type" IN ('WITHDRAWAL', 'DEPOSIT')
-    AND date(st.creationdate) BETWEEN date('2025-04-03') and date('2025-10-15')
+    SELECT account_key, transaction_date, amount, transaction_type, balance
+    FROM GHANA_PROD.SAVINGS_MODELS.SAVINGS_TRANSACTIONS
+    WHERE transaction_type IN ('WITHDRAWAL', 'DEPOSIT')
 ),
 
 client_summary AS (
@@ -1,27 +1,24 @@
 -- Comprehensive analysis of client retention patterns and savings behavior
 -- Examines relationship between prior Fido app engagement and savings performance
 
-WITH base_savings_clients AS (
-    SELECT 
-        cl.id as client_id,
-        MIN(cl.encodedkey) as client_key,  -- Take any client_key for the client
-        MIN(sa.creationdate) as first_savings_date,
-        MAX(sa.creationdate) as last_savings_date,
-        COUNT(DISTINCT sa.id) as total_savings_accounts,
-        SUM(CASE WHEN st."type" = 'DEPOSIT' THEN st.amount ELSE 0 END) as total_deposits,
-        SUM(CASE WHEN st."type" = 'WITHDRAWAL' THEN st.amount ELSE 0 END) as total_withdrawals,
-        MAX(sa.balance) as current_balance,
-        MAX(sa.closeddate) as last_account_closure
-    FROM GHANA_PROD.MAMBU.SAVINGSACCOUNT sa
-    LEFT JOIN MAMBU.CLIENT cl on cl.ENCODEDKEY = sa.ACCOUNTHOLDERKEY
-    LEFT JOIN GHANA_PROD.MAMBU.SAVINGSTRANSACTION st ON st.PARENTACCOUNTKEY = sa.ENCODEDKEY
-    WHERE sa.ACCOUNTTYPE = 'REGULAR_SAVINGS'
-    AND (cl.MOBILEPHONE1 not in ('233552602681', '233243630046', '233245822584' , '23346722591', '233257806345') or cl.MOBILEPHONE1 is null)
-    AND (cl.MOBILEPHONE2 not in ('233552602681', '233243630046', '233245822584' , '23346722591', '233257806345') or cl.MOBILEPHONE2 is null) 
-    AND date(sa.creationdate) >= date('2025-04-03')
-    AND date(sa.creationdate) between '2025-04-03' and '2025-09-30'
-    AND 'ACCOUNTSTATE' != 'WITHDRAWN'
-    GROUP BY cl.id  -- Group only by client_id to ensure one row per client
+WITH refresh AS (
+    SELECT as_of_date FROM GHANA_PROD.SAVINGS_MODELS.REFRESH_INFO
+),
+
+base_savings_clients AS (
+    SELECT
+        bsd.client_id,
+        MIN(bsd.client_key) as client_key,
+        MIN(bsd.creation_date) as first_savings_date,
+        MAX(bsd.creation_date) as last_savings_date,
+        COUNT(DISTINCT bsd.account_id) as total_savings_accounts,
+        SUM(CASE WHEN st.transaction_type = 'DEPOSIT' THEN st.amount ELSE 0 END) as total_deposits,
+        SUM(CASE WHEN st.transaction_type = 'WITHDRAWAL' THEN st.amount ELSE 0 END) as total_withdrawals,
+        MAX(bsd.balance) as current_balance,
+        MAX(bsd.closeddate) as last_account_closure
+    FROM GHANA_PROD.SAVINGS_MODELS.BASE_SAVINGS_DATA bsd
+    LEFT JOIN GHANA_PROD.SAVINGS_MODELS.SAVINGS_TRANSACTIONS st ON st.account_key = bsd.account_key
+    GROUP BY bsd.client_id
 ),
 
 -- Get loan history for clients
@@ -91,11 +88,11 @@ login_activity AS (
     FROM (
         SELECT DISTINCT
             bu.banking_platform_id as client_id,
-            DATE(bn.timestamp) as activity_date
-        FROM data.backend_notifications bn
+            bn.event_date as activity_date
+        FROM data.backend_events bn
         JOIN banking_service.user bu ON bn.user_identity = bu.id
         WHERE bn."TYPE" = 'BE_AUTHENTICATION_PHONE_VERIFICATION_2'
-        AND TO_TIMESTAMP_NTZ(bn.timestamp) >= '2025-01-01'
+        AND bn.event_date >= '2025-01-01'
     ) la
     JOIN base_savings_clients bsc ON la.client_id = bsc.client_id
     WHERE la.activity_date < bsc.first_savings_date
@@ -104,19 +101,10 @@ login_activity AS (
 
 -- Calculate account gaps for multi-account clients
 account_gaps_calc AS (
-    SELECT 
+    SELECT
         client_id,
-        MAX(days_between_accounts) as max_gap
-    FROM (
-        SELECT 
-            bsc.client_id,
-            DATEDIFF(day, LAG(sa.creationdate) OVER (PARTITION BY bsc.client_id ORDER BY sa.creationdate), sa.creationdate) as days_between_accounts
-        FROM base_savings_clients bsc
-        JOIN GHANA_PROD.MAMBU.SAVINGSACCOUNT sa ON sa.ACCOUNTHOLDERKEY = bsc.client_key
-        WHERE bsc.total_savings_accounts > 1
-    ) gaps
-    WHERE days_between_accounts IS NOT NULL
-    GROUP BY client_id
+        max_gap_days as max_gap
+    FROM GHANA_PROD.SAVINGS_MODELS.MULTI_ACCOUNT_CHURNED
 ),
 
 
@@ -127,7 +115,7 @@ comprehensive_analysis AS (
         -- Retention status
         CASE 
             WHEN bsc.last_account_closure IS NOT NULL 
-            AND DATEDIFF(day, bsc.last_account_closure, '2025-09-30') > 25 THEN 'churned'
+            AND DATEDIFF(day, bsc.last_account_closure, (SELECT as_of_date FROM refresh)) > 25 THEN 'churned'
             WHEN bsc.total_savings_accounts > 1 
             AND EXISTS (
                 SELECT 1 FROM account_gaps_calc agc
@@ -153,7 +141,7 @@ comprehensive_analysis AS (
         -- Calculate savings metrics
         CASE WHEN bsc.total_withdrawals > 0 THEN bsc.total_deposits / bsc.total_withdrawals ELSE NULL END as deposit_to_withdrawal_ratio,
         CASE WHEN bsc.total_savings_accounts > 0 THEN bsc.total_deposits / bsc.total_savings_accounts ELSE 0 END as avg_deposits_per_account,
-        DATEDIFF(day, bsc.first_savings_date, COALESCE(bsc.last_account_closure, '2025-09-30')) as savings_tenure_days
+        DATEDIFF(day, bsc.first_savings_date, COALESCE(bsc.last_account_closure, (SELECT as_of_date FROM refresh))) as savings_tenure_days
     FROM base_savings_clients bsc
     LEFT JOIN loan_history lh ON bsc.client_id = lh.client_id
     LEFT JOIN loan_gaps lg ON bsc.client_id = lg.client_id
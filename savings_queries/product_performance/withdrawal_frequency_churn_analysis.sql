@@ -1,45 +1,26 @@
 -- Analysis of withdrawal frequency patterns and churn behavior
 -- Helps justify the need for savings goals feature by showing if frequent withdrawal users churn more
 
-WITH base_savings_data AS (
-    SELECT DISTINCT
-        cl.id as client_id, 
-        cl.encodedkey as client_key,
-        sa.id as account_id,
-        sa.encodedkey as account_key,
-        sa.creationdate as creation_date,
-        sa.closeddate,
-        sa.accountstate,
-        sa.balance
-    FROM GHANA_PROD.MAMBU.SAVINGSACCOUNT sa
-    LEFT JOIN MAMBU.CLIENT cl on cl.ENCODEDKEY = sa.ACCOUNTHOLDERKEY
-    WHERE sa.ACCOUNTTYPE = 'REGULAR_SAVINGS'
-    AND (cl.MOBILEPHONE1 not in ('233552602681', '233243630046', '233245822584' , '23346722591', '233257806345') or cl.MOBILEPHONE1 is null)
-    AND (cl.MOBILEPHONE2 not in ('233552602681', '233243630046', '233245822584' , '23346722591', '233257806345') or cl.MOBILEPHONE2 is null) 
-    AND date(sa.creationdate) >= date('2025-04-03')
-    AND date(sa.creationdate) between '2025-04-03' and '2025-09-30'
+WITH refresh AS (
+    SELECT as_of_date FROM GHANA_PROD.SAVINGS_MODELS.REFRESH_INFO
+),
+
+base_savings_data AS (
+    SELECT * FROM GHANA_PROD.SAVINGS_MODELS.BASE_SAVINGS_DATA
 ),
 
 -- Get withdrawal transaction data
 withdrawal_transactions AS (
-    SELECT 
-        st.PARENTACCOUNTKEY as account_key,
-        st.ENTRYDATE as transaction_date,
-        st.amount as withdrawal_amount,
-        st."type" as transaction_type,
-        wallet_id.value as wallet_id,
-        wallet_network.value as network,
-        identifier.value as identifier
-    FROM GHANA_PROD.MAMBU.SAVINGSTRANSACTION st
-    LEFT JOIN GHANA_PROD.MAMBU.CUSTOMFIELDVALUE wallet_id ON st.ENCODEDKEY = wallet_id.PARENTKEY 
-        AND wallet_id.CUSTOMFIELDKEY = (SELECT encodedkey FROM GHANA_PROD.MAMBU.CUSTOMFIELD WHERE id = 'ACCOUNT_NUMBER_TRANSACTION_CHANN')
-    LEFT JOIN GHANA_PROD.MAMBU.CUSTOMFIELDVALUE wallet_network ON st.ENCODEDKEY = wallet_network.PARENTKEY 
-        AND wallet_network.CUSTOMFIELDKEY = (SELECT encodedkey FROM GHANA_PROD.MAMBU.CUSTOMFIELD WHERE id = 'NETWORK_TRANSACTION_CHANNEL')
-    LEFT JOIN GHANA_PROD.MAMBU.CUSTOMFIELDVALUE identifier ON st.ENCODEDKEY = identifier.PARENTKEY 
-        AND identifier.CUSTOMFIELDKEY = (SELECT encodedkey FROM GHANA_PROD.MAMBU.CUSTOMFIELD WHERE id = 'IDENTIFIER_TRANSACTION_CHANNEL_I')
-    WHERE st."type" IN ('WITHDRAWAL', 'WITHDRAWAL_ADJUSTMENT')
-    AND (wallet_id.value not in ('233552602681', '233243630046', '233245822584' , '23346722591', '233257806345') or wallet_id.value is null)
-    AND date(st.ENTRYDATE) >= '2025-04-03'
+    SELECT
+        account_key,
+        entry_date as transaction_date,
+        amount as withdrawal_amount,
+        transaction_type,
+        wallet_id,
+        network,
+        identifier
+    FROM GHANA_PROD.SAVINGS_MODELS.SAVINGS_TRANSACTIONS
+    WHERE transaction_type IN ('WITHDRAWAL', 'WITHDRAWAL_ADJUSTMENT')
 ),
 
 -- Calculate withdrawal patterns per client
@@ -81,7 +62,7 @@ withdrawal_patterns AS (
         -- Calculate withdrawal velocity (withdrawals in first 30 days)
         COUNT(CASE WHEN wt.transaction_date <= DATEADD(day, 30, first_savings_date) THEN 1 END) as withdrawals_first_30_days,
         -- Calculate withdrawal recency (days since last withdrawal)
-        DATEDIFF(day, MAX(wt.transaction_date), '2025-09-30') as days_since_last_withdrawal
+        DATEDIFF(day, MAX(wt.transaction_date), (SELECT as_of_date FROM refresh)) as days_since_last_withdrawal
     FROM base_savings_data bsd
     LEFT JOIN withdrawal_transactions wt ON bsd.account_key = wt.account_key
     GROUP BY bsd.client_id  -- Group only by client_id to ensure one row per client
@@ -111,7 +92,7 @@ client_retention AS (
         wp.*,
         CASE 
             WHEN wp.last_account_closure IS NOT NULL 
-            AND DATEDIFF(day, wp.last_account_closure, '2025-09-30') > 25 THEN 'churned'
+            AND DATEDIFF(day, wp.last_account_closure, (SELECT as_of_date FROM refresh)) > 25 THEN 'churned'
             WHEN wp.total_savings_accounts > 1 
             AND EXISTS (
                 SELECT 1 FROM account_gaps_calc agc
@@ -11,10 +11,10 @@ parse_json(INSTALL_DEVICES_IDS):kochava_device_id as kochava_device_id FROM KOCH
 left join kochava_data.cost_details_view c on  REGEXP_SUBSTR(s.ATTRIBUTION_CREATIVE, '\\d+') =c.creative_id)
 
 ,kyc_verified AS (  
-    SELECT distinct date(TIMESTAMP) as date_, USER_IDENTITY
-    		FROM ghana_prod.DATA.BACKEND_NOTIFICATIONS WHERE TYPE='BE_KYC_VERIFICATION_RESULT'
-            AND parse_json(payload):status = 'succeeded'
-            AND parse_json(payload):is_duplicate = false )
+    SELECT distinct event_date as date_, USER_IDENTITY
+    		FROM ghana_prod.DATA.BACKEND_EVENTS WHERE TYPE='BE_KYC_VERIFICATION_RESULT'
+            AND status = 'succeeded'
+            AND is_duplicate = false )
             
 ,cost_data AS (
 SELECT date_trunc('month',cost_date::date) as time ,network_partner_name, partner_campaign_name ,partner_campaign_id, sum(total_spend_USD) daily_cost FROM (
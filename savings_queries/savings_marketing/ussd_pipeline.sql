@@ -281,17 +281,17 @@ kyc_verified AS (
         COUNT(*) AS KYC_VERIFIED
     FROM (
         SELECT DISTINCT
-            TO_CHAR(DATE_TRUNC('{{Scale}}', DATE(TIMESTAMP)), 'YYYY-MM-DD') AS date_, -- Truncate timestamp
+            TO_CHAR(DATE_TRUNC('{{Scale}}', event_date), 'YYYY-MM-DD') AS date_, -- Truncate timestamp
             bn.USER_IDENTITY,
-            bn.*, -- Select all columns from backend_notifications
+            bn.*, -- Select all columns from backend_events
             source_name
-        FROM GHANA_PROD.DATA.BACKEND_NOTIFICATIONS bn
+        FROM GHANA_PROD.DATA.BACKEND_EVENTS bn
         JOIN ussd_data u ON u.id = bn.USER_IDENTITY -- Join with USSD signup data
         JOIN params p ON 1 = 1 -- Join with parameters CTE
         WHERE bn.TYPE = 'BE_KYC_VERIFICATION_RESULT' -- Filter for KYC verification results
-          AND PARSE_JSON(payload):status = 'succeeded' -- Filter for successful verifications
-          AND PARSE_JSON(payload):is_duplicate = false -- Exclude duplicate verifications
-          AND DATE(TIMESTAMP) BETWEEN p.start_date AND p.end_date
+          AND status = 'succeeded' -- Filter for successful verifications
+          AND is_duplicate = false -- Exclude duplicate verifications
+          AND event_date BETWEEN p.start_date AND p.end_date
     ) ml
     GROUP BY date_, source_name
     ORDER BY date_
@@ -300,21 +300,21 @@ kyc_verified AS (
 -- Calculate the ratio of duplicate KYC users by date and source name
 Duplicat_Users_Ratio AS (
     SELECT
-        TO_CHAR(DATE_TRUNC('{{Scale}}', DATE(TIMESTAMP)), 'YYYY-MM-DD') AS date_, -- Truncate timestamp
+        TO_CHAR(DATE_TRUNC('{{Scale}}', event_date), 'YYYY-MM-DD') AS date_, -- Truncate timestamp
         source_name,
-        COUNT(DISTINCT(CASE WHEN PARSE_JSON(payload):is_duplicate = true THEN USER_IDENTITY END)) duplicate_users, -- Count distinct duplicate users
+        COUNT(DISTINCT(CASE WHEN is_duplicate = true THEN USER_IDENTITY END)) duplicate_users, -- Count distinct duplicate users
         COUNT(DISTINCT USER_IDENTITY) all_kyc, -- Count all distinct KYC users
         duplicate_users / all_kyc Duplicat_Users_Ratio -- Calculate ratio
     FROM (
         SELECT
-            bn.*, -- Select all columns from backend_notifications
+            bn.*, -- Select all columns from backend_events
             source_name
-        FROM GHANA_PROD.DATA.BACKEND_NOTIFICATIONS bn
+        FROM GHANA_PROD.DATA.BACKEND_EVENTS bn
         JOIN ussd_data u ON u.id = bn.USER_IDENTITY -- Join with USSD signup data
         JOIN params p ON 1 = 1 -- Join with parameters CTE
         WHERE bn.TYPE = 'BE_KYC_VERIFICATION_RESULT' -- Filter for KYC verification results
-          AND PARSE_JSON(payload):status = 'succeeded' -- Filter for successful verifications
-          AND DATE(TIMESTAMP) BETWEEN p.start_date AND p.end_date
+          AND status = 'succeeded' -- Filter for successful verifications
+          AND event_date BETWEEN p.start_date AND p.end_date
     ) x
     GROUP BY date_, source_name
     ORDER BY date_
@@ -442,7 +442,7 @@ fidobiz AS (
 -- Count KYB (Know Your Business) submissions for new clients by date and source name
 kyb AS (
     SELECT
-        TO_CHAR(DATE_TRUNC('{{Scale}}', timestamp::DATE), 'YYYY-MM-DD') date_, -- Truncate timestamp
+        TO_CHAR(DATE_TRUNC('{{Scale}}', event_date), 'YYYY-MM-DD') date_, -- Truncate timestamp
         source_name,
         COUNT(DISTINCT USER_IDENTITY) AS KYB_submitted -- Count distinct users who submitted KYB
     FROM (
@@ -456,8 +456,8 @@ kyb AS (
         FROM (
             SELECT
                 bn.*,
-                PARSE_JSON(payload):application_info:application_version::STRING AS app_version -- Extract app version from payload
-            FROM GHANA_PROD.DATA.BACKEND_NOTIFICATIONS bn
+                application_version AS app_version -- App version, parsed from the payload at load time
+            FROM GHANA_PROD.DATA.BACKEND_EVENTS bn
             JOIN ussd_data u ON u.id = bn.USER_IDENTITY -- Join with USSD signup data
             WHERE TYPE = 'BE_FIDOBIZ_SURVEY_SUBMISSION' -- Filter for FidoBiz survey submissions
             QUALIFY ROW_NUMBER() OVER (PARTITION BY bn.USER_IDENTITY ORDER BY timestamp) = 1 -- Select the first submission per user
@@ -476,7 +476,7 @@ kyb AS (
             QUALIFY ROW_NUMBER() OVER (PARTITION BY ml.CLIENT_ID ORDER BY DISBURSEMENTDATE DESC) = 1 -- Select the latest non-FidoBiz disbursement per client
         ) ml ON ml.CLIENT_ID = s.BANKING_PLATFORM_ID -- Join with loan info
         JOIN params p ON 1 = 1 -- Join with parameters CTE
-        WHERE DATE(app.timestamp) BETWEEN p.start_date AND p.end_date
+        WHERE app.event_date BETWEEN p.start_date AND p.end_date
     )
     WHERE Client_Type_1 = 'New' -- Filter for New clients
     GROUP BY 1, 2
@@ -485,7 +485,7 @@ kyb AS (
 -- Count FidoBiz business document submissions in review for new clients by date and source name
 biz_doc AS (
     SELECT
-        TO_CHAR(DATE_TRUNC('{{Scale}}', timestamp::DATE), 'YYYY-MM-DD') date_, -- Truncate timestamp
+        TO_CHAR(DATE_TRUNC('{{Scale}}', event_date), 'YYYY-MM-DD') date_, -- Truncate timestamp
         source_name,
         COUNT(DISTINCT USER_IDENTITY) AS biz_doc -- Count distinct users with biz doc in review
     FROM (
@@ -499,9 +499,9 @@ biz_doc AS (
         FROM (
             SELECT
                 bn.*,
-                PARSE_JSON(payload):updated_status::STRING AS doc_status, -- Extract document status from payload
+                updated_status AS doc_status, -- Document status, parsed from the payload at load time
                 source_name
-            FROM GHANA_PROD.DATA.BACKEND_NOTIFICATIONS bn
+            FROM GHANA_PROD.DATA.BACKEND_EVENTS bn
             JOIN ussd_data u ON u.id = bn.USER_IDENTITY -- Join with USSD signup data
             WHERE TYPE = 'BE_FIDOBIZ_SCORE_DOCUMENT_STATUS_EVENT' -- Filter for FidoBiz document status events
               AND doc_status = 'IN_REVIEW' -- Filter for documents in review
@@ -519,7 +519,7 @@ biz_doc AS (
             QUALIFY ROW_NUMBER() OVER (PARTITION BY CLIENT_ID ORDER BY DISBURSEMENTDATE DESC) = 1 -- Select the latest non-FidoBiz disbursement per client
         ) ml ON ml.CLIENT_ID = s.BANKING_PLATFORM_ID -- Join with loan info
         JOIN params p ON 1 = 1 -- Join with parameters CTE
-        WHERE DATE(app.timestamp) BETWEEN p.start_date AND p.end_date
+        WHERE app.event_date BETWEEN p.start_date AND p.end_date
     )
     WHERE Client_Type_1 = 'New' -- Filter for New clients
     GROUP BY 1, 2
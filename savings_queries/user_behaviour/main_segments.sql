@@ -1,44 +1,17 @@
-WITH base_savings_data AS (
-    SELECT DISTINCT
-        cl.id as client_id, 
-        sa.id as account_id,
-        sa.creationdate as creation_date,
-        sa.closeddate,
-        sa.accountstate,
-        sa.encodedkey as account_key,
-        cl.birthdate,
-        DATEDIFF('year', cl.birthdate, current_date) as age
-    FROM GHANA_PROD.MAMBU.SAVINGSACCOUNT sa
-    LEFT JOIN MAMBU.CLIENT cl on cl.ENCODEDKEY = sa.ACCOUNTHOLDERKEY
-    WHERE sa.ACCOUNTTYPE = 'REGULAR_SAVINGS'
-    AND (cl.MOBILEPHONE1 not in ('233552602681', '233243630046', '233245822584' , '23346722591', '233257806345') or cl.MOBILEPHONE1 is null)
-    AND (cl.MOBILEPHONE2 not in ('233552602681', '233243630046', '233245822584' , '23346722591', '233257806345') or cl.MOBILEPHONE2 is null) 
-    AND sa.accountstate !='WITHDRAWN'
-    AND date(sa.creationdate) >= date('2025-04-03')
-    AND date(sa.creationdate) between '2025-04-03' and '2025-10-20'
+WITH refresh AS (
+    SELECT as_of_date FROM GHANA_PROD.SAVINGS_MODELS.REFRESH_INFO
+),
+
+base_savings_data AS (
+    SELECT * FROM GHANA_PROD.SAVINGS_MODELS.BASE_SAVINGS_DATA
 ),
 
 account_gaps AS (
-    SELECT 
-        client_id,
-        account_id,
-        creation_date,
-        closeddate,
-        account_key,
-        LAG(creation_date) OVER (PARTITION BY client_id ORDER BY creation_date) as previous_creation_date,
-        DATEDIFF(day, LAG(creation_date) OVER (PARTITION BY client_id ORDER BY creation_date), creation_date) as days_since_previous_account,
-        ROW_NUMBER() OVER (PARTITION BY client_id ORDER BY creation_date DESC) as account_rank
-    FROM base_savings_data
+    SELECT * FROM GHANA_PROD.SAVINGS_MODELS.ACCOUNT_GAPS
 ),
 
 multi_account_churned AS (
-    SELECT 
-        client_id,
-        MAX(days_since_previous_account) as max_gap_days
-    FROM account_gaps
-    WHERE days_since_previous_account IS NOT NULL
-    GROUP BY client_id
-    HAVING MAX(days_since_previous_account) > 25
+    SELECT * FROM GHANA_PROD.SAVINGS_MODELS.MULTI_ACCOUNT_CHURNED
 ),
 
 single_account_churned AS (
@@ -47,10 +20,10 @@ single_account_churned AS (
         account_id,
         creation_date,
         closeddate,
-        DATEDIFF(day, closeddate, '2025-10-20') as days_since_closed
+        DATEDIFF(day, closeddate, (SELECT as_of_date FROM refresh)) as days_since_closed
     FROM base_savings_data
     WHERE closeddate IS NOT NULL
-    AND DATEDIFF(day, closeddate, '2025-10-20') > 25
+    AND DATEDIFF(day, closeddate, (SELECT as_of_date FROM refresh)) > 25
     AND client_id NOT IN (SELECT client_id FROM multi_account_churned)
 ),
 
@@ -69,7 +42,7 @@ churn_status AS (
         END as is_churned,
         CASE 
             WHEN ag.closeddate IS NULL THEN TRUE  -- Most recent account still active
-            WHEN DATEDIFF(day, ag.closeddate, '2025-10-20') < 25 THEN TRUE  -- Most recent account closed < 25 days ago
+            WHEN DATEDIFF(day, ag.closeddate, (SELECT as_of_date FROM refresh)) < 25 THEN TRUE  -- Most recent account closed < 25 days ago
             ELSE FALSE  -- Most recent account closed >= 25 days ago
         END as is_returned,
         COALESCE(mac.max_gap_days, sac.days_since_closed) as churn_indicator_days,
@@ -85,15 +58,9 @@ churn_status AS (
 ),
 
 transaction_data AS (
-    SELECT 
-        st.parentaccountkey as account_key,
-        st.creationdate as transaction_date,
-        st.amount,
-        st."type" as transaction_type,
-        st.balance
-    FROM GHANA_PROD.MAMBU.SAVINGSTRANSACTION st
-    WHERE st."type" IN ('WITHDRAWAL', 'DEPOSIT')
-    AND date(st.creationdate) BETWEEN date('2025-04-03') and date('2025-10-20')
+    SELECT account_key, transaction_date, amount, transaction_type, balance
+    FROM GHANA_PROD.SAVINGS_MODELS.SAVINGS_TRANSACTIONS
+    WHERE transaction_type IN ('WITHDRAWAL', 'DEPOSIT')
 ),
 
 -- Get loan history for each client
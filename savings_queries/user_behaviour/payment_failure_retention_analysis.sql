@@ -1,7 +1,11 @@
 -- Analysis of payment failure rates and their impact on savings product retention
 -- Examines whether payment failures influence client churn behavior
 
-WITH savings_transactions_all AS (
+WITH refresh AS (
+    SELECT as_of_date FROM GHANA_PROD.SAVINGS_MODELS.REFRESH_INFO
+),
+
+savings_transactions_all AS (
     SELECT 
         ss.ID,
         ss.created_on AS date_and_time,
@@ -23,32 +27,18 @@ WITH savings_transactions_all AS (
 
 mambu_transactions AS (
     SELECT 
-        st.ENCODEDKEY as encodedkey,
-        st.ENTRYDATE as date_and_time,
-        c.id as client_id,
-        sa.id as account_id,
-        st.TRANSACTIONID as transactionid,
-        st."type" as transaction_type,
-        st.amount AS transaction_amount,
-        cv.value as momo_id,
+        transaction_key as encodedkey,
+        entry_date as date_and_time,
+        client_id,
+        account_id,
+        transaction_id as transactionid,
+        transaction_type,
+        amount AS transaction_amount,
+        momo_id,
         'SUCCESS' as transaction_status,
-        wallet_id.value as wallet_id,
+        wallet_id,
         'mambu' as source_table
-    FROM GHANA_PROD.MAMBU.SAVINGSTRANSACTION st
-    LEFT JOIN GHANA_PROD.MAMBU.SAVINGSACCOUNT sa ON st.PARENTACCOUNTKEY = sa.ENCODEDKEY
-    LEFT JOIN GHANA_PROD.MAMBU.CLIENT c ON sa.ACCOUNTHOLDERKEY = c.ENCODEDKEY
-    LEFT JOIN ghana_prod.MAMBU.customfieldvalue cv ON cv.PARENTKEY = st.encodedkey 
-        AND cv.CUSTOMFIELDKEY IN (
-            SELECT encodedkey FROM GHANA_PROD.MAMBU.CUSTOMFIELD WHERE id = 'INTERNAL_ID'
-        )
-    LEFT JOIN GHANA_PROD.MAMBU.CUSTOMFIELDVALUE wallet_id ON st.ENCODEDKEY = wallet_id.PARENTKEY 
-        AND wallet_id.CUSTOMFIELDKEY = (SELECT encodedkey FROM GHANA_PROD.MAMBU.CUSTOMFIELD WHERE id = 'ACCOUNT_NUMBER_TRANSACTION_CHANN')
-    WHERE st."type" in ('DEPOSIT','WITHDRAWAL', 'WITHDRAWAL_ADJUSTMENT','ADJUSTMENT')
-    AND sa.ACCOUNTTYPE = 'REGULAR_SAVINGS'
-    AND (c.MOBILEPHONE1 not in ('233552602681', '233243630046', '233245822584' , '23346722591', '233257806345') or c.MOBILEPHONE1 is null)
-    AND (c.MOBILEPHONE2 not in ('233552602681', '233243630046', '233245822584' , '23346722591', '233257806345') or c.MOBILEPHONE2 is null) 
-    AND (wallet_id.value not in ('233552602681', '233243630046', '233245822584' , '23346722591', '233257806345') or wallet_id.value is null)
-    AND date(st.ENTRYDATE) >= '2025-03-01'
+    FROM GHANA_PROD.SAVINGS_MODELS.SAVINGS_TRANSACTIONS
 ),
 
 -- Combine all transactions
@@ -73,25 +63,19 @@ all_transactions AS (
 
 -- Get client savings account information
 savings_clients AS (
-    SELECT DISTINCT
-        cl.id as client_id,
-        cl.encodedkey as client_key,
-        MIN(sa.creationdate) as first_savings_date,
-        MAX(sa.creationdate) as last_savings_date,
-        MAX(sa.closeddate) as last_account_closure,
-        COUNT(DISTINCT sa.id) as total_savings_accounts,
-        SUM(CASE WHEN st."type" = 'DEPOSIT' THEN st.amount ELSE 0 END) as total_deposits,
-        SUM(CASE WHEN st."type" = 'WITHDRAWAL' THEN st.amount ELSE 0 END) as total_withdrawals,
-        MAX(sa.balance) as current_balance
-    FROM GHANA_PROD.MAMBU.SAVINGSACCOUNT sa
-    LEFT JOIN MAMBU.CLIENT cl on cl.ENCODEDKEY = sa.ACCOUNTHOLDERKEY
-    LEFT JOIN GHANA_PROD.MAMBU.SAVINGSTRANSACTION st ON st.PARENTACCOUNTKEY = sa.ENCODEDKEY
-    WHERE sa.ACCOUNTTYPE = 'REGULAR_SAVINGS'
-    AND (cl.MOBILEPHONE1 not in ('233552602681', '233243630046', '233245822584' , '23346722591', '233257806345') or cl.MOBILEPHONE1 is null)
-    AND (cl.MOBILEPHONE2 not in ('233552602681', '233243630046', '233245822584' , '23346722591', '233257806345') or cl.MOBILEPHONE2 is null) 
-    AND date(sa.creationdate) >= date('2025-04-03')
-    AND date(sa.creationdate) between '2025-04-03' and '2025-09-30'
-    GROUP BY cl.id, cl.encodedkey
+    SELECT
+        bsd.client_id,
+        bsd.client_key as client_key,
+        MIN(bsd.creation_date) as first_savings_date,
+        MAX(bsd.creation_date) as last_savings_date,
+        MAX(bsd.closeddate) as last_account_closure,
+        COUNT(DISTINCT bsd.account_id) as total_savings_accounts,
+        SUM(CASE WHEN st.transaction_type = 'DEPOSIT' THEN st.amount ELSE 0 END) as total_deposits,
+        SUM(CASE WHEN st.transaction_type = 'WITHDRAWAL' THEN st.amount ELSE 0 END) as total_withdrawals,
+        MAX(bsd.balance) as current_balance
+    FROM GHANA_PROD.SAVINGS_MODELS.BASE_SAVINGS_DATA bsd
+    LEFT JOIN GHANA_PROD.SAVINGS_MODELS.SAVINGS_TRANSACTIONS st ON st.account_key = bsd.account_key
+    GROUP BY bsd.client_id, bsd.client_key
 ),
 
 -- Calculate payment failure rates per client
@@ -128,19 +112,10 @@ payment_failure_analysis AS (
 
 -- Calculate account gaps for multi-account clients
 account_gaps_calc AS (
-    SELECT 
+    SELECT
         client_id,
-        MAX(days_between_accounts) as max_gap
-    FROM (
-        SELECT 
-            bsc.client_id,
-            DATEDIFF(day, LAG(sa.creationdate) OVER (PARTITION BY bsc.client_id ORDER BY sa.creationdate), sa.creationdate) as days_between_accounts
-        FROM savings_clients bsc
-        JOIN GHANA_PROD.MAMBU.SAVINGSACCOUNT sa ON sa.ACCOUNTHOLDERKEY = bsc.client_key
-        WHERE bsc.total_savings_accounts > 1
-    ) gaps
-    WHERE days_between_accounts IS NOT NULL
-    GROUP BY client_id
+        max_gap_days as max_gap
+    FROM GHANA_PROD.SAVINGS_MODELS.MULTI_ACCOUNT_CHURNED
 ),
 
 -- Classify clients as churned or retained
@@ -149,7 +124,7 @@ client_retention AS (
         sc.*,
         CASE 
             WHEN sc.last_account_closure IS NOT NULL 
-            AND DATEDIFF(day, sc.last_account_closure, '2025-09-30') > 25 THEN 'churned'
+            AND DATEDIFF(day, sc.last_account_closure, (SELECT as_of_date FROM refresh)) > 25 THEN 'churned'
             WHEN sc.total_savings_accounts > 1 
             AND EXISTS (
                 SELECT 1 FROM account_gaps_calc agc
@@ -177,7 +152,7 @@ comprehensive_analysis AS (
         -- Calculate savings metrics
         CASE WHEN cr.total_withdrawals > 0 THEN cr.total_deposits / cr.total_withdrawals ELSE NULL END as deposit_to_withdrawal_ratio,
         CASE WHEN cr.total_savings_accounts > 0 THEN cr.total_deposits / cr.total_savings_accounts ELSE 0 END as avg_deposits_per_account,
-        DATEDIFF(day, cr.first_savings_date, COALESCE(cr.last_account_closure, '2025-09-30')) as savings_tenure_days
+        DATEDIFF(day, cr.first_savings_date, COALESCE(cr.last_account_closure, (SELECT as_of_date FROM refresh))) as savings_tenure_days
     FROM client_retention cr
     LEFT JOIN payment_failure_analysis pfa ON cr.client_id = pfa.client_id
 )
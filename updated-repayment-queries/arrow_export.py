@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Stream large query results to partitioned Parquet as Arrow record batches
+
+pd.read_sql turns the whole result into Python objects before anything is written, which does not
+work for transaction-level extracts (savings_transactions.sql, loan_details.sql) of hundreds of
+millions of rows. Here the result is pulled batch by batch (fetch_arrow_batches on Snowflake,
+to_arrow_reader on DuckDB) and each batch is written to Parquet before the next is fetched, so
+memory stays at one batch whatever the result size. Rows can be split into hive-style partitions
+by a column or by the day / month / year of a date column (CREATIONDATE:month ->
+CREATIONDATE_MONTH=2025-06/), with one open file per partition. Each partition's rows are buffered
+up to --row-group-rows and written as full row groups, so a partition spread thinly over many
+batches is not stored as thousands of tiny row groups. Every batch is cast to the first batch's
+schema (integer columns widened to 64 bits): Snowflake types a NUMBER column per result chunk, by
+the range of the values in that chunk.
+Rows/s, MB/s (Arrow bytes) and time to the first batch are reported per query.
+
+Usage:
+    python arrow_export.py REPORT.sql [REPORT.sql ...] [--output-dir extracts] [--partition-by CREATIONDATE:month]
+                           [--param name=value ...] [--batch-rows 1000000] [--row-group-rows 1000000]
+                           [--backend duckdb --database local.duckdb]
+"""
+
+import argparse
+import itertools
+import os
+import shutil
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from report_runner import connect, parse_params
+
+BATCH_ROWS = 1_000_000
+ROW_GROUP_ROWS = 1_000_000
+DATE_GRAINS = {'day': '%Y-%m-%d', 'month': '%Y-%m', 'year': '%Y'}
+HIVE_NULL = '__HIVE_DEFAULT_PARTITION__'
+
+def parse_partition(spec):
+    """'CREATIONDATE:month' -> ('CREATIONDATE', 'month'); 'TYPE' -> ('TYPE', None)"""
+    if not spec:
+        return None
+    column, _, grain = spec.partition(':')
+    if grain and grain not in DATE_GRAINS:
+        raise ValueError(f"Unknown partition grain {grain!r} (expected one of {list(DATE_GRAINS)})")
+    return column, grain or None
+
+def partition_column(schema, partition):
+    """Name of the column the batches are partitioned on, matched case-insensitively"""
+    column, grain = partition
+    names = {name.upper(): name for name in schema.names}
+    if column.upper() not in names:
+        raise ValueError(f"Partition column {column!r} not in result columns {schema.names}")
+    source = names[column.upper()]
+    return source, (f"{source}_{grain}".upper() if grain else source)
+
+def stream_schema(schema):
+    """Schema every batch is written with: the first batch's, with integers widened to int64"""
+    return pa.schema([field.with_type(pa.int64()) if pa.types.is_integer(field.type) else field for field in schema])
+
+def conform(batch, schema):
+    """batch cast to schema; a column that does not fit raises ValueError naming it"""
+    if batch.schema.equals(schema):
+        return batch
+    if batch.schema.names != schema.names:
+        raise ValueError(f"Batch columns {batch.schema.names} differ from the first batch's {schema.names}")
+    columns = []
+    for name, values, field in zip(schema.names, batch.columns, schema):
+        try:
+            columns.append(values if values.type.equals(field.type) else pc.cast(values, field.type))
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+            raise ValueError(f"Column {name!r} is {values.type} in a later batch and cannot be cast to the "
+                             f"first batch's {field.type} (cast it in the query): {e}") from e
+    return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+def with_partition(batch, source, target, grain):
+    """Add the derived date partition column to a batch"""
+    values = batch.column(source)
+    if not (pa.types.is_timestamp(values.type) or pa.types.is_date(values.type)):
+        values = pc.cast(values, pa.timestamp('us'))
+    labels = pc.fill_null(pc.strftime(values, format=DATE_GRAINS[grain]), 'unknown')
+    return pa.RecordBatch.from_arrays(batch.columns + [labels], names=batch.schema.names + [target])
+
+class Throughput:
+    """Rows and Arrow bytes seen by a stream, with timings"""
+
+    def __init__(self):
+        self.rows = 0
+        self.bytes = 0
+        self.batches = 0
+        self.started = time.perf_counter()
+        self.first_batch = None
+
+    def count(self, batch):
+        if self.first_batch is None:
+            self.first_batch = time.perf_counter() - self.started
+        self.rows += batch.num_rows
+        self.bytes += batch.nbytes
+        self.batches += 1
+
+    def summary(self):
+        seconds = time.perf_counter() - self.started
+        return {'rows': self.rows, 'batches': self.batches, 'arrow_mb': self.bytes / 1024**2, 'seconds': seconds,
+                'first_batch_s': self.first_batch or 0.0,
+                'rows_per_s': self.rows / seconds if seconds else 0.0,
+                'mb_per_s': self.bytes / 1024**2 / seconds if seconds else 0.0}
+
+class PartitionWriter:
+    """
+    One open ParquetWriter per partition value (hive layout). A partition's slices are buffered until
+    they fill a row group of row_group_rows; when more than max_buffered_rows are held in all, the
+    largest partition is written out early. At most max_open_files writers stay open; a partition seen
+    again after its writer was closed continues in a new file.
+    """
+
+    def __init__(self, output_dir, column=None, basename='part', max_open_files=64, row_group_rows=ROW_GROUP_ROWS,
+                 max_buffered_rows=None):
+        self.output_dir = output_dir
+        self.column = column
+        self.basename = basename
+        self.max_open_files = max_open_files
+        self.row_group_rows = row_group_rows
+        self.max_buffered_rows = max_buffered_rows or 4 * row_group_rows
+        self.writers = {}
+        self.file_counts = {}
+        self.paths = []
+        self.pending = {}
+        self.pending_rows = {}
+
+    def directory(self, value):
+        if self.column is None:
+            return self.output_dir
+        label = HIVE_NULL if value is None else str(value).replace('/', '_')
+        return os.path.join(self.output_dir, f"{self.column}={label}")
+
+    def writer(self, value, schema):
+        if value in self.writers:
+            return self.writers[value]
+        if len(self.writers) >= self.max_open_files:
+            oldest = next(iter(self.writers))
+            self.flush(oldest, partial=True)
+            self.writers.pop(oldest).close()
+        directory = self.directory(value)
+        index = self.file_counts.get(value, 0)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.basename}-{index}.parquet")
+        self.file_counts[value] = index + 1
+        self.paths.append(path)
+        self.writers[value] = pq.ParquetWriter(path, schema, compression='zstd')
+        return self.writers[value]
+
+    def flush(self, value, partial=False):
+        """Write value's buffered rows as full row groups; with partial, the remainder too"""
+        if not self.pending_rows.get(value):
+            return
+        table = pa.Table.from_batches(self.pending.pop(value))
+        rows = table.num_rows if partial else table.num_rows - table.num_rows % self.row_group_rows
+        self.pending_rows[value] = table.num_rows - rows
+        if rows < table.num_rows:
+            self.pending[value] = table.slice(rows).to_batches()
+        if rows:
+            self.writer(value, table.schema).write_table(table.slice(0, rows), row_group_size=self.row_group_rows)
+
+    def add(self, value, batch):
+        self.pending.setdefault(value, []).append(batch)
+        self.pending_rows[value] = self.pending_rows.get(value, 0) + batch.num_rows
+        if self.pending_rows[value] >= self.row_group_rows:
+            self.flush(value)
+        if sum(self.pending_rows.values()) > self.max_buffered_rows:
+            self.flush(max(self.pending_rows, key=self.pending_rows.get), partial=True)
+
+    def write(self, batch):
+        if self.column is None:
+            self.add(None, batch)
+            return
+        values = batch.column(self.column)
+        data = batch.drop_columns([self.column])
+        for value in pc.unique(values).to_pylist():
+            mask = pc.is_null(values) if value is None else pc.fill_null(pc.equal(values, value), False)
+            self.add(value, data.filter(mask))
+
+    def close(self):
+        try:
+            for value in list(self.pending):
+                self.flush(value, partial=True)
+        finally:
+            for writer in self.writers.values():
+                writer.close()
+            self.writers = {}
+
+def clear_dataset(output_dir):
+    """Remove the Parquet files and hive partition directories of a previous export"""
+    if os.path.isdir(output_dir):
+        for name in os.listdir(output_dir):
+            path = os.path.join(output_dir, name)
+            if os.path.isdir(path) and '=' in name:
+                shutil.rmtree(path)
+            elif name.endswith('.parquet'):
+                os.remove(path)
+    os.makedirs(output_dir, exist_ok=True)
+
+def stream_to_parquet(batches, output_dir, partition=None, basename='part', row_group_rows=ROW_GROUP_ROWS):
+    """
+    Write an iterator of record batches to a Parquet dataset under output_dir, one batch at a time.
+    Returns the throughput summary plus the bytes written on disk.
+    """
+    meter = Throughput()
+    batches = iter(batches)
+    first = next(batches, None)
+    # Replace the whole dataset: partitions missing from this run must not survive from the last one
+    clear_dataset(output_dir)
+    if first is None:
+        return {**meter.summary(), 'disk_mb': 0.0, 'partitions': 0}
+
+    schema = stream_schema(first.schema)
+    source = target = None
+    if partition:
+        source, target = partition_column(schema, partition)
+    writer = PartitionWriter(output_dir, target, basename, row_group_rows=row_group_rows)
+    try:
+        for batch in itertools.chain([first], batches):
+            if not batch.num_rows:
+                continue
+            batch = conform(batch, schema)
+            if partition and partition[1]:
+                batch = with_partition(batch, source, target, partition[1])
+            meter.count(batch)
+            writer.write(batch)
+    finally:
+        writer.close()
+    disk = sum(os.path.getsize(path) for path in writer.paths)
+    return {**meter.summary(), 'disk_mb': disk / 1024**2,
+            'partitions': len({os.path.dirname(path) for path in writer.paths})}
+
+def export_query(backend, sql, params, output_dir, partition=None, batch_rows=BATCH_ROWS, name='part',
+                 row_group_rows=ROW_GROUP_ROWS):
+    return stream_to_parquet(backend.fetch_batches(sql, params, batch_rows), output_dir, partition, name, row_group_rows)
+
+def export_file(backend, path, values, output_dir, partition=None, batch_rows=BATCH_ROWS, row_group_rows=ROW_GROUP_ROWS):
+    """Export a .sql report (last statement; each statement's {{ parameters }} bound from values)"""
+    from query_params import QueryTemplate
+    with open(path) as f:
+        statements = QueryTemplate(f.read()).bind_statements(values or {}, backend.paramstyle)
+    if not statements:
+        raise ValueError(f"No SQL statements in {path}")
+    name = os.path.splitext(os.path.basename(path))[0]
+    with backend.session():
+        for statement, params in statements[:-1]:
+            backend.execute(statement, params)
+        sql, params = statements[-1]
+        return export_query(backend, sql, params, output_dir, partition, batch_rows, name, row_group_rows)
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream query results to partitioned Parquet")
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('--output-dir', default='extracts', help="One dataset directory per file is created here")
+    parser.add_argument('--partition-by', default=None, help="COLUMN or COLUMN:day|month|year")
+    parser.add_argument('--param', nargs='*', default=[], help="name=value")
+    parser.add_argument('--batch-rows', type=int, default=BATCH_ROWS)
+    parser.add_argument('--row-group-rows', type=int, default=ROW_GROUP_ROWS, help="Rows per Parquet row group")
+    parser.add_argument('--backend', choices=['snowflake', 'duckdb'], default='snowflake')
+    parser.add_argument('--database', default=None)
+    args = parser.parse_args()
+
+    backend = connect(args.backend, args.database)
+    partition = parse_partition(args.partition_by)
+    summaries = []
+    try:
+        for path in args.files:
+            output_dir = os.path.join(args.output_dir, os.path.splitext(os.path.basename(path))[0])
+            summary = export_file(backend, path, parse_params(args.param), output_dir, partition, args.batch_rows,
+                                  args.row_group_rows)
+            summaries.append({'query': path, **summary})
+            print(f"{path}: {summary['rows']:,} rows in {summary['seconds']:.1f}s "
+                  f"({summary['rows_per_s']:,.0f} rows/s, {summary['mb_per_s']:.1f} MB/s, "
+                  f"first batch {summary['first_batch_s']:.2f}s) -> {output_dir} "
+                  f"[{summary['partitions']} partitions, {summary['disk_mb']:.1f} MB on disk]")
+    finally:
+        backend.close()
+
+    print("\n" + "="*60)
+    print("THROUGHPUT")
+    print("="*60)
+    print(pd.DataFrame(summaries).round(2).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Flattened, incrementally loaded backend_notifications events
+
+data.backend_notifications keeps every event's details in a JSON PAYLOAD, so the repayment,
+savings and marketing reports (failed_payments_by_day, penalty_payment_analysis, savings_activity,
+savings_analysis, the marketing pipelines, ...) call PARSE_JSON(PAYLOAD) several times per row and
+filter on TO_TIMESTAMP_NTZ(timestamp), which no partition metadata can prune. Here each payload
+is parsed once, at load time, into typed columns of DATA.BACKEND_EVENTS:
+  - id, "TYPE", timestamp (TIMESTAMP_NTZ), event_date, created_at,    as in the source
+    user_identity, identity_type
+  - user_id, client_id, status                                         every event type
+  - is_duplicate, updated_status, application_version, error_code,    only for the event types
+    error_reason                                                       that carry them (FIELDS)
+The table is clustered by ("TYPE", event_date) on Snowflake and written in that order on DuckDB, so
+the reports' filters on "TYPE" and event_date / timestamp become pruned columnar scans.
+
+Loads are incremental from a watermark, the latest timestamp already in the table: events after
+watermark - --lookback-hours (late arrivals) are deleted and reloaded, in --batch-days windows
+so an interrupted load resumes from the last completed window. --full-refresh rebuilds from the
+first event. Adding a field to FIELDS needs a full refresh.
+
+Usage:
+    python backend_events.py load [--until 2025-10-20] [--lookback-hours 48] [--batch-days 31] [--full-refresh]
+                                  [--backend duckdb --database ghana_prod.duckdb]
+    python backend_events.py status
+"""
+
+import argparse
+import time
+
+import pandas as pd
+
+SOURCE_TABLE = 'GHANA_PROD.DATA.BACKEND_NOTIFICATIONS'
+EVENTS_TABLE = 'GHANA_PROD.DATA.BACKEND_EVENTS'
+LOOKBACK_HOURS = 48
+BATCH_DAYS = 31
+
+# column: (payload path, type, event types it is extracted for - None for every type)
+FIELDS = {
+    'user_id': ('user_id', 'STRING', None),
+    'client_id': ('client_id', 'STRING', None),
+    'status': ('status', 'STRING', None),
+    'is_duplicate': ('is_duplicate', 'BOOLEAN', ['BE_KYC_VERIFICATION_RESULT']),
+    'updated_status': ('updated_status', 'STRING', ['BE_FIDOBIZ_SCORE_DOCUMENT_STATUS_EVENT']),
+    'application_version': ('application_info:application_version', 'STRING', ['BE_FIDOBIZ_SURVEY_SUBMISSION']),
+    'error_code': ('error_code', 'STRING', ['BE_LOAN_REPAYMENT_RESULT']),
+    'error_reason': ('error_reason', 'STRING', ['BE_LOAN_REPAYMENT_RESULT']),
+}
+
+def field_expression(column, path, kind, types):
+    value = f"payload:{path}::{kind}"
+    if types:
+        value = f"""CASE WHEN "TYPE" IN ({', '.join(f"'{name}'" for name in types)}) THEN {value} END"""
+    return f"{value} AS {column}"
+
+class EventLoader:
+    """Loads source into the flattened events table, window by window from the watermark"""
+
+    def __init__(self, backend, source=SOURCE_TABLE, target=EVENTS_TABLE):
+        self.backend = backend
+        self.source = source
+        self.target = target
+
+    def sql(self, text):
+        """Statements are written for Snowflake and translated for a local DuckDB database"""
+        if self.backend.name != 'duckdb':
+            return text
+        from dialect_translate import translate
+        statements, issues = translate(text)
+        problems = [item for item in issues if item['severity'] != 'rewritten']
+        if problems:
+            raise ValueError(f"Cannot translate event load SQL: {problems[0]['detail']}")
+        return statements[0]
+
+    def execute(self, text):
+        return self.backend.execute(self.sql(text))
+
+    def create(self, replace=False):
+        fields = ''.join(f",\n    {column} {kind}" for column, (_, kind, _) in FIELDS.items())
+        cluster = ' CLUSTER BY ("TYPE", event_date)' if self.backend.name == 'snowflake' else ''
+        self.execute(f"CREATE SCHEMA IF NOT EXISTS {self.target.rsplit('.', 1)[0]}")
+        self.execute(f"""
+CREATE {'OR REPLACE TABLE' if replace else 'TABLE IF NOT EXISTS'} {self.target} (
+    id STRING,
+    "TYPE" STRING,
+    timestamp TIMESTAMP_NTZ,
+    event_date DATE,
+    created_at TIMESTAMP_NTZ,
+    user_identity STRING,
+    identity_type STRING{fields},
+    loaded_at TIMESTAMP_NTZ
+){cluster}""")
+
+    def scalar(self, text):
+        value = self.execute(text).iloc[0, 0]
+        return None if pd.isna(value) else pd.Timestamp(value)
+
+    def watermark(self):
+        """Latest event timestamp already loaded, or None for an empty table"""
+        return self.scalar(f"SELECT MAX(timestamp) AS watermark FROM {self.target}")
+
+    def load_window(self, start, end):
+        """Replace the events with start < timestamp <= end; returns the rows inserted"""
+        self.execute(f"DELETE FROM {self.target} WHERE timestamp > '{start}' AND timestamp <= '{end}'")
+        fields = ''.join(f",\n    {field_expression(column, *spec)}" for column, spec in FIELDS.items())
+        inserted = self.execute(f"""
+INSERT INTO {self.target}
+SELECT
+    id,
+    "TYPE",
+    timestamp,
+    DATE(timestamp) AS event_date,
+    created_at,
+    user_identity,
+    identity_type{fields},
+    CURRENT_TIMESTAMP()::TIMESTAMP_NTZ AS loaded_at
+FROM (
+    -- Each payload is parsed once here
+    SELECT id, "TYPE", TO_TIMESTAMP_NTZ(timestamp) AS timestamp, TO_TIMESTAMP_NTZ(created_at) AS created_at,
+           user_identity, identity_type, PARSE_JSON(payload) AS payload
+    FROM {self.source}
+    WHERE TO_TIMESTAMP_NTZ(timestamp) > '{start}' AND TO_TIMESTAMP_NTZ(timestamp) <= '{end}'
+)
+ORDER BY "TYPE", timestamp""")
+        return int(inserted.iloc[0, 0])
+
+    def load(self, until=None, lookback_hours=LOOKBACK_HOURS, batch_days=BATCH_DAYS, full_refresh=False, on_batch=None):
+        """Load everything after the watermark (less the lookback) up to until; one record per window"""
+        self.create(replace=full_refresh)
+        watermark = None if full_refresh else self.watermark()
+        if watermark is not None:
+            start = watermark - pd.Timedelta(hours=lookback_hours)
+        else:
+            first = self.scalar(f"SELECT MIN(TO_TIMESTAMP_NTZ(timestamp)) AS first_event FROM {self.source}")
+            start = first - pd.Timedelta(microseconds=1) if first is not None else None
+        end = pd.Timestamp(until) if until else self.scalar(f"SELECT MAX(TO_TIMESTAMP_NTZ(timestamp)) AS last_event FROM {self.source}")
+        records = []
+        while start is not None and end is not None and start < end:
+            stop = min(start.normalize() + pd.Timedelta(days=batch_days), end)
+            started = time.perf_counter()
+            rows = self.load_window(start, stop)
+            record = {'from': start, 'to': stop, 'rows': rows, 'seconds': time.perf_counter() - started}
+            records.append(record)
+            if on_batch:
+                on_batch(record)
+            start = stop
+        return records
+
+    def status(self):
+        """Events, days and latest timestamp per event type"""
+        return self.execute(f"""
+SELECT "TYPE" AS event_type, COUNT(*) AS events, COUNT(DISTINCT event_date) AS days,
+       MIN(timestamp) AS first_event, MAX(timestamp) AS last_event, MAX(loaded_at) AS last_loaded
+FROM {self.target}
+GROUP BY 1
+ORDER BY events DESC""")
+
+def main():
+    from report_runner import connect
+
+    parser = argparse.ArgumentParser(description="Flatten backend_notifications into typed event columns")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    load_parser = subparsers.add_parser('load', help="Load new events from the watermark")
+    load_parser.add_argument('--until', default=None, help="Load events up to this timestamp (default: the latest)")
+    load_parser.add_argument('--lookback-hours', type=float, default=LOOKBACK_HOURS)
+    load_parser.add_argument('--batch-days', type=int, default=BATCH_DAYS)
+    load_parser.add_argument('--full-refresh', action='store_true')
+    subparsers.add_parser('status', help="Events per type in the flattened table")
+    for subparser in subparsers.choices.values():
+        subparser.add_argument('--source', default=SOURCE_TABLE)
+        subparser.add_argument('--target', default=EVENTS_TABLE)
+        subparser.add_argument('--backend', choices=['snowflake', 'duckdb'], default='snowflake')
+        subparser.add_argument('--database', default=None)
+    args = parser.parse_args()
+
+    backend = connect(args.backend, args.database)
+    try:
+        loader = EventLoader(backend, args.source, args.target)
+        if args.command == 'status':
+            loader.create()
+            print(loader.status().to_string(index=False))
+            return
+        loader.create()
+        watermark = None if args.full_refresh else loader.watermark()
+        print(f"Loading {args.source} -> {args.target} "
+              f"({'full refresh' if args.full_refresh or watermark is None else f'watermark {watermark}'})")
+        records = loader.load(args.until, args.lookback_hours, args.batch_days, args.full_refresh,
+                              lambda record: print(f"  {record['from']} -> {record['to']}: {record['rows']:,} events in {record['seconds']:.2f}s"))
+    finally:
+        backend.close()
+
+    print("\n" + "="*60)
+    print("EVENT LOAD SUMMARY")
+    print("="*60)
+    if not records:
+        print("Nothing new to load")
+        return
+    loaded = pd.DataFrame(records)
+    print(f"{len(loaded)} windows, {loaded['rows'].sum():,} events in {loaded['seconds'].sum():.2f}s")
+
+if __name__ == "__main__":
+    main()
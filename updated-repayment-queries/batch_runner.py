@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Concurrent month-end batch of SQL reports over a bounded connection pool
+
+A manifest lists the reports to run (mags_report_v2, asset_class, closed_wo_loans, loanbookatdate,
+age_distribution_report, ...). Reports run on a thread pool of --concurrency workers that borrow
+connections from a pool of at most --pool-size connections, so the warehouse sees a bounded number
+of sessions and a month-end batch takes roughly as long as its slowest few reports instead of their
+sum. Each result is written as soon as it lands, a report exceeding its timeout is cancelled, and a
+failure does not stop the others. Runs go through report_runner, so unchanged reports are read from
+its result cache.
+
+Manifest: a text file with one .sql path per line (# comments allowed), or a JSON list of
+{"file": ..., "params": {...}, "timeout": seconds, "name": ...}. Relative paths are resolved
+against the manifest's directory.
+
+Usage:
+    python batch_runner.py MANIFEST [--concurrency 4] [--pool-size 4] [--timeout 900]
+                           [--param name=value ...] [--output-dir month_end] [--format csv|parquet]
+                           [--backend duckdb --database local.duckdb]
+"""
+
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+
+import pandas as pd
+
+from report_runner import CACHE_DIR, ReportRunner, ResultCache, connect, parse_params
+
+DEFAULT_TIMEOUT = 900
+
+class ConnectionPool:
+    """At most size connections, created on first use and handed out one caller at a time"""
+
+    def __init__(self, factory, size=4):
+        self.factory = factory
+        self.size = size
+        self.idle = queue.LifoQueue()
+        self.created = []
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        backend = self._acquire()
+        try:
+            yield backend
+        finally:
+            self.idle.put(backend)
+
+    def _acquire(self):
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self.lock:
+            if len(self.created) < self.size:
+                backend = self.factory()
+                self.created.append(backend)
+                return backend
+        return self.idle.get()
+
+    def close(self):
+        for backend in self.created:
+            backend.close()
+        self.created = []
+
+def read_manifest(path):
+    """Manifest entries as dicts with file, name, params and timeout"""
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path) as f:
+        if path.endswith('.json'):
+            entries = json.load(f)
+        else:
+            entries = [{'file': line.strip()} for line in f if line.strip() and not line.strip().startswith('#')]
+    for entry in entries:
+        entry['file'] = os.path.join(base, entry['file'])
+        entry.setdefault('name', os.path.splitext(os.path.basename(entry['file']))[0])
+        entry.setdefault('params', {})
+    return entries
+
+def write_result(df, output_dir, name, output_format):
+    path = os.path.join(output_dir, f"{name}.{output_format}")
+    if output_format == 'parquet':
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+def run_batch(entries, pool, cache=None, concurrency=4, timeout=DEFAULT_TIMEOUT, params=None,
+              output_dir='.', output_format='csv', refresh=False, on_result=None):
+    """
+    Run manifest entries concurrently; each result is written as it completes.
+    Returns a DataFrame with one row per report: status, rows, queued / run seconds, output.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    submitted = time.perf_counter()
+
+    def run(entry):
+        queued = time.perf_counter()
+        with pool.connection() as backend:
+            started = time.perf_counter()
+            record = {'name': entry['name'], 'file': entry['file'], 'queued_s': started - queued}
+            try:
+                df, info = ReportRunner(backend, cache).run_file(
+                    entry['file'], {**(params or {}), **entry['params']}, refresh, entry.get('timeout', timeout))
+                record.update(status='cached' if info['cached'] else 'ok', rows=len(df),
+                              output=write_result(df, output_dir, entry['name'], output_format))
+            except TimeoutError as e:
+                record.update(status='timeout', error=str(e))
+            except Exception as e:
+                record.update(status='failed', error=f"{type(e).__name__}: {e}")
+            record['run_s'] = time.perf_counter() - started
+            record['finished_s'] = time.perf_counter() - submitted
+            return record
+
+    records = []
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(run, entry) for entry in entries]
+        for future in as_completed(futures):
+            record = future.result()
+            records.append(record)
+            if on_result:
+                on_result(record)
+    columns = ['name', 'status', 'rows', 'queued_s', 'run_s', 'finished_s', 'output', 'error', 'file']
+    return pd.DataFrame(records).reindex(columns=columns)
+
+def latency_summary(report, wall_seconds):
+    """Batch totals: wall time against the serial sum, latency percentiles"""
+    run = report['run_s']
+    return {
+        'reports': len(report),
+        'ok': int(report['status'].isin(['ok', 'cached']).sum()),
+        'cached': int((report['status'] == 'cached').sum()),
+        'failed': int((report['status'] == 'failed').sum()),
+        'timed out': int((report['status'] == 'timeout').sum()),
+        'wall time': f"{wall_seconds:.1f}s",
+        'sum of run times': f"{run.sum():.1f}s ({run.sum() / wall_seconds:.1f}x concurrency gain)" if wall_seconds else '',
+        'p50 / p95 / max latency': f"{run.quantile(0.5):.2f}s / {run.quantile(0.95):.2f}s / {run.max():.2f}s",
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a manifest of SQL reports concurrently")
+    parser.add_argument('manifest')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--pool-size', type=int, default=None, help="Maximum connections (default: --concurrency)")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help="Per-report timeout in seconds")
+    parser.add_argument('--param', nargs='*', default=[], help="name=value shared by every report")
+    parser.add_argument('--output-dir', default='month_end')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+    parser.add_argument('--backend', choices=['snowflake', 'duckdb'], default='snowflake')
+    parser.add_argument('--database', default=None)
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--refresh', action='store_true')
+    args = parser.parse_args()
+
+    entries = read_manifest(args.manifest)
+    pool = ConnectionPool(lambda: connect(args.backend, args.database), args.pool_size or args.concurrency)
+    cache = None if args.no_cache else ResultCache(args.cache_dir)
+    print(f"Running {len(entries)} reports, concurrency {args.concurrency}, pool {pool.size}")
+
+    def progress(record):
+        detail = f"{record['rows']} rows" if record['status'] in ('ok', 'cached') else record['error'].splitlines()[0]
+        print(f"  [{record['finished_s']:7.1f}s] {record['name']}: {record['status']} in {record['run_s']:.2f}s - {detail}")
+
+    started = time.perf_counter()
+    try:
+        report = run_batch(entries, pool, cache, args.concurrency, args.timeout, parse_params(args.param),
+                           args.output_dir, args.format, args.refresh, progress)
+    finally:
+        pool.close()
+    wall = time.perf_counter() - started
+
+    report_path = os.path.join(args.output_dir, 'batch_latency.csv')
+    report.sort_values('run_s', ascending=False).to_csv(report_path, index=False)
+
+    print("\n" + "="*60)
+    print("BATCH SUMMARY")
+    print("="*60)
+    for label, value in latency_summary(report, wall).items():
+        print(f"  - {label}: {value}")
+    print(f"\nLatency report saved to: {report_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+SQL benchmark suite on synthetic data
+
+Times every report in the repository against the seeded synthetic tables from synthetic_data.py
+(bench_data/<scale>/ghana_prod.duckdb), so a rewrite can be measured before it costs warehouse
+credits. Each report's {{ parameters }} get fixed defaults (quoted sample values for text and
+multi-select parameters), the Snowflake SQL is translated to DuckDB by dialect_translate.py, the
+savings models and the flattened backend events are built first (savings_models.py,
+backend_events.py), and every report is run --repeat times with a timeout. The data is
+regenerated when the seed or synthetic_data.py changes, and the models and events are rebuilt
+when their SQL or code changes (hashes kept in bench_data/<scale>/build.json). Results are stored
+per run as bench_results/<commit>_<scale>_<timestamp>.parquet, tagged with the git commit (-dirty
+when the tree has local changes), so two commits can be compared report by report.
+
+The generator creates every schema-qualified table the reports read (those it does not model
+empty). Reports that do not run locally (untranslatable SQL, views defined only in the warehouse)
+are recorded as failed with the error and skipped in comparisons; the run summary counts them by
+cause (missing table or error type), so the coverage gap is visible next to the timings.
+
+Usage:
+    python bench_suite.py run [--scale 1x] [--seed 42] [--repeat 3] [--timeout 60] [--filter savings_queries]
+    python bench_suite.py compare [BASE_COMMIT [HEAD_COMMIT]] [--scale 1x]
+    python bench_suite.py history [--report main_segments]
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import statistics
+import subprocess
+import time
+
+import pandas as pd
+
+from dialect_translate import translate
+from query_params import QueryTemplate
+from report_runner import DuckDBBackend
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = 'bench_data'
+RESULTS_DIR = 'bench_results'
+AS_OF = '2025-10-20'
+EXCLUDED_DIRS = [os.path.join('savings_queries', 'models')]
+# Text and multi-select values; written into the SQL quoted (QueryTemplate.inline)
+SAMPLE_VALUES = {'accountstates': "'ACTIVE','ACTIVE_IN_ARREARS'"}
+SAMPLE_TEXT = 'sample'
+MISSING_TABLE = re.compile(r'Table with name "?([\w.]+)"? does not exist')
+
+def git_commit():
+    """Short HEAD hash, suffixed -dirty when the working tree has changes"""
+    def git(*args):
+        return subprocess.run(['git', *args], cwd=REPO_ROOT, capture_output=True, text=True).stdout.strip()
+    commit = git('rev-parse', '--short', 'HEAD') or 'unknown'
+    return commit + ('-dirty' if git('status', '--porcelain', '--untracked-files=no') else '')
+
+def discover_reports(root=REPO_ROOT, pattern=None):
+    """Repository .sql files (relative paths), optionally only those whose path contains pattern"""
+    reports = []
+    for path in sorted(glob.glob(os.path.join(root, '**', '*.sql'), recursive=True)):
+        relative = os.path.relpath(path, root)
+        if any(relative.startswith(excluded) for excluded in EXCLUDED_DIRS):
+            continue
+        if pattern is None or pattern.lower() in relative.lower():
+            reports.append(relative)
+    return reports
+
+def default_values(template, as_of=AS_OF):
+    """Fixed benchmark values per parameter type, so every run executes the same statements"""
+    values = {}
+    for name, spec in template.parameters.items():
+        if spec.kind == 'date':
+            values[name] = f"{pd.Timestamp(as_of) - pd.Timedelta(days=90):%Y-%m-%d}" if name.lower().endswith('start') else as_of
+        elif spec.kind == 'number':
+            values[name] = 30
+        elif spec.kind == 'choice':
+            values[name] = 'month' if 'month' in spec.choices else spec.choices[0]
+        else:
+            values[name] = SAMPLE_VALUES.get(name.lower(), SAMPLE_TEXT)
+    return values
+
+def prepare(sql, as_of=AS_OF):
+    """DuckDB statements for a report: parameters inlined, then translated from Snowflake"""
+    template = QueryTemplate(sql)
+    statements, issues = translate(template.inline(default_values(template, as_of)))
+    problems = [item for item in issues if item['severity'] != 'rewritten']
+    if problems:
+        raise ValueError(f"line {problems[0]['line'] or '?'}: {problems[0]['construct']} - {problems[0]['detail']}")
+    return statements
+
+def time_report(backend, statements, repeat=3, timeout=60):
+    """(rows, run seconds) of repeat runs; earlier statements run before the last one each time"""
+    seconds, rows = [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        with backend.session():
+            for statement in statements[:-1]:
+                backend.execute(statement, timeout=timeout)
+            rows = len(backend.execute(statements[-1], timeout=timeout))
+        seconds.append(time.perf_counter() - started)
+    return rows, seconds
+
+def source_hash(paths):
+    """sha256 over the contents of the given files"""
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def ensure_data(scale, seed, data_dir=DATA_DIR):
+    """Path of the synthetic database for scale, (re)building the data, the savings models and the flattened events when their sources changed"""
+    import backend_events
+    import savings_models
+    import synthetic_data
+    database = os.path.join(data_dir, scale, 'ghana_prod.duckdb')
+    build_file = os.path.join(os.path.dirname(database), 'build.json')
+    built = {}
+    if os.path.exists(database) and os.path.exists(build_file):
+        with open(build_file) as f:
+            built = json.load(f)
+    models = savings_models.load_models()
+    wanted = {'data': f"{seed}:{source_hash([synthetic_data.__file__])}",
+              'models': source_hash([model.path for model in models.values()] + [savings_models.__file__, backend_events.__file__])}
+    if built.get('data') != wanted['data']:
+        print(f"Generating {scale} synthetic data (seed {seed}) in {database}")
+        synthetic_data.generate(database, scale, seed)
+        built = {'data': wanted['data']}
+    if built.get('models') != wanted['models']:
+        print(f"Building the savings models and flattened events in {database}")
+        backend = DuckDBBackend(database)
+        try:
+            savings_models.ModelBuilder(backend, models, state_file=os.path.join(os.path.dirname(database), 'savings_models_state.json')) \
+                .refresh({'as_of': AS_OF, 'savings_start_date': savings_models.SAVINGS_START_DATE})
+            backend_events.EventLoader(backend).load(full_refresh=True)
+        finally:
+            backend.close()
+        built['models'] = wanted['models']
+    with open(build_file, 'w') as f:
+        json.dump(built, f, indent=2)
+    return database
+
+def run_suite(database, reports, repeat=3, timeout=60, on_result=None):
+    """One record per report: status, rows, median / min seconds, error"""
+    backend = DuckDBBackend(database)
+    records = []
+    try:
+        for report in reports:
+            record = {'report': report, 'status': 'ok', 'rows': None, 'median_s': None, 'min_s': None, 'error': None}
+            try:
+                with open(os.path.join(REPO_ROOT, report), errors='replace') as f:
+                    statements = prepare(f.read())
+                if not statements:
+                    raise ValueError("No statements")
+                rows, seconds = time_report(backend, statements, repeat, timeout)
+                record.update(rows=rows, median_s=statistics.median(seconds), min_s=min(seconds))
+            except TimeoutError as e:
+                record.update(status='timeout', error=str(e))
+            except Exception as e:
+                record.update(status='failed', error=f"{type(e).__name__}: {str(e).splitlines()[0][:200]}")
+            records.append(record)
+            if on_result:
+                on_result(record)
+    finally:
+        backend.close()
+    return pd.DataFrame(records)
+
+def failure_causes(results):
+    """Failed and timed-out reports per cause: the missing table, else the error type"""
+    def cause(record):
+        if record['status'] == 'timeout':
+            return 'timeout'
+        missing = MISSING_TABLE.search(record['error'] or '')
+        return f"missing table {missing.group(1).lower()}" if missing else (record['error'] or '').split(':')[0]
+    failed = results[results['status'] != 'ok']
+    return failed.apply(cause, axis=1).value_counts() if len(failed) else pd.Series(dtype=int)
+
+def save_results(results, scale, seed, results_dir=RESULTS_DIR):
+    os.makedirs(results_dir, exist_ok=True)
+    run_at = pd.Timestamp.now()
+    commit = git_commit()
+    path = os.path.join(results_dir, f"{commit}_{scale}_{run_at:%Y%m%d_%H%M%S}.parquet")
+    results.assign(commit=commit, scale=scale, seed=seed, run_at=run_at).to_parquet(path, index=False)
+    return path
+
+def load_results(results_dir=RESULTS_DIR, scale=None):
+    paths = sorted(glob.glob(os.path.join(results_dir, '*.parquet')))
+    if not paths:
+        return pd.DataFrame(columns=['report', 'status', 'rows', 'median_s', 'min_s', 'error', 'commit', 'scale', 'seed', 'run_at'])
+    results = pd.concat([pd.read_parquet(path) for path in paths], ignore_index=True)
+    return results if scale is None else results[results['scale'] == scale]
+
+def compare_runs(results, base, head):
+    """Per report: base and head median seconds, speedup (base / head) and row-count changes"""
+    def latest(commit):
+        runs = results[results['commit'] == commit]
+        if runs.empty:
+            raise ValueError(f"No results for commit {commit!r}")
+        return runs[runs['run_at'] == runs['run_at'].max()].set_index('report')
+    old, new = latest(base), latest(head)
+    comparison = old[['status', 'rows', 'median_s']].join(new[['status', 'rows', 'median_s']], how='outer', lsuffix='_base', rsuffix='_head')
+    comparison['speedup'] = comparison['median_s_base'] / comparison['median_s_head']
+    comparison['rows_changed'] = comparison['rows_base'].ne(comparison['rows_head']) & comparison['rows_base'].notna() & comparison['rows_head'].notna()
+    return comparison.sort_values('speedup')
+
+def main():
+    from synthetic_data import SCALES
+
+    parser = argparse.ArgumentParser(description="Benchmark the repository's reports on synthetic data")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    run_parser = subparsers.add_parser('run', help="Time every report and store the results for this commit")
+    run_parser.add_argument('--seed', type=int, default=42)
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--timeout', type=float, default=60, help="Per-statement timeout in seconds")
+    run_parser.add_argument('--filter', default=None, help="Only reports whose path contains this")
+    run_parser.add_argument('--data-dir', default=DATA_DIR)
+    compare_parser = subparsers.add_parser('compare', help="Compare two commits (default: the last two benchmarked)")
+    compare_parser.add_argument('commits', nargs='*')
+    history_parser = subparsers.add_parser('history', help="Median seconds per commit")
+    history_parser.add_argument('--report', default=None)
+    for subparser in subparsers.choices.values():
+        subparser.add_argument('--scale', choices=list(SCALES), default='1x')
+        subparser.add_argument('--results-dir', default=RESULTS_DIR)
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        database = ensure_data(args.scale, args.seed, args.data_dir)
+        reports = discover_reports(pattern=args.filter)
+        print(f"Benchmarking {len(reports)} reports on {database} ({git_commit()})")
+
+        def progress(record):
+            detail = f"{record['median_s']:.3f}s, {record['rows']} rows" if record['status'] == 'ok' else record['error']
+            print(f"  {record['status']:>7}  {record['report']}: {detail}")
+
+        results = run_suite(database, reports, args.repeat, args.timeout, progress)
+        path = save_results(results, args.scale, args.seed, args.results_dir)
+        print("\n" + "="*60)
+        print("BENCHMARK SUMMARY")
+        print("="*60)
+        print(results['status'].value_counts().to_string())
+        ok = results[results['status'] == 'ok']
+        if len(ok):
+            print(f"\nTotal median time: {ok['median_s'].sum():.2f}s over {len(ok)} reports; slowest:")
+            print(ok.nlargest(10, 'median_s')[['report', 'median_s', 'rows']].round(3).to_string(index=False))
+        causes = failure_causes(results)
+        if len(causes):
+            print(f"\nCoverage: {len(ok)} of {len(results)} reports measured; the rest by cause:")
+            print(causes.to_string())
+        print(f"\nResults saved to: {path}")
+        return
+
+    results = load_results(args.results_dir, args.scale)
+    if args.command == 'history':
+        if args.report:
+            results = results[results['report'].str.contains(args.report, regex=False)]
+        history = results[results['status'] == 'ok'].pivot_table(index='report', columns='commit', values='median_s', aggfunc='last')
+        print(history.round(3).to_string())
+        return
+
+    commits = args.commits or list(results.sort_values('run_at')['commit'].drop_duplicates())[-2:]
+    if len(commits) < 2:
+        print("Need results for two commits to compare")
+        return
+    comparison = compare_runs(results, commits[0], commits[1])
+    both = comparison.dropna(subset=['speedup'])
+    print("="*60)
+    print(f"{commits[0]} -> {commits[1]} ({args.scale})")
+    print("="*60)
+    with pd.option_context('display.width', 200):
+        print(comparison.round(3).to_string())
+    if len(both):
+        total = both['median_s_base'].sum() / both['median_s_head'].sum()
+        print(f"\nTotal speedup over {len(both)} reports: {total:.2f}x; "
+              f"{int((both['speedup'] > 1.1).sum())} faster, {int((both['speedup'] < 0.9).sum())} slower, "
+              f"{int(both['rows_changed'].sum())} with changed row counts")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Vectorized savings churn flags at one or many as-of dates
+Local replacement for the churn CTEs of main_segments.sql and churn_clients.sql.
+
+Input is savings accounts in the shape of SAVINGS_MODELS.BASE_SAVINGS_DATA built for the latest
+as-of date (client_id, account_id, creation_date, closeddate); accounts without a client_id or
+creation date are ignored. Accounts are sorted per client by
+creation date once, with the running maximum gap between consecutive accounts. At an as-of date R
+only accounts created on or before R count, and closures after R have not happened yet; then, as
+in the SQL:
+  - multi_account_gap       the client's largest gap between consecutive accounts is > 25 days
+  - single_account_closure  otherwise, an account was closed more than 25 days before R
+  - is_returned             the most recent account is open at R or closed less than 25 days before
+All as-of dates are evaluated as one (accounts x dates) array, in chunks of dates, so a year of
+week-ends is a single call.
+
+Usage:
+    python churn_engine.py ACCOUNTS_FILE [--as-of 2025-10-20 ...] [--start 2024-10-20] [--end 2025-10-20] [--freq W-SUN]
+                           [--output savings_churn.csv]
+"""
+
+import argparse
+import time
+
+import pandas as pd
+import numpy as np
+
+from par_engine import to_days
+
+CHURN_GAP_DAYS = 25
+NEVER = np.iinfo(np.int64).max
+NONE = np.iinfo(np.int64).min
+# Gaps are offset by client so one running maximum over all accounts never crosses clients
+CLIENT_OFFSET = 1 << 24
+
+class SavingsAccounts:
+    """Accounts sorted by client and creation day, with each client's running maximum gap"""
+
+    def __init__(self, accounts):
+        accounts = accounts.rename(columns=str.lower)
+        accounts = accounts[accounts['client_id'].notna() & accounts['creation_date'].notna()]
+        codes, self.client_ids = pd.factorize(accounts['client_id'])
+        created = to_days(accounts['creation_date'])
+        closed = pd.to_datetime(accounts['closeddate'])
+        closed = np.where(closed.isna(), NEVER, to_days(closed.fillna(pd.Timestamp(0))))
+
+        order = np.lexsort((created, codes))
+        self.codes, self.created, self.closed = codes[order], created[order], closed[order]
+        self.starts = np.flatnonzero(np.r_[True, self.codes[1:] != self.codes[:-1]])
+        first = np.zeros(len(order), dtype=bool)
+        first[self.starts] = True
+        gaps = np.where(first, -1, self.created - np.r_[self.created[:1], self.created[:-1]])
+        self.running_gap = np.maximum.accumulate(gaps + self.codes * CLIENT_OFFSET) - self.codes * CLIENT_OFFSET
+
+    def churn_at(self, days):
+        """Churn flags per (client, as-of day) for the clients with an account by that day"""
+        days = np.asarray(days, dtype=np.int64)[None, :]
+        created_by = self.created[:, None] <= days
+        accounts = np.add.reduceat(created_by, self.starts, axis=0)
+        has_account = accounts > 0
+        # Accounts are sorted by creation day, so those created by R are a prefix of the client's rows
+        latest = self.starts[:, None] + np.maximum(accounts, 1) - 1
+
+        max_gap = self.running_gap[latest]
+        multi = has_account & (max_gap > CHURN_GAP_DAYS)
+        closed_long_ago = created_by & (self.closed[:, None] <= days - CHURN_GAP_DAYS - 1)
+        last_closure = np.maximum.reduceat(np.where(closed_long_ago, self.closed[:, None], NONE), self.starts, axis=0)
+        single = has_account & ~multi & (last_closure != NONE)
+        latest_closed = self.closed[latest]
+        returned = has_account & ((latest_closed > days) | (days - latest_closed < CHURN_GAP_DAYS))
+
+        clients, dates = np.nonzero(has_account)
+        churn_type = np.select([multi, single], ['multi_account_gap', 'single_account_closure'], 'retained')
+        return pd.DataFrame({
+            'as_of_date': days[0, dates].astype('datetime64[D]'),
+            'client_id': self.client_ids[clients],
+            'accounts': accounts[clients, dates],
+            'max_gap_days': np.where(max_gap >= 0, max_gap, np.nan)[clients, dates],
+            'days_since_closed': np.where(single, days - last_closure, np.nan)[clients, dates],
+            'is_churned': (multi | single)[clients, dates],
+            'is_returned': returned[clients, dates],
+            'churn_type': churn_type[clients, dates],
+        })
+
+def savings_churn(accounts, as_of_dates, dates_per_chunk=8):
+    """Churn flags for every client with a savings account at every as-of date"""
+    engine = SavingsAccounts(accounts)
+    days = to_days(pd.DatetimeIndex(as_of_dates))
+    chunks = [engine.churn_at(days[i:i + dates_per_chunk]) for i in range(0, len(days), dates_per_chunk)]
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+
+def churn_summary(churn):
+    """Clients, churned clients by type and returned clients per as-of date"""
+    summary = churn.groupby('as_of_date').agg(
+        clients=('client_id', 'size'),
+        churned=('is_churned', 'sum'),
+        multi_account_gap=('churn_type', lambda types: (types == 'multi_account_gap').sum()),
+        single_account_closure=('churn_type', lambda types: (types == 'single_account_closure').sum()),
+        returned=('is_returned', 'sum'),
+    )
+    summary['churn_rate'] = summary['churned'] / summary['clients']
+    return summary.reset_index()
+
+def main():
+    parser = argparse.ArgumentParser(description="Savings churn flags at one or many as-of dates")
+    parser.add_argument('accounts', help="base_savings_data extract (CSV or Parquet)")
+    parser.add_argument('--as-of', nargs='*', default=None, help="As-of dates (default: every --freq date from --start to --end)")
+    parser.add_argument('--start', default=None, help="First as-of date (default: a year before --end)")
+    parser.add_argument('--end', default=None, help="Last as-of date (default: today)")
+    parser.add_argument('--freq', default='W-SUN', help="pandas frequency of the as-of dates")
+    parser.add_argument('--output', default='savings_churn.csv')
+    args = parser.parse_args()
+
+    if args.as_of:
+        as_of_dates = pd.DatetimeIndex(sorted(pd.to_datetime(args.as_of)))
+    else:
+        end = pd.Timestamp(args.end) if args.end else pd.Timestamp.today().normalize()
+        start = pd.Timestamp(args.start) if args.start else end - pd.DateOffset(years=1)
+        as_of_dates = pd.date_range(start, end, freq=args.freq)
+
+    read = pd.read_parquet if args.accounts.endswith('.parquet') else pd.read_csv
+    accounts = read(args.accounts)
+    print(f"Savings accounts: {len(accounts)}, as-of dates: {len(as_of_dates)}")
+
+    started = time.perf_counter()
+    churn = savings_churn(accounts, as_of_dates)
+    print(f"Evaluated {len(churn)} client-dates in {time.perf_counter() - started:.2f}s")
+
+    churn.to_csv(args.output, index=False)
+    print(f"Saved to: {args.output}")
+
+    print("\n" + "="*60)
+    print("CHURN SUMMARY")
+    print("="*60)
+    print(churn_summary(churn).round({"churn_rate": 4}).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
@@ -23,16 +23,15 @@ WITH client_industries AS (
         DATEDIFF(year, BIRTHDAY, CURRENT_DATE) AS Age,
         CASE 
             WHEN region IN ('Accra', 'Tema') THEN 'Greater Accra Region'
-            WHEN region = 'Brong-Ahafo Region' THEN 
-                CASE 
-                    WHEN RANDOM() <= 0.4652 THEN 'Bono Region'
-                    WHEN RANDOM() <= 0.7561 THEN 'Bono East Region'
-                    ELSE 'Ahafo Region'
-                END
+            -- Deterministic split of Brong-Ahafo (see region_allocation.py) so every run gives a client the same region
+            WHEN brong_ahafo_bucket < 4652 THEN 'Bono Region'
+            WHEN brong_ahafo_bucket < 7561 THEN 'Bono East Region'
+            WHEN brong_ahafo_bucket IS NOT NULL THEN 'Ahafo Region'
             ELSE region 
         END as region
-    FROM data.survey_data
-    QUALIFY ROW_NUMBER() OVER (PARTITION BY CLIENT_ID ORDER BY LOAN_DATE DESC) = 1
+    FROM ( select *, CASE WHEN region = 'Brong-Ahafo Region' THEN MOD(MD5_NUMBER_LOWER64('brong-ahafo:' || client_id::VARCHAR), 10000) END as brong_ahafo_bucket
+    from data.survey_data
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY CLIENT_ID ORDER BY LOAN_DATE DESC) = 1)
 ),
 
 national_id AS (
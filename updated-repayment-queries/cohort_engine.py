@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Incremental savings cohort engine over a client x day activity bitmap
+
+retention_analysis.sql, active_vs_closed_users_over_time.sql and new_returning_savers.sql rebuild
+cohort-style activity tables from the raw accounts and transactions for every {{time_period}}.
+Here one store (savings_cohorts.npz) keeps, per client:
+  - active   one bit per day with a savings transaction or an account opening
+  - opened   one bit per day with an account opening
+  - the first account opening (the client's cohort) and the latest account closure
+Bits are packed eight days to a byte, so a year of a million clients is ~46 MB per bitmap. Day,
+week (Monday start, as DATE_TRUNC('week')) and month periods are all OR-reductions of the same day
+bits, and the reports are array reductions over them:
+  - retention      clients of each cohort active k periods after it (the retention triangle)
+  - active_closed  clients with an account during the period (first opening <= period end and
+                   latest closure >= period start, as active_vs_closed_users_over_time.sql), of
+                   those now closed, and clients transacting in the period
+  - new_returning  clients opening their first account, and clients opening another account on a
+                   later day (same-day second accounts are not distinguished at day resolution)
+
+`update` adds accounts and transactions to the store: new clients and days extend it, bits are
+OR-ed and closures only move forward, so loading the latest period (or reloading an overlapping
+one) never needs a rebuild. The extracts are SAVINGS_MODELS.BASE_SAVINGS_DATA (client_id,
+creation_date, closeddate) and SAVINGS_MODELS.SAVINGS_TRANSACTIONS (client_id, transaction_date);
+rows without a client_id or date are ignored.
+
+Usage:
+    python cohort_engine.py update [--accounts base_savings_data.parquet] [--transactions savings_transactions.parquet]
+                                   [--store savings_cohorts.npz]
+    python cohort_engine.py report [--granularity week] [--start 2025-04-01] [--end 2025-10-20] [--store savings_cohorts.npz]
+                                   [--prefix savings_cohorts]
+"""
+
+import argparse
+import os
+import time
+
+import pandas as pd
+import numpy as np
+
+from par_engine import to_days
+
+STORE_FILE = 'savings_cohorts.npz'
+GRANULARITIES = {'day': 'D', 'week': 'W-SUN', 'month': 'M'}
+CHUNK_ROWS = 65536
+NEVER = np.iinfo(np.int64).max
+NONE = np.iinfo(np.int64).min
+
+def read_extract(path):
+    read = pd.read_parquet if path.endswith('.parquet') else pd.read_csv
+    return read(path).rename(columns=str.lower)
+
+class CohortStore:
+    """Packed client x day bitmaps plus each client's first opening and latest closure"""
+
+    def __init__(self, path=STORE_FILE):
+        self.path = path
+        self.client_ids = pd.Index([], dtype=object)
+        self.first_day, self.days = 0, 0
+        self.first_opened = np.empty(0, dtype=np.int64)
+        self.last_closed = np.empty(0, dtype=np.int64)
+        self.active = np.empty((0, 0), dtype=np.uint8)
+        self.opened = np.empty((0, 0), dtype=np.uint8)
+        if os.path.exists(path):
+            with np.load(path) as data:
+                self.client_ids = pd.Index(data['client_ids'].astype(object))
+                self.first_day, self.days = int(data['first_day']), int(data['days'])
+                self.first_opened, self.last_closed = data['first_opened'], data['last_closed']
+                self.active, self.opened = data['active'], data['opened']
+
+    def save(self):
+        temporary = self.path + '.tmp'
+        with open(temporary, 'wb') as f:
+            np.savez_compressed(f, client_ids=np.asarray(self.client_ids, dtype=str), first_day=self.first_day,
+                                days=self.days, first_opened=self.first_opened, last_closed=self.last_closed,
+                                active=self.active, opened=self.opened)
+        os.replace(temporary, self.path)
+
+    def rows(self, client_ids):
+        """Store rows of client_ids, appending clients not seen before"""
+        client_ids = pd.Index(client_ids.astype(str))
+        new = client_ids.unique().difference(self.client_ids)
+        if len(new):
+            self.client_ids = self.client_ids.append(new)
+            self.first_opened = np.r_[self.first_opened, np.full(len(new), NEVER)]
+            self.last_closed = np.r_[self.last_closed, np.full(len(new), NONE)]
+            self.active = np.pad(self.active, ((0, len(new)), (0, 0)))
+            self.opened = np.pad(self.opened, ((0, len(new)), (0, 0)))
+        return self.client_ids.get_indexer(client_ids)
+
+    def cover(self, days):
+        """Extend the day columns to include days"""
+        if not len(days):
+            return
+        start = min(days.min(), self.first_day) if self.days else days.min()
+        end = max(days.max() + 1, self.first_day + self.days)
+        if self.days and start < self.first_day:
+            # Back-filled history: re-pack with the new first day (appending days only pads bytes)
+            shift = ((0, 0), (self.first_day - start, 0))
+            self.active = np.packbits(np.pad(self.day_bits(self.active), shift), axis=1, bitorder='little')
+            self.opened = np.packbits(np.pad(self.day_bits(self.opened), shift), axis=1, bitorder='little')
+        self.first_day, self.days = int(start), int(end - start)
+        width = ((0, 0), (0, (self.days + 7) // 8 - self.active.shape[1]))
+        self.active, self.opened = np.pad(self.active, width), np.pad(self.opened, width)
+
+    def mark(self, bits, rows, days):
+        columns = days - self.first_day
+        np.bitwise_or.at(bits, (rows, columns >> 3), (1 << (columns & 7)).astype(np.uint8))
+
+    def update(self, accounts=None, transactions=None):
+        """Add accounts (new or newly closed) and transactions; returns the number of new clients"""
+        clients = len(self.client_ids)
+        if accounts is not None:
+            accounts = accounts[accounts['client_id'].notna() & accounts['creation_date'].notna()]
+            rows = self.rows(accounts['client_id'])
+            created = to_days(accounts['creation_date'])
+            self.cover(created)
+            self.mark(self.active, rows, created)
+            self.mark(self.opened, rows, created)
+            np.minimum.at(self.first_opened, rows, created)
+            closed = accounts['closeddate'].notna().to_numpy()
+            np.maximum.at(self.last_closed, rows[closed], to_days(accounts['closeddate'][closed]))
+        if transactions is not None:
+            transactions = transactions[transactions['client_id'].notna() & transactions['transaction_date'].notna()]
+            rows = self.rows(transactions['client_id'])
+            days = to_days(transactions['transaction_date'])
+            self.cover(days)
+            self.mark(self.active, rows, days)
+        return len(self.client_ids) - clients
+
+    def day_bits(self, bits):
+        return np.unpackbits(bits, axis=1, count=self.days, bitorder='little').astype(bool)
+
+    def periods(self, granularity):
+        """(column index where each period starts, period start dates, period end dates)"""
+        dates = pd.PeriodIndex(pd.date_range(pd.Timestamp(self.first_day, unit='D'), periods=self.days), freq=GRANULARITIES[granularity])
+        starts = np.flatnonzero(np.r_[True, dates[1:] != dates[:-1]])
+        periods = dates[starts]
+        return starts, periods.start_time.normalize(), periods.end_time.normalize()
+
+    def period_bits(self, bits, granularity, after=None, chunk_rows=CHUNK_ROWS):
+        """(row slice, clients x periods bits) per chunk of clients; after masks days up to each row's day"""
+        starts = self.periods(granularity)[0]
+        for start in range(0, len(self.client_ids), chunk_rows):
+            rows = slice(start, start + chunk_rows)
+            days = self.day_bits(bits[rows])
+            if after is not None:
+                days &= np.arange(self.days) > (after[rows] - self.first_day)[:, None]
+            yield rows, np.logical_or.reduceat(days, starts, axis=1)
+
+    def cohorts(self, granularity):
+        """Period index of each client's first account opening, -1 for clients without accounts"""
+        starts = self.periods(granularity)[0]
+        cohorts = np.searchsorted(starts, self.first_opened - self.first_day, side='right') - 1
+        return np.where(self.first_opened == NEVER, -1, cohorts)
+
+    def retention(self, granularity):
+        """Cohort size and the share of each cohort active 0, 1, ... periods after it"""
+        _, period_start, _ = self.periods(granularity)
+        count = len(period_start)
+        cohorts = self.cohorts(granularity)
+        active = np.zeros(count * count, dtype=np.int64)
+        for rows, bits in self.period_bits(self.active, granularity):
+            clients, periods = np.nonzero(bits)
+            cohort = cohorts[rows][clients]
+            offset = periods - cohort
+            keep = (cohort >= 0) & (offset >= 0)
+            active += np.bincount(cohort[keep] * count + offset[keep], minlength=count * count)
+        sizes = np.bincount(cohorts[cohorts >= 0], minlength=count)
+        shares = active.reshape(count, count) / np.maximum(sizes, 1)[:, None]
+        # Periods after the store's last day have not been observed yet
+        shares[np.arange(count)[:, None] + np.arange(count) >= count] = np.nan
+        triangle = pd.DataFrame(shares, columns=[str(offset) for offset in range(count)])
+        triangle.insert(0, 'cohort_size', sizes)
+        triangle.insert(0, 'cohort', period_start)
+        return triangle
+
+    def active_closed(self, granularity):
+        """Clients with an account in each period, those of them now closed, and transacting clients"""
+        _, period_start, period_end = self.periods(granularity)
+        starts, ends = to_days(period_start), to_days(period_end)
+        has_account = self.first_opened != NEVER
+        closed = has_account & (self.last_closed != NONE)
+        # A closure never precedes its account's opening, so closed < period start implies opened <= period end
+        closed_before = np.searchsorted(np.sort(self.last_closed[closed]), starts, side='left')
+        active = np.searchsorted(np.sort(self.first_opened[has_account]), ends, side='right') - closed_before
+        now_closed = np.searchsorted(np.sort(self.first_opened[closed]), ends, side='right') - closed_before
+        transacting = np.zeros(len(starts), dtype=np.int64)
+        for _, bits in self.period_bits(self.active, granularity):
+            transacting += bits.sum(axis=0)
+        return pd.DataFrame({
+            'period_start': period_start,
+            'period_end': period_end,
+            'total_active_users': active,
+            'active_users_still_active': active - now_closed,
+            'active_users_now_closed': now_closed,
+            'pct_active_users_now_closed': (100 * now_closed / np.maximum(active, 1)).round(2),
+            'transacting_users': transacting,
+        })
+
+    def new_returning(self, granularity):
+        """Clients opening their first account and clients opening another one, per period"""
+        _, period_start, _ = self.periods(granularity)
+        cohorts = self.cohorts(granularity)
+        returning = np.zeros(len(period_start), dtype=np.int64)
+        for _, bits in self.period_bits(self.opened, granularity, after=self.first_opened):
+            returning += bits.sum(axis=0)
+        return pd.DataFrame({
+            'period_start': period_start,
+            'new_clients': np.bincount(cohorts[cohorts >= 0], minlength=len(period_start)),
+            'returning_clients': returning,
+        })
+
+def main():
+    parser = argparse.ArgumentParser(description="Savings cohort retention, active/closed and new/returning clients")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    update_parser = subparsers.add_parser('update', help="Add accounts and transactions to the store")
+    update_parser.add_argument('--accounts', default=None, help="base_savings_data extract (CSV or Parquet)")
+    update_parser.add_argument('--transactions', default=None, help="savings_transactions extract (CSV or Parquet)")
+    report_parser = subparsers.add_parser('report', help="Cohort reports at a granularity")
+    report_parser.add_argument('--granularity', choices=list(GRANULARITIES), default='week')
+    report_parser.add_argument('--start', default=None, help="First period shown")
+    report_parser.add_argument('--end', default=None, help="Last period shown")
+    report_parser.add_argument('--prefix', default='savings_cohorts')
+    for subparser in subparsers.choices.values():
+        subparser.add_argument('--store', default=STORE_FILE)
+    args = parser.parse_args()
+
+    store = CohortStore(args.store)
+    if args.command == 'update':
+        if not args.accounts and not args.transactions:
+            parser.error("update needs --accounts and/or --transactions")
+        started = time.perf_counter()
+        accounts = read_extract(args.accounts) if args.accounts else None
+        transactions = read_extract(args.transactions) if args.transactions else None
+        new_clients = store.update(accounts, transactions)
+        store.save()
+        print(f"Updated {args.store} in {time.perf_counter() - started:.2f}s: {new_clients} new clients, "
+              f"{len(store.client_ids)} clients over {store.days} days, {os.path.getsize(args.store) / 1e6:.1f} MB")
+        return
+
+    if not store.days:
+        print(f"{args.store} is empty; run update first")
+        return
+    started = time.perf_counter()
+    reports = {
+        'retention': store.retention(args.granularity),
+        'active_closed': store.active_closed(args.granularity),
+        'new_returning': store.new_returning(args.granularity),
+    }
+    print(f"Built {args.granularity} reports for {len(store.client_ids)} clients in {time.perf_counter() - started:.2f}s")
+
+    for name, report in reports.items():
+        dates = report.iloc[:, 0]
+        shown = report[(dates >= pd.Timestamp(args.start or dates.min())) & (dates <= pd.Timestamp(args.end or dates.max()))]
+        path = f"{args.prefix}_{args.granularity}_{name}.csv"
+        shown.to_csv(path, index=False)
+        print("\n" + "="*60)
+        print(f"{name.upper().replace('_', ' ')} ({args.granularity}) -> {path}")
+        print("="*60)
+        if name == 'retention':
+            shown = shown.iloc[:, :8]
+        print(shown.tail(12).to_string(index=False, float_format='{:.3f}'.format))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,519 @@
+#!/usr/bin/env python3
+"""
+Snowflake to DuckDB translation layer, with a compatibility report
+
+The reports are written for Snowflake, so none of them run on a laptop as they stand. Every file is
+parsed with sqlglot (Snowflake dialect) and generated as DuckDB SQL. sqlglot already maps QUALIFY,
+DATEADD / DATEDIFF with units, SEQ4() / TABLE(GENERATOR()), LAST_DAY, IFF, NVL and REGEXP_SUBSTR;
+the constructs it gets wrong or leaves alone are rewritten here first:
+  - PARSE_JSON(x):field[::type]   ->> (text) instead of -> (JSON), so values compare and cast
+                                  like Snowflake's VARIANT instead of keeping their JSON quotes
+  - TO_TIMESTAMP_NTZ / _LTZ / _TZ CAST(... AS TIMESTAMP[TZ]), TO_TIMESTAMP for epoch numbers,
+                                  STRPTIME when a format is given
+  - TO_CHAR(date, 'YYYYMMDD')     STRFTIME with the format converted
+  - CONDITIONAL_TRUE_EVENT(cond)  running SUM(CASE WHEN cond THEN 1 ELSE 0 END) over the window
+  - PERCENTILE_CONT(q) WITHIN GROUP (ORDER BY x)   QUANTILE_CONT(x, q)
+  - MD5_NUMBER_LOWER64(x)         CAST('0x' || RIGHT(MD5(x), 16) AS UBIGINT), same for _UPPER64
+  - SUM(CASE ... monthb ...)      an alias of the same SELECT read inside an aggregate is inlined
+  - SEQ4() ... HAVING month_end   SEQ4() outside TABLE(GENERATOR()) becomes a window function, so
+                                  the HAVING moves to a WHERE around the aggregate query
+  - WITH cte AS (... cte ...)     WITH RECURSIVE (Snowflake infers it, DuckDB needs the keyword)
+  - FROM t at, asc.amount         aliases that are DuckDB keywords are quoted
+  - GHANA_PROD.MAMBU.X            MAMBU.X: catalogs are stripped (or renamed with --catalog), so
+                                  the SQL resolves against a local database or Parquet extracts
+Whatever is still not expressible (LATERAL FLATTEN, functions DuckDB does not have, arguments
+the generator drops) is listed per file with its line in the compatibility report, which can also
+EXPLAIN every translated statement against a local database to catch the rest.
+
+Redash {{ parameters }} survive translation, so translated files can be run with report_runner.
+'run' executes a report against Parquet extracts laid out as <extracts>/<schema>/<table>/ (a
+dataset directory, e.g. from arrow_export.py, hive partitions allowed) or
+<extracts>/<schema>/<table>.parquet, each exposed as the view <schema>.<table>.
+
+Usage:
+    python dialect_translate.py translate REPORT.sql [REPORT.sql ...] [--output-dir duckdb_sql] [--catalog UG_PROD=GHANA_PROD]
+    python dialect_translate.py report [PATH ...] [--check DATABASE | --extracts extracts] [--output compat.csv]
+    python dialect_translate.py run REPORT.sql --extracts extracts [--param name=value ...] [--output result.csv]
+"""
+
+import argparse
+import functools
+import glob
+import logging
+import os
+import re
+import time
+
+import pandas as pd
+
+from sql_analyser import node_line, sql_files
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT_DIR = 'duckdb_sql'
+PLACEHOLDER = re.compile(r"\{\{[^{}]*\}\}")
+SENTINEL = re.compile(r"__param(\d+)__", re.IGNORECASE)
+
+# Snowflake-only constructs counted per file for the report (comments excluded)
+CONSTRUCTS = {
+    'QUALIFY': r"\bQUALIFY\b",
+    'DATEADD': r"\bDATEADD\s*\(",
+    'DATEDIFF': r"\bDATEDIFF\s*\(",
+    'SEQ4/GENERATOR': r"\b(?:SEQ[1248]|GENERATOR)\s*\(",
+    'LAST_DAY': r"\bLAST_DAY\s*\(",
+    'PARSE_JSON path': r"\bPARSE_JSON\s*\([^()]*\)\s*:",
+    'IFF': r"\bIFF\s*\(",
+    'NVL': r"\bNVL2?\s*\(",
+    'REGEXP_SUBSTR': r"\bREGEXP_SUBSTR\s*\(",
+    'TO_TIMESTAMP_NTZ': r"\bTO_TIMESTAMP_(?:NTZ|LTZ|TZ)\s*\(",
+    'TO_CHAR': r"\bTO_(?:CHAR|VARCHAR)\s*\(",
+    'CONDITIONAL_TRUE_EVENT': r"\bCONDITIONAL_(?:TRUE_)?EVENT\s*\(",
+    'FLATTEN': r"\bFLATTEN\s*\(",
+}
+COMMENTS = re.compile(r"('(?:[^']|'')*')|--[^\n]*|/\*.*?\*/", re.DOTALL)
+
+@functools.lru_cache(maxsize=None)
+def duckdb_names(query):
+    """Lower-case first column of a query on DuckDB's own catalog (functions, keywords)"""
+    import duckdb
+    connection = duckdb.connect()
+    try:
+        return frozenset(name.lower() for name, in connection.execute(query).fetchall())
+    finally:
+        connection.close()
+
+def duckdb_functions():
+    return duckdb_names("SELECT DISTINCT function_name FROM duckdb_functions()")
+
+def duckdb_keywords():
+    """Keywords DuckDB does not accept as bare table aliases or qualifiers (asc, at, join, ...)"""
+    return duckdb_names("SELECT keyword_name FROM duckdb_keywords() WHERE keyword_category IN ('reserved', 'type_function')")
+
+def count_constructs(sql):
+    """{construct: occurrences} of the Snowflake-only constructs in sql"""
+    text = COMMENTS.sub(lambda match: match.group(1) or ' ', sql)
+    counts = {name: len(re.findall(pattern, text, re.IGNORECASE)) for name, pattern in CONSTRUCTS.items()}
+    return {name: count for name, count in counts.items() if count}
+
+def issue(node, construct, severity, detail):
+    return {'line': node_line(node) if node is not None else None, 'construct': construct, 'severity': severity, 'detail': detail}
+
+def rewrite_json_paths(tree):
+    """PARSE_JSON(x):a:b -> JSON(x) ->> '$.a.b': Snowflake's path extraction yields a scalar VARIANT"""
+    from sqlglot import exp
+    issues = []
+    for node in list(tree.find_all(exp.JSONExtract)):
+        if not node.args.get('variant_extract') or node.find_ancestor(exp.Explode):
+            continue
+        issues.append(issue(node, 'PARSE_JSON path', 'rewritten', f"{node.sql('snowflake')} -> ->> (text)"))
+        node.replace(exp.JSONExtractScalar(this=node.this, expression=node.expression))
+    return issues
+
+def rewrite_timestamps(tree):
+    """TO_TIMESTAMP_NTZ / _LTZ / _TZ, which DuckDB does not have"""
+    from sqlglot import exp
+    from sqlglot.dialects.snowflake import Snowflake
+    from sqlglot.time import format_time
+    issues = []
+    for node in list(tree.find_all(exp.Anonymous)):
+        name = node.name.upper()
+        if name not in ('TO_TIMESTAMP_NTZ', 'TO_TIMESTAMP_LTZ', 'TO_TIMESTAMP_TZ') or not node.expressions:
+            continue
+        value, *rest = node.expressions
+        target = 'TIMESTAMP' if name == 'TO_TIMESTAMP_NTZ' else 'TIMESTAMPTZ'
+        if rest and rest[0].is_string:
+            converted = format_time(rest[0].name, Snowflake.TIME_MAPPING, Snowflake.TIME_TRIE)
+            replacement = exp.StrToTime(this=value, format=exp.Literal.string(converted))
+        elif rest and rest[0].is_int:
+            replacement = exp.UnixToTime(this=value, scale=rest[0])
+        elif value.is_number:
+            replacement = exp.UnixToTime(this=value)
+        else:
+            replacement = exp.Cast(this=value, to=exp.DataType.build(target))
+        issues.append(issue(node, 'TO_TIMESTAMP_NTZ', 'rewritten', f"{name} -> {replacement.sql('duckdb')}"))
+        node.replace(replacement)
+    return issues
+
+def rewrite_to_char(tree):
+    """TO_CHAR(date, format) -> STRFTIME; numeric formats ('999,999') have no DuckDB equivalent"""
+    from sqlglot import exp
+    from sqlglot.dialects.snowflake import Snowflake
+    from sqlglot.time import format_time
+    issues = []
+    for node in list(tree.find_all(exp.ToChar)):
+        fmt = node.args.get('format')
+        if fmt is None:
+            continue
+        converted = format_time(fmt.name, Snowflake.TIME_MAPPING, Snowflake.TIME_TRIE) if fmt.is_string else None
+        if not converted or '%' not in converted:
+            issues.append(issue(node, 'TO_CHAR', 'untranslatable', f"format {fmt.sql('snowflake')} is not a date format"))
+            continue
+        issues.append(issue(node, 'TO_CHAR', 'rewritten', f"{fmt.sql('snowflake')} -> STRFTIME '{converted}'"))
+        node.replace(exp.TimeToStr(this=node.this, format=exp.Literal.string(converted)))
+    return issues
+
+def rewrite_conditional_events(tree):
+    """CONDITIONAL_TRUE_EVENT(cond) OVER (...) counts the rows so far (inclusive) where cond held"""
+    from sqlglot import exp
+    issues = []
+    for node in list(tree.find_all(exp.Anonymous)):
+        if node.name.upper() != 'CONDITIONAL_TRUE_EVENT' or not isinstance(node.parent, exp.Window):
+            continue
+        window = node.parent
+        issues.append(issue(node, 'CONDITIONAL_TRUE_EVENT', 'rewritten', "-> running SUM(CASE WHEN ...) over the window"))
+        node.replace(exp.Sum(this=exp.If(this=node.expressions[0], true=exp.Literal.number(1), false=exp.Literal.number(0))))
+        window.set('spec', exp.WindowSpec(kind='ROWS', start='UNBOUNDED', start_side='PRECEDING', end='CURRENT ROW'))
+    return issues
+
+def rewrite_percentiles(tree):
+    """PERCENTILE_CONT(q) WITHIN GROUP (ORDER BY x) -> QUANTILE_CONT(x, q); sqlglot emits invalid SQL for it"""
+    from sqlglot import exp
+    issues = []
+    for node in list(tree.find_all(exp.WithinGroup)):
+        percentile, order = node.this, node.expression
+        if not isinstance(percentile, (exp.PercentileCont, exp.PercentileDisc)) or not isinstance(order, exp.Order) \
+                or len(order.expressions) != 1:
+            continue
+        ordered = order.expressions[0]
+        quantile = exp.Sub(this=exp.Literal.number(1), expression=percentile.this) if ordered.args.get('desc') else percentile.this
+        name = 'QUANTILE_CONT' if isinstance(percentile, exp.PercentileCont) else 'QUANTILE_DISC'
+        issues.append(issue(node, 'WITHIN GROUP', 'rewritten', f"{percentile.sql('snowflake')} WITHIN GROUP -> {name}"))
+        node.replace(exp.Anonymous(this=name, expressions=[ordered.this, quantile]))
+    return issues
+
+def rewrite_md5_numbers(tree):
+    """MD5_NUMBER_LOWER64 / _UPPER64 -> the hex digest's half cast to UBIGINT (DuckDB's md5_number is byte-swapped)"""
+    from sqlglot import exp
+    issues = []
+    for node in list(tree.find_all(exp.MD5NumberLower64, exp.MD5NumberUpper64)):
+        half = 'RIGHT' if isinstance(node, exp.MD5NumberLower64) else 'LEFT'
+        digest = exp.Anonymous(this=half, expressions=[exp.MD5(this=node.this), exp.Literal.number(16)])
+        replacement = exp.Cast(this=exp.DPipe(this=exp.Literal.string('0x'), expression=digest), to=exp.DataType.build('UBIGINT', dialect='duckdb'))
+        issues.append(issue(node, 'MD5_NUMBER', 'rewritten', f"{node.sql('snowflake')} -> {replacement.sql('duckdb')}"))
+        node.replace(replacement)
+    return issues
+
+def rewrite_lateral_aliases(tree):
+    """Aliases read inside an aggregate of the same SELECT (SUM(... monthb ...)), which DuckDB does not resolve"""
+    from sqlglot import exp
+    issues = []
+    for select in list(tree.find_all(exp.Select)):
+        # An alias whose definition reads a column of the same name (COALESCE(x, 0) AS x) shadows a source column
+        aliases = {projection.alias.lower(): projection.this for projection in select.expressions
+                   if isinstance(projection, exp.Alias)
+                   and not any(column.name.lower() == projection.alias.lower() for column in projection.this.find_all(exp.Column))}
+        for column in list(select.find_all(exp.Column)):
+            name = column.name.lower()
+            if column.table or name not in aliases or column.parent_select is not select:
+                continue
+            aggregate = column.find_ancestor(exp.AggFunc, exp.Select)
+            if not isinstance(aggregate, exp.AggFunc) or isinstance(aggregate.parent, exp.Window):
+                continue
+            definition = aliases[name]
+            if definition.find(exp.AggFunc, exp.Window):
+                issues.append(issue(column, 'lateral alias', 'untranslatable',
+                                    f"{column.name} is an aggregate of the same SELECT and cannot be nested in {aggregate.key.upper()}"))
+                continue
+            issues.append(issue(column, 'lateral alias', 'rewritten', f"{column.name} inside {aggregate.key.upper()} -> {definition.sql('duckdb')}"))
+            column.replace(definition.copy())
+    return issues
+
+def rewrite_sequences(tree):
+    """
+    SEQ4() outside TABLE(GENERATOR()) is generated as ROW_NUMBER() OVER (), which DuckDB does not allow
+    in WHERE, GROUP BY or HAVING. A HAVING over the output columns of an aggregate query (the month
+    spines' HAVING month_end <= CURRENT_DATE) moves to a WHERE around it; anything else is listed.
+    """
+    from sqlglot import exp
+    sequences = (exp.Seq1, exp.Seq2, exp.Seq4, exp.Seq8)
+    issues = []
+    for select in list(tree.find_all(exp.Select)):
+        source = select.args.get('from_')
+        if source is not None and isinstance(source.this, exp.TableFromRows):
+            continue
+        nodes = [node for node in select.find_all(*sequences) if node.parent_select is select]
+        if not nodes:
+            continue
+        name = nodes[0].key.upper()
+        carriers = {projection.alias_or_name.lower() for projection in select.expressions if projection.find(*sequences)}
+        for key in ('where', 'group', 'qualify'):
+            clause = select.args.get(key)
+            if clause is not None and (clause.find(*sequences) or any(column.name.lower() in carriers for column in clause.find_all(exp.Column))):
+                issues.append(issue(clause, name, 'untranslatable', f"{name}() outside TABLE(GENERATOR()) is used in {key.upper()}"))
+        having = select.args.get('having')
+        if having is None or not (having.find(*sequences) or any(column.name.lower() in carriers for column in having.find_all(exp.Column))):
+            continue
+        outputs = {output.lower() for output in select.named_selects}
+        if having.find(exp.AggFunc, *sequences) or any(column.table or column.name.lower() not in outputs for column in having.find_all(exp.Column)):
+            issues.append(issue(having, name, 'untranslatable', f"HAVING over {name}() reads more than the output columns"))
+            continue
+        inner = select.copy()
+        for key in ('with_', 'having', 'order', 'limit', 'offset'):
+            inner.set(key, None)
+        for key in list(select.args):
+            if key not in ('with_', 'order', 'limit', 'offset'):
+                select.set(key, None)
+        select.set('expressions', [exp.Star()])
+        select.set('from_', exp.From(this=inner.subquery('sequenced')))
+        select.set('where', exp.Where(this=having.this))
+        issues.append(issue(nodes[0], name, 'rewritten', f"HAVING with {name}() -> WHERE around the aggregate query"))
+    return issues
+
+def quote_keywords(tree):
+    """Quote identifiers that are keywords in DuckDB but not in Snowflake (FROM x at, asc.amount)"""
+    from sqlglot import exp
+    keywords = duckdb_keywords()
+    quoted = set()
+    for identifier in tree.find_all(exp.Identifier):
+        if not identifier.quoted and identifier.name.lower() in keywords:
+            identifier.set('quoted', True)
+            quoted.add(identifier.name)
+    return [issue(None, 'keyword identifier', 'rewritten', f"{name} quoted") for name in sorted(quoted)]
+
+def rewrite_recursive_ctes(tree):
+    """Mark WITH clauses RECURSIVE when a CTE reads itself"""
+    from sqlglot import exp
+    issues = []
+    for with_ in tree.find_all(exp.With):
+        if with_.args.get('recursive'):
+            continue
+        for cte in with_.expressions:
+            name = cte.alias_or_name.lower()
+            if any(table.name.lower() == name and not table.db for table in cte.this.find_all(exp.Table)):
+                with_.set('recursive', True)
+                issues.append(issue(cte, 'recursive CTE', 'rewritten', f"{cte.alias_or_name} reads itself -> WITH RECURSIVE"))
+                break
+    return issues
+
+def rewrite_catalogs(tree, catalogs=None):
+    """Drop database names (UG_PROD.MAMBU.X -> MAMBU.X), or rename those listed in catalogs"""
+    from sqlglot import exp
+    renamed = set()
+    for table in tree.find_all(exp.Table):
+        catalog = table.catalog
+        if not catalog:
+            continue
+        target = (catalogs or {}).get(catalog.upper())
+        table.set('catalog', exp.to_identifier(target) if target else None)
+        renamed.add(f"{catalog.upper()} -> {target or '(default)'}")
+    return [issue(None, 'catalog', 'rewritten', change) for change in sorted(renamed)]
+
+def find_untranslatable(tree):
+    """Constructs with no DuckDB equivalent that the generator would pass through silently"""
+    from sqlglot import exp
+    issues = []
+    for node in tree.find_all(exp.Lateral):
+        if isinstance(node.this, exp.Explode):
+            issues.append(issue(node, 'FLATTEN', 'untranslatable', "LATERAL FLATTEN has no DuckDB equivalent; rewrite with UNNEST"))
+    known = duckdb_functions()
+    for node in tree.find_all(exp.Anonymous):
+        if node.name.lower() not in known:
+            issues.append(issue(node, node.name.upper(), 'untranslatable', f"function {node.name.upper()} does not exist in DuckDB"))
+    return issues
+
+REWRITES = [rewrite_json_paths, rewrite_timestamps, rewrite_to_char, rewrite_conditional_events, rewrite_percentiles,
+            rewrite_md5_numbers, rewrite_lateral_aliases, rewrite_sequences, rewrite_recursive_ctes, quote_keywords]
+
+def translate(sql, catalogs=None):
+    """(DuckDB statements, issues) for Snowflake sql; {{ parameters }} are kept as they are"""
+    import sqlglot
+    from sqlglot.dialects.dialect import Dialect
+    from sqlglot.errors import ErrorLevel, ParseError
+    logging.getLogger('sqlglot').setLevel(logging.CRITICAL)
+    placeholders = PLACEHOLDER.findall(sql)
+    counter = iter(range(len(placeholders)))
+    masked = PLACEHOLDER.sub(lambda match: f"__param{next(counter)}__", sql)
+    try:
+        trees = [tree for tree in sqlglot.parse(masked, read='snowflake') if tree is not None]
+    except ParseError as e:
+        error = e.errors[0] if e.errors else {}
+        return [], [{'line': error.get('line'), 'construct': 'parse', 'severity': 'parse_error',
+                     'detail': (error.get('description') or str(e)).splitlines()[0][:200]}]
+    statements, issues = [], []
+    for tree in trees:
+        for rewrite in REWRITES:
+            issues.extend(rewrite(tree))
+        issues.extend(rewrite_catalogs(tree, catalogs))
+        issues.extend(find_untranslatable(tree))
+        generator = Dialect.get_or_raise('duckdb').generator(unsupported_level=ErrorLevel.IGNORE, pretty=True)
+        statement = generator.generate(tree)
+        issues.extend(issue(None, 'unsupported', 'untranslatable', message) for message in generator.unsupported_messages)
+        statements.append(SENTINEL.sub(lambda match: placeholders[int(match.group(1))], statement))
+    return statements, issues
+
+def attach_extracts(backend, extracts_dir):
+    """Create a <schema>.<table> view over every Parquet dataset under extracts_dir; returns the view names"""
+    views = []
+    for schema in sorted(os.listdir(extracts_dir)):
+        schema_dir = os.path.join(extracts_dir, schema)
+        if not os.path.isdir(schema_dir):
+            continue
+        backend.execute(f'CREATE SCHEMA IF NOT EXISTS "{schema}"')
+        for entry in sorted(os.listdir(schema_dir)):
+            path = os.path.join(schema_dir, entry)
+            if os.path.isdir(path):
+                table, pattern = entry, os.path.join(path, '**', '*.parquet')
+            elif entry.endswith('.parquet'):
+                table, pattern = entry[:-len('.parquet')], path
+            else:
+                continue
+            if not glob.glob(pattern, recursive=True):
+                continue
+            backend.execute(f'CREATE OR REPLACE VIEW "{schema}"."{table}" AS '
+                            f"SELECT * FROM read_parquet('{pattern}', hive_partitioning = true, union_by_name = true)")
+            views.append(f"{schema}.{table}")
+    return views
+
+def local_backend(database=None, extracts_dir=None):
+    """DuckDB backend over a local database file (read only) or in memory over Parquet extracts"""
+    from report_runner import DuckDBBackend
+    if database:
+        return DuckDBBackend(database, read_only=True)
+    backend = DuckDBBackend()
+    if extracts_dir:
+        attach_extracts(backend, extracts_dir)
+    return backend
+
+def inline_parameters(statements, values):
+    """Statements with their {{ parameters }} replaced by validated values"""
+    from query_params import QueryTemplate
+    return [QueryTemplate(statement).inline(values) for statement in statements]
+
+def check(backend, statements):
+    """First error DuckDB raises when planning the statements, or None"""
+    for statement in statements:
+        try:
+            backend.execute(f"EXPLAIN {statement}")
+        except Exception as e:
+            return f"{type(e).__name__}: {str(e).splitlines()[0][:200]}"
+    return None
+
+def compatibility_report(paths, catalogs=None, backend=None):
+    """One row per file: constructs found, rewrites, untranslatable constructs and (with backend) plan errors"""
+    records = []
+    for path in sql_files(paths):
+        with open(path, errors='replace') as f:
+            sql = f.read()
+        statements, issues = translate(sql, catalogs)
+        problems = [item for item in issues if item['severity'] != 'rewritten']
+        record = {
+            'file': os.path.relpath(path, REPO_ROOT),
+            'status': 'parse_error' if not statements else ('untranslatable' if problems else 'translated'),
+            'statements': len(statements),
+            'constructs': ', '.join(f"{name} x{count}" for name, count in count_constructs(sql).items()),
+            'rewritten': sum(item['severity'] == 'rewritten' for item in issues),
+            'untranslatable': '; '.join(f"line {item['line'] or '?'}: {item['construct']} - {item['detail']}" for item in problems),
+            'check_error': None,
+        }
+        if backend is not None and statements:
+            # Parameters get the benchmark suite's fixed values so the plan can be built
+            from bench_suite import default_values
+            from query_params import QueryTemplate
+            from savings_models import REF, TARGET_SCHEMA
+            # Savings models read each other through {{ ref('model') }}
+            schema = TARGET_SCHEMA.split('.')[-1]
+            statements = [REF.sub(lambda match: f"{schema}.{match.group(1).upper()}", statement) for statement in statements]
+            try:
+                values = default_values(QueryTemplate(';\n'.join(statements)))
+                record['check_error'] = check(backend, inline_parameters(statements, values))
+            except ValueError as e:
+                record['check_error'] = f"ValueError: {e}"
+            if record['check_error'] and record['status'] == 'translated':
+                record['status'] = 'check_failed'
+        records.append(record)
+    return pd.DataFrame(records)
+
+def parse_catalogs(values):
+    """['UG_PROD=GHANA_PROD'] -> {'UG_PROD': 'GHANA_PROD'}"""
+    return {name.strip().upper(): target.strip() for name, _, target in (value.partition('=') for value in values or [])}
+
+def main():
+    from report_runner import parse_params
+
+    parser = argparse.ArgumentParser(description="Translate Snowflake reports to DuckDB SQL")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    translate_parser = subparsers.add_parser('translate', help="Write DuckDB versions of SQL files")
+    translate_parser.add_argument('files', nargs='+')
+    translate_parser.add_argument('--output-dir', default=OUTPUT_DIR)
+    report_parser = subparsers.add_parser('report', help="Compatibility report for every SQL file")
+    report_parser.add_argument('paths', nargs='*', default=[REPO_ROOT])
+    report_parser.add_argument('--check', default=None, metavar='DATABASE', help="EXPLAIN translated statements against a DuckDB file")
+    report_parser.add_argument('--extracts', default=None, help="EXPLAIN against Parquet extracts instead")
+    report_parser.add_argument('--output', default='compat.csv')
+    run_parser = subparsers.add_parser('run', help="Run a report on Parquet extracts or a local database")
+    run_parser.add_argument('file')
+    run_parser.add_argument('--extracts', default=None)
+    run_parser.add_argument('--database', default=None)
+    run_parser.add_argument('--param', nargs='*', default=[], help="name=value")
+    run_parser.add_argument('--output', default=None, help="CSV for the result (default: print the first rows)")
+    for subparser in subparsers.choices.values():
+        subparser.add_argument('--catalog', nargs='*', default=[], help="FROM=TO catalog renames (default: strip catalogs)")
+    args = parser.parse_args()
+    catalogs = parse_catalogs(args.catalog)
+
+    if args.command == 'translate':
+        os.makedirs(args.output_dir, exist_ok=True)
+        for path in args.files:
+            with open(path, errors='replace') as f:
+                statements, issues = translate(f.read(), catalogs)
+            target = os.path.join(args.output_dir, os.path.basename(path))
+            if statements:
+                with open(target, 'w') as f:
+                    f.write(';\n\n'.join(statements) + ';\n')
+            rewritten = sum(item['severity'] == 'rewritten' for item in issues)
+            print(f"{path} -> {target if statements else '(not written)'}: {rewritten} rewrites")
+            for item in issues:
+                if item['severity'] != 'rewritten':
+                    print(f"  line {item['line'] or '?'}: {item['severity']} {item['construct']} - {item['detail']}")
+        return
+
+    if args.command == 'report':
+        backend = local_backend(args.check, args.extracts) if args.check or args.extracts else None
+        try:
+            report = compatibility_report(args.paths, catalogs, backend)
+        finally:
+            if backend:
+                backend.close()
+        report.to_csv(args.output, index=False)
+        print("="*60)
+        print("COMPATIBILITY REPORT")
+        print("="*60)
+        print(report['status'].value_counts().to_string())
+        problems = report[report['status'] != 'translated']
+        if len(problems):
+            print("\nFiles needing attention:")
+            for _, row in problems.iterrows():
+                print(f"  {row['status']:>14}  {row['file']}: {row['untranslatable'] or row['check_error']}")
+        print(f"\nReport saved to: {args.output}")
+        return
+
+    with open(args.file, errors='replace') as f:
+        statements, issues = translate(f.read(), catalogs)
+    problems = [item for item in issues if item['severity'] != 'rewritten']
+    for item in problems:
+        print(f"  line {item['line'] or '?'}: {item['severity']} {item['construct']} - {item['detail']}")
+    if not statements:
+        raise SystemExit(f"{args.file} could not be translated")
+    try:
+        statements = inline_parameters(statements, parse_params(args.param))
+    except ValueError as e:
+        raise SystemExit(f"{args.file}: {e} (pass it with --param)")
+    backend = local_backend(args.database, args.extracts)
+    try:
+        started = time.perf_counter()
+        with backend.session():
+            for statement in statements[:-1]:
+                backend.execute(statement)
+            result = backend.execute(statements[-1])
+        seconds = time.perf_counter() - started
+    finally:
+        backend.close()
+    print(f"{args.file}: {len(result):,} rows in {seconds:.2f}s")
+    if args.output:
+        result.to_csv(args.output, index=False)
+        print(f"Saved to: {args.output}")
+    else:
+        with pd.option_context('display.width', 200, 'display.max_columns', 20):
+            print(result.head(20).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
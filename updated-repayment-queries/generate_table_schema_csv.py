@@ -3,6 +3,9 @@ import snowflake.connector
 import os
 from datetime import datetime
 
+from report_runner import SnowflakeBackend
+from schema_catalog import SchemaCatalog
+
 # Database connection parameters (you'll need to update these)
 DB_CONFIG = {
     'user': os.getenv('SNOWFLAKE_USER', 'your_username'),
@@ -23,78 +26,79 @@ def connect_to_snowflake():
         print(f"Error connecting to Snowflake: {e}")
         return None
 
-def get_table_schema(conn, table_name):
-    """Get schema information for a specific table"""
-    query = f"""
-    SELECT 
-        column_name AS "ColumnName",
-        data_type AS "DataType",
-        character_maximum_length AS "MaxLength",
-        is_nullable AS "IsNullable",
-        column_default AS "DefaultValue",
-        ordinal_position AS "ColumnOrder",
-        CASE 
-            WHEN table_schema = 'ml' THEN 'ml.loan_info_tbl'
-            WHEN table_schema = 'mambu' THEN 'mambu.client'
-        END AS "TableName"
-    FROM information_schema.columns 
-    WHERE table_name = '{table_name.split('.')[-1]}'
-        AND table_schema = '{table_name.split('.')[0]}'
-    ORDER BY ordinal_position
-    """
-    
-    try:
-        df = pd.read_sql(query, conn)
-        return df
-    except Exception as e:
-        print(f"Error executing query for {table_name}: {e}")
-        return pd.DataFrame()
+def get_catalog(conn, refresh=False):
+    """Columns of every schema the repository's SQL touches - one information_schema query, cached locally"""
+    return SchemaCatalog().refresh(SnowflakeBackend(conn), force=refresh)
 
-def generate_csv_report():
-    """Generate CSV report with table schemas"""
+def to_report_columns(catalog):
+    """Catalog rows in the column layout of the schema report"""
+    return pd.DataFrame({
+        'TableName': (catalog['TABLE_SCHEMA'] + '.' + catalog['TABLE_NAME']).str.lower(),
+        'ColumnName': catalog['COLUMN_NAME'],
+        'DataType': catalog['DATA_TYPE'],
+        'MaxLength': catalog['CHARACTER_MAXIMUM_LENGTH'],
+        'IsNullable': catalog['IS_NULLABLE'],
+        'DefaultValue': catalog['COLUMN_DEFAULT'],
+        'ColumnOrder': catalog['ORDINAL_POSITION'],
+        'Database': catalog['TABLE_CATALOG'],
+    }).reset_index(drop=True)
+
+def get_table_schema(conn, table_name, catalog=None):
+    """Get schema information for a specific table (from the bulk catalog)"""
+    if catalog is None:
+        catalog, _ = get_catalog(conn)
+    parts = table_name.upper().split('.')
+    rows = catalog[(catalog['TABLE_SCHEMA'] == parts[-2]) & (catalog['TABLE_NAME'] == parts[-1])]
+    if len(parts) == 3:
+        rows = rows[rows['TABLE_CATALOG'] == parts[0]]
+    return to_report_columns(rows)
+
+def generate_csv_report(refresh=False):
+    """Generate CSV report with the schemas of every table the repository touches"""
     conn = connect_to_snowflake()
     if not conn:
         return
     
     try:
-        # Get schema for both tables
-        loan_info_schema = get_table_schema(conn, 'ml.loan_info_tbl')
-        client_schema = get_table_schema(conn, 'mambu.client')
+        # One bulk information_schema query (or the cached snapshot when it is fresh)
+        catalog, diff = get_catalog(conn, refresh)
+        schema_report = to_report_columns(catalog)
         
         # Create timestamp for filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"table_schema_report_{timestamp}.csv"
         
-        # Combine both schemas
-        combined_schema = pd.concat([loan_info_schema, client_schema], ignore_index=True)
-        
         # Add additional metadata
-        combined_schema['GeneratedDate'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        combined_schema['Description'] = ''  # Placeholder for manual descriptions
+        schema_report['GeneratedDate'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        schema_report['Description'] = ''  # Placeholder for manual descriptions
         
         # Reorder columns for better readability
         column_order = [
-            'TableName', 'ColumnName', 'DataType', 'MaxLength', 
+            'Database', 'TableName', 'ColumnName', 'DataType', 'MaxLength', 
             'IsNullable', 'DefaultValue', 'ColumnOrder', 'Description', 'GeneratedDate'
         ]
-        combined_schema = combined_schema[column_order]
+        schema_report = schema_report[column_order]
         
         # Save to CSV
-        combined_schema.to_csv(filename, index=False)
+        schema_report.to_csv(filename, index=False)
         print(f"Schema report generated successfully: {filename}")
         
         # Print summary
         print(f"\nSummary:")
-        print(f"ml.loan_info_tbl columns: {len(loan_info_schema)}")
-        print(f"mambu.client columns: {len(client_schema)}")
-        print(f"Total columns: {len(combined_schema)}")
-        
-        # Display sample of each table
-        print(f"\nSample columns from ml.loan_info_tbl:")
-        print(loan_info_schema[['ColumnName', 'DataType', 'IsNullable']].head())
+        print(f"Tables: {schema_report.groupby(['Database', 'TableName']).ngroups}")
+        print(f"Total columns: {len(schema_report)}")
+        print(schema_report.groupby(['Database', 'TableName']).size().rename('Columns').to_string())
         
-        print(f"\nSample columns from mambu.client:")
-        print(client_schema[['ColumnName', 'DataType', 'IsNullable']].head())
+        # Column changes since the previous snapshot
+        if diff is None:
+            print(f"\nServed from the cached catalog snapshot (use --refresh to fetch again)")
+        elif diff.empty:
+            print(f"\nNo column changes since the previous snapshot")
+        else:
+            diff_filename = f"table_schema_changes_{timestamp}.csv"
+            diff.to_csv(diff_filename, index=False)
+            print(f"\nColumn changes since the previous snapshot ({diff_filename}):")
+            print(diff['CHANGE'].value_counts().to_string())
         
     except Exception as e:
         print(f"Error generating report: {e}")
@@ -103,4 +107,5 @@ def generate_csv_report():
         print("Database connection closed")
 
 if __name__ == "__main__":
-    generate_csv_report() 
\ No newline at end of file
+    import sys
+    generate_csv_report(refresh='--refresh' in sys.argv)
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Incremental month-partitioned materialisation of the MAGS report
+
+mags_report_view.sql is a plain view, so every read recomputes client_industries, national_id
+and the repayment joins over the whole history. This job stores the report as one Parquet
+partition per month (REPORT_MONTH=YYYY-MM.parquet) and tracks a watermark per source table.
+On refresh it:
+  - recomputes the current month in full (the view evaluated at today's date),
+  - re-evaluates a closed month once at its month end when it was last built before that,
+  - for older months, recomputes only the loans whose source rows changed since the last
+    watermark, in the partitions from the month the change takes effect onwards.
+A month query is then a read of one partition file.
+
+The report SQL is the view body evaluated with CURRENT_DATE replaced by the partition's
+as-of date, so the view stays the single definition. Any DB-API connection works
+(snowflake.connector or a local DuckDB stand-in).
+
+Usage:
+    python mags_materialise.py refresh [--start 2024-01] [--store mags_report_partitions]
+    python mags_materialise.py read 2025-06 [--store mags_report_partitions] [--output mags_2025_06.csv]
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+
+import pandas as pd
+
+STORE_DIR = 'mags_report_partitions'
+VIEW_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mags_report_view.sql')
+LOAN_COLUMN = 'Account Number'
+# Watermark of a source with no recorded one: everything it holds counts as changed
+EPOCH = '1900-01-01'
+
+# Per source table: a query returning (loan_id, changed_at, effective_date) for rows changed after
+# {since}. effective_date is the first date whose report is affected by the change; NULL means
+# every partition (static loan/client attributes, whose old values are no longer known).
+MAGS_SOURCES = {
+    'mambu.loantransaction': """
+        SELECT m.loan_id, l.creationdate AS changed_at, l.creationdate AS effective_date
+        FROM GHANA_PROD.MAMBU.loantransaction l
+        JOIN GHANA_PROD.ML.LOAN_INFO_TBL m ON m.loan_key = l.parentaccountkey
+        WHERE l.creationdate > {since}""",
+    'ml.repayment_transactions_extended': """
+        SELECT rt.loan_id, rt.transaction_date AS changed_at, rt.transaction_date AS effective_date
+        FROM GHANA_PROD.ML.REPAYMENT_TRANSACTIONS_EXTENDED rt
+        WHERE rt.transaction_date > {since}""",
+    'ml.loan_info_tbl': """
+        SELECT m.loan_id, m.lastmodifieddate AS changed_at, CAST(NULL AS DATE) AS effective_date
+        FROM GHANA_PROD.ML.LOAN_INFO_TBL m
+        WHERE m.lastmodifieddate > {since}""",
+    'mambu.client': """
+        SELECT m.loan_id, c.lastmodifieddate AS changed_at, CAST(NULL AS DATE) AS effective_date
+        FROM GHANA_PROD.MAMBU.CLIENT c
+        JOIN GHANA_PROD.ML.LOAN_INFO_TBL m ON m.client_key = c.encodedkey
+        WHERE c.lastmodifieddate > {since}""",
+    'data.survey_data': """
+        SELECT m.loan_id, s.loan_date AS changed_at, CAST(NULL AS DATE) AS effective_date
+        FROM data.survey_data s
+        JOIN GHANA_PROD.MAMBU.CLIENT c ON c.id = s.client_id
+        JOIN GHANA_PROD.ML.LOAN_INFO_TBL m ON m.client_key = c.encodedkey
+        WHERE s.loan_date > {since}""",
+}
+
+def sql_date(value):
+    return f"DATE '{pd.Timestamp(value):%Y-%m-%d}'"
+
+def sql_timestamp(value):
+    return f"TIMESTAMP '{pd.Timestamp(value):%Y-%m-%d %H:%M:%S.%f}'"
+
+def sql_in_list(values):
+    return ", ".join("'" + str(value).replace("'", "''") + "'" for value in values)
+
+def view_body(view_sql):
+    """SELECT part of a CREATE [OR REPLACE] VIEW statement"""
+    body = re.sub(r"^\s*CREATE\s+(OR\s+REPLACE\s+)?VIEW\s+\S+\s+AS\s+", "", view_sql, flags=re.IGNORECASE)
+    return body.strip().rstrip(';')
+
+def report_sql_at(report_sql, as_of, loan_ids=None):
+    """The report evaluated at as_of (CURRENT_DATE replaced), optionally for some loans only"""
+    sql = re.sub(r"\bCURRENT_DATE\b(\s*\(\s*\))?", sql_date(as_of), report_sql, flags=re.IGNORECASE)
+    if loan_ids is not None:
+        sql = f'SELECT * FROM ({sql}) report WHERE report."{LOAN_COLUMN}" IN ({sql_in_list(loan_ids)})'
+    return sql
+
+def fetch_frame(connection, sql):
+    """Run a query on any DB-API connection and return a DataFrame"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute(sql)
+        columns = [column[0] for column in cursor.description]
+        return pd.DataFrame(cursor.fetchall(), columns=columns)
+    finally:
+        cursor.close()
+
+class MonthPartitionStore:
+    """One Parquet file per report month plus a JSON state file"""
+
+    def __init__(self, directory=STORE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.state_path = os.path.join(directory, '_state.json')
+        self.state = {'watermarks': {}, 'partitions': {}}
+        if os.path.exists(self.state_path):
+            with open(self.state_path) as f:
+                self.state = json.load(f)
+
+    def path(self, month):
+        return os.path.join(self.directory, f"REPORT_MONTH={month}.parquet")
+
+    def read(self, month):
+        path = self.path(month)
+        return pd.read_parquet(path) if os.path.exists(path) else None
+
+    def write(self, month, df, as_of):
+        df.to_parquet(self.path(month), index=False)
+        self.state['partitions'][month] = {'as_of': f"{pd.Timestamp(as_of):%Y-%m-%d}", 'rows': len(df),
+                                           'refreshed_at': pd.Timestamp.now().isoformat(timespec='seconds')}
+
+    def save_state(self):
+        with open(self.state_path, 'w') as f:
+            json.dump(self.state, f, indent=2)
+
+class MagsMaterialiser:
+    """Refreshes the month partitions from a DB-API connection"""
+
+    def __init__(self, connection, store, report_sql=None, sources=MAGS_SOURCES):
+        self.connection = connection
+        self.store = store
+        if report_sql is None:
+            with open(VIEW_FILE) as f:
+                report_sql = view_body(f.read())
+        self.report_sql = report_sql
+        self.sources = sources
+
+    def changed_loans(self):
+        """Earliest effective month per changed loan across all sources, and the new watermarks"""
+        changes, watermarks = [], {}
+        for source, query in self.sources.items():
+            since = self.store.state['watermarks'].get(source, EPOCH)
+            changed = fetch_frame(self.connection, query.format(since=sql_timestamp(since)))
+            changed.columns = [column.lower() for column in changed.columns]
+            if not changed.empty:
+                watermarks[source] = pd.to_datetime(changed['changed_at']).max()
+                changes.append(changed)
+        if not changes:
+            return pd.Series(dtype='period[M]'), watermarks
+
+        changes = pd.concat(changes, ignore_index=True)
+        effective = pd.to_datetime(changes['effective_date']).dt.to_period('M').fillna(pd.Period(EPOCH, 'M'))
+        return effective.groupby(changes['loan_id'].astype(str)).min(), watermarks
+
+    def current_watermarks(self):
+        """Latest change timestamp per source - the starting point for the next refresh"""
+        watermarks = {}
+        for source, query in self.sources.items():
+            latest = fetch_frame(self.connection, f"SELECT MAX(changed_at) AS latest FROM ({query.format(since=sql_timestamp(EPOCH))}) changes")
+            if latest['latest'].notna().any():
+                watermarks[source] = pd.Timestamp(latest['latest'].iloc[0])
+        return watermarks
+
+    def build_month(self, month, as_of):
+        df = fetch_frame(self.connection, report_sql_at(self.report_sql, as_of))
+        self.store.write(str(month), df, as_of)
+        return len(df)
+
+    def patch_month(self, month, as_of, loan_ids):
+        """Replace the rows of loan_ids in a month partition with freshly computed ones"""
+        partition = self.store.read(str(month))
+        fresh = fetch_frame(self.connection, report_sql_at(self.report_sql, as_of, loan_ids))
+        if partition is not None:
+            partition = partition[~partition[LOAN_COLUMN].astype(str).isin(loan_ids)]
+            fresh = pd.concat([partition, fresh], ignore_index=True)
+        self.store.write(str(month), fresh, as_of)
+        return len(loan_ids)
+
+    def refresh(self, start_month, today=None):
+        """Bring every partition from start_month to the current month up to date; returns a log"""
+        today = pd.Timestamp(today or pd.Timestamp.today()).normalize()
+        current = today.to_period('M')
+        partitions = self.store.state['partitions']
+        log = []
+
+        # Read the watermarks before computing, so changes landing during the run are picked up next time.
+        # Every month is built in full on the first run; afterwards a source without a watermark (empty
+        # until now) is read from EPOCH.
+        first_run = not partitions
+        changed, watermarks = (pd.Series(dtype='period[M]'), self.current_watermarks()) if first_run \
+            else self.changed_loans()
+
+        for month in pd.period_range(pd.Period(start_month, 'M'), current, freq='M'):
+            as_of = today if month == current else month.end_time.normalize()
+            built = partitions.get(str(month))
+
+            if month == current or built is None or pd.Timestamp(built['as_of']) < as_of:
+                rows = self.build_month(month, as_of)
+                log.append((str(month), 'full', rows))
+                continue
+
+            loan_ids = sorted(changed.index[changed <= month]) if len(changed) else []
+            if loan_ids:
+                self.patch_month(month, as_of, loan_ids)
+                log.append((str(month), 'patched loans', len(loan_ids)))
+            else:
+                log.append((str(month), 'unchanged', 0))
+
+        self.store.state['watermarks'].update({source: f"{ts:%Y-%m-%d %H:%M:%S.%f}" for source, ts in watermarks.items()})
+        self.store.save_state()
+        return pd.DataFrame(log, columns=['REPORT_MONTH', 'ACTION', 'ROWS_OR_LOANS'])
+
+def connect_to_snowflake():
+    """Warehouse connection, as in generate_table_schema_csv"""
+    from generate_table_schema_csv import connect_to_snowflake as connect
+    return connect()
+
+def main():
+    parser = argparse.ArgumentParser(description="Month-partitioned MAGS report")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    refresh_parser = subparsers.add_parser('refresh', help="Refresh changed partitions from the warehouse")
+    refresh_parser.add_argument('--start', default='2024-01', help="First report month to keep")
+    read_parser = subparsers.add_parser('read', help="Read one month partition")
+    read_parser.add_argument('month', help="YYYY-MM")
+    read_parser.add_argument('--output', default=None)
+    for subparser in (refresh_parser, read_parser):
+        subparser.add_argument('--store', default=STORE_DIR)
+    args = parser.parse_args()
+
+    store = MonthPartitionStore(args.store)
+    if args.command == 'read':
+        started = time.perf_counter()
+        df = store.read(str(pd.Period(args.month, 'M')))
+        if df is None:
+            print(f"No partition for {args.month} - run refresh first")
+            return
+        print(f"{args.month}: {len(df)} rows ({(time.perf_counter() - started) * 1000:.0f} ms)")
+        output = args.output or f"mags_{pd.Period(args.month, 'M').strftime('%Y_%m')}.csv"
+        df.to_csv(output, index=False)
+        print(f"Saved to: {output}")
+        return
+
+    connection = connect_to_snowflake()
+    if not connection:
+        return
+    try:
+        started = time.perf_counter()
+        log = MagsMaterialiser(connection, store).refresh(args.start)
+        print(log.to_string(index=False))
+        print(f"\nRefresh complete in {time.perf_counter() - started:.1f}s")
+    finally:
+        connection.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Vectorized days-past-due, PAR buckets and asset classification at one or many reporting dates
+Local replacement for the CASE chains in arrears_analysis.sql, asset_class*.sql and mags_report_v2.sql.
+
+Input is installment-level repayment data in the shape of ml.repayment_transactions_extended
+(loan_id, installment, repayment_due_date, total_due, transaction_date, amount). Payments are
+sorted per installment once; for every reporting date the amount paid so far per installment
+is a searchsorted over the running sums. An installment is open at date R when it was due
+on or before R and paid-to-date < total_due; days past due is R minus the earliest open due date.
+All reporting dates are evaluated as one (installments x dates) array, in chunks of dates.
+
+Usage:
+    python par_engine.py REPAYMENTS_FILE [--start 2024-11] [--end 2025-10] [--output par_classification.csv]
+"""
+
+import argparse
+import time
+
+import pandas as pd
+import numpy as np
+
+# (upper bound of days past due, label) - same cut points as the SQL CASE expressions
+PAR_CLASSIFICATION = [(2, 'Performing'), (32, 'Watch'), (92, 'Substandard'), (182, 'Doubtful'), (np.inf, 'Loss')]
+BOG_CLASSIFICATION = [(2, 'current'), (32, 'par 0'), (62, 'par 30'), (92, 'par 60'), (122, 'par 90'),
+                      (152, 'par 120'), (np.inf, 'par 150')]
+BOG_PROVISION = [(32, 0.01), (62, 0.2), (92, 0.4), (122, 0.6), (152, 0.8), (np.inf, 1.0)]
+IFRS_STAGE = [(60, 'Stage 1'), (120, 'Stage 2'), (np.inf, 'Stage 3')]
+
+# PARn = more than n days past due (PAR1 = any day past due)
+PAR_THRESHOLDS = {'par1': 0, 'par30': 30, 'par60': 60, 'par90': 90}
+
+# Overdue amount by installment age, as the AmtOverdue* columns of the MAGS report
+OVERDUE_BUCKETS = [(31, 60), (61, 90), (91, 120), (121, 150), (151, 180), (181, None)]
+
+# (installment, day) keys: days shifted by DAY_OFFSET and clipped to DAY_BITS so a far-off date
+# never reaches into the next installment's payments
+DAY_BITS = 17
+DAY_OFFSET = 1 << 16
+
+def installment_day_keys(rows, days):
+    """One sortable int64 per (installment row, day)"""
+    return (rows << DAY_BITS) + np.clip(days + DAY_OFFSET, 0, (1 << DAY_BITS) - 1)
+
+def to_days(values):
+    """Calendar day numbers since 1970-01-01"""
+    return pd.to_datetime(values).to_numpy(dtype='datetime64[D]').astype(np.int64)
+
+def classify(days_past_due, bands):
+    """Label of the first band whose upper bound is >= days past due"""
+    bounds = np.array([upper for upper, _ in bands])
+    labels = np.array([label for _, label in bands], dtype=object)
+    return labels[np.searchsorted(bounds, days_past_due, side='left')]
+
+def split_repayment_transactions(rte_df):
+    """
+    Installments (loan_id, installment, due_date, total_due) and payments (installment row, day, amount)
+    from repayment_transactions_extended rows, where every payment row repeats its installment's due
+    """
+    rte = rte_df.rename(columns=str.lower)
+    if 'installment' not in rte:
+        rte = rte.assign(installment=rte['repayment_due_date'])
+    rte = rte.assign(repayment_due_date=pd.to_datetime(rte['repayment_due_date']),
+                     total_due=pd.to_numeric(rte['total_due'], errors='coerce'))
+    rte = rte[rte['repayment_due_date'].notna()]
+
+    installments = rte.groupby(['loan_id', 'installment'], sort=True).agg(
+        due_date=('repayment_due_date', 'min'),
+        total_due=('total_due', 'max'),
+    ).reset_index()
+
+    keys = pd.MultiIndex.from_frame(installments[['loan_id', 'installment']])
+    paid = rte[rte['transaction_date'].notna() & rte['amount'].notna()]
+    payments = pd.DataFrame({
+        'installment_row': keys.get_indexer(pd.MultiIndex.from_frame(paid[['loan_id', 'installment']])),
+        'day': to_days(paid['transaction_date']),
+        'amount': pd.to_numeric(paid['amount']).to_numpy(dtype=float),
+    })
+    return installments, payments
+
+class PaidToDate:
+    """Running payment totals per installment, queried at any day"""
+
+    def __init__(self, installment_count, payments):
+        rows = payments['installment_row'].to_numpy(dtype=np.int64)
+        days = payments['day'].to_numpy(dtype=np.int64)
+        order = np.lexsort((days, rows))
+        self.keys = installment_day_keys(rows[order], days[order])
+        self.running = np.concatenate([[0.0], np.cumsum(payments['amount'].to_numpy(dtype=float)[order])])
+        self.starts = np.searchsorted(rows[order], np.arange(installment_count))
+
+    def at(self, days):
+        """(installments x days) matrix of amounts paid on or before each day"""
+        rows = np.arange(len(self.starts), dtype=np.int64)[:, None]
+        ends = np.searchsorted(self.keys, installment_day_keys(rows, np.asarray(days, dtype=np.int64)[None, :]), side='right')
+        return self.running[ends] - self.running[self.starts][:, None]
+
+def loan_arrears(installments, payments, reporting_dates, disbursement_dates=None):
+    """
+    Per-loan arrears at each reporting date: days_past_due, amount_in_arrears, overdue amounts by
+    installment age and the total still outstanding. Returns one row per (reporting_date, loan_id)
+    for loans on the book at that date: disbursed (by disbursement_dates, a Series indexed by
+    loan_id, or else by their first due date) and not yet fully repaid.
+    """
+    installments = installments.sort_values(['loan_id', 'due_date'], kind='mergesort')
+    order = installments.index.to_numpy()
+    installments = installments.reset_index(drop=True)
+    # installment_row refers to the original order - remap to the sorted one
+    remap = np.empty(len(order), dtype=np.int64)
+    remap[order] = np.arange(len(order))
+    payments = payments.assign(installment_row=remap[payments['installment_row'].to_numpy()])
+
+    loan_ids, loan_starts = np.unique(installments['loan_id'].to_numpy(), return_index=True)
+    due = to_days(installments['due_date'])
+    total_due = pd.to_numeric(installments['total_due']).fillna(0).to_numpy(dtype=float)
+    dates = to_days(reporting_dates)
+
+    paid = PaidToDate(len(installments), payments).at(dates)
+    outstanding = np.clip(total_due[:, None] - paid, 0, None)
+    is_open = (due[:, None] <= dates[None, :]) & (outstanding > 0)
+    open_amount = np.where(is_open, outstanding, 0.0)
+    age = dates[None, :] - due[:, None]
+
+    # Installments are sorted by due date within each loan, so the earliest open due is a segment minimum
+    earliest_open = np.minimum.reduceat(np.where(is_open, due[:, None], np.iinfo(np.int64).max), loan_starts, axis=0)
+    has_open = earliest_open != np.iinfo(np.int64).max
+    days_past_due = np.where(has_open, dates[None, :] - earliest_open, 0)
+
+    total_outstanding = np.add.reduceat(outstanding, loan_starts, axis=0)
+    if disbursement_dates is not None:
+        start = pd.Series(loan_ids).map(disbursement_dates).to_numpy(dtype='datetime64[D]').astype(np.int64)
+    else:
+        start = due[loan_starts]
+    on_book = ((start[:, None] <= dates[None, :]) & (total_outstanding > 0)).ravel()
+
+    result = {
+        'reporting_date': np.tile(dates.astype('datetime64[D]'), len(loan_ids)),
+        'loan_id': np.repeat(loan_ids, len(dates)),
+        'days_past_due': days_past_due.ravel(),
+        'amount_in_arrears': np.add.reduceat(open_amount, loan_starts, axis=0).ravel(),
+        'total_outstanding': total_outstanding.ravel(),
+    }
+    for low, high in OVERDUE_BUCKETS:
+        in_bucket = (age >= low) if high is None else (age >= low) & (age <= high)
+        name = f"amt_overdue{low}_{high}d" if high else f"amt_overdue{low}_d"
+        result[name] = np.add.reduceat(np.where(in_bucket, open_amount, 0.0), loan_starts, axis=0).ravel()
+    return pd.DataFrame({name: values[on_book] for name, values in result.items()})
+
+def classify_arrears(arrears, written_off=None):
+    """
+    Add PAR flags and the regulatory classes to loan_arrears output
+
+    written_off: optional Series of write-off dates indexed by loan_id; written-off loans get
+    asset class 'E' from that date on, otherwise 'C' when in arrears and 'A' when current
+    (the MAGS A / C / E codes).
+    """
+    dpd = arrears['days_past_due'].to_numpy()
+    for name, threshold in PAR_THRESHOLDS.items():
+        arrears[name] = dpd > threshold
+    arrears['par_classification'] = classify(dpd, PAR_CLASSIFICATION)
+    arrears['bog_loan_classification'] = classify(dpd, BOG_CLASSIFICATION)
+    arrears['bog_provision'] = classify(dpd, BOG_PROVISION).astype(float)
+    arrears['ifrs_classification'] = classify(dpd, IFRS_STAGE)
+
+    asset_class = np.where(dpd > 0, 'C', 'A').astype(object)
+    if written_off is not None:
+        write_off_date = arrears['loan_id'].map(written_off).to_numpy(dtype='datetime64[D]')
+        asset_class[write_off_date <= arrears['reporting_date'].to_numpy(dtype='datetime64[D]')] = 'E'
+    arrears['asset_classification'] = asset_class
+    return arrears
+
+def classify_loans(rte_df, reporting_dates, disbursement_dates=None, written_off=None, dates_per_chunk=12):
+    """Days past due, PAR buckets and asset classes for every loan on the book at every reporting date"""
+    installments, payments = split_repayment_transactions(rte_df)
+    reporting_dates = pd.DatetimeIndex(reporting_dates)
+    chunks = [loan_arrears(installments, payments, reporting_dates[i:i + dates_per_chunk], disbursement_dates)
+              for i in range(0, len(reporting_dates), dates_per_chunk)]
+    arrears = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+    return classify_arrears(arrears, written_off)
+
+def par_summary(classified):
+    """Loans and arrears per reporting date and PAR bucket"""
+    summary = classified.groupby('reporting_date').agg(
+        loans=('loan_id', 'size'),
+        outstanding=('total_outstanding', 'sum'),
+        amount_in_arrears=('amount_in_arrears', 'sum'),
+        **{f"{name}_loans": (name, 'sum') for name in PAR_THRESHOLDS},
+    )
+    # PAR ratio = outstanding of loans past the threshold / total outstanding
+    for name in PAR_THRESHOLDS:
+        at_risk = classified['total_outstanding'].where(classified[name], 0.0).groupby(classified['reporting_date']).sum()
+        summary[f"{name}_ratio"] = at_risk / summary['outstanding']
+    return summary.reset_index()
+
+def month_end_dates(start, end):
+    """Month ends from the start month to the end month (inclusive)"""
+    return pd.date_range(pd.Period(start, 'M').start_time, pd.Period(end, 'M').end_time, freq='ME').normalize()
+
+def main():
+    parser = argparse.ArgumentParser(description="Days past due, PAR buckets and asset classification")
+    parser.add_argument('repayments', help="repayment_transactions_extended extract (CSV or Parquet)")
+    parser.add_argument('--start', default=None, help="First reporting month (default: 11 months before --end)")
+    parser.add_argument('--end', default=None, help="Last reporting month (default: last complete month)")
+    parser.add_argument('--output', default='par_classification.csv')
+    args = parser.parse_args()
+
+    end = pd.Period(args.end, 'M') if args.end else pd.Period(pd.Timestamp.today(), 'M') - 1
+    start = pd.Period(args.start, 'M') if args.start else end - 11
+    reporting_dates = month_end_dates(start, end)
+
+    read = pd.read_parquet if args.repayments.endswith('.parquet') else pd.read_csv
+    rte_df = read(args.repayments)
+    print(f"Repayment rows: {len(rte_df)}, reporting dates: {len(reporting_dates)} ({start} to {end})")
+
+    started = time.perf_counter()
+    classified = classify_loans(rte_df, reporting_dates)
+    print(f"Classified {len(classified)} loan-dates in {time.perf_counter() - started:.2f}s")
+
+    classified.to_csv(args.output, index=False)
+    print(f"Saved to: {args.output}")
+
+    print("\n" + "="*60)
+    print("PAR SUMMARY")
+    print("="*60)
+    print(par_summary(classified).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
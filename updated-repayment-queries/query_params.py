@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Redash-style {{ parameter }} templates bound as real query parameters
+
+The reports carry Redash placeholders ({{time_period}}, {{persona_type}}, '{{ Range.start }}',
+{{score_limit}}, ...). Instead of pasting values into the text, a template is compiled once into
+SQL with bind markers ($name for DuckDB, ? for Snowflake) and every run only changes the bound
+values, so the warehouse sees one statement text and the result cache in report_runner keys each
+parameter set separately:
+  - '{{ x }}' becomes a marker; 'prefix {{ x }} suffix' becomes 'prefix ' || marker || ' suffix',
+  - a bare {{ x }} becomes a marker,
+  - a Redash multi-select inside IN ({{ x }}) is a list parameter: 'ACTIVE','CLOSED' (or ACTIVE,CLOSED)
+    becomes one marker per value, IN ($x_0, $x_1),
+  - choice parameters (date parts such as {{time_period}}) are validated against their fixed list
+    and inlined, because they are used as SQL keywords (DATE_TRUNC units) that cannot be bound.
+Values written into the text instead (model DDL, local plans) become SQL literals in code and plain
+text inside string literals. Hardcoded literals such as '2025-10-20' in main_segments.sql can be
+lifted into parameters.
+A sweep runs the compiled statement over many parameter sets (e.g. 24 months) concurrently.
+
+Usage:
+    python query_params.py REPORT.sql --list
+    python query_params.py REPORT.sql --param time_period=week "Range.start=2025-04-01" "Range.end=2025-06-30"
+    python query_params.py REPORT.sql --param sacle=month --sweep-months 2024-01 2025-12 [--workers 4]
+                           [--lift 2025-10-20=as_of] [--backend duckdb --database local.duckdb]
+"""
+
+import argparse
+import csv
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+PLACEHOLDER = re.compile(r"\{\{\s*([^{}]+?)\s*\}\}")
+# Literals, quoted identifiers and comments are matched first so placeholders inside them are seen in context
+SQL_PARTS = re.compile(r"""('(?:[^']|'')*')|("(?:[^"]|"")*")|(--[^\n]*|/\*.*?\*/)""", re.DOTALL)
+LIST_PLACEHOLDER = re.compile(r"\bIN\s*\(\s*\{\{\s*([^{}]+?)\s*\}\}\s*\)", re.IGNORECASE)
+
+DATE_PARTS = ['day', 'week', 'month', 'quarter', 'year']
+
+class ParameterSpec:
+    """Name, type ('date', 'number', 'text', 'list' or 'choice') and allowed values of a template parameter"""
+
+    def __init__(self, name, kind='text', choices=None):
+        self.name = name
+        self.kind = kind
+        self.choices = [choice.lower() for choice in choices] if choices else None
+
+    def validate(self, value):
+        """Typed value for binding; raises ValueError when the value does not fit"""
+        if value is None:
+            raise ValueError(f"Missing value for parameter {self.name!r}")
+        if self.kind == 'date':
+            try:
+                return f"{pd.Timestamp(value):%Y-%m-%d}"
+            except (ValueError, TypeError):
+                raise ValueError(f"Parameter {self.name!r} expects a date, got {value!r}")
+        if self.kind == 'number':
+            try:
+                number = float(value)
+            except (ValueError, TypeError):
+                raise ValueError(f"Parameter {self.name!r} expects a number, got {value!r}")
+            return int(number) if number.is_integer() else number
+        if self.kind == 'choice':
+            if str(value).lower() not in self.choices:
+                raise ValueError(f"Parameter {self.name!r} must be one of {self.choices}, got {value!r}")
+            return str(value).lower()
+        if self.kind == 'list':
+            if isinstance(value, (list, tuple)):
+                items = [str(item) for item in value]
+            else:
+                items = next(csv.reader([str(value)], quotechar="'", skipinitialspace=True), [])
+            items = tuple(item.strip() for item in items if item.strip())
+            if not items:
+                raise ValueError(f"Parameter {self.name!r} expects at least one value, got {value!r}")
+            return items
+        return str(value)
+
+    def sql(self, value):
+        """A validated value written into the SQL text as literal(s)"""
+        if self.kind in ('choice', 'number'):
+            return str(value)
+        items = value if self.kind == 'list' else [value]
+        return ', '.join("'" + str(item).replace("'", "''") + "'" for item in items)
+
+    def text(self, value):
+        """A validated value written inside a string literal"""
+        return (', '.join(value) if self.kind == 'list' else str(value)).replace("'", "''")
+
+    def __repr__(self):
+        return f"{self.name}: {self.kind}" + (f" {self.choices}" if self.choices else '')
+
+# Parameters used across the repository whose type is not obvious from the name
+KNOWN_PARAMETERS = {
+    'time_period': ParameterSpec('time_period', 'choice', DATE_PARTS),
+    'sacle': ParameterSpec('sacle', 'choice', DATE_PARTS),
+    'scale': ParameterSpec('scale', 'choice', DATE_PARTS),
+    'persona_type': ParameterSpec('persona_type', 'text'),
+    'score_limit': ParameterSpec('score_limit', 'number'),
+    'convertions_days': ParameterSpec('convertions_days', 'number'),
+    'up to date': ParameterSpec('Up To Date', 'date'),
+}
+
+def infer_spec(name, in_list=False):
+    """Spec for a placeholder name: known parameters first, then IN ({{ x }}) lists, then by naming convention"""
+    known = KNOWN_PARAMETERS.get(name.lower())
+    if known is not None:
+        return ParameterSpec(name, known.kind, known.choices)
+    if in_list:
+        return ParameterSpec(name, 'list')
+    lowered = name.lower()
+    if lowered.endswith(('.start', '.end')) or 'date' in lowered or lowered.startswith('as_of'):
+        return ParameterSpec(name, 'date')
+    if lowered.endswith(('days', 'limit', 'count')):
+        return ParameterSpec(name, 'number')
+    return ParameterSpec(name, 'text')
+
+def bind_name(name):
+    """Identifier-safe bind name: 'Range.start' -> 'range_start', 'Up To Date' -> 'up_to_date'"""
+    return re.sub(r"\W+", '_', name.strip()).strip('_').lower()
+
+def lift_literals(sql, literals):
+    """Replace hardcoded string literals with placeholders: {'2025-10-20': 'as_of'}"""
+    for literal, name in literals.items():
+        sql = sql.replace(f"'{literal}'", f"'{{{{{name}}}}}'")
+    return sql
+
+class QueryTemplate:
+    """A SQL text with {{ }} placeholders, compiled to bind markers per paramstyle"""
+
+    def __init__(self, sql, specs=None):
+        self.sql = sql
+        names = []
+        for match in PLACEHOLDER.finditer(self._without_comments()):
+            if match.group(1) not in names:
+                names.append(match.group(1))
+        lists = set(LIST_PLACEHOLDER.findall(self._without_comments()))
+        specs = {spec.name: spec for spec in specs or []}
+        self.parameters = {name: specs.get(name) or infer_spec(name, name in lists) for name in names}
+        self._compiled = {}
+        self._statements = None
+
+    def _without_comments(self):
+        return SQL_PARTS.sub(lambda match: '' if match.group(3) else match.group(0), self.sql)
+
+    def compile(self, paramstyle='dollar', inline=None, lengths=None):
+        """
+        (sql, order): SQL with bind markers and the parameter names in marker order
+        (for positional styles). inline holds validated values written into the text
+        (choice parameters always are); lengths holds the number of values of each bound
+        list parameter. The compiled text is cached per inline and lengths set.
+        """
+        inline, lengths = inline or {}, lengths or {}
+        cache_key = (paramstyle, tuple(sorted(inline.items())), tuple(sorted(lengths.items())))
+        if cache_key in self._compiled:
+            return self._compiled[cache_key]
+        order = []
+
+        def marker(name):
+            if name in inline:
+                return None
+            order.append(name)
+            if self.parameters[name].kind == 'list':
+                count = lengths.get(name, 1)
+                return ', '.join(['?'] * count if paramstyle == 'qmark' else [f"${bind_name(name)}_{i}" for i in range(count)])
+            return '?' if paramstyle == 'qmark' else f"${bind_name(name)}"
+
+        def in_code(text):
+            def replace(match):
+                name = match.group(1)
+                bound = marker(name)
+                return bound if bound is not None else self.parameters[name].sql(inline[name])
+            return PLACEHOLDER.sub(replace, text)
+
+        def in_literal(literal):
+            body = literal[1:-1]
+            pieces, position = [], 0
+            for match in PLACEHOLDER.finditer(body):
+                name = match.group(1)
+                if name in inline:
+                    continue
+                pieces.append(('text', body[position:match.start()]))
+                pieces.append(('param', marker(name)))
+                position = match.end()
+            pieces.append(('text', body[position:]))
+            # Inline values become part of the literal text
+            pieces = [(kind, PLACEHOLDER.sub(lambda m: self.parameters[m.group(1)].text(inline[m.group(1)]), value) if kind == 'text' else value)
+                      for kind, value in pieces]
+            if len(pieces) == 1:
+                return f"'{pieces[0][1]}'"
+            terms = [value if kind == 'param' else f"'{value}'" for kind, value in pieces if kind == 'param' or value]
+            return terms[0] if len(terms) == 1 else '(' + ' || '.join(terms) + ')'
+
+        compiled, position = [], 0
+        for match in SQL_PARTS.finditer(self.sql):
+            compiled.append(in_code(self.sql[position:match.start()]))
+            literal, identifier, comment = match.groups()
+            compiled.append(in_literal(literal) if literal else match.group(0))
+            position = match.end()
+        compiled.append(in_code(self.sql[position:]))
+        self._compiled[cache_key] = (''.join(compiled), order)
+        return self._compiled[cache_key]
+
+    def bind(self, values, paramstyle='dollar'):
+        """(sql, params) ready for cursor.execute - a dict for 'dollar', a list for 'qmark'"""
+        typed = {name: spec.validate(values.get(name)) for name, spec in self.parameters.items()}
+        inline = {name: value for name, value in typed.items() if self.parameters[name].kind == 'choice'}
+        lengths = {name: len(value) for name, value in typed.items() if self.parameters[name].kind == 'list'}
+        sql, order = self.compile(paramstyle, inline, lengths)
+        if paramstyle == 'qmark':
+            return sql, [item for name in order for item in (typed[name] if name in lengths else [typed[name]])]
+        params = {}
+        for name in order:
+            if name in lengths:
+                params.update((f"{bind_name(name)}_{i}", item) for i, item in enumerate(typed[name]))
+            else:
+                params[bind_name(name)] = typed[name]
+        return sql, params
+
+    def inline(self, values):
+        """The text with every parameter written in as a literal, for DDL and local plans"""
+        return self.compile('dollar', {name: spec.validate(values.get(name)) for name, spec in self.parameters.items()})[0]
+
+    def bind_statements(self, values, paramstyle='dollar'):
+        """[(sql, params)] per statement of the text, each bound to the markers of that statement only"""
+        if self._statements is None:
+            from report_runner import split_statements
+            specs = list(self.parameters.values())
+            self._statements = [QueryTemplate(statement, specs) for statement in split_statements(self.sql)]
+        return [statement.bind(values, paramstyle) for statement in self._statements]
+
+def month_ranges(start, end, start_name='Range.start', end_name='Range.end'):
+    """One {start, end} parameter set per month from start to end (inclusive)"""
+    return [{start_name: month.start_time, end_name: month.end_time.normalize()}
+            for month in pd.period_range(pd.Period(start, 'M'), pd.Period(end, 'M'), freq='M')]
+
+def run_template(runner, template, values, name=None, refresh=False, versions=None):
+    statements = template.bind_statements(values, getattr(runner.backend, 'paramstyle', 'dollar'))
+    return runner.run(statements, refresh=refresh, name=name, versions=versions)
+
+def sweep(runner, template, base_values, parameter_sets, workers=4, name=None, refresh=False):
+    """
+    Run template once per parameter set, concurrently. Table version stamps are read once
+    for the whole sweep, so cached parameter sets never touch the warehouse.
+    Returns [(values, DataFrame, info)] in the order of parameter_sets.
+    """
+    from report_runner import source_tables
+    versions = runner.backend.table_versions(source_tables(template.sql)) if runner.cache is not None else None
+    runs = [{**base_values, **values} for values in parameter_sets]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda values: run_template(runner, template, values, name, refresh, versions), runs))
+    return [(values, df, info) for values, (df, info) in zip(runs, results)]
+
+def main():
+    from report_runner import CACHE_DIR, ResultCache, ReportRunner, connect, parse_params
+
+    parser = argparse.ArgumentParser(description="Run a Redash-style templated report with bound parameters")
+    parser.add_argument('file')
+    parser.add_argument('--list', action='store_true', help="List the template's parameters and exit")
+    parser.add_argument('--param', nargs='*', default=[], help="name=value")
+    parser.add_argument('--lift', nargs='*', default=[], help="literal=name: turn a hardcoded literal into a parameter")
+    parser.add_argument('--sweep-months', nargs=2, metavar=('START', 'END'), default=None,
+                        help="Run once per month, binding Range.start / Range.end")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--backend', choices=['snowflake', 'duckdb'], default='snowflake')
+    parser.add_argument('--database', default=None)
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--refresh', action='store_true')
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    with open(args.file) as f:
+        template = QueryTemplate(lift_literals(f.read(), parse_params(args.lift)))
+    if args.list:
+        for spec in template.parameters.values():
+            print(f"  - {spec}")
+        return
+
+    backend = connect(args.backend, args.database)
+    runner = ReportRunner(backend, ResultCache(args.cache_dir))
+    values = parse_params(args.param)
+    output = args.output or os.path.splitext(os.path.basename(args.file))[0] + '.csv'
+    started = time.perf_counter()
+    try:
+        if args.sweep_months:
+            results = sweep(runner, template, values, month_ranges(*args.sweep_months), args.workers, args.file, args.refresh)
+            frames = []
+            for month_values, df, info in results:
+                month = f"{pd.Timestamp(month_values['Range.start']):%Y-%m}"
+                print(f"  {month}: {info['rows']} rows, {'cache' if info['cached'] else args.backend}, {info['seconds']:.2f}s")
+                frames.append(df.assign(SWEEP_MONTH=month))
+            df = pd.concat(frames, ignore_index=True)
+        else:
+            df, info = run_template(runner, template, values, args.file, args.refresh)
+        df.to_csv(output, index=False)
+        print(f"{len(df)} rows in {time.perf_counter() - started:.2f}s -> {output}")
+    finally:
+        backend.close()
+
+if __name__ == "__main__":
+    main()
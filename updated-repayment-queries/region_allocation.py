@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Deterministic split of 'Brong-Ahafo Region' clients into Bono / Bono East / Ahafo
+
+The MAGS queries used RANDOM() (twice per row), so every run gave clients different regions.
+The region now comes from a seeded MD5 hash of the client id: the lower 64 bits of
+MD5('<seed>:<client_id>') modulo 10000 is compared with the 0.4652 / 0.7561 cut points.
+The same bucket is computed by Snowflake (MD5_NUMBER_LOWER64), DuckDB and Python, so a
+client always lands in the same region and report outputs can be cached and diffed.
+
+Usage:
+    python region_allocation.py [--dialect snowflake|duckdb] [--column client_id]   # print the SQL expression
+    python region_allocation.py --check                                              # Python vs DuckDB + shares
+"""
+
+import argparse
+import hashlib
+
+import pandas as pd
+import numpy as np
+
+REGION_SEED = 'brong-ahafo'
+BUCKETS = 10000
+# (exclusive upper bucket, region) - 46.52% Bono, 29.09% Bono East, 24.39% Ahafo
+BRONG_AHAFO_SPLIT = [(4652, 'Bono Region'), (7561, 'Bono East Region'), (BUCKETS, 'Ahafo Region')]
+BRONG_AHAFO = 'Brong-Ahafo Region'
+
+# Lower 64 bits of the MD5 digest as an unsigned integer, per dialect
+HASH_SQL = {
+    'snowflake': "MD5_NUMBER_LOWER64('{seed}:' || {column}::VARCHAR)",
+    'duckdb': "('0x' || RIGHT(MD5('{seed}:' || CAST({column} AS VARCHAR)), 16))::UBIGINT",
+}
+
+def allocation_bucket(client_ids, seed=REGION_SEED):
+    """Bucket 0..9999 per client id (ids are hashed as text, as the SQL casts them to VARCHAR)"""
+    ids = pd.Series(client_ids, dtype=object).astype(str)
+    unique_ids = pd.unique(ids)
+    buckets = np.fromiter(
+        (int.from_bytes(hashlib.md5(f"{seed}:{client_id}".encode()).digest()[8:], 'big') % BUCKETS
+         for client_id in unique_ids),
+        dtype=np.int64, count=len(unique_ids))
+    return buckets[pd.Index(unique_ids).get_indexer(ids)]
+
+def allocate_brong_ahafo(client_ids, seed=REGION_SEED):
+    """Bono / Bono East / Ahafo for each client id"""
+    bounds = np.array([upper for upper, _ in BRONG_AHAFO_SPLIT])
+    regions = np.array([region for _, region in BRONG_AHAFO_SPLIT], dtype=object)
+    return regions[np.searchsorted(bounds, allocation_bucket(client_ids, seed), side='right')]
+
+def resolve_regions(regions, client_ids, seed=REGION_SEED):
+    """Replace 'Brong-Ahafo Region' with the client's allocated region, leave other regions as they are"""
+    regions = pd.Series(regions, dtype=object).reset_index(drop=True)
+    client_ids = pd.Series(client_ids).reset_index(drop=True)
+    brong_ahafo = (regions == BRONG_AHAFO).to_numpy()
+    regions[brong_ahafo] = allocate_brong_ahafo(client_ids[brong_ahafo], seed)
+    return regions
+
+def allocation_sql(column='client_id', dialect='snowflake', seed=REGION_SEED, indent=''):
+    """CASE expression giving the allocated region for column"""
+    hashed = HASH_SQL[dialect].format(seed=seed, column=column)
+    lines = ["CASE"]
+    for upper, region in BRONG_AHAFO_SPLIT[:-1]:
+        lines.append(f"    WHEN MOD({hashed}, {BUCKETS}) < {upper} THEN '{region}'")
+    lines.append(f"    ELSE '{BRONG_AHAFO_SPLIT[-1][1]}'")
+    lines.append("END")
+    return f"\n{indent}".join(lines)
+
+def check_against_duckdb(sample_size=100000):
+    """Compare the Python allocation with the DuckDB expression and report the region shares"""
+    import duckdb
+    client_ids = pd.Series(np.arange(sample_size)).astype(str)
+    con = duckdb.connect()
+    con.register('clients', pd.DataFrame({'client_id': client_ids}))
+    sql_regions = con.execute(f"SELECT {allocation_sql(dialect='duckdb')} AS region FROM clients").df()['region']
+    con.close()
+
+    python_regions = allocate_brong_ahafo(client_ids)
+    mismatches = int((sql_regions.to_numpy() != python_regions).sum())
+    print(f"Python vs DuckDB on {sample_size} client ids: {mismatches} mismatches")
+    print(pd.Series(python_regions).value_counts(normalize=True).round(4).to_string())
+    return mismatches == 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Deterministic Brong-Ahafo region allocation")
+    parser.add_argument('--dialect', choices=list(HASH_SQL), default='snowflake')
+    parser.add_argument('--column', default='client_id')
+    parser.add_argument('--check', action='store_true', help="Check Python against DuckDB and show the shares")
+    args = parser.parse_args()
+
+    if args.check:
+        check_against_duckdb()
+    else:
+        print(allocation_sql(args.column, args.dialect))
+
+if __name__ == "__main__":
+    main()
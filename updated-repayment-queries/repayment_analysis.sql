@@ -64,11 +64,11 @@ login_activity AS (
     -- Pre-aggregate login activity
     SELECT DISTINCT
         bu.banking_platform_id as client_id,
-        DATE(bn.timestamp) as activity_date
-    FROM data.backend_notifications bn
+        bn.event_date as activity_date
+    FROM data.backend_events bn
     JOIN banking_service.user bu ON bn.user_identity = bu.id
     WHERE bn."TYPE" = 'BE_AUTHENTICATION_PHONE_VERIFICATION_2'
-    AND TO_TIMESTAMP_NTZ(bn.timestamp) >= '2024-01-01'
+    AND bn.event_date >= '2024-01-01'
 ),
 
 combined_activity AS (
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Run any of the repository's .sql reports through a pluggable connection, with a result cache
+
+Results are stored as zstd-compressed Parquet files keyed by a hash of
+  - the normalised SQL text (comments dropped, whitespace collapsed, string literals kept),
+  - the bound parameters,
+  - a version stamp of every source table the query reads (LAST_ALTERED / ROW_COUNT from
+    information_schema on Snowflake, estimated size and database file stamp on DuckDB),
+so re-running an unchanged report against unchanged tables is a local Parquet read.
+The cache is bounded in bytes and evicts the least recently used results; a hit refreshes
+the file's modification time, so the cache needs no index file.
+
+Backends: 'snowflake' (connection from generate_table_schema_csv) or 'duckdb' (a local
+database file standing in for the warehouse). Redash {{ parameters }} in a file are bound as
+query parameters through query_params.
+
+Usage:
+    python report_runner.py run REPORT.sql [REPORT.sql ...] [--backend duckdb --database local.duckdb]
+                            [--param name=value ...] [--refresh] [--output-dir results]
+    python report_runner.py cache [--clear]
+"""
+
+import argparse
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+import pandas as pd
+
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'report_runner')
+CACHE_MAX_BYTES = 2 * 1024**3
+CACHE_MAX_AGE_HOURS = 24
+
+# String literals and quoted identifiers are kept verbatim, comments are dropped
+SQL_TOKENS = re.compile(r"""('(?:[^']|'')*'|"(?:[^"]|"")*")|(--[^\n]*|/\*.*?\*/)|(\s+)""", re.DOTALL)
+
+# Fallback for files sqlglot cannot parse: dotted names after FROM / JOIN, quoted parts included
+TABLE_REFERENCE = re.compile(r'\b(?:FROM|JOIN)\s+((?:[A-Za-z_][\w$]*|"[^"]+")(?:\.(?:[A-Za-z_][\w$]*|"[^"]+"))*)', re.IGNORECASE)
+
+# Statements sqlglot cannot fully parse (CALL ...) fall back to commands; the warnings are noise here
+logging.getLogger('sqlglot').setLevel(logging.ERROR)
+
+def normalise_sql(sql):
+    """SQL text with comments removed and whitespace collapsed, for cache keys"""
+    def replace(match):
+        literal, comment, space = match.groups()
+        return literal if literal else ' '
+    return re.sub(r"\s+", ' ', SQL_TOKENS.sub(replace, sql)).strip().rstrip(';').strip()
+
+def split_statements(sql):
+    """Statements of a file, split on semicolons outside literals and comments"""
+    masked = SQL_TOKENS.sub(lambda match: match.group(0) if match.group(3) else ' ' * len(match.group(0)), sql)
+    bounds = [-1] + [i for i, char in enumerate(masked) if char == ';'] + [len(sql)]
+    statements = [sql[start + 1:end] for start, end in zip(bounds, bounds[1:])]
+    return [statement.strip() for statement in statements if normalise_sql(statement)]
+
+def source_tables(sql):
+    """Tables a query reads (CTE names excluded), as lower-case dotted names"""
+    import sqlglot
+    from sqlglot import exp
+    try:
+        trees = sqlglot.parse(sql, read='snowflake')
+    except sqlglot.errors.ParseError:
+        return sorted(set(name.replace('"', '').lower() for name in TABLE_REFERENCE.findall(sql)))
+    tables = set()
+    for tree in trees:
+        if tree is None:
+            continue
+        ctes = {cte.alias_or_name.lower() for cte in tree.find_all(exp.CTE)}
+        for table in tree.find_all(exp.Table):
+            name = '.'.join(part for part in (table.catalog, table.db, table.name) if part).lower()
+            if name and name not in ctes:
+                tables.add(name)
+    return sorted(tables)
+
+class DuckDBBackend:
+    """Local DuckDB database standing in for the warehouse"""
+
+    name = 'duckdb'
+    paramstyle = 'dollar'
+
+    def __init__(self, database=':memory:', read_only=False):
+        import duckdb
+        self.database = database
+        self.connection = duckdb.connect(database, read_only=read_only)
+        # Each DuckDB cursor is its own connection; session() pins one per thread
+        self.sessions = threading.local()
+
+    @contextlib.contextmanager
+    def session(self):
+        """Run every execute / fetch_batches in the block on one cursor, so temp tables and SET carry over"""
+        if getattr(self.sessions, 'cursor', None) is not None:
+            yield self
+            return
+        self.sessions.cursor = self.connection.cursor()
+        try:
+            yield self
+        finally:
+            self.sessions.cursor.close()
+            self.sessions.cursor = None
+
+    def cursor(self):
+        """(cursor, owned) - the thread's session cursor, or a new one the caller closes"""
+        cursor = getattr(self.sessions, 'cursor', None)
+        return (cursor, False) if cursor is not None else (self.connection.cursor(), True)
+
+    def execute(self, sql, params=None, timeout=None):
+        import duckdb
+        cursor, owned = self.cursor()
+        timer = threading.Timer(timeout, cursor.interrupt) if timeout else None
+        try:
+            if timer:
+                timer.start()
+            return cursor.execute(sql, params or None).df()
+        except duckdb.InterruptException:
+            raise TimeoutError(f"Query cancelled after {timeout}s")
+        finally:
+            if timer:
+                timer.cancel()
+            if owned:
+                cursor.close()
+
+    def fetch_batches(self, sql, params=None, batch_rows=1_000_000):
+        """Result as a stream of Arrow record batches, without materialising it"""
+        cursor, owned = self.cursor()
+        result = cursor.execute(sql, params or None)
+        # to_arrow_reader replaces fetch_record_batch in newer DuckDB releases
+        reader = result.to_arrow_reader(batch_rows) if hasattr(result, 'to_arrow_reader') else \
+            result.fetch_record_batch(batch_rows)
+        try:
+            yield from reader
+        finally:
+            if owned:
+                cursor.close()
+
+    def table_versions(self, tables):
+        """Estimated size per table plus the database file stamp (any write changes it)"""
+        rows = self.connection.cursor().execute(
+            "SELECT lower(schema_name), lower(table_name), estimated_size, column_count FROM duckdb_tables()").fetchall()
+        sizes = {}
+        for schema, table, size, columns in rows:
+            sizes[f"{schema}.{table}"] = f"{size}:{columns}"
+            sizes.setdefault(table, f"{size}:{columns}")
+        database_stamp = None
+        if self.database != ':memory:':
+            paths = [path for path in (self.database, self.database + '.wal') if os.path.exists(path)]
+            database_stamp = ':'.join(f"{os.stat(path).st_mtime_ns}:{os.stat(path).st_size}" for path in paths)
+        versions = {}
+        for table in tables:
+            parts = table.split('.')
+            stamp = sizes.get('.'.join(parts[-2:])) or sizes.get(parts[-1])
+            versions[table] = f"{stamp}@{database_stamp}" if stamp and database_stamp else stamp
+        return versions
+
+    def close(self):
+        self.connection.close()
+
+class SnowflakeBackend:
+    """Warehouse connection from generate_table_schema_csv"""
+
+    name = 'snowflake'
+    paramstyle = 'qmark'
+
+    def __init__(self, connection=None):
+        if connection is None:
+            import snowflake.connector
+            from generate_table_schema_csv import connect_to_snowflake
+            # Server-side binding; must be set before the connection is opened
+            snowflake.connector.paramstyle = 'qmark'
+            connection = connect_to_snowflake()
+            if connection is None:
+                raise ConnectionError("Could not connect to Snowflake")
+        self.connection = connection
+
+    @contextlib.contextmanager
+    def session(self):
+        """Cursors of one Snowflake connection already share its session (temp tables, SET)"""
+        yield self
+
+    def execute(self, sql, params=None, timeout=None):
+        import snowflake.connector
+        cursor = self.connection.cursor()
+        try:
+            try:
+                cursor.execute(sql, params or None, timeout=timeout)
+            except snowflake.connector.errors.ProgrammingError as e:
+                if e.errno == 604:  # cancelled by the client-side timeout
+                    raise TimeoutError(f"Query cancelled after {timeout}s")
+                raise
+            try:
+                return cursor.fetch_pandas_all()
+            except Exception:
+                columns = [column[0] for column in cursor.description or []]
+                return pd.DataFrame(cursor.fetchall(), columns=columns)
+        finally:
+            cursor.close()
+
+    def fetch_batches(self, sql, params=None, batch_rows=None):
+        """Result as a stream of Arrow record batches, one result chunk at a time"""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(sql, params or None)
+            for table in cursor.fetch_arrow_batches():
+                yield from table.to_batches(max_chunksize=batch_rows)
+        finally:
+            cursor.close()
+
+    def table_versions(self, tables):
+        """LAST_ALTERED and ROW_COUNT per table, one information_schema query per database"""
+        current_database = self.execute("SELECT CURRENT_DATABASE() AS db")['DB'].iloc[0]
+        by_database = {}
+        for table in tables:
+            parts = table.upper().split('.')
+            if len(parts) == 2:
+                parts = [current_database] + parts
+            if len(parts) == 3:
+                by_database.setdefault(parts[0], []).append((table, parts[1], parts[2]))
+
+        versions = {table: None for table in tables}
+        for database, entries in by_database.items():
+            wanted = ' OR '.join(f"(table_schema = '{schema}' AND table_name = '{name}')" for _, schema, name in entries)
+            stamps = self.execute(f"""
+                SELECT table_schema, table_name, last_altered, row_count
+                FROM {database}.information_schema.tables
+                WHERE {wanted}""")
+            stamps = {(row.TABLE_SCHEMA, row.TABLE_NAME): f"{row.LAST_ALTERED}:{row.ROW_COUNT}"
+                      for row in stamps.itertuples(index=False)}
+            for table, schema, name in entries:
+                versions[table] = stamps.get((schema, name))
+        return versions
+
+    def close(self):
+        self.connection.close()
+
+def connect(backend='snowflake', database=None):
+    if backend == 'duckdb':
+        return DuckDBBackend(database or ':memory:')
+    return SnowflakeBackend()
+
+class ResultCache:
+    """Parquet result files in one directory, evicted least recently used first"""
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES, max_age_hours=CACHE_MAX_AGE_HOURS):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = pd.Timedelta(hours=max_age_hours) if max_age_hours else None
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.parquet")
+
+    def get(self, key):
+        """Cached result or None; results past max_age (e.g. of views with no version stamp) are dropped"""
+        import pyarrow.parquet as pq
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        metadata = pq.read_metadata(path).metadata or {}
+        created = pd.Timestamp(metadata.get(b'report_runner.created', b'1970-01-01').decode())
+        if self.max_age is not None and pd.Timestamp.now() - created > self.max_age:
+            os.remove(path)
+            return None
+        df = pd.read_parquet(path)
+        os.utime(path)
+        return df
+
+    def put(self, key, df, description=None):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[b'report_runner.created'] = pd.Timestamp.now().isoformat().encode()
+        metadata[b'report_runner.description'] = json.dumps(description or {}, default=str).encode()
+        temporary = self.path(key) + '.tmp'
+        pq.write_table(table.replace_schema_metadata(metadata), temporary, compression='zstd')
+        os.replace(temporary, self.path(key))
+        self.evict()
+
+    def entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.parquet'):
+                try:
+                    stat = os.stat(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    continue  # evicted by a concurrent run
+                entries.append((stat.st_mtime, stat.st_size, name))
+        return sorted(entries)
+
+    def evict(self):
+        """Remove the least recently used results until the cache fits in max_bytes"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        for _, _, name in self.entries():
+            os.remove(os.path.join(self.directory, name))
+
+def cache_key(backend_name, sql, params, versions):
+    payload = json.dumps({
+        'backend': backend_name,
+        'sql': normalise_sql(sql),
+        'params': sorted((str(name), repr(value)) for name, value in params.items()) if isinstance(params, dict)
+                  else [repr(value) for value in params or []],
+        'versions': sorted(versions.items()),
+    }, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class ReportRunner:
+    """Runs SQL through a backend, answering repeated runs from the result cache"""
+
+    def __init__(self, backend, cache=None):
+        self.backend = backend
+        self.cache = cache
+
+    def run(self, sql, params=None, refresh=False, name=None, versions=None, timeout=None):
+        """
+        Result of the last statement in sql, plus a dict describing the run. sql is either a
+        text whose statements all take params, or a list of (statement, params) pairs bound
+        per statement (QueryTemplate.bind_statements). versions (table version stamps) can be
+        passed in when many runs share the same sources; timeout (seconds) applies to each
+        statement and raises TimeoutError.
+        """
+        started = time.perf_counter()
+        if isinstance(sql, str):
+            bound = [(statement, params) for statement in split_statements(sql)]
+        else:
+            bound = list(sql)
+        if not bound:
+            raise ValueError(f"No SQL statements in {name or 'query'}")
+        text = ';\n'.join(statement for statement, _ in bound)
+        if versions is None:
+            versions = self.backend.table_versions(source_tables(text)) if self.cache is not None else {}
+        key = cache_key(self.backend.name, text, [statement_params for _, statement_params in bound], versions)
+
+        df = None if refresh or self.cache is None else self.cache.get(key)
+        cached = df is not None
+        if not cached:
+            with self.backend.session():
+                for statement, statement_params in bound[:-1]:
+                    self.backend.execute(statement, statement_params, timeout)
+                df = self.backend.execute(bound[-1][0], bound[-1][1], timeout)
+            if self.cache is not None:
+                self.cache.put(key, df, {'name': name, 'params': [p for _, p in bound], 'versions': versions})
+        return df, {'name': name, 'cached': cached, 'rows': len(df), 'seconds': time.perf_counter() - started,
+                    'key': key[:12]}
+
+    def run_file(self, path, values=None, refresh=False, timeout=None):
+        """Run a .sql file, binding each statement's {{ parameters }} from values"""
+        from query_params import QueryTemplate
+        with open(path) as f:
+            statements = QueryTemplate(f.read()).bind_statements(values or {}, self.backend.paramstyle)
+        return self.run(statements, refresh=refresh, name=path, timeout=timeout)
+
+def parse_params(values):
+    """['month=2025-06', 'limit=10'] -> {'month': '2025-06', 'limit': '10'}"""
+    params = {}
+    for value in values or []:
+        name, _, text = value.partition('=')
+        params[name.strip()] = text
+    return params
+
+def main():
+    parser = argparse.ArgumentParser(description="Run repository SQL reports with a result cache")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    run_parser = subparsers.add_parser('run', help="Run one or more .sql files")
+    run_parser.add_argument('files', nargs='+')
+    run_parser.add_argument('--backend', choices=['snowflake', 'duckdb'], default='snowflake')
+    run_parser.add_argument('--database', default=None, help="DuckDB database file for --backend duckdb")
+    run_parser.add_argument('--param', nargs='*', default=[], help="name=value for the files' {{ parameters }}")
+    run_parser.add_argument('--refresh', action='store_true', help="Ignore cached results")
+    run_parser.add_argument('--no-cache', action='store_true')
+    run_parser.add_argument('--output-dir', default='.')
+    cache_parser = subparsers.add_parser('cache', help="Show or clear the result cache")
+    cache_parser.add_argument('--clear', action='store_true')
+    for subparser in (run_parser, cache_parser):
+        subparser.add_argument('--cache-dir', default=CACHE_DIR)
+        subparser.add_argument('--cache-max-mb', type=int, default=CACHE_MAX_BYTES // 1024**2)
+    args = parser.parse_args()
+
+    cache = ResultCache(args.cache_dir, args.cache_max_mb * 1024**2)
+    if args.command == 'cache':
+        if args.clear:
+            cache.clear()
+        entries = cache.entries()
+        print(f"{len(entries)} cached results, {sum(size for _, size, _ in entries) / 1024**2:.1f} MB in {args.cache_dir}")
+        return
+
+    backend = connect(args.backend, args.database)
+    runner = ReportRunner(backend, None if args.no_cache else cache)
+    params = parse_params(args.param)
+    os.makedirs(args.output_dir, exist_ok=True)
+    try:
+        for path in args.files:
+            df, info = runner.run_file(path, params, args.refresh)
+            output = os.path.join(args.output_dir, os.path.splitext(os.path.basename(path))[0] + '.csv')
+            df.to_csv(output, index=False)
+            source = 'cache' if info['cached'] else args.backend
+            print(f"{path}: {info['rows']} rows from {source} in {info['seconds']:.2f}s -> {output}")
+    finally:
+        backend.close()
+
+if __name__ == "__main__":
+    main()
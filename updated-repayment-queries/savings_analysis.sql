@@ -35,11 +35,11 @@ all_eligible_clients AS (
  login_activity AS (
     SELECT DISTINCT
         bu.banking_platform_id as client_id,
-        DATE(bn.timestamp) as activity_date
-    FROM data.backend_notifications bn
+        bn.event_date as activity_date
+    FROM data.backend_events bn
     JOIN banking_service.user bu ON bn.user_identity = bu.id
     WHERE bn."TYPE" = 'BE_AUTHENTICATION_PHONE_VERIFICATION_2'
-    AND TO_TIMESTAMP_NTZ(bn.timestamp) between '2025-04-03' and '2025-05-31'
+    AND bn.timestamp between '2025-04-03' and '2025-05-31'
     
 ),
 -- New CTE to count logins before account creation
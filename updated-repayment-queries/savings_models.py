@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Shared materialised base tables for the savings reports
+
+base_savings_data, account_gaps, multi_account_churned and the test-phone exclusions used to be
+copy-pasted into every savings report (main_segments, churn_clients, client_segments_behaviour,
+withdrawal_frequency_churn_analysis, payment_failure_retention_analysis, retention_analysis, ...),
+so a full refresh recomputed them from SAVINGSACCOUNT and SAVINGSTRANSACTION once per report.
+They now live as models in savings_queries/models/, one SELECT per file, referring to each other
+with {{ ref('model') }}. A refresh builds the models in dependency order, each exactly once, as
+tables in GHANA_PROD.SAVINGS_MODELS, and the reports read those tables: the raw transaction tables
+are scanned once per refresh (by savings_transactions) instead of once per report.
+
+Models take the refresh parameters as {{ }} placeholders (as_of, savings_start_date); their values
+are recorded in refresh_info so the reports use the same as-of date as the tables they read.
+With --manifest the report batch runs after the build (see batch_runner); the reports' cache
+entries are keyed on the model tables' versions, so a rebuild invalidates them.
+
+Usage:
+    python savings_models.py list
+    python savings_models.py refresh [--as-of 2025-10-20] [--models account_gaps ...] [--manifest savings_reports.txt]
+                             [--backend duckdb --database ghana_prod.duckdb]
+"""
+
+import argparse
+import glob
+import graphlib
+import json
+import os
+import re
+import time
+
+import pandas as pd
+
+from query_params import QueryTemplate
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(REPO_ROOT, 'savings_queries', 'models')
+TARGET_SCHEMA = 'GHANA_PROD.SAVINGS_MODELS'
+STATE_FILE = 'savings_models_state.json'
+SAVINGS_START_DATE = '2025-04-03'
+
+REF = re.compile(r"\{\{\s*ref\(\s*'(\w+)'\s*\)\s*\}\}")
+
+class Model:
+    """One model file: its SELECT, the models it refers to and where it is materialised"""
+
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.splitext(os.path.basename(path))[0]
+        with open(path) as f:
+            self.sql = f.read().strip().rstrip(';')
+        self.refs = sorted(set(REF.findall(self.sql)))
+
+    def compiled(self, target, values):
+        """SELECT with refs pointing at target and parameters inlined (models are DDL, not bound queries)"""
+        sql = REF.sub(lambda match: f"{target}.{match.group(1).upper()}", self.sql)
+        return QueryTemplate(sql).inline(values)
+
+def load_models(directory=MODELS_DIR):
+    models = {model.name: model for model in map(Model, sorted(glob.glob(os.path.join(directory, '*.sql'))))}
+    for model in models.values():
+        missing = [name for name in model.refs if name not in models]
+        if missing:
+            raise ValueError(f"Model {model.name} refers to unknown models {missing}")
+    return models
+
+def build_order(models, selected=None):
+    """Selected models (default: all) and everything upstream of them, dependencies first"""
+    needed, pending = set(), list(selected or models)
+    while pending:
+        name = pending.pop()
+        if name not in models:
+            raise ValueError(f"Unknown model {name!r} (available: {sorted(models)})")
+        if name not in needed:
+            needed.add(name)
+            pending.extend(models[name].refs)
+    # graphlib raises CycleError when two models refer to each other
+    return list(graphlib.TopologicalSorter({name: models[name].refs for name in sorted(needed)}).static_order())
+
+class ModelBuilder:
+    """Builds models as tables in target, in dependency order, recording each build in a state file"""
+
+    def __init__(self, backend, models, target=TARGET_SCHEMA, state_file=STATE_FILE):
+        self.backend = backend
+        self.models = models
+        self.target = target
+        self.state_file = state_file
+        self.state = {}
+        if os.path.exists(state_file):
+            with open(state_file) as f:
+                self.state = json.load(f)
+
+    def build(self, name, values):
+        model = self.models[name]
+        table = f"{self.target}.{name.upper()}"
+        started = time.perf_counter()
+        self.backend.execute(f"CREATE OR REPLACE TABLE {table} AS\n{model.compiled(self.target, values)}")
+        rows = int(self.backend.execute(f"SELECT COUNT(*) AS row_count FROM {table}").iloc[0, 0])
+        record = {'model': name, 'table': table, 'rows': rows, 'seconds': time.perf_counter() - started,
+                  'built_at': f"{pd.Timestamp.now():%Y-%m-%d %H:%M:%S}", 'values': values}
+        self.state[name] = record
+        return record
+
+    def refresh(self, values, selected=None, on_build=None):
+        """Build every needed model once; returns one record per model"""
+        self.backend.execute(f"CREATE SCHEMA IF NOT EXISTS {self.target}")
+        records = []
+        for name in build_order(self.models, selected):
+            record = self.build(name, values)
+            records.append(record)
+            if on_build:
+                on_build(record)
+        with open(self.state_file, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        return records
+
+def main():
+    from report_runner import CACHE_DIR, ResultCache, connect
+
+    parser = argparse.ArgumentParser(description="Build the shared savings base tables")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('list', help="List the models and their dependencies")
+    refresh_parser = subparsers.add_parser('refresh', help="Build models (and their dependencies) once each")
+    refresh_parser.add_argument('--as-of', default=f"{pd.Timestamp.today():%Y-%m-%d}")
+    refresh_parser.add_argument('--savings-start-date', default=SAVINGS_START_DATE)
+    refresh_parser.add_argument('--models', nargs='*', default=None, help="Models to build (default: all)")
+    refresh_parser.add_argument('--manifest', default=None, help="Report manifest to run after the build")
+    refresh_parser.add_argument('--concurrency', type=int, default=4)
+    refresh_parser.add_argument('--output-dir', default='savings_reports')
+    refresh_parser.add_argument('--state-file', default=STATE_FILE)
+    refresh_parser.add_argument('--backend', choices=['snowflake', 'duckdb'], default='snowflake')
+    refresh_parser.add_argument('--database', default=None)
+    for subparser in subparsers.choices.values():
+        subparser.add_argument('--models-dir', default=MODELS_DIR)
+        subparser.add_argument('--target', default=TARGET_SCHEMA)
+    args = parser.parse_args()
+
+    models = load_models(args.models_dir)
+    if args.command == 'list':
+        for name in build_order(models):
+            refs = ', '.join(models[name].refs) or '-'
+            print(f"  - {name} -> {args.target}.{name.upper()} (depends on: {refs})")
+        return
+
+    values = {'as_of': args.as_of, 'savings_start_date': args.savings_start_date}
+    backend = connect(args.backend, args.database)
+    try:
+        builder = ModelBuilder(backend, models, args.target, args.state_file)
+        print(f"Building savings models as of {args.as_of} into {args.target}")
+        records = builder.refresh(values, args.models,
+                                  lambda record: print(f"  {record['model']}: {record['rows']:,} rows in {record['seconds']:.2f}s"))
+    finally:
+        backend.close()
+
+    print("\n" + "="*60)
+    print("MODEL BUILD SUMMARY")
+    print("="*60)
+    print(pd.DataFrame(records)[['model', 'table', 'rows', 'seconds']].round(2).to_string(index=False))
+
+    if args.manifest:
+        from batch_runner import ConnectionPool, read_manifest, run_batch
+        pool = ConnectionPool(lambda: connect(args.backend, args.database), args.concurrency)
+        try:
+            report = run_batch(read_manifest(args.manifest), pool, ResultCache(CACHE_DIR), args.concurrency,
+                               output_dir=args.output_dir)
+        finally:
+            pool.close()
+        print(f"\nReports: {report['status'].value_counts().to_dict()} -> {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
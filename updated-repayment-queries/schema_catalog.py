@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Cached column catalog for every warehouse schema the repository's SQL touches
+
+The schemas come from the tables referenced in the repository's .sql files (ghana_prod.mambu,
+ghana_prod.ml, ghana_prod.data, ug_prod.mambu, ...). Their columns are fetched with one
+information_schema query (one SELECT per database, UNION ALL-ed into a single round trip) and
+saved as a timestamped Parquet snapshot. Later reads use the latest snapshot while it is younger
+than --max-age, and every fetch is diffed against the previous snapshot to report added, dropped
+and retyped columns.
+
+Usage:
+    python schema_catalog.py fetch [--refresh] [--max-age 24] [--backend duckdb --database local.duckdb]
+    python schema_catalog.py diff [OLD_SNAPSHOT NEW_SNAPSHOT]
+    python schema_catalog.py tables
+"""
+
+import argparse
+import glob
+import os
+
+import pandas as pd
+
+from report_runner import connect, source_tables
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CATALOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schema_catalog')
+DEFAULT_DATABASE = 'GHANA_PROD'
+MAX_AGE_HOURS = 24
+
+CATALOG_COLUMNS = ['TABLE_CATALOG', 'TABLE_SCHEMA', 'TABLE_NAME', 'COLUMN_NAME', 'DATA_TYPE',
+                   'CHARACTER_MAXIMUM_LENGTH', 'NUMERIC_PRECISION', 'NUMERIC_SCALE', 'IS_NULLABLE',
+                   'COLUMN_DEFAULT', 'ORDINAL_POSITION']
+
+def touched_tables(root=REPO_ROOT):
+    """(database, schema, table) for every schema-qualified table read by a .sql file under root"""
+    names = set()
+    for path in glob.glob(os.path.join(root, '**', '*.sql'), recursive=True):
+        with open(path, errors='replace') as f:
+            names.update(tuple(name.upper().split('.')) for name in source_tables(f.read()))
+    databases = {parts[0] for parts in names if len(parts) == 3} | {DEFAULT_DATABASE}
+    tables = set()
+    for parts in names:
+        if len(parts) == 2:
+            # database.schema with the table cut off is not schema.table in the default database
+            if parts[0] in databases:
+                continue
+            parts = (DEFAULT_DATABASE,) + parts
+        if len(parts) == 3 and parts[1] != 'INFORMATION_SCHEMA':
+            tables.add(parts)
+    return sorted(tables)
+
+def catalog_sql(schemas, backend_name='snowflake'):
+    """One query returning the columns of every (database, schema) pair"""
+    columns = ', '.join(CATALOG_COLUMNS)
+    if backend_name == 'duckdb':
+        # The local stand-in is a single database; schemas are matched by name only
+        names = ', '.join(sorted({f"'{schema.lower()}'" for _, schema in schemas}))
+        return f"SELECT {columns} FROM information_schema.columns WHERE lower(table_schema) IN ({names})"
+    by_database = {}
+    for database, schema in schemas:
+        by_database.setdefault(database, set()).add(schema)
+    selects = [f"SELECT {columns} FROM {database}.information_schema.columns "
+               f"WHERE table_schema IN ({', '.join(repr(schema) for schema in sorted(names))})"
+               for database, names in sorted(by_database.items())]
+    return '\nUNION ALL\n'.join(selects)
+
+def fetch_catalog(backend, tables=None):
+    """Columns of all schemas holding the given (or the repository's) tables, in one round trip"""
+    tables = touched_tables() if tables is None else tables
+    schemas = sorted({(database, schema) for database, schema, _ in tables})
+    catalog = backend.execute(catalog_sql(schemas, backend.name))
+    catalog.columns = [column.upper() for column in catalog.columns]
+    for column in ['TABLE_CATALOG', 'TABLE_SCHEMA', 'TABLE_NAME', 'COLUMN_NAME']:
+        catalog[column] = catalog[column].astype(str).str.upper()
+    return catalog.sort_values(['TABLE_CATALOG', 'TABLE_SCHEMA', 'TABLE_NAME', 'ORDINAL_POSITION']).reset_index(drop=True)
+
+def column_type(catalog):
+    """DATA_TYPE with its length or precision, e.g. TEXT(16777216), NUMBER(38,0)"""
+    data_type = catalog['DATA_TYPE'].astype(str)
+    length = pd.to_numeric(catalog['CHARACTER_MAXIMUM_LENGTH'], errors='coerce')
+    precision = pd.to_numeric(catalog['NUMERIC_PRECISION'], errors='coerce')
+    scale = pd.to_numeric(catalog['NUMERIC_SCALE'], errors='coerce')
+    sized = data_type + '(' + length.astype('Int64').astype(str) + ')'
+    numeric = data_type + '(' + precision.astype('Int64').astype(str) + ',' + scale.fillna(0).astype('Int64').astype(str) + ')'
+    # DuckDB already spells the size out in DATA_TYPE (DECIMAL(18,2))
+    with_size = sized.where(length.notna(), numeric.where(precision.notna(), data_type))
+    return data_type.where(data_type.str.contains('(', regex=False), with_size)
+
+def diff_catalogs(old, new):
+    """
+    Added, dropped and retyped columns between two catalog snapshots, in the schemas both
+    snapshots cover (a schema newly added to or removed from the fetch is not a column change)
+    """
+    keys = ['TABLE_CATALOG', 'TABLE_SCHEMA', 'TABLE_NAME', 'COLUMN_NAME']
+    schemas = ['TABLE_CATALOG', 'TABLE_SCHEMA']
+    shared = old[schemas].drop_duplicates().merge(new[schemas].drop_duplicates())
+    old, new = old.merge(shared), new.merge(shared)
+    old = old.assign(COLUMN_TYPE=column_type(old))[keys + ['COLUMN_TYPE']]
+    new = new.assign(COLUMN_TYPE=column_type(new))[keys + ['COLUMN_TYPE']]
+    merged = old.merge(new, on=keys, how='outer', suffixes=('_OLD', '_NEW'), indicator=True)
+    merged['CHANGE'] = merged['_merge'].map({'left_only': 'dropped', 'right_only': 'added', 'both': 'retyped'})
+    changed = (merged['CHANGE'] != 'retyped') | (merged['COLUMN_TYPE_OLD'] != merged['COLUMN_TYPE_NEW'])
+    return merged[changed].drop(columns='_merge').rename(columns={'COLUMN_TYPE_OLD': 'OLD_TYPE', 'COLUMN_TYPE_NEW': 'NEW_TYPE'}) \
+        [['CHANGE'] + keys + ['OLD_TYPE', 'NEW_TYPE']].sort_values(['CHANGE'] + keys).reset_index(drop=True)
+
+class SchemaCatalog:
+    """Timestamped catalog snapshots in a directory (columns_YYYYmmdd_HHMMSS.parquet)"""
+
+    def __init__(self, directory=CATALOG_DIR):
+        self.directory = directory
+
+    def snapshots(self):
+        return sorted(glob.glob(os.path.join(self.directory, 'columns_*.parquet')))
+
+    @staticmethod
+    def fetched_at(path):
+        return pd.to_datetime(os.path.basename(path)[len('columns_'):-len('.parquet')], format='%Y%m%d_%H%M%S')
+
+    def save(self, catalog):
+        fetched_at = pd.Timestamp.now()
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"columns_{fetched_at:%Y%m%d_%H%M%S}.parquet")
+        catalog.assign(FETCHED_AT=fetched_at).to_parquet(path, index=False)
+        return path
+
+    def latest(self, max_age_hours=None):
+        """Latest snapshot, or None when there is none or it is older than max_age_hours"""
+        snapshots = self.snapshots()
+        if not snapshots:
+            return None
+        if max_age_hours is not None and pd.Timestamp.now() - self.fetched_at(snapshots[-1]) > pd.Timedelta(hours=max_age_hours):
+            return None
+        return pd.read_parquet(snapshots[-1])
+
+    def refresh(self, backend, max_age_hours=MAX_AGE_HOURS, force=False, tables=None):
+        """(catalog, diff against the previous snapshot or None when served from cache)"""
+        cached = None if force else self.latest(max_age_hours)
+        if cached is not None:
+            return cached, None
+        previous = self.latest()
+        catalog = fetch_catalog(backend, tables)
+        self.save(catalog)
+        diff = diff_catalogs(previous if previous is not None else catalog, catalog)
+        return catalog, diff
+
+def print_diff(diff):
+    if diff.empty:
+        print("No column changes since the previous snapshot")
+        return
+    print(diff['CHANGE'].value_counts().to_string())
+    print(diff.to_string(index=False))
+
+def main():
+    parser = argparse.ArgumentParser(description="Cached warehouse column catalog with snapshot diffs")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    fetch_parser = subparsers.add_parser('fetch', help="Fetch the catalog (unless the latest snapshot is fresh)")
+    fetch_parser.add_argument('--refresh', action='store_true', help="Fetch even when the latest snapshot is fresh")
+    fetch_parser.add_argument('--max-age', type=float, default=MAX_AGE_HOURS, help="Hours a snapshot stays fresh")
+    fetch_parser.add_argument('--backend', choices=['snowflake', 'duckdb'], default='snowflake')
+    fetch_parser.add_argument('--database', default=None)
+    diff_parser = subparsers.add_parser('diff', help="Diff two snapshots (default: the last two)")
+    diff_parser.add_argument('snapshots', nargs='*')
+    subparsers.add_parser('tables', help="List the tables the repository's SQL reads")
+    for subparser in subparsers.choices.values():
+        subparser.add_argument('--catalog-dir', default=CATALOG_DIR)
+    args = parser.parse_args()
+
+    catalog_store = SchemaCatalog(args.catalog_dir)
+    if args.command == 'tables':
+        for table in touched_tables():
+            print('.'.join(table))
+    elif args.command == 'diff':
+        paths = args.snapshots or catalog_store.snapshots()[-2:]
+        if len(paths) < 2:
+            print("Need two snapshots to diff")
+            return
+        print_diff(diff_catalogs(pd.read_parquet(paths[-2]), pd.read_parquet(paths[-1])))
+    else:
+        backend = connect(args.backend, args.database)
+        try:
+            catalog, diff = catalog_store.refresh(backend, args.max_age, args.refresh)
+        finally:
+            backend.close()
+        tables = catalog.groupby(['TABLE_CATALOG', 'TABLE_SCHEMA', 'TABLE_NAME']).ngroups
+        print(f"Catalog: {len(catalog)} columns in {tables} tables")
+        if diff is None:
+            print(f"Served from the snapshot fetched at {catalog['FETCHED_AT'].iloc[0]}" if len(catalog) else "Empty snapshot")
+        else:
+            print_diff(diff)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Static performance analyser for the repository's SQL
+
+Every .sql file is parsed with sqlglot (Snowflake dialect; {{ ref('model') }} becomes the savings
+model table and other Redash {{ }} placeholders a dummy value first) and each SELECT is checked
+for the patterns that dominate our warehouse time:
+  - cross_join_spine  CROSS / comma / range join of a month or date spine with a table
+                      (loanbookatdate/*.sql: every loan x every month)
+  - cross_join        any other CROSS join, or comma join without a WHERE equality linking it
+  - non_equi_join     JOIN ... ON without an equality between the two sides (expressions allowed)
+  - qualify_full_scan QUALIFY ROW_NUMBER() over a large table with no WHERE before it
+  - not_in_subquery   NOT IN (SELECT ...) - null-unsafe, usually a nested-loop anti join (rows x subquery rows)
+  - repeated_parse_json PARSE_JSON(x) evaluated more than once per row for the same x
+  - distinct_wide     SELECT DISTINCT * or DISTINCT over many columns
+Rows flowing through each SELECT are estimated from table cardinality hints (CARDINALITY_HINTS,
+overridable with --hints rows.json): key joins keep the larger side, cross and range joins
+multiply, CTEs and subqueries are estimated recursively. Findings are ranked by the estimated
+rows they touch, so the top of the report is where optimisation pays most.
+
+Usage:
+    python sql_analyser.py [PATH ...] [--hints rows.json] [--top 30] [--output sql_findings.csv]
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import re
+
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Rough order-of-magnitude row counts; replace with real ROW_COUNTs via --hints
+CARDINALITY_HINTS = {
+    'mambu.loantransaction': 20_000_000,
+    'mambu.savingstransaction': 30_000_000,
+    'mambu.repayment': 6_000_000,
+    'mambu.loanaccount': 1_000_000,
+    'mambu.savingsaccount': 1_500_000,
+    'mambu.client': 1_500_000,
+    'mambu.customfieldvalue': 15_000_000,
+    'mambu.client_extra_values': 1_500_000,
+    'mambu.activity': 20_000_000,
+    'mambu.gljournalentry': 40_000_000,
+    'ml.loan_info_tbl': 1_000_000,
+    'ml.repayment_transactions_extended': 8_000_000,
+    'ml.repayment': 6_000_000,
+    'ml.client_info': 1_500_000,
+    'data.backend_notifications': 60_000_000,
+    'data.fido_score': 5_000_000,
+    'data.survey_data': 500_000,
+    'data.infobip_sms': 20_000_000,
+    'banking_service.subscription_log': 5_000_000,
+    'banking_service.user': 1_500_000,
+    'savings.savings_transactions': 30_000_000,
+    # Savings models read through {{ ref() }}: the one-row as-of record and the test phone list
+    'savings_models.refresh_info': 1,
+    'savings_models.test_phone_numbers': 5,
+}
+DEFAULT_TABLE_ROWS = 100_000
+DEFAULT_SPINE_ROWS = 36
+LARGE_TABLE_ROWS = 1_000_000
+WIDE_DISTINCT_COLUMNS = 8
+SPINE_NAME = re.compile(r"spine|month|calendar|date_range|dates|periods", re.IGNORECASE)
+PLACEHOLDER = re.compile(r"\{\{[^{}]*\}\}")
+
+RULES = {
+    'cross_join_spine': "Spine x table cross/range join - every row repeated per period",
+    'cross_join': "Cross or comma join - cartesian product",
+    'non_equi_join': "Join without an equality condition - range/nested-loop join",
+    'qualify_full_scan': "QUALIFY window over a whole large table",
+    'not_in_subquery': "NOT IN (subquery) - use NOT EXISTS or an anti join",
+    'repeated_parse_json': "Same JSON parsed several times per row - parse once in a CTE",
+    'distinct_wide': "DISTINCT over a wide select - dedupe on keys instead",
+}
+
+def node_line(node):
+    """First source line recorded under node (sqlglot keeps token positions on identifiers)"""
+    for child in node.walk():
+        line = (child.meta or {}).get('line')
+        if line:
+            return line
+    return None
+
+def table_name(table):
+    return '.'.join(part for part in (table.catalog, table.db, table.name) if part).lower()
+
+class QueryEstimator:
+    """Row estimates for the SELECTs of one parsed statement"""
+
+    def __init__(self, tree, hints):
+        from sqlglot import exp
+        self.exp = exp
+        self.hints = hints
+        self.ctes = {cte.alias_or_name.lower(): cte.this for cte in tree.find_all(exp.CTE)}
+        self.memo = {}
+        self.in_progress = set()
+
+    def hinted_rows(self, name):
+        parts = name.split('.')
+        for key in ('.'.join(parts[-2:]), parts[-1]):
+            if key in self.hints:
+                return self.hints[key]
+        return DEFAULT_TABLE_ROWS
+
+    def cte(self, source):
+        """CTE body an unqualified table reference points to (schema-qualified names are base tables)"""
+        if isinstance(source, self.exp.Table) and not source.db:
+            return self.ctes.get(source.name.lower())
+        return None
+
+    def is_base_table(self, source):
+        return isinstance(source, self.exp.Table) and self.cte(source) is None and not source.find(self.exp.Generator)
+
+    def is_spine(self, source):
+        """Month / date spines: generator-based sources, or CTEs and subqueries named like a calendar"""
+        exp = self.exp
+        if source.find(exp.Generator) or source.find(exp.Explode) or source.find(exp.Unnest):
+            return True
+        if isinstance(source, exp.Subquery):
+            return bool(SPINE_NAME.search(source.alias_or_name or ''))
+        cte = self.cte(source)
+        if cte is None:
+            return False
+        if cte.find(exp.Generator) or cte.find(exp.GenerateDateArray) or cte.find(exp.GenerateSeries):
+            return True
+        return bool(SPINE_NAME.search(source.name) or SPINE_NAME.search(source.alias_or_name))
+
+    def source_rows(self, source):
+        exp = self.exp
+        generator = source.find(exp.Generator)
+        if generator is not None:
+            rowcount = generator.args.get('rowcount')
+            return int(rowcount.this) if isinstance(rowcount, exp.Literal) and not rowcount.is_string else DEFAULT_SPINE_ROWS
+        if self.is_spine(source):
+            # seq4() over a table or SELECT DISTINCT month: one row per period, whatever it reads
+            return DEFAULT_SPINE_ROWS
+        if isinstance(source, exp.Table):
+            cte = self.cte(source)
+            return self.select_rows(cte) if cte is not None else self.hinted_rows(table_name(source))
+        if isinstance(source, exp.Subquery):
+            return self.select_rows(source.this)
+        return DEFAULT_TABLE_ROWS
+
+    def select_rows(self, query):
+        """Rows produced by a query: unions add up, joins as in is_product"""
+        exp = self.exp
+        key = id(query)
+        if key in self.memo:
+            return self.memo[key]
+        if key in self.in_progress:
+            return DEFAULT_SPINE_ROWS  # recursive CTE (date ranges): treat as a spine
+        self.in_progress.add(key)
+        if isinstance(query, exp.Union):
+            rows = self.select_rows(query.this) + self.select_rows(query.expression)
+        elif isinstance(query, exp.Select):
+            rows = self.joined_rows(query)[-1]
+        else:
+            rows = DEFAULT_TABLE_ROWS
+        self.in_progress.discard(key)
+        self.memo[key] = rows
+        return rows
+
+    def joined_rows(self, select):
+        """Running row estimate after the FROM source and after each join"""
+        source = select.args.get('from_') or select.args.get('from')
+        rows = [self.source_rows(source.this) if source is not None else 1]
+        for join in select.args.get('joins') or []:
+            right = self.source_rows(join.this)
+            rows.append(rows[-1] * right if self.is_product(join) else max(rows[-1], right))
+        return rows
+
+    def is_product(self, join):
+        """
+        Cross joins, and joins with no equality between the joined source and the rest: in the ON,
+        or for comma joins in the WHERE. Either side of the equality may be an expression
+        (DATE_TRUNC('month', l.creationdate) = days.month is still a key join).
+        """
+        exp = self.exp
+        if (join.args.get('kind') or '').upper() == 'CROSS':
+            return True
+        if join.args.get('using'):
+            return False
+        condition = join.args.get('on')
+        if condition is None:
+            select = join.parent
+            condition = select.args.get('where') if isinstance(select, exp.Select) else None
+        if condition is None:
+            return True
+        joined = (join.this.alias_or_name or '').lower()
+        return not any(self.links(eq, joined) for eq in condition.find_all(exp.EQ)
+                       if eq.parent_select is condition.parent_select)
+
+    def links(self, eq, joined):
+        """Whether one side of eq reads the joined source and the other side reads another source"""
+        def sources(side):
+            # Unqualified columns could belong to either side
+            return {(column.table or '').lower() for column in side.find_all(self.exp.Column)}
+        left, right = sources(eq.this), sources(eq.expression)
+        if not left or not right:
+            return False
+        reads_joined = lambda names: joined in names or '' in names
+        reads_other = lambda names: bool(names - {joined})
+        return (reads_joined(left) and reads_other(right)) or (reads_joined(right) and reads_other(left))
+
+def own_nodes(select, node_type):
+    """Nodes of node_type whose nearest enclosing SELECT is select"""
+    return [node for node in select.find_all(node_type) if node.parent_select is select]
+
+def analyse_statement(tree, hints):
+    """Findings (rule, line, estimated rows, detail) for one parsed statement"""
+    from sqlglot import exp
+    estimator = QueryEstimator(tree, hints)
+    findings = []
+    for select in tree.find_all(exp.Select):
+        rows = estimator.joined_rows(select)
+        source = select.args.get('from_') or select.args.get('from')
+        sources = ([source.this] if source is not None else []) + [join.this for join in select.args.get('joins') or []]
+
+        for position, join in enumerate(select.args.get('joins') or []):
+            if not estimator.is_product(join):
+                continue
+            spine = estimator.is_spine(join.this) or any(estimator.is_spine(other) for other in sources[:position + 1])
+            explicit = (join.args.get('kind') or '').upper() == 'CROSS' or join.args.get('on') is None
+            rule = 'cross_join_spine' if spine else ('cross_join' if explicit else 'non_equi_join')
+            findings.append((rule, node_line(join), rows[position + 1],
+                             f"{' x '.join(s.alias_or_name for s in sources[:position + 2])}"))
+
+        if select.args.get('qualify') is not None and select.args.get('where') is None:
+            large = [s for s in sources if estimator.is_base_table(s) and estimator.hinted_rows(table_name(s)) >= LARGE_TABLE_ROWS]
+            if large:
+                findings.append(('qualify_full_scan', node_line(select.args['qualify']), rows[-1],
+                                 f"window over {', '.join(table_name(s) for s in large)}"))
+
+        # NOT IN is null-unsafe, so it often runs as a nested loop: every row against the subquery
+        for neq in own_nodes(select, exp.NEQ):
+            if isinstance(neq.expression, exp.All) and neq.expression.find(exp.Select):
+                findings.append(('not_in_subquery', node_line(neq), rows[-1] * estimator.select_rows(neq.expression.find(exp.Select)),
+                                 f"{neq.this.sql(dialect='snowflake')} NOT IN (SELECT ...)"))
+        for negation in own_nodes(select, exp.Not):
+            query = negation.this.args.get('query') if isinstance(negation.this, exp.In) else None
+            if query is not None:
+                subquery = query.this if isinstance(query, exp.Subquery) else query
+                findings.append(('not_in_subquery', node_line(negation), rows[-1] * estimator.select_rows(subquery),
+                                 f"{negation.this.this.sql(dialect='snowflake')} NOT IN (SELECT ...)"))
+
+        parsed = {}
+        for parse_json in own_nodes(select, exp.ParseJSON):
+            argument = parse_json.this.sql(dialect='snowflake').lower().split('.')[-1]
+            parsed.setdefault(argument, []).append(parse_json)
+        for argument, calls in parsed.items():
+            if len(calls) > 1:
+                findings.append(('repeated_parse_json', node_line(calls[0]), rows[-1] * len(calls),
+                                 f"PARSE_JSON({argument}) x {len(calls)}"))
+
+        if select.args.get('distinct') is not None:
+            columns = select.expressions
+            if any(isinstance(column, exp.Star) or column.find(exp.Star) for column in columns) or len(columns) >= WIDE_DISTINCT_COLUMNS:
+                findings.append(('distinct_wide', node_line(select), rows[-1], f"DISTINCT over {len(columns)} columns"))
+    return findings
+
+def analyse_file(path, hints):
+    """Findings for every statement of a .sql file, plus any parse problem"""
+    import sqlglot
+    from sqlglot.errors import ErrorLevel, ParseError
+    from savings_models import REF, TARGET_SCHEMA
+    with open(path, errors='replace') as f:
+        sql = f.read()
+    # {{ ref('model') }} is a savings model table; other placeholders get a dummy value
+    sql = REF.sub(lambda match: f"{TARGET_SCHEMA}.{match.group(1)}", sql)
+    sql = PLACEHOLDER.sub('__param__', sql)
+    logging.getLogger('sqlglot').setLevel(logging.CRITICAL)
+    findings = []
+    try:
+        trees = sqlglot.parse(sql, read='snowflake')
+    except ParseError as e:
+        error = e.errors[0] if e.errors else {}
+        findings.append(('parse_error', error.get('line'), 0, f"ParseError: {(error.get('description') or str(e)).splitlines()[0][:120]}"))
+        # What still parses leniently is analysed as well
+        trees = sqlglot.parse(sql, read='snowflake', error_level=ErrorLevel.IGNORE)
+    for tree in trees:
+        if tree is not None:
+            findings.extend(analyse_statement(tree, hints))
+    return findings
+
+def sql_files(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(glob.glob(os.path.join(path, '**', '*.sql'), recursive=True))
+        else:
+            files.append(path)
+    return sorted(set(files))
+
+def analyse(paths, hints=None):
+    """Ranked findings across files: one row per finding, highest estimated rows first"""
+    hints = {**CARDINALITY_HINTS, **{name.lower(): rows for name, rows in (hints or {}).items()}}
+    records = []
+    for path in sql_files(paths):
+        relative = os.path.relpath(path, REPO_ROOT) if os.path.abspath(path).startswith(REPO_ROOT) else path
+        for rule, line, rows, detail in analyse_file(path, hints):
+            records.append({'rule': rule, 'file': relative, 'line': line, 'est_rows': rows, 'detail': detail})
+    findings = pd.DataFrame(records, columns=['rule', 'file', 'line', 'est_rows', 'detail'])
+    findings = findings.drop_duplicates().sort_values(['est_rows', 'file', 'line'], ascending=[False, True, True])
+    findings.insert(0, 'rank', range(1, len(findings) + 1))
+    return findings.reset_index(drop=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Static performance analysis of the repository's SQL")
+    parser.add_argument('paths', nargs='*', default=[REPO_ROOT], help=".sql files or directories (default: whole repository)")
+    parser.add_argument('--hints', default=None, help="JSON {table: row count} overriding CARDINALITY_HINTS")
+    parser.add_argument('--top', type=int, default=30)
+    parser.add_argument('--output', default='sql_findings.csv')
+    args = parser.parse_args()
+
+    hints = None
+    if args.hints:
+        with open(args.hints) as f:
+            hints = json.load(f)
+    findings = analyse(args.paths, hints)
+    findings.to_csv(args.output, index=False)
+
+    print("="*60)
+    print(f"TOP {args.top} FINDINGS BY ESTIMATED ROWS")
+    print("="*60)
+    with pd.option_context('display.max_colwidth', 70, 'display.width', 200):
+        print(findings.head(args.top).to_string(index=False, formatters={'est_rows': '{:,.0f}'.format}))
+
+    print("\n" + "="*60)
+    print("BY RULE")
+    print("="*60)
+    by_rule = findings.groupby('rule').agg(findings=('rank', 'size'), files=('file', 'nunique'), est_rows=('est_rows', 'sum'))
+    by_rule['description'] = by_rule.index.map(RULES).fillna('')
+    print(by_rule.sort_values('est_rows', ascending=False).to_string(formatters={'est_rows': '{:,.0f}'.format}))
+
+    print("\n" + "="*60)
+    print("BY FILE")
+    print("="*60)
+    by_file = findings.groupby('file').agg(findings=('rank', 'size'), est_rows=('est_rows', 'sum'))
+    print(by_file.sort_values('est_rows', ascending=False).head(args.top).to_string(formatters={'est_rows': '{:,.0f}'.format}))
+    print(f"\n{len(findings)} findings saved to: {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,549 @@
+#!/usr/bin/env python3
+"""
+Seeded synthetic MAMBU-schema data in DuckDB
+
+Generates the tables the repository's reports read (mambu.client, savingsaccount,
+savingstransaction, customfield/customfieldvalue, loanaccount, loantransaction, repayment,
+ml.loan_info_tbl, ml.repayment_transactions_extended, data.backend_notifications, data.fido_score,
+data.survey_data, banking_service.user, banking_service.subscription_log,
+savings.savings_transactions) into a local DuckDB database named like the warehouse (ghana_prod.duckdb), so reports can be timed
+without spending warehouse credits. Volumes scale with --scale (1x is ~20k clients, 10x and 100x
+multiply every table) and follow the skews seen in production:
+  - clients take repeat loans (ln) geometrically, and loan volume grows towards recent months,
+  - transactions per savings account are heavy-tailed (a few very active savers),
+  - notification types and users are Zipf-distributed.
+Data is generated in chunks of clients, each with its own seed derived from --seed, so the same
+seed, scale and --chunk-clients always produce the same tables and memory stays at one chunk.
+Columns the reports reference but the generator does not model are added as typed NULL columns,
+and every other schema-qualified table the reports read is created empty with the columns they
+reference, so every query binds.
+
+Usage:
+    python synthetic_data.py [--scale 1x|10x|100x] [--seed 42] [--database ghana_prod.duckdb]
+"""
+
+import argparse
+import glob
+import logging
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCALES = {'1x': 1, '10x': 10, '100x': 100}
+BASE_CLIENTS = 20_000
+CHUNK_CLIENTS = 50_000
+TEST_PHONES = ['233552602681', '233243630046', '233245822584', '23346722591', '233257806345']
+
+LOAN_START, DATA_END = pd.Timestamp('2022-01-01'), pd.Timestamp('2025-10-31')
+SAVINGS_START = pd.Timestamp('2025-04-03')
+
+TRANSACTION_FIELDS = ['ACCOUNT_NUMBER_TRANSACTION_CHANN', 'NETWORK_TRANSACTION_CHANNEL',
+                      'IDENTIFIER_TRANSACTION_CHANNEL_I', 'INTERNAL_ID']
+NOTIFICATION_TYPES = ['BE_AUTHENTICATION_PHONE_VERIFICATION_2', 'BE_LOAN_REPAYMENT_RESULT', 'BE_KYC_VERIFICATION_RESULT',
+                      'BE_FIDOBIZ_SURVEY_SUBMISSION', 'BE_FIDOBIZ_SCORE_DOCUMENT_STATUS_EVENT', 'BE_LOAN_APPLICATION_CREATED']
+SUBSCRIPTION_SOURCES = ['ussd', 'app', 'web', 'agent', 'sms_campaign']
+REGIONS = ['Greater Accra Region', 'Ashanti Region', 'Central Region', 'Eastern Region', 'Western Region',
+           'Brong-Ahafo Region', 'Volta Region', 'Northern Region', 'Upper East Region', 'Upper West Region']
+SECTORS = ['Trading', 'Agriculture', 'Services', 'Manufacturing', 'Transport']
+INCOME_BANDS = ['Below 300 GHS', '301 GHS - 700 GHS', '701 GHS - 1000 GHS', '1001 GHS - 3000 GHS', 'Above 3000 GHS']
+
+# Tables generated, as referenced by the SQL (schema.table); the database is the file's name
+TABLES = ['mambu.client', 'mambu.savingsaccount', 'mambu.savingstransaction', 'mambu.customfield',
+          'mambu.customfieldvalue', 'ml.loan_info_tbl', 'mambu.loanaccount', 'mambu.loantransaction', 'mambu.repayment',
+          'ml.repayment_transactions_extended', 'data.backend_notifications', 'data.fido_score', 'data.survey_data',
+          'banking_service.user', 'banking_service.subscription_log', 'savings.savings_transactions']
+# Columns the reports only read unqualified in joins, where referenced_columns cannot place them
+EXTRA_COLUMNS = {'mambu.gljournalentry': {'amount', 'notes'}}
+# Schemas the reports read that are not raw data: built by savings_models.py, or DuckDB's own
+DERIVED_SCHEMAS = ['savings_models', 'information_schema']
+
+def quoted(table):
+    """schema.table as quoted identifiers (banking_service.user is a keyword)"""
+    return '.'.join(f'"{part}"' for part in table.split('.'))
+
+def keys(prefix, numbers):
+    return np.char.add(prefix, np.char.zfill(np.asarray(numbers).astype(str), 9))
+
+def random_times(rng, start, end, size, recency=1.0):
+    """Timestamps between start and end; recency > 1 skews them towards end (volume growth)"""
+    fraction = rng.random(size) ** (1.0 / recency)
+    return start + pd.to_timedelta((fraction * (end - start).total_seconds()).astype('int64'), unit='s')
+
+def zipf_choice(rng, options, size, exponent=1.2):
+    weights = 1.0 / np.arange(1, len(options) + 1) ** exponent
+    return np.asarray(options)[rng.choice(len(options), size, p=weights / weights.sum())]
+
+class SyntheticMambu:
+    """Generates the tables for one block of clients; ids are global so blocks can be appended"""
+
+    def __init__(self, seed=42):
+        self.seed = seed
+        self.transaction_ids = 0
+
+    def chunk(self, index, first_client, clients):
+        rng = np.random.default_rng([self.seed, index])
+        client_numbers = np.arange(first_client, first_client + clients)
+        tables = {'mambu.client': self.clients(rng, client_numbers)}
+        accounts = self.savings_accounts(rng, tables['mambu.client'])
+        transactions = self.savings_transactions(rng, accounts)
+        loans = self.loans(rng, tables['mambu.client'])
+        schedule = self.repayments(rng, loans)
+        tables.update({
+            'mambu.savingsaccount': accounts,
+            'mambu.savingstransaction': transactions,
+            'mambu.customfieldvalue': self.transaction_fields(rng, transactions),
+            'ml.loan_info_tbl': loans,
+            'mambu.loanaccount': self.loan_accounts(rng, loans),
+            'mambu.loantransaction': self.loan_transactions(rng, loans, schedule),
+            'mambu.repayment': schedule,
+            'ml.repayment_transactions_extended': self.repayment_transactions(rng, loans, schedule),
+            'data.backend_notifications': self.notifications(rng, tables['mambu.client']),
+            'data.fido_score': self.fido_scores(rng, loans),
+            'data.survey_data': self.surveys(rng, tables['mambu.client'], loans),
+            'banking_service.user': self.users(rng, tables['mambu.client']),
+            'banking_service.subscription_log': self.subscriptions(rng, tables['mambu.client']),
+            'savings.savings_transactions': self.wallet_transactions(rng, tables['mambu.client'], accounts, transactions),
+        })
+        return tables
+
+    def next_ids(self, count):
+        ids = np.arange(self.transaction_ids, self.transaction_ids + count)
+        self.transaction_ids += count
+        return ids
+
+    def clients(self, rng, numbers):
+        n = len(numbers)
+        phones = np.char.add('2332', np.char.zfill(rng.integers(0, 10**8, n).astype(str), 8))
+        if numbers[0] == 0:
+            phones[:len(TEST_PHONES)] = TEST_PHONES  # internal test clients, excluded by the reports
+        created = random_times(rng, LOAN_START - pd.Timedelta(days=365), DATA_END, n, recency=1.5)
+        return pd.DataFrame({
+            'id': np.char.add('', numbers.astype(str)),
+            'encodedkey': keys('8a', numbers),
+            'firstname': zipf_choice(rng, ['Kwame', 'Ama', 'Kofi', 'Akosua', 'Yaw', 'Abena', 'Kwabena', 'Efua'], n, 0.5),
+            'middlename': np.where(rng.random(n) < 0.3, zipf_choice(rng, ['Kojo', 'Adjoa', 'Yaa', 'Kwaku', 'N/A'], n, 0.5), None),
+            'lastname': zipf_choice(rng, ['Mensah', 'Owusu', 'Boateng', 'Asante', 'Osei', 'Addo', 'Appiah'], n, 0.5),
+            'gender': rng.choice(['MALE', 'FEMALE'], n, p=[0.55, 0.45]),
+            'birthdate': (pd.Timestamp('2005-01-01') - pd.to_timedelta(rng.gamma(4, 2200, n).astype(int) + 365, unit='D')).normalize(),
+            'mobilephone1': phones,
+            'mobilephone2': np.where(rng.random(n) < 0.1, np.char.add('2335', np.char.zfill(rng.integers(0, 10**8, n).astype(str), 8)), None),
+            'state': rng.choice(['ACTIVE', 'INACTIVE', 'EXITED'], n, p=[0.8, 0.15, 0.05]),
+            'creationdate': created,
+            'lastmodifieddate': created + pd.to_timedelta(rng.integers(0, 200, n), unit='D'),
+        })
+
+    def savings_accounts(self, rng, clients):
+        savers = clients[rng.random(len(clients)) < 0.6]
+        per_client = rng.geometric(0.7, len(savers)).clip(max=9)
+        owner = np.repeat(np.arange(len(savers)), per_client)
+        sequence = np.concatenate([np.arange(count) for count in per_client]) if len(per_client) else np.array([], int)
+        numbers = savers['id'].to_numpy(dtype=np.int64)[owner] * 10 + sequence
+        n = len(numbers)
+        created = random_times(rng, SAVINGS_START, DATA_END, n, recency=1.3)
+        state = rng.choice(['ACTIVE', 'CLOSED', 'WITHDRAWN', 'APPROVED'], n, p=[0.62, 0.28, 0.05, 0.05])
+        closed = created + pd.to_timedelta(rng.exponential(40, n).astype(int) + 1, unit='D')
+        closed = pd.Series(closed).where((state == 'CLOSED') & (closed <= DATA_END))
+        return pd.DataFrame({
+            'id': np.char.add('SA', numbers.astype(str)),
+            'encodedkey': keys('8s', numbers),
+            'accountholderkey': savers['encodedkey'].to_numpy()[owner],
+            'accounttype': rng.choice(['REGULAR_SAVINGS', 'CURRENT_ACCOUNT'], n, p=[0.92, 0.08]),
+            'accountstate': state,
+            'creationdate': created,
+            'closeddate': closed.to_numpy(),
+            'balance': np.round(rng.lognormal(4, 1.5, n) * (state == 'ACTIVE'), 2),
+            'lastmodifieddate': created + pd.to_timedelta(rng.integers(0, 60, n), unit='D'),
+        })
+
+    def savings_transactions(self, rng, accounts):
+        # Heavy tail: most accounts see a handful of transactions, a few see hundreds
+        per_account = np.minimum(rng.pareto(1.3, len(accounts)) * 4 + 1, 500).astype(int)
+        per_account[accounts['accountstate'].to_numpy() == 'WITHDRAWN'] = 0
+        owner = np.repeat(np.arange(len(accounts)), per_account)
+        n = len(owner)
+        created = accounts['creationdate'].to_numpy()[owner]
+        end = accounts['closeddate'].fillna(DATA_END).to_numpy()[owner]
+        when = created + (rng.random(n) * (end - created).astype('int64')).astype('timedelta64[ns]')
+        kind = rng.choice(['DEPOSIT', 'WITHDRAWAL', 'INTEREST_APPLIED', 'WITHDRAWAL_ADJUSTMENT', 'ADJUSTMENT'], n,
+                          p=[0.55, 0.35, 0.07, 0.02, 0.01])
+        amount = np.round(rng.lognormal(3.5, 1.2, n), 2)
+        ids = self.next_ids(n)
+        return pd.DataFrame({
+            'encodedkey': keys('8t', ids),
+            'transactionid': ids,
+            'parentaccountkey': accounts['encodedkey'].to_numpy()[owner],
+            'type': kind,
+            'amount': amount,
+            'balance': np.round(np.abs(rng.normal(200, 150, n)), 2),
+            'creationdate': when,
+            'entrydate': when + pd.to_timedelta(rng.integers(0, 120, n), unit='s'),
+        })
+
+    def transaction_fields(self, rng, transactions):
+        n = len(transactions)
+        wallets = np.char.add('2332', np.char.zfill(rng.integers(0, 10**8, n).astype(str), 8))
+        values = {
+            'ACCOUNT_NUMBER_TRANSACTION_CHANN': wallets,
+            'NETWORK_TRANSACTION_CHANNEL': rng.choice(['MTN', 'VODAFONE', 'AIRTELTIGO'], n, p=[0.7, 0.2, 0.1]),
+            'IDENTIFIER_TRANSACTION_CHANNEL_I': np.char.add('ID', rng.integers(0, 10**6, n).astype(str)),
+            'INTERNAL_ID': np.char.add('MOMO', transactions['transactionid'].to_numpy().astype(str)),
+        }
+        frames = [pd.DataFrame({'encodedkey': np.char.add(keys('8f', transactions['transactionid']), str(position)),
+                                'parentkey': transactions['encodedkey'].to_numpy(),
+                                'customfieldkey': f"CF{position}", 'value': value})
+                  for position, value in enumerate(values.values())]
+        return pd.concat(frames, ignore_index=True)
+
+    def loans(self, rng, clients):
+        borrowers = clients[rng.random(len(clients)) < 0.75]
+        per_client = rng.geometric(0.25, len(borrowers)).clip(max=40)
+        owner = np.repeat(np.arange(len(borrowers)), per_client)
+        ln = np.concatenate([np.arange(1, count + 1) for count in per_client]) if len(per_client) else np.array([], int)
+        numbers = borrowers['id'].to_numpy(dtype=np.int64)[owner] * 50 + ln
+        n = len(numbers)
+        # Repeat loans follow each other: disbursement dates sorted per client
+        disbursed = pd.Series(random_times(rng, LOAN_START, DATA_END, n, recency=1.8))
+        disbursed = disbursed.groupby(owner).transform(lambda dates: dates.sort_values().to_numpy()).dt.floor('s')
+        installments = rng.choice([1, 2, 4, 6, 12], n, p=[0.2, 0.3, 0.3, 0.1, 0.1])
+        amount = np.round(rng.lognormal(6.3, 0.7, n) * (1 + 0.15 * np.minimum(ln, 10)), -1)
+        age_days = (DATA_END - disbursed).dt.days.to_numpy()
+        state = np.where(age_days < installments * 30, rng.choice(['ACTIVE', 'ACTIVE_IN_ARREARS'], n, p=[0.85, 0.15]),
+                         rng.choice(['CLOSED', 'CLOSED_WRITTEN_OFF', 'ACTIVE_IN_ARREARS'], n, p=[0.9, 0.06, 0.04]))
+        return pd.DataFrame({
+            'loan_id': np.char.add('L', numbers.astype(str)),
+            'loan_key': keys('8l', numbers),
+            'client_id': borrowers['id'].to_numpy()[owner],
+            'client_key': borrowers['encodedkey'].to_numpy()[owner],
+            'ln': ln,
+            'loan_product_id': zipf_choice(rng, ['FIDO_BIZ', 'FIDO_FLEX', 'FIDO_PLUS', 'FIDO_AGRI'], n),
+            'producttypekey': zipf_choice(rng, ['PT1', 'PT2', 'PT3', 'PT4'], n),
+            'loanamount': amount,
+            'interestrate': rng.choice([8.0, 10.0, 12.5], n),
+            'repaymentinstallments': installments,
+            'creationdate': disbursed - pd.to_timedelta(rng.integers(60, 3600, n), unit='s'),
+            'approveddate': disbursed - pd.to_timedelta(rng.integers(1, 60, n), unit='s'),
+            'disbursementdate': disbursed,
+            'closeddate': pd.Series(disbursed + pd.to_timedelta(installments * 30, unit='D')).where(np.char.startswith(state.astype(str), 'CLOSED')).to_numpy(),
+            'accountstate': state,
+            'days_in_arrears': np.where(state == 'ACTIVE_IN_ARREARS', rng.integers(1, 400, n), 0),
+            'principalpaid': np.round(amount * np.where(np.char.startswith(state.astype(str), 'CLOSED'), 1.0, rng.random(n)), 2),
+            'penaltypaid': np.round(rng.exponential(5, n) * (rng.random(n) < 0.2), 2),
+            'lastmodifieddate': disbursed + pd.to_timedelta(rng.integers(0, 90, n), unit='D'),
+            'lastsettoarrearsdate': pd.Series(disbursed + pd.to_timedelta(30, unit='D')).where(state == 'ACTIVE_IN_ARREARS').to_numpy(),
+        })
+
+    def loan_accounts(self, rng, loans):
+        """MAMBU's view of the same loans (ml.loan_info_tbl is built from it)"""
+        return pd.DataFrame({
+            'id': loans['loan_id'], 'encodedkey': loans['loan_key'], 'accountholderkey': loans['client_key'],
+            'loanname': loans['loan_product_id'], 'producttypekey': loans['producttypekey'],
+            'accountstate': loans['accountstate'],
+            'accountsubstate': np.where((loans['accountstate'] == 'ACTIVE_IN_ARREARS') & (rng.random(len(loans)) < 0.2), 'LOCKED', None),
+            'loanamount': loans['loanamount'], 'interestrate': loans['interestrate'],
+            'repaymentinstallments': loans['repaymentinstallments'],
+            'creationdate': loans['creationdate'], 'approveddate': loans['approveddate'],
+            'disbursementdate': loans['disbursementdate'], 'closeddate': loans['closeddate'],
+            'lastsettoarrearsdate': loans['lastsettoarrearsdate'], 'lastmodifieddate': loans['lastmodifieddate'],
+            'principalpaid': loans['principalpaid'], 'principalbalance': (loans['loanamount'] - loans['principalpaid']).round(2),
+            'penaltypaid': loans['penaltypaid'], 'accruedinterest': 0.0, 'accruedpenalty': 0.0,
+        })
+
+    def repayments(self, rng, loans):
+        installments = loans['repaymentinstallments'].to_numpy()
+        owner = np.repeat(np.arange(len(loans)), installments)
+        number = np.concatenate([np.arange(1, count + 1) for count in installments]) if len(installments) else np.array([], int)
+        n = len(owner)
+        period = np.where(installments[owner] == 1, 30, 14)
+        due = loans['disbursementdate'].to_numpy()[owner] + pd.to_timedelta(number * period, unit='D').to_numpy()
+        principal = np.round(loans['loanamount'].to_numpy()[owner] / installments[owner], 2)
+        interest = np.round(principal * loans['interestrate'].to_numpy()[owner] / 100, 2)
+        loan_state = loans['accountstate'].to_numpy()[owner]
+        paid = (due < np.datetime64(DATA_END)) & ((loan_state == 'CLOSED') | (rng.random(n) < 0.85))
+        return pd.DataFrame({
+            'encodedkey': np.char.add(np.char.add(loans['loan_key'].to_numpy()[owner], '-'), number.astype(str)),
+            'parentaccountkey': loans['loan_key'].to_numpy()[owner],
+            'installment': number,
+            'duedate': pd.DatetimeIndex(due).normalize(),
+            'state': np.where(paid, 'PAID', np.where(due < np.datetime64(DATA_END), 'LATE', 'PENDING')),
+            'principaldue': principal, 'principalpaid': principal * paid,
+            'interestdue': interest, 'interestpaid': interest * paid,
+            'feesdue': 0.0, 'feespaid': 0.0,
+            'penaltydue': np.round(interest * 0.1 * ~paid, 2), 'penaltypaid': 0.0,
+            'repaymentschedulemethod': 'FIXED',
+            'lastpaiddate': pd.Series(due + pd.to_timedelta(rng.integers(-5, 10, n), unit='D').to_numpy()).where(paid).to_numpy(),
+        })
+
+    def loan_transactions(self, rng, loans, schedule):
+        disbursements = pd.DataFrame({'parentaccountkey': loans['loan_key'], 'type': 'DISBURSEMENT',
+                                      'amount': loans['loanamount'], 'entrydate': loans['disbursementdate']})
+        paid = schedule[schedule['state'] == 'PAID']
+        repayments = pd.DataFrame({'parentaccountkey': paid['parentaccountkey'], 'type': 'REPAYMENT',
+                                   'amount': paid['principalpaid'] + paid['interestpaid'], 'entrydate': paid['lastpaiddate']})
+        accruals = pd.DataFrame({'parentaccountkey': schedule['parentaccountkey'],
+                                 'type': rng.choice(['INTEREST_APPLIED', 'INTEREST_ACCRUAL', 'FEE_PAYMENT', 'PENALTY_ACCRUAL'], len(schedule), p=[0.6, 0.3, 0.05, 0.05]),
+                                 'amount': schedule['interestdue'], 'entrydate': schedule['duedate']})
+        frame = pd.concat([disbursements, repayments, accruals], ignore_index=True).sort_values(['parentaccountkey', 'entrydate'], kind='stable')
+        n = len(frame)
+        principal = np.where(frame['type'] == 'REPAYMENT', frame['amount'] * 0.9, 0.0)
+        disbursed = np.where(frame['type'] == 'DISBURSEMENT', frame['amount'], 0.0)
+        balance = pd.Series(disbursed - principal).groupby(frame['parentaccountkey'].to_numpy()).cumsum().clip(lower=0).round(2)
+        ids = self.next_ids(n)
+        return frame.assign(
+            encodedkey=keys('8x', ids), transactionid=ids,
+            principalamount=np.round(principal, 2), interestamount=np.round(frame['amount'] - principal, 2),
+            principalbalance=balance.to_numpy(), balance=balance.to_numpy(),
+            creationdate=frame['entrydate'] + pd.to_timedelta(rng.integers(0, 300, n), unit='s'),
+            reversaltransactionkey=np.where(rng.random(n) < 0.005, 'REVERSED', None),
+        )[['encodedkey', 'transactionid', 'parentaccountkey', 'type', 'amount', 'principalamount', 'interestamount',
+           'principalbalance', 'balance', 'entrydate', 'creationdate', 'reversaltransactionkey']]
+
+    def repayment_transactions(self, rng, loans, schedule):
+        loan = loans.set_index('loan_key').loc[schedule['parentaccountkey']]
+        paid = schedule['state'].to_numpy() == 'PAID'
+        # Some installments are paid in several goes
+        parts = np.where(paid, rng.geometric(0.7, len(schedule)).clip(max=4), 0)
+        row = np.repeat(np.arange(len(schedule)), parts)
+        total_due = (schedule['principaldue'] + schedule['interestdue']).to_numpy()
+        return pd.DataFrame({
+            'loan_id': loan['loan_id'].to_numpy()[row],
+            'loan_key': schedule['parentaccountkey'].to_numpy()[row],
+            'client_id': loan['client_id'].to_numpy()[row],
+            'installment': schedule['installment'].to_numpy()[row],
+            'repayment_due_date': schedule['duedate'].to_numpy()[row],
+            'transaction_date': schedule['lastpaiddate'].to_numpy()[row] - pd.to_timedelta(rng.integers(0, 3, len(row)), unit='D').to_numpy(),
+            'amount': np.round(total_due[row] / parts[row], 2),
+            'total_due': total_due[row],
+            'total_repayment_amount': total_due[row],
+            'disbursementdate': loan['disbursementdate'].to_numpy()[row],
+            'repayment_state': 'PAID',
+            'status': 'SUCCESSFUL',
+        })
+
+    def notifications(self, rng, clients):
+        n = len(clients) * 25
+        user = zipf_choice(rng, clients['id'].to_numpy(), n, 0.8) if len(clients) else np.array([], str)
+        kind = zipf_choice(rng, NOTIFICATION_TYPES, n, 1.1)
+        status = rng.choice(['SUCCESS', 'FAILED', 'PENDING'], n, p=[0.8, 0.15, 0.05])
+        version = rng.choice(['2.3.1', '2.4.0', '2.5.2'], n)
+        payload = pd.Series(np.char.add(np.char.add(np.char.add(
+            np.char.add('{"client_id": "', user), '", "user_id": "'), user),
+            np.char.add(np.char.add(np.char.add('", "status": "', status), '", "is_duplicate": '),
+                        np.char.add(np.where(rng.random(n) < 0.03, 'true', 'false'),
+                                    np.char.add(', "application_info": {"application_version": "', np.char.add(version, '"}}'))))))
+        when = random_times(rng, pd.Timestamp('2024-01-01'), DATA_END, n, recency=1.5)
+        return pd.DataFrame({
+            'id': np.char.add('N', rng.integers(0, 2**62, n).astype(str)),
+            'type': kind, 'payload': payload.to_numpy(),
+            'timestamp': when, 'created_at': when,
+            # user_identity holds the user id, as in the events the reports filter on IDENTITY_TYPE = 'USER_ID'
+            'user_identity': user, 'identity_type': 'USER_ID',
+        })
+
+    def fido_scores(self, rng, loans):
+        """One score per loan application, scored shortly before it"""
+        n = len(loans)
+        scored = loans['creationdate'] - pd.to_timedelta(rng.integers(60, 86400, n), unit='s')
+        score = np.round(rng.beta(5, 3, n) * 1000, 1)
+        return pd.DataFrame({
+            'client_id': loans['client_id'], 'fido_score': score, 'score': score,
+            'fido_score_flow': zipf_choice(rng, ['LOAN_APPLICATION', 'LIMIT_INCREASE', 'REASSESSMENT'], n),
+            'created_at': scored, 'created_on': scored, 'updated_at': scored, 'score_date': scored.dt.normalize(),
+        })
+
+    def surveys(self, rng, clients, loans):
+        """The onboarding survey of each borrower, taken before the first loan"""
+        first = loans.groupby('client_id', sort=False)['creationdate'].min()
+        surveyed = clients.set_index('id').loc[first.index]
+        n = len(surveyed)
+        return pd.DataFrame({
+            'client_id': first.index, 'session_id': np.char.add('SV', first.index.to_numpy().astype(str)),
+            'firstname': surveyed['firstname'].to_numpy(), 'lastname': surveyed['lastname'].to_numpy(),
+            'gender': surveyed['gender'].to_numpy(),
+            'age': ((DATA_END - surveyed['birthdate']).dt.days // 365).to_numpy(),
+            'region': zipf_choice(rng, REGIONS, n, 0.8), 'cust_location': zipf_choice(rng, ['Urban', 'Peri-urban', 'Rural'], n),
+            'employment': rng.choice(['Self-employed', 'Salaried', 'Unemployed'], n, p=[0.7, 0.2, 0.1]),
+            'industry': zipf_choice(rng, SECTORS, n), 'economic_sector': zipf_choice(rng, SECTORS, n),
+            'income_value': rng.choice(INCOME_BANDS, n, p=[0.3, 0.35, 0.2, 0.1, 0.05]),
+            'loan_date': (first - pd.to_timedelta(rng.integers(60, 3600, n), unit='s')).to_numpy(),
+        })
+
+    def users(self, rng, clients):
+        """App users; id and banking_platform_id are the MAMBU client id"""
+        n = len(clients)
+        signed_up = clients['creationdate'] - pd.to_timedelta(rng.integers(60, 86400, n), unit='s')
+        return pd.DataFrame({
+            'id': clients['id'], 'banking_platform_id': clients['id'], 'phone_number': clients['mobilephone1'],
+            'national_id': np.char.add('GHA-', np.char.zfill(rng.integers(0, 10**9, n).astype(str), 9)),
+            'type': 'CUSTOMER', 'status': rng.choice(['ACTIVE', 'BLOCKED', 'DELETED'], n, p=[0.93, 0.05, 0.02]),
+            'kyc_verified': rng.random(n) < 0.8, 'created_timestamp': signed_up,
+        })
+
+    def subscriptions(self, rng, clients):
+        subscribers = clients[rng.random(len(clients)) < 0.3]
+        n = len(subscribers)
+        start = random_times(rng, pd.Timestamp('2024-06-01'), DATA_END, n)
+        return pd.DataFrame({
+            'id': np.char.add('S', subscribers['id'].to_numpy()),
+            'phone_number': subscribers['mobilephone1'].to_numpy(),
+            'source': zipf_choice(rng, SUBSCRIPTION_SOURCES, n),
+            'action': rng.choice(['SUBSCRIBE', 'UNSUBSCRIBE'], n, p=[0.85, 0.15]),
+            'created_timestamp': start, 'start_date': start.normalize(),
+            'end_date': pd.Series(start + pd.to_timedelta(rng.integers(30, 365, n), unit='D')).where(rng.random(n) < 0.3).to_numpy(),
+        })
+
+    def wallet_transactions(self, rng, clients, accounts, transactions):
+        """Mobile-money requests behind the savings transactions, including failed and pending ones"""
+        n = len(transactions)
+        account = accounts.set_index('encodedkey').loc[transactions['parentaccountkey']]
+        client_ids = clients.set_index('encodedkey')['id']
+        return pd.DataFrame({
+            'id': np.char.add('W', transactions['transactionid'].to_numpy().astype(str)),
+            'account_id': account['id'].to_numpy(),
+            'client_id': client_ids.loc[account['accountholderkey']].to_numpy(),
+            'wallet_id': np.char.add('2332', np.char.zfill(rng.integers(0, 10**8, n).astype(str), 8)),
+            'external_id': np.char.add('MOMO', transactions['transactionid'].to_numpy().astype(str)),
+            'transaction_type': transactions['type'].to_numpy(),
+            'amount': transactions['amount'].to_numpy(),
+            'state': rng.choice(['SUCCESSFUL', 'FAILED', 'PENDING'], n, p=[0.88, 0.09, 0.03]),
+            'created_on': (transactions['creationdate'] - pd.to_timedelta(rng.integers(1, 120, n), unit='s')).to_numpy(),
+        })
+
+def referenced_columns(root=REPO_ROOT):
+    """
+    Columns the repository's SQL reads from each table it names with a schema, and from
+    generated tables it names without one ({'mambu.client': {...}}). Columns read through a
+    CTE or subquery that selects * from one table count for that table; unqualified columns
+    count only in SELECTs with a single source.
+    """
+    import sqlglot
+    from sqlglot import exp
+    logging.getLogger('sqlglot').setLevel(logging.CRITICAL)
+    names = {table.split('.')[1]: table for table in TABLES}
+    columns = {table: set() for table in TABLES}
+
+    def source(table, ctes):
+        """(table name, column names the reference adds itself) of a FROM item, or None"""
+        name = table.name.lower()
+        if table.db:
+            return f"{table.db.lower()}.{name}", set()
+        if name in ctes:
+            return ctes[name]
+        return (names[name], set()) if name in names else None
+
+    def passthrough(body, ctes):
+        """source() of the one table a SELECT * reads, with the columns it adds, or None"""
+        if not isinstance(body, exp.Select) or not body.is_star or body.args.get('joins'):
+            return None
+        tables = [table for table in body.find_all(exp.Table) if table.parent_select is body]
+        found = source(tables[0], ctes) if len(tables) == 1 else None
+        return (found[0], found[1] | {item.alias.lower() for item in body.expressions if item.alias}) if found else None
+
+    for path in glob.glob(os.path.join(root, '**', '*.sql'), recursive=True):
+        with open(path, errors='replace') as f:
+            sql = re.sub(r"\{\{[^{}]*\}\}", "x", f.read())
+        try:
+            trees = sqlglot.parse(sql, read='snowflake', error_level=sqlglot.ErrorLevel.IGNORE)
+        except Exception:
+            continue
+        for tree in filter(None, trees):
+            ctes = {cte.alias_or_name.lower(): None for cte in tree.find_all(exp.CTE)}
+            for cte in tree.find_all(exp.CTE):
+                ctes[cte.alias_or_name.lower()] = passthrough(cte.this, ctes)
+            for select in tree.find_all(exp.Select):
+                tables = [table for table in select.find_all(exp.Table) if table.parent_select is select]
+                sources = {(table.alias or table.name).lower(): source(table, ctes) for table in tables}
+                items = [(select.args.get('from_') or exp.From()).this] + [join.this for join in select.args.get('joins') or []]
+                sources.update((item.alias.lower(), passthrough(item.this, ctes))
+                               for item in items if isinstance(item, exp.Subquery) and item.alias)
+                sources = {alias: found for alias, found in sources.items() if found}
+                for name, _ in sources.values():
+                    columns.setdefault(name, set())
+                single = len(tables) == 1 and not select.args.get('joins') and not isinstance(
+                    (select.args.get('from_') or exp.From()).this, (exp.Subquery, exp.Lateral, exp.Unnest))
+                for column in select.find_all(exp.Column):
+                    if column.parent_select is not select or not column.name or column.name == '*':
+                        continue
+                    alias = column.table.lower()
+                    found = sources.get(alias) if alias else (next(iter(sources.values())) if single and sources else None)
+                    if found and column.name.lower() not in found[1]:
+                        columns[found[0]].add(column.name.lower())
+    for table, names in EXTRA_COLUMNS.items():
+        columns.setdefault(table, set()).update(names)
+    return columns
+
+def column_type(name):
+    """DuckDB type for a referenced but unmodelled column, from its name"""
+    if re.search(r"date|time|_at$|_on$|_repayment$", name):
+        return 'TIMESTAMP'
+    if re.search(r"amount|balance|due|paid|principal|interest|fee|penalty|rate|score|overdue", name):
+        return 'DOUBLE'
+    return 'VARCHAR'
+
+def generate(database, scale='1x', seed=42, chunk_clients=CHUNK_CLIENTS, add_referenced=True):
+    """(Re)create the synthetic tables in database; returns rows and seconds per table"""
+    import duckdb
+    clients = BASE_CLIENTS * SCALES[scale]
+    generator = SyntheticMambu(seed)
+    os.makedirs(os.path.dirname(os.path.abspath(database)), exist_ok=True)
+    connection = duckdb.connect(database)
+    rows, seconds = {table: 0 for table in TABLES}, {table: 0.0 for table in TABLES}
+    referenced = referenced_columns() if add_referenced else {table: set() for table in TABLES}
+    stubs = sorted(table for table in referenced if table not in TABLES and table.split('.')[0] not in DERIVED_SCHEMAS)
+    for schema in sorted({table.split('.')[0] for table in TABLES + stubs}):
+        connection.execute(f'CREATE SCHEMA IF NOT EXISTS "{schema}"')
+    for table in TABLES + stubs:
+        connection.execute(f"DROP TABLE IF EXISTS {quoted(table)}")
+    connection.execute("CREATE TABLE mambu.customfield AS SELECT * FROM (VALUES " +
+                       ', '.join(f"('CF{position}', '{name}')" for position, name in enumerate(TRANSACTION_FIELDS)) +
+                       ") AS fields(encodedkey, id)")
+    rows['mambu.customfield'] = len(TRANSACTION_FIELDS)
+
+    for index, first in enumerate(range(0, clients, chunk_clients)):
+        started = time.perf_counter()
+        tables = generator.chunk(index, first, min(chunk_clients, clients - first))
+        generated = time.perf_counter() - started
+        for table, frame in tables.items():
+            started = time.perf_counter()
+            connection.register('chunk_frame', frame)
+            if index == 0:
+                connection.execute(f"CREATE TABLE {quoted(table)} AS SELECT * FROM chunk_frame")
+            else:
+                connection.execute(f"INSERT INTO {quoted(table)} BY NAME SELECT * FROM chunk_frame")
+            connection.unregister('chunk_frame')
+            rows[table] += len(frame)
+            seconds[table] += time.perf_counter() - started + generated / len(tables)
+
+    for table in TABLES:
+        existing = {row[0].lower() for row in connection.execute(f"DESCRIBE {quoted(table)}").fetchall()}
+        for name in sorted(referenced[table] - existing):
+            connection.execute(f'ALTER TABLE {quoted(table)} ADD COLUMN "{name}" {column_type(name)}')
+    # Tables outside the generator's model: empty, with the columns the reports read
+    for table in stubs:
+        columns = ', '.join(f'"{name}" {column_type(name)}' for name in sorted(referenced[table]) or ['id'])
+        connection.execute(f"CREATE TABLE {quoted(table)} ({columns})")
+    connection.close()
+    return pd.DataFrame({'table': TABLES + stubs, 'rows': [rows.get(table, 0) for table in TABLES + stubs],
+                         'seconds': [seconds.get(table, 0.0) for table in TABLES + stubs]})
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate seeded synthetic MAMBU-schema tables in DuckDB")
+    parser.add_argument('--scale', choices=list(SCALES), default='1x')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--database', default='ghana_prod.duckdb', help="DuckDB file; name it like the warehouse database")
+    parser.add_argument('--chunk-clients', type=int, default=CHUNK_CLIENTS)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    summary = generate(args.database, args.scale, args.seed, args.chunk_clients)
+    print("="*60)
+    print(f"SYNTHETIC DATA ({args.scale}, seed {args.seed}) -> {args.database}")
+    print("="*60)
+    print(summary.round(2).to_string(index=False, formatters={'rows': '{:,}'.format}))
+    print(f"\n{summary['rows'].sum():,} rows in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from arrow_export import PartitionWriter, stream_to_parquet
+
+def chunk(ids, kind, amounts=None):
+    """A result chunk as Snowflake returns it: NUMBER columns typed by this chunk's values"""
+    amounts = amounts if amounts is not None else [1.5] * len(ids)
+    return pa.RecordBatch.from_arrays([pa.array(ids, kind), pa.array(amounts)], names=['ID', 'AMOUNT'])
+
+def test_chunks_typed_differently_are_cast_to_one_schema(tmp_path):
+    batches = [chunk([1, 2], pa.int8()), chunk([300, 70000], pa.int32()), chunk([2 ** 40], pa.int64())]
+    summary = stream_to_parquet(batches, str(tmp_path))
+    table = pq.read_table(tmp_path)
+    assert summary['rows'] == 5 and table.schema.field('ID').type == pa.int64()
+    assert table.column('ID').to_pylist() == [1, 2, 300, 70000, 2 ** 40]
+
+def test_a_chunk_that_does_not_fit_the_first_schema_fails_clearly(tmp_path):
+    batches = [chunk([1], pa.int8()), chunk([2], pa.int8(), pa.array(['n/a']))]
+    with pytest.raises(ValueError, match="Column 'AMOUNT' is string in a later batch .* first batch's double"):
+        stream_to_parquet(batches, str(tmp_path))
+
+def test_partitions_are_written_in_full_row_groups(tmp_path):
+    # 40 batches of 10 rows, alternating between two partitions: 200 rows per partition
+    batches = [pa.RecordBatch.from_arrays([pa.array(range(i * 10, i * 10 + 10)), pa.array(['A', 'B'] * 5)],
+                                          names=['ID', 'TYPE']) for i in range(40)]
+    summary = stream_to_parquet(batches, str(tmp_path), partition=('TYPE', None), row_group_rows=64)
+    assert summary['partitions'] == 2
+    for label in ('A', 'B'):
+        metadata = pq.ParquetFile(tmp_path / f'TYPE={label}' / 'part-0.parquet').metadata
+        assert [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)] == [64, 64, 64, 8]
+    ids = pq.read_table(tmp_path / 'TYPE=A').column('ID').to_pylist()
+    assert ids == list(range(0, 400, 2))
+
+def test_buffered_rows_are_bounded_and_evicted_partitions_keep_every_row(tmp_path):
+    writer = PartitionWriter(str(tmp_path), 'TYPE', max_open_files=2, row_group_rows=100, max_buffered_rows=30)
+    for i in range(30):
+        writer.write(pa.RecordBatch.from_arrays([pa.array([i, i + 100]), pa.array([f'T{i % 5}'] * 2)], names=['ID', 'TYPE']))
+        assert sum(writer.pending_rows.values()) <= 30
+    writer.close()
+    table = pq.read_table(tmp_path)
+    assert sorted(table.column('ID').to_pylist()) == sorted(list(range(30)) + list(range(100, 130)))
+    assert len(list(tmp_path.iterdir())) == 5
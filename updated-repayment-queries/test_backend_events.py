@@ -0,0 +1,75 @@
+import pandas as pd
+import pytest
+
+from backend_events import EventLoader
+from report_runner import DuckDBBackend
+
+EVENTS = [
+    ('e1', 'BE_LOAN_REPAYMENT_RESULT', '2025-01-01 10:00:00', '{"user_id": "u1", "client_id": "c1", "status": "FAILED", "error_code": "E1"}'),
+    ('e2', 'BE_KYC_VERIFICATION_RESULT', '2025-01-20 10:00:00', '{"user_id": "u2", "is_duplicate": true, "error_code": "X"}'),
+    ('e3', 'BE_FIDOBIZ_SURVEY_SUBMISSION', '2025-02-15 10:00:00', '{"user_id": "u3", "application_info": {"application_version": "1.2"}}'),
+]
+
+def add_events(backend, events):
+    for event_id, kind, timestamp, payload in events:
+        backend.execute("INSERT INTO data.backend_notifications VALUES ($1, $2, $3, $3, 'u', 'phone', $4)",
+                        [event_id, kind, timestamp, payload])
+
+@pytest.fixture
+def backend():
+    """DuckDB stand-in for data.backend_notifications holding EVENTS"""
+    backend = DuckDBBackend()
+    backend.execute("CREATE SCHEMA data")
+    backend.execute('CREATE TABLE data.backend_notifications (id VARCHAR, "TYPE" VARCHAR, timestamp VARCHAR, '
+                    'created_at VARCHAR, user_identity VARCHAR, identity_type VARCHAR, payload VARCHAR)')
+    add_events(backend, EVENTS)
+    yield backend
+    backend.close()
+
+def loader(backend):
+    return EventLoader(backend, 'data.backend_notifications', 'data.backend_events')
+
+def loaded_ids(backend):
+    return backend.execute("SELECT id FROM data.backend_events ORDER BY timestamp, id")['id'].tolist()
+
+def test_payload_fields_are_flattened_per_event_type(backend):
+    records = loader(backend).load(batch_days=31)
+    assert sum(record['rows'] for record in records) == 3
+    events = backend.execute("SELECT * FROM data.backend_events ORDER BY id").set_index('id')
+    assert events.loc['e1', 'client_id'] == 'c1' and events.loc['e1', 'error_code'] == 'E1'
+    # error_code is only extracted for repayment results, is_duplicate only for KYC results
+    assert events['error_code'].isna().tolist() == [False, True, True]
+    assert events.loc['e2', 'is_duplicate'] == True and events['is_duplicate'].isna().tolist() == [True, False, True]
+    assert events.loc['e3', 'application_version'] == '1.2'
+    assert str(events.loc['e3', 'event_date'])[:10] == '2025-02-15'
+
+def test_late_events_within_the_lookback_are_reloaded(backend):
+    loader(backend).load(until='2025-01-31')
+    assert loaded_ids(backend) == ['e1', 'e2']
+    add_events(backend, [
+        ('late', 'BE_LOAN_REPAYMENT_RESULT', '2025-01-19 08:00:00', '{"user_id": "u4"}'),
+        ('too_late', 'BE_LOAN_REPAYMENT_RESULT', '2025-01-05 08:00:00', '{"user_id": "u5"}'),
+    ])
+    records = loader(backend).load(lookback_hours=48)
+    # The reload starts 48 hours before the watermark (e2): the event arriving later than that is not picked up
+    assert records[0]['from'] == pd.Timestamp('2025-01-18 10:00:00')
+    assert loaded_ids(backend) == ['e1', 'late', 'e2', 'e3']
+    assert loader(backend).load(until='2025-02-15 10:00:00', lookback_hours=0) == []
+
+def test_an_interrupted_load_resumes_from_the_last_completed_window(backend):
+    interrupted = loader(backend)
+    load_window, windows = interrupted.load_window, []
+
+    def fail_on_the_second_window(start, end):
+        windows.append((start, end))
+        if len(windows) == 2:
+            raise ConnectionError("connection lost")
+        return load_window(start, end)
+
+    interrupted.load_window = fail_on_the_second_window
+    with pytest.raises(ConnectionError):
+        interrupted.load(batch_days=31, lookback_hours=1)
+    assert loaded_ids(backend) == ['e1', 'e2']
+    records = loader(backend).load(batch_days=31, lookback_hours=1)
+    assert records[0]['from'] == pd.Timestamp('2025-01-20 09:00:00')
+    assert loaded_ids(backend) == ['e1', 'e2', 'e3']
@@ -0,0 +1,79 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from batch_runner import ConnectionPool, run_batch
+from report_runner import DuckDBBackend
+
+SLOW_SQL = "SELECT sum(a.range * b.range) AS total FROM range(100000000) a, range(1000) b"
+
+class CountingFactory:
+    """DuckDBBackend factory that remembers every backend it made"""
+
+    def __init__(self):
+        self.made = []
+
+    def __call__(self):
+        backend = DuckDBBackend()
+        self.made.append(backend)
+        return backend
+
+def test_pool_never_opens_more_than_size_connections():
+    factory = CountingFactory()
+    pool = ConnectionPool(factory, size=2)
+    lock = threading.Lock()
+    active, peak, used = [0], [0], []
+
+    def borrow(_):
+        with pool.connection() as backend:
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+                used.append(backend)
+            time.sleep(0.02)
+            backend.execute("SELECT 1")
+            with lock:
+                active[0] -= 1
+
+    try:
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            list(executor.map(borrow, range(12)))
+        assert len(factory.made) == 2 and peak[0] == 2
+        # Every borrower was handed one of the pooled connections
+        assert {id(backend) for backend in used} == {id(backend) for backend in factory.made}
+    finally:
+        pool.close()
+    assert pool.created == []
+
+def write_reports(directory, reports):
+    """Manifest entries for {name: sql}, written as .sql files"""
+    entries = []
+    for name, sql in reports.items():
+        path = directory / f'{name}.sql'
+        path.write_text(sql)
+        entries.append({'file': str(path), 'name': name, 'params': {}})
+    return entries
+
+def test_statuses_of_a_batch(tmp_path):
+    entries = write_reports(tmp_path, {
+        'small': "SELECT range AS id FROM range(3)",
+        'slow': SLOW_SQL,
+        'broken': "SELECT * FROM missing_table",
+    })
+    entries[1]['timeout'] = 0.2
+    # One connection: the reports after the cancelled one run on the connection it leaves behind
+    factory = CountingFactory()
+    pool = ConnectionPool(factory, size=1)
+    results = []
+    try:
+        report = run_batch(entries, pool, concurrency=3, output_dir=str(tmp_path / 'out'), on_result=results.append)
+    finally:
+        pool.close()
+    report = report.set_index('name')
+    assert report['status'].to_dict() == {'small': 'ok', 'slow': 'timeout', 'broken': 'failed'}
+    assert report.loc['slow', 'error'] == "Query cancelled after 0.2s" and report.loc['slow', 'run_s'] < 5
+    assert report.loc['broken', 'error'].startswith('CatalogException')
+    assert pd.read_csv(report.loc['small', 'output'])['id'].tolist() == [0, 1, 2]
+    assert len(results) == 3 and len(factory.made) == 1
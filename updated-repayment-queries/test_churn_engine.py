@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from churn_engine import CHURN_GAP_DAYS, savings_churn
+
+def fixture_accounts(seed=5, clients=40):
+    """One to four accounts per client on distinct days, some closed, plus accounts with no client"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for client in range(clients):
+        created = pd.Timestamp('2024-01-01') + pd.to_timedelta(np.sort(rng.choice(600, rng.integers(1, 5), replace=False)), unit='D')
+        for day in created:
+            closed = day + pd.Timedelta(days=int(rng.integers(1, 200))) if rng.random() < 0.5 else pd.NaT
+            rows.append((f"C{client}", day, closed))
+    rows += [(None, pd.Timestamp('2024-03-01'), pd.NaT), (np.nan, pd.Timestamp('2024-02-01'), pd.Timestamp('2024-02-10')),
+             ('C0', pd.NaT, pd.NaT)]
+    accounts = pd.DataFrame(rows, columns=['client_id', 'creation_date', 'closeddate'])
+    return accounts.assign(account_id=[f"A{i}" for i in range(len(accounts))])
+
+def reference_churn(accounts, as_of):
+    """The churn rules applied client by client at one as-of date"""
+    records = []
+    known = accounts.dropna(subset=['client_id', 'creation_date'])
+    for client, rows in known[known['creation_date'] <= as_of].groupby('client_id'):
+        rows = rows.sort_values('creation_date')
+        closed = rows['closeddate'].where(rows['closeddate'] <= as_of)
+        max_gap = rows['creation_date'].diff().dt.days.max()
+        multi = max_gap > CHURN_GAP_DAYS
+        long_ago = closed[(as_of - closed).dt.days > CHURN_GAP_DAYS]
+        single = not multi and len(long_ago) > 0
+        latest_closed = closed.iloc[-1]
+        records.append({
+            'as_of_date': as_of, 'client_id': client, 'accounts': len(rows), 'max_gap_days': max_gap,
+            'days_since_closed': (as_of - long_ago.max()).days if single else np.nan,
+            'is_churned': multi or single,
+            'is_returned': pd.isna(latest_closed) or (as_of - latest_closed).days < CHURN_GAP_DAYS,
+            'churn_type': 'multi_account_gap' if multi else 'single_account_closure' if single else 'retained',
+        })
+    return pd.DataFrame(records)
+
+def test_engine_matches_the_rules_at_every_as_of_date():
+    accounts = fixture_accounts()
+    as_of_dates = pd.date_range('2024-01-15', '2025-12-31', freq='MS')
+    churn = savings_churn(accounts, as_of_dates, dates_per_chunk=5)
+    expected = pd.concat([reference_churn(accounts, as_of) for as_of in as_of_dates], ignore_index=True)
+    sort = lambda df: df.sort_values(['as_of_date', 'client_id']).reset_index(drop=True)
+    pd.testing.assert_frame_equal(sort(churn), sort(expected), check_dtype=False)
+
+def test_accounts_without_a_client_are_ignored():
+    accounts = fixture_accounts(clients=2)
+    churn = savings_churn(accounts, ['2025-12-31'])
+    assert set(churn['client_id']) == {'C0', 'C1'}
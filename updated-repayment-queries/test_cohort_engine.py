@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+from cohort_engine import GRANULARITIES, CohortStore
+
+def fixture_extracts(seed=11, clients=60):
+    """Accounts (some closed) and transactions over half a year, plus rows with no client"""
+    rng = np.random.default_rng(seed)
+    day = lambda: pd.Timestamp('2025-01-01') + pd.Timedelta(days=int(rng.integers(0, 180)))
+    accounts = []
+    for client in range(clients):
+        for _ in range(rng.integers(1, 4)):
+            created = day()
+            closed = created + pd.Timedelta(days=int(rng.integers(0, 90))) if rng.random() < 0.4 else pd.NaT
+            accounts.append((f"C{client}", created, closed))
+    accounts.append((None, pd.Timestamp('2025-02-01'), pd.NaT))
+    transactions = [(f"C{rng.integers(0, clients + 10)}", day()) for _ in range(400)] + [(None, pd.Timestamp('2025-03-01'))]
+    return (pd.DataFrame(accounts, columns=['client_id', 'creation_date', 'closeddate']),
+            pd.DataFrame(transactions, columns=['client_id', 'transaction_date']))
+
+def reference_reports(accounts, transactions, granularity):
+    """retention, active_closed and new_returning grouped straight from the extracts"""
+    accounts, transactions = accounts.dropna(subset=['client_id']), transactions.dropna(subset=['client_id'])
+    days = pd.concat([accounts['creation_date'], transactions['transaction_date']])
+    periods = pd.period_range(days.min(), days.max(), freq=GRANULARITIES[granularity])
+    period = lambda dates: pd.PeriodIndex(dates, freq=GRANULARITIES[granularity])
+    position = {p: i for i, p in enumerate(periods)}
+    count = len(periods)
+
+    clients = accounts.groupby('client_id').agg(first_opened=('creation_date', 'min'), last_closed=('closeddate', 'max'))
+    cohort = pd.Series([position[p] for p in period(clients['first_opened'])], index=clients.index)
+    activity = pd.concat([accounts[['client_id', 'creation_date']].set_axis(['client_id', 'date'], axis=1),
+                          transactions.set_axis(['client_id', 'date'], axis=1)])
+    activity = activity.assign(period=[position[p] for p in period(activity['date'])])[['client_id', 'period']].drop_duplicates()
+
+    sizes = cohort.value_counts().reindex(range(count), fill_value=0)
+    offsets = activity.join(cohort.rename('cohort'), on='client_id', how='inner')
+    offsets = offsets[offsets['period'] >= offsets['cohort']]
+    active = offsets.groupby(['cohort', offsets['period'] - offsets['cohort']]).size()
+    shares = np.full((count, count), np.nan)
+    for c in range(count):
+        for k in range(count - c):
+            shares[c, k] = active.get((c, k), 0) / max(sizes[c], 1)
+    retention = pd.DataFrame(shares, columns=[str(k) for k in range(count)])
+    retention.insert(0, 'cohort_size', sizes.to_numpy())
+    retention.insert(0, 'cohort', periods.start_time)
+
+    records = []
+    for i, p in enumerate(periods):
+        start, end = p.start_time.normalize(), p.end_time.normalize()
+        with_account = clients[(clients['first_opened'] <= end) & ~(clients['last_closed'] < start)]
+        now_closed = int(with_account['last_closed'].notna().sum())
+        records.append({'period_start': start, 'period_end': end, 'total_active_users': len(with_account),
+                        'active_users_still_active': len(with_account) - now_closed, 'active_users_now_closed': now_closed,
+                        'pct_active_users_now_closed': round(100 * now_closed / max(len(with_account), 1), 2),
+                        'transacting_users': int((activity['period'] == i).sum())})
+    active_closed = pd.DataFrame(records)
+
+    later = accounts.join(clients['first_opened'], on='client_id')
+    later = later[later['creation_date'] > later['first_opened']]
+    returning = later.assign(period=[position[p] for p in period(later['creation_date'])]).groupby('period')['client_id'].nunique()
+    new_returning = pd.DataFrame({'period_start': periods.start_time,
+                                  'new_clients': sizes.to_numpy(),
+                                  'returning_clients': returning.reindex(range(count), fill_value=0).to_numpy()})
+    return {'retention': retention, 'active_closed': active_closed, 'new_returning': new_returning}
+
+def store_reports(store, granularity):
+    return {'retention': store.retention(granularity), 'active_closed': store.active_closed(granularity),
+            'new_returning': store.new_returning(granularity)}
+
+def assert_reports_equal(actual, expected):
+    for name in expected:
+        pd.testing.assert_frame_equal(actual[name].reset_index(drop=True), expected[name].reset_index(drop=True),
+                                      check_dtype=False, check_index_type=False, obj=name)
+
+def test_reports_match_grouping_the_extracts(tmp_path):
+    accounts, transactions = fixture_extracts()
+    store = CohortStore(str(tmp_path / 'cohorts.npz'))
+    store.update(accounts, transactions)
+    for granularity in GRANULARITIES:
+        assert_reports_equal(store_reports(store, granularity), reference_reports(accounts, transactions, granularity))
+
+def test_incremental_updates_equal_a_full_load(tmp_path):
+    accounts, transactions = fixture_extracts()
+    full = CohortStore(str(tmp_path / 'full.npz'))
+    full.update(accounts, transactions)
+
+    # Load April onwards first (accounts not yet closed), then back-fill everything with overlap
+    path = str(tmp_path / 'incremental.npz')
+    store = CohortStore(path)
+    recent = accounts[accounts['creation_date'] >= '2025-04-01']
+    store.update(recent.assign(closeddate=pd.NaT), transactions[transactions['transaction_date'] >= '2025-04-01'])
+    store.save()
+    store = CohortStore(path)
+    store.update(accounts, transactions[transactions['transaction_date'] < '2025-05-01'])
+    for granularity in GRANULARITIES:
+        assert_reports_equal(store_reports(store, granularity), store_reports(full, granularity))
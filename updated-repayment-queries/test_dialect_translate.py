@@ -0,0 +1,70 @@
+import duckdb
+
+from dialect_translate import translate
+
+def run(sql, setup=()):
+    """(rows of the translated statement on an in-memory DuckDB, non-rewritten issues)"""
+    statements, issues = translate(sql)
+    connection = duckdb.connect()
+    try:
+        for statement in setup:
+            connection.execute(statement)
+        return connection.execute(statements[-1]).fetchall(), [item for item in issues if item['severity'] != 'rewritten']
+    finally:
+        connection.close()
+
+def problems(sql):
+    """(construct, line) of every issue that is not a rewrite"""
+    _, issues = translate(sql)
+    return [(item['construct'], item['line']) for item in issues if item['severity'] != 'rewritten']
+
+LOANS = ["CREATE SCHEMA ml",
+         "CREATE TABLE ml.loan_info_tbl AS SELECT * FROM (VALUES (DATE '2024-01-15', 100), (DATE '2024-03-02', 50)) t(disbursementdate, amount)"]
+
+def test_month_spine_having_moves_to_an_outer_where():
+    rows, issues = run("""
+        SELECT
+            DATE_TRUNC('month', DATEADD('month', seq4(), MIN(disbursementdate))) AS month_start,
+            LAST_DAY(DATEADD('month', seq4(), MIN(disbursementdate))) AS month_end
+        FROM UG_PROD.ML.LOAN_INFO_TBL
+        WHERE disbursementdate IS NOT NULL
+        HAVING month_end <= CURRENT_DATE
+        ORDER BY month_start""", LOANS)
+    # An aggregate query without GROUP BY is one row, so SEQ4() is 0 as in Snowflake
+    assert [tuple(str(value)[:10] for value in row) for row in rows] == [('2024-01-01', '2024-01-31')]
+    assert issues == []
+
+def test_sequence_in_where_or_having_over_source_columns_is_flagged():
+    assert problems("SELECT seq4() AS n FROM ml.loan_info_tbl\nWHERE n < 10") == [('SEQ4', 2)]
+    assert problems("SELECT MIN(disbursementdate) AS first, seq4() AS n FROM ml.loan_info_tbl\nHAVING COUNT(*) > n") == [('SEQ4', 2)]
+
+def test_generator_sequences_are_left_to_sqlglot():
+    rows, issues = run("SELECT seq4() AS n FROM TABLE(GENERATOR(ROWCOUNT => 3)) WHERE n > 0 ORDER BY n")
+    assert rows == [(1,), (2,)]
+    assert issues == []
+
+def test_alias_read_inside_an_aggregate_is_inlined():
+    rows, issues = run("""
+        SELECT amount * 2 AS doubled, SUM(CASE WHEN doubled > 100 THEN amount ELSE 0 END) AS large
+        FROM ml.loan_info_tbl
+        GROUP BY 1
+        ORDER BY 1""", LOANS)
+    assert rows == [(100, 0), (200, 100)]
+    assert issues == []
+
+def test_aggregate_alias_nested_in_an_aggregate_is_flagged():
+    assert problems("""
+        SELECT MIN(disbursementdate) AS first_date,
+            COUNT(CASE WHEN disbursementdate <= DATEADD(day, 30, first_date) THEN 1 END) AS early
+        FROM ml.loan_info_tbl""") == [('lateral alias', 3)]
+
+def test_aliases_that_shadow_a_source_column_are_not_inlined():
+    rows, issues = run("SELECT COALESCE(amount, 0) AS amount, SUM(amount) AS total FROM ml.loan_info_tbl GROUP BY 1 ORDER BY 1", LOANS)
+    assert rows == [(50, 50), (100, 100)]
+    assert issues == []
+
+def test_md5_numbers_match_snowflake():
+    rows, issues = run("SELECT MD5_NUMBER_LOWER64('a'), MD5_NUMBER_UPPER64('a')")
+    # Snowflake reads the digest 0cc175b9c0f1b6a8 31c399e269772661 big-endian
+    assert rows == [(int('31c399e269772661', 16), int('0cc175b9c0f1b6a8', 16))]
+    assert issues == []
@@ -0,0 +1,68 @@
+import duckdb
+import pytest
+
+from mags_materialise import MagsMaterialiser, MonthPartitionStore
+
+REPORT_SQL = """
+    SELECT loan_id AS "Account Number", amount
+    FROM loans
+    WHERE opened <= CURRENT_DATE"""
+
+SOURCES = {
+    'loans': "SELECT loan_id, changed_at, effective_date FROM loan_changes WHERE changed_at > {since}",
+    'clients': "SELECT loan_id, changed_at, CAST(NULL AS DATE) AS effective_date FROM client_changes WHERE changed_at > {since}",
+}
+
+@pytest.fixture
+def connection():
+    """Three loans opened in January to March 2025, with empty change logs"""
+    connection = duckdb.connect()
+    connection.execute("CREATE TABLE loans AS SELECT * FROM (VALUES "
+                       "('L1', 100, DATE '2025-01-10'), ('L2', 200, DATE '2025-02-10'), ('L3', 300, DATE '2025-03-10')) "
+                       "t(loan_id, amount, opened)")
+    for table in ('loan_changes', 'client_changes'):
+        connection.execute(f"CREATE TABLE {table} (loan_id VARCHAR, changed_at TIMESTAMP, effective_date DATE)")
+    connection.execute("INSERT INTO loan_changes VALUES ('L1', TIMESTAMP '2025-01-10 09:00:00', DATE '2025-01-10')")
+    yield connection
+    connection.close()
+
+def refresh(connection, directory, today):
+    """(action per month, store) after one refresh"""
+    store = MonthPartitionStore(str(directory))
+    log = MagsMaterialiser(connection, store, REPORT_SQL, SOURCES).refresh('2025-01', today)
+    return dict(zip(log['REPORT_MONTH'], log['ACTION'])), store
+
+def amounts(store, month):
+    return dict(store.read(month)[['Account Number', 'amount']].itertuples(index=False))
+
+def test_first_run_builds_every_month_and_closed_months_are_rebuilt_once_at_month_end(connection, tmp_path):
+    actions, store = refresh(connection, tmp_path, '2025-03-15')
+    assert actions == {'2025-01': 'full', '2025-02': 'full', '2025-03': 'full'}
+    assert [store.state['partitions'][month]['rows'] for month in ('2025-01', '2025-02', '2025-03')] == [1, 2, 3]
+    actions, store = refresh(connection, tmp_path, '2025-04-02')
+    assert actions == {'2025-01': 'unchanged', '2025-02': 'unchanged', '2025-03': 'full', '2025-04': 'full'}
+    assert store.state['partitions']['2025-03']['as_of'] == '2025-03-31'
+    actions, _ = refresh(connection, tmp_path, '2025-04-03')
+    assert actions['2025-03'] == 'unchanged'
+
+def test_changed_loans_are_patched_from_their_effective_month(connection, tmp_path):
+    refresh(connection, tmp_path, '2025-04-02')
+    connection.execute("UPDATE loans SET amount = amount + 1")
+    connection.execute("INSERT INTO loan_changes VALUES ('L2', TIMESTAMP '2025-04-02 10:00:00', DATE '2025-03-05')")
+    actions, store = refresh(connection, tmp_path, '2025-04-02')
+    assert actions == {'2025-01': 'unchanged', '2025-02': 'unchanged', '2025-03': 'patched loans', '2025-04': 'full'}
+    # Only the changed loan is recomputed in a patched month; the other rows are kept as built
+    assert amounts(store, '2025-02') == {'L1': 100, 'L2': 200}
+    assert amounts(store, '2025-03') == {'L1': 100, 'L2': 201, 'L3': 300}
+    assert store.state['watermarks']['loans'].startswith('2025-04-02 10:00:00')
+
+def test_a_source_empty_on_the_first_run_is_read_from_the_epoch(connection, tmp_path):
+    _, store = refresh(connection, tmp_path, '2025-04-02')
+    assert 'clients' not in store.state['watermarks']
+    connection.execute("UPDATE loans SET amount = amount * 10 WHERE loan_id = 'L1'")
+    connection.execute("INSERT INTO client_changes VALUES ('L1', TIMESTAMP '2025-01-20 08:00:00', NULL)")
+    actions, store = refresh(connection, tmp_path, '2025-04-02')
+    # A client attribute change has no effective date, so every partition holding the loan is patched
+    assert actions == {'2025-01': 'patched loans', '2025-02': 'patched loans', '2025-03': 'patched loans', '2025-04': 'full'}
+    assert [amounts(store, month)['L1'] for month in ('2025-01', '2025-02', '2025-03')] == [1000, 1000, 1000]
+    assert store.state['watermarks']['clients'].startswith('2025-01-20 08:00:00')
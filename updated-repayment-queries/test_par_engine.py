@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from par_engine import classify, classify_loans, PAR_CLASSIFICATION, BOG_CLASSIFICATION
+
+REPORTING_DATES = pd.DatetimeIndex(['2025-01-31', '2025-02-28', '2025-03-31', '2025-06-30', '2025-12-31'])
+
+def fixture_repayments(seed=7, loans=40):
+    """repayment_transactions_extended rows: every payment repeats its installment's due, unpaid installments have one row"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for loan in range(loans):
+        first_due = pd.Timestamp('2024-12-01') + pd.Timedelta(days=int(rng.integers(0, 90)))
+        for installment in range(int(rng.integers(1, 5))):
+            due = first_due + pd.Timedelta(days=30 * installment)
+            total_due = float(rng.integers(1, 5) * 50)
+            payments = int(rng.integers(0, 3))
+            if payments == 0:
+                rows.append((f"L{loan}", installment, due, total_due, None, None))
+            for _ in range(payments):
+                paid_on = due + pd.Timedelta(days=int(rng.integers(-10, 120)))
+                rows.append((f"L{loan}", installment, due, total_due, paid_on, float(rng.integers(1, 4) * 25)))
+    return pd.DataFrame(rows, columns=['loan_id', 'installment', 'repayment_due_date', 'total_due',
+                                       'transaction_date', 'amount'])
+
+def reference_arrears(rte, reporting_dates):
+    """Row-by-row days past due and arrears, as the SQL evaluates one reporting date at a time"""
+    rows = []
+    for date in reporting_dates:
+        paid = rte[rte['transaction_date'] <= date].groupby(['loan_id', 'installment'])['amount'].sum()
+        installments = rte.groupby(['loan_id', 'installment']).agg(due=('repayment_due_date', 'min'),
+                                                                   total_due=('total_due', 'max'))
+        installments['outstanding'] = (installments['total_due'] - paid.reindex(installments.index).fillna(0)).clip(lower=0)
+        installments['open'] = (installments['due'] <= date) & (installments['outstanding'] > 0)
+        for loan_id, loan in installments.groupby(level='loan_id'):
+            if loan['due'].min() > date or loan['outstanding'].sum() <= 0:
+                continue
+            open_due = loan.loc[loan['open'], 'due']
+            rows.append({'reporting_date': date, 'loan_id': loan_id,
+                         'days_past_due': (date - open_due.min()).days if len(open_due) else 0,
+                         'amount_in_arrears': loan.loc[loan['open'], 'outstanding'].sum(),
+                         'total_outstanding': loan['outstanding'].sum()})
+    return pd.DataFrame(rows)
+
+def test_engine_matches_row_by_row_reference():
+    rte = fixture_repayments()
+    classified = classify_loans(rte, REPORTING_DATES, dates_per_chunk=2)
+    columns = ['reporting_date', 'loan_id', 'days_past_due', 'amount_in_arrears', 'total_outstanding']
+    actual = classified[columns].sort_values(['reporting_date', 'loan_id']).reset_index(drop=True)
+    expected = reference_arrears(rte, REPORTING_DATES).sort_values(['reporting_date', 'loan_id']).reset_index(drop=True)
+    expected['reporting_date'] = expected['reporting_date'].astype(actual['reporting_date'].dtype)
+    assert len(actual) > 0
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+def test_cut_points_follow_the_sql_case_bounds():
+    # CASE WHEN dpd <= 2 THEN 'Performing' WHEN dpd BETWEEN 3 AND 32 THEN 'Watch' ...
+    dpd = np.array([0, 2, 3, 32, 33, 92, 93, 182, 183])
+    assert list(classify(dpd, PAR_CLASSIFICATION)) == ['Performing', 'Performing', 'Watch', 'Watch', 'Substandard',
+                                                        'Substandard', 'Doubtful', 'Doubtful', 'Loss']
+    assert list(classify(np.array([2, 3, 62, 63, 152, 153]), BOG_CLASSIFICATION)) == [
+        'current', 'par 0', 'par 30', 'par 60', 'par 120', 'par 150']
+
+def test_far_future_reporting_date_stays_within_each_installment():
+    rte = fixture_repayments(loans=5)
+    far = classify_loans(rte, pd.DatetimeIndex(['9999-12-31']))
+    expected = reference_arrears(rte, pd.DatetimeIndex(['2149-06-30']))
+    assert sorted(far['loan_id']) == sorted(expected['loan_id'])
+    assert np.allclose(far.sort_values('loan_id')['total_outstanding'], expected.sort_values('loan_id')['total_outstanding'])
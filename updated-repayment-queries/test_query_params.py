@@ -0,0 +1,56 @@
+import duckdb
+import pytest
+
+from query_params import QueryTemplate, infer_spec
+
+STATES_SQL = """
+SELECT count(*) AS n FROM (VALUES ('ACTIVE'), ('CLOSED'), ('LOCKED'), ('ACTIVE')) loans(accountstate)
+WHERE accountstate IN ({{accountstates}}) AND 'state: {{ label }}' LIKE 'state: %'
+"""
+
+def run(sql, params):
+    return duckdb.connect().execute(sql, params).fetchone()[0]
+
+def test_multi_select_placeholders_in_in_lists_are_list_parameters():
+    template = QueryTemplate(STATES_SQL)
+    assert template.parameters['accountstates'].kind == 'list'
+    assert template.parameters['label'].kind == 'text'
+    # Outside IN (...) the same name is an ordinary parameter
+    assert infer_spec('accountstates').kind == 'text'
+
+@pytest.mark.parametrize('selection, expected', [
+    ("'ACTIVE','CLOSED'", 3),
+    ("ACTIVE, CLOSED", 3),
+    (['LOCKED'], 1),
+    ("'ACTIVE'", 2),
+])
+def test_each_selected_value_gets_its_own_marker(selection, expected):
+    template = QueryTemplate(STATES_SQL)
+    for paramstyle in ('dollar', 'qmark'):
+        sql, params = template.bind({'accountstates': selection, 'label': 'x'}, paramstyle)
+        assert run(sql, params) == expected
+
+def test_dollar_markers_are_numbered_per_value():
+    sql, params = QueryTemplate(STATES_SQL).bind({'accountstates': "'ACTIVE','CLOSED'", 'label': 'x'})
+    assert 'IN ($accountstates_0, $accountstates_1)' in sql
+    assert params == {'accountstates_0': 'ACTIVE', 'accountstates_1': 'CLOSED', 'label': 'x'}
+
+def test_empty_selection_is_rejected():
+    with pytest.raises(ValueError, match='at least one value'):
+        QueryTemplate(STATES_SQL).bind({'accountstates': "", 'label': 'x'})
+
+def test_inline_writes_literals_by_context():
+    template = QueryTemplate("SELECT DATE_TRUNC('{{time_period}}', d), '{{ Range.start }}' AS since, {{score_limit}} AS n "
+                             "FROM t WHERE s IN ({{states}}) AND name = {{persona_type}}")
+    sql = template.inline({'time_period': 'Week', 'Range.start': '2025-04-01', 'score_limit': '30',
+                           'states': "'ACTIVE','O''NEIL'", 'persona_type': "it's"})
+    assert sql == ("SELECT DATE_TRUNC('week', d), '2025-04-01' AS since, 30 AS n "
+                   "FROM t WHERE s IN ('ACTIVE', 'O''NEIL') AND name = 'it''s'")
+
+def test_literal_placeholders_are_concatenated_around_markers():
+    template = QueryTemplate("SELECT 'score under {{ score_limit }}' AS label, DATE_TRUNC('{{time_period}}', DATE '2025-05-17') AS p")
+    sql, params = template.bind({'score_limit': 7, 'time_period': 'month'}, 'qmark')
+    assert sql == "SELECT ('score under ' || ?) AS label, DATE_TRUNC('month', DATE '2025-05-17') AS p"
+    assert params == [7]
+    with pytest.raises(ValueError, match='must be one of'):
+        template.bind({'score_limit': 7, 'time_period': 'fortnight'})
@@ -0,0 +1,63 @@
+import pyarrow.parquet as pq
+
+from arrow_export import export_file
+from report_runner import DuckDBBackend, ReportRunner
+
+SESSION_SQL = """
+CREATE TEMP TABLE recent AS SELECT range AS id FROM range(5);
+SET VARIABLE cutoff = 2;
+SELECT id FROM recent WHERE id > getvariable('cutoff') ORDER BY id;
+"""
+
+def test_statements_of_a_report_share_temp_tables_and_variables():
+    backend = DuckDBBackend()
+    try:
+        df, info = ReportRunner(backend).run(SESSION_SQL, name='session')
+        assert list(df['id']) == [3, 4]
+        # Session state does not leak into the next run
+        df, _ = ReportRunner(backend).run("SELECT count(*) AS n FROM duckdb_tables() WHERE table_name = 'recent'")
+        assert df['n'].iloc[0] == 0
+    finally:
+        backend.close()
+
+def test_export_file_runs_its_statements_on_one_cursor(tmp_path):
+    report = tmp_path / 'session.sql'
+    report.write_text(SESSION_SQL)
+    backend = DuckDBBackend()
+    try:
+        summary = export_file(backend, str(report), {}, str(tmp_path / 'out'))
+    finally:
+        backend.close()
+    assert summary['rows'] == 2
+    assert pq.read_table(tmp_path / 'out').column('id').to_pylist() == [3, 4]
+
+TEMPLATE_SQL = """
+CREATE TEMP TABLE scores AS SELECT range AS score FROM range(10) WHERE range >= {{ score_floor }};
+SELECT count(*) AS n FROM scores WHERE score < {{score_limit}};
+"""
+
+def test_each_statement_gets_only_its_own_parameters(tmp_path):
+    report = tmp_path / 'template.sql'
+    report.write_text(TEMPLATE_SQL)
+    values = {'score_floor': 2, 'score_limit': 7}
+    for paramstyle in ('dollar', 'qmark'):
+        backend = DuckDBBackend()
+        backend.paramstyle = paramstyle
+        try:
+            df, _ = ReportRunner(backend).run_file(str(report), values)
+            assert df['n'].iloc[0] == 5
+            summary = export_file(backend, str(report), values, str(tmp_path / paramstyle))
+            assert summary['rows'] == 1
+        finally:
+            backend.close()
+
+def test_export_replaces_partitions_missing_from_the_new_run(tmp_path):
+    from arrow_export import export_query
+    backend = DuckDBBackend()
+    try:
+        for month in ('2025-01-15', '2025-02-15'):
+            export_query(backend, f"SELECT 1 AS id, DATE '{month}' AS created", None, str(tmp_path),
+                         partition=('created', 'month'))
+    finally:
+        backend.close()
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['CREATED_MONTH=2025-02']
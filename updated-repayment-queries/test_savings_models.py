@@ -0,0 +1,58 @@
+import graphlib
+import json
+
+import pytest
+
+from report_runner import DuckDBBackend
+from savings_models import ModelBuilder, build_order, load_models
+
+MODELS = {
+    'transactions': "SELECT range AS account_id, range * 10 AS amount, DATE '2025-04-01' + CAST(range AS INTEGER) AS tx_date FROM range(6)",
+    'balances': "SELECT account_id, SUM(amount) AS balance FROM {{ ref('transactions') }} WHERE tx_date <= {{ as_of }} GROUP BY account_id",
+    'active': "SELECT account_id FROM {{ ref('balances') }} WHERE balance > 0",
+    'gaps': "SELECT account_id, tx_date FROM {{ ref('transactions') }};",
+}
+
+def write_models(directory, models):
+    """Model files for {name: sql}; returns load_models over them"""
+    directory.mkdir(exist_ok=True)
+    for name, sql in models.items():
+        (directory / f'{name}.sql').write_text(sql)
+    return load_models(str(directory))
+
+def test_dependencies_come_first_and_only_upstream_models_are_selected(tmp_path):
+    models = write_models(tmp_path / 'models', MODELS)
+    order = build_order(models)
+    assert sorted(order) == sorted(MODELS)
+    assert order.index('transactions') < order.index('balances') < order.index('active')
+    assert order.index('transactions') < order.index('gaps')
+    assert build_order(models, ['active']) == ['transactions', 'balances', 'active']
+    assert build_order(models, ['gaps', 'transactions']) == ['transactions', 'gaps']
+    with pytest.raises(ValueError, match="Unknown model 'missing'"):
+        build_order(models, ['missing'])
+
+def test_unknown_refs_and_cycles_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match=r"Model balances refers to unknown models \['transactions'\]"):
+        write_models(tmp_path / 'unknown', {'balances': MODELS['balances']})
+    models = write_models(tmp_path / 'cycle', {'a': "SELECT * FROM {{ ref('b') }}", 'b': "SELECT * FROM {{ ref('a') }}"})
+    with pytest.raises(graphlib.CycleError):
+        build_order(models)
+
+def test_refresh_builds_each_model_once_with_the_refresh_values(tmp_path):
+    models = write_models(tmp_path / 'models', MODELS)
+    state_file = tmp_path / 'state.json'
+    backend = DuckDBBackend()
+    built = []
+    try:
+        builder = ModelBuilder(backend, models, 'models', str(state_file))
+        records = builder.refresh({'as_of': '2025-04-03'}, ['active', 'gaps'], lambda record: built.append(record['model']))
+        assert [record['model'] for record in records] == built == build_order(models, ['active', 'gaps'])
+        assert {record['table']: record['rows'] for record in records} == {
+            'models.TRANSACTIONS': 6, 'models.BALANCES': 3, 'models.ACTIVE': 2, 'models.GAPS': 6}
+        assert backend.execute("SELECT account_id FROM models.ACTIVE ORDER BY 1")['account_id'].tolist() == [1, 2]
+    finally:
+        backend.close()
+    state = json.loads(state_file.read_text())
+    assert sorted(state) == sorted(MODELS) and state['balances']['values'] == {'as_of': '2025-04-03'}
+    # A later builder starts from the recorded state
+    assert ModelBuilder(None, models, 'models', str(state_file)).state['active']['rows'] == 2
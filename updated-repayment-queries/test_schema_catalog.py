@@ -0,0 +1,35 @@
+import pandas as pd
+
+from schema_catalog import SchemaCatalog, diff_catalogs, touched_tables
+
+def catalog(rows):
+    """Catalog snapshot from (database, schema, table, column, type) tuples"""
+    df = pd.DataFrame(rows, columns=['TABLE_CATALOG', 'TABLE_SCHEMA', 'TABLE_NAME', 'COLUMN_NAME', 'DATA_TYPE'])
+    return df.assign(CHARACTER_MAXIMUM_LENGTH=None, NUMERIC_PRECISION=None, NUMERIC_SCALE=None)
+
+def test_database_prefixes_are_not_read_as_schemas(tmp_path):
+    # The unparseable GROUP BY sends this file through the regex fallback
+    (tmp_path / 'report.sql').write_text(
+        'SELECT u.id FROM GHANA_PROD.BANKING_SERVICE."USER" u JOIN ml.loan_info_tbl l ON l.client_id = u.id GROUP BY ,;\n'
+        'SELECT * FROM ug_prod.mambu.loanaccount;\n'
+        'SELECT * FROM ghana_prod.banking_service;\n')
+    assert touched_tables(str(tmp_path)) == [
+        ('GHANA_PROD', 'BANKING_SERVICE', 'USER'),
+        ('GHANA_PROD', 'ML', 'LOAN_INFO_TBL'),
+        ('UG_PROD', 'MAMBU', 'LOANACCOUNT'),
+    ]
+
+def test_diff_covers_only_schemas_in_both_snapshots():
+    old = catalog([('GHANA_PROD', 'ML', 'LOANS', 'ID', 'NUMBER'),
+                   ('GHANA_PROD', 'ML', 'LOANS', 'AMOUNT', 'FLOAT')])
+    new = catalog([('GHANA_PROD', 'ML', 'LOANS', 'ID', 'TEXT'),
+                   ('GHANA_PROD', 'ML', 'LOANS', 'STATUS', 'TEXT'),
+                   ('GHANA_PROD', 'MAMBU', 'LOANACCOUNT', 'ID', 'TEXT')])
+    diff = diff_catalogs(old, new)
+    assert set(zip(diff['CHANGE'], diff['COLUMN_NAME'])) == {('added', 'STATUS'), ('dropped', 'AMOUNT'), ('retyped', 'ID')}
+
+def test_the_catalog_directory_is_created_on_first_save(tmp_path):
+    store = SchemaCatalog(str(tmp_path / 'catalog'))
+    assert store.latest() is None and not (tmp_path / 'catalog').exists()
+    store.save(catalog([('GHANA_PROD', 'ML', 'LOANS', 'ID', 'NUMBER')]))
+    assert len(store.snapshots()) == 1
@@ -0,0 +1,47 @@
+import sqlglot
+
+from sql_analyser import CARDINALITY_HINTS, analyse_file, analyse_statement
+
+def findings(sql):
+    """(rule, estimated rows) per finding of one statement"""
+    return [(rule, rows) for rule, _, rows, _ in analyse_statement(sqlglot.parse_one(sql, read='snowflake'), CARDINALITY_HINTS)]
+
+def test_expression_equalities_are_key_joins():
+    assert findings("""
+        SELECT * FROM mambu.loantransaction l
+        JOIN (SELECT DISTINCT date_trunc('month', creationdate) month FROM mambu.loantransaction) days
+          ON date_trunc('month', l.creationdate) = days.month
+        JOIN mambu.client c ON REPLACE(c.mobilephone1, '+', '') = right(l.parentaccountkey, 9)""") == []
+
+def test_equalities_within_one_side_do_not_make_a_key_join():
+    assert [rule for rule, _ in findings("""
+        SELECT * FROM mambu.loanaccount a JOIN mambu.client c ON c.state = 'ACTIVE' AND a.id = a.loanname""")] == ['non_equi_join']
+
+def test_comma_joins_use_the_where_equality():
+    assert findings("SELECT * FROM mambu.loanaccount a, mambu.client c WHERE a.accountholderkey = c.encodedkey") == []
+    assert findings("SELECT * FROM mambu.loanaccount a, mambu.client c WHERE a.loanamount > 0") == [
+        ('cross_join', 1_000_000 * 1_500_000)]
+
+def test_not_in_is_ranked_by_both_sides_and_qualified_names_are_not_ctes():
+    # The CTE shares its name with the schema-qualified table it reads
+    assert findings("""
+        WITH base_savings_data AS (SELECT * FROM savings_models.base_savings_data)
+        SELECT client_id FROM base_savings_data
+        WHERE client_id NOT IN (SELECT client_id FROM mambu.client)""") == [('not_in_subquery', 100_000 * 1_500_000)]
+
+def file_findings(tmp_path, sql):
+    """(rule, line, estimated rows) per finding of a .sql file"""
+    path = tmp_path / 'report.sql'
+    path.write_text(sql)
+    return [(rule, line, rows) for rule, line, rows, _ in analyse_file(str(path), CARDINALITY_HINTS)]
+
+def test_unparseable_files_report_a_parse_error(tmp_path):
+    assert file_findings(tmp_path, "SELECT\n    CASE WHEN amount > 0 THEN 1\nFROM mambu.loanaccount") == [('parse_error', 2, 0)]
+    assert file_findings(tmp_path, "SELECT id FROM mambu.loanaccount WHERE id = '{{ loan_id }}'") == []
+
+def test_model_refs_resolve_to_the_model_tables(tmp_path):
+    # refresh_info is the one-row as-of record, not a 100k-row placeholder table
+    assert file_findings(tmp_path, """
+        SELECT st.*, ri.as_of_date
+        FROM GHANA_PROD.MAMBU.SAVINGSTRANSACTION st
+        CROSS JOIN {{ ref('refresh_info') }} ri""") == [('cross_join', 4, 30_000_000)]